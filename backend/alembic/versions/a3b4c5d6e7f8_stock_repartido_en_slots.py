@@ -0,0 +1,266 @@
+"""stock repartido en slots para productos de alta concurrencia
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+STATS_SLOTS = 16
+
+
+def upsert_daily_counts(source: str, sign: int, slot: str) -> str:
+    """Sumar (o restar) los movimientos de ``source`` a su día y slot."""
+    return f"""
+        INSERT INTO inventory_movement_daily_counts AS c (day, slot, movements)
+        SELECT r.created_at::date, {slot} % {STATS_SLOTS}, {sign} * count(*)
+        FROM {source} r
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (day, slot) DO UPDATE SET movements = c.movements + EXCLUDED.movements
+    """
+
+
+def movements_trigger(slot: str) -> str:
+    """Función del trigger de conteo diario de movimientos, repartido por ``slot``."""
+    return f"""
+        CREATE OR REPLACE FUNCTION inventory_stats_movements_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {upsert_daily_counts('new_rows', 1, slot)};
+            ELSE
+                {upsert_daily_counts('old_rows', -1, slot)};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3b4c5d6e7f8'
+down_revision: Union[str, None] = 'f2a3b4c5d6e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 0 = modo normal; N > 0 = el stock vive en N filas de product_stock_shards
+    op.add_column('products', sa.Column('stock_shards', sa.SmallInteger(), nullable=False, server_default='0'))
+    op.create_table(
+        'product_stock_shards',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('shard', sa.SmallInteger(), autoincrement=False, nullable=False),
+        sa.Column('stock', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('product_id', 'shard'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.CheckConstraint('stock >= 0', name='check_shard_stock_positive'),
+    )
+
+    # Los movimientos de un producto repartido se insertan sin stock
+    # antes/después (no hay un total serializado); los completa el plegado.
+    op.alter_column('inventory_movements', 'stock_before', nullable=True)
+    op.alter_column('inventory_movements', 'stock_after', nullable=True)
+    op.execute("""
+        CREATE INDEX ix_inventory_movements_unfolded ON inventory_movements (product_id, id)
+        WHERE stock_after IS NULL
+    """)
+
+    # Aplica un delta al stock repartido de un producto. Camino rápido: un
+    # solo UPDATE sobre el primer slot libre (SKIP LOCKED, sin esperar) con
+    # stock suficiente, empezando por uno al azar para repartir escritores.
+    # Con más escritores que slots puede no haber ninguno libre: se espera
+    # por uno solo. Si ni así alcanza, se bloquean todos los slots en orden
+    # y se toma de varios.
+    # Retorna false si el total no alcanza y NULL si el producto no está
+    # repartido. El llamador debe tener bloqueada la fila del producto.
+    op.execute("""
+        CREATE FUNCTION apply_stock_shard_delta(p_product_id integer, p_delta integer, p_shards integer)
+        RETURNS boolean
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            start integer := floor(random() * p_shards);
+            picked smallint;
+            shard_count integer;
+            total bigint;
+            remaining integer := -p_delta;
+            slot record;
+        BEGIN
+            -- Un slot que se bloquea (o por el que se espera) y al revalidarlo
+            -- ya no alcanza queda bloqueado igual; con un slot tomado fuera de
+            -- orden el camino lento podría caer en deadlock. Si los caminos
+            -- rápidos fallan, el bloque (una subtransacción) se deshace y
+            -- libera esos bloqueos.
+            BEGIN
+                UPDATE product_stock_shards s SET stock = s.stock + p_delta
+                WHERE s.product_id = p_product_id AND s.shard = (
+                    SELECT f.shard FROM product_stock_shards f
+                    WHERE f.product_id = p_product_id AND f.stock + p_delta >= 0
+                    ORDER BY (f.shard - start + p_shards) % p_shards
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING s.shard INTO picked;
+                IF picked IS NOT NULL THEN
+                    RETURN true;
+                END IF;
+
+                SELECT f.shard INTO picked FROM product_stock_shards f
+                WHERE f.product_id = p_product_id AND f.stock + p_delta >= 0
+                ORDER BY (f.shard - start + p_shards) % p_shards
+                LIMIT 1;
+                IF picked IS NOT NULL THEN
+                    UPDATE product_stock_shards SET stock = stock + p_delta
+                    WHERE product_id = p_product_id AND shard = picked AND stock + p_delta >= 0;
+                    IF FOUND THEN
+                        RETURN true;
+                    END IF;
+                END IF;
+                RAISE EXCEPTION 'sin slot con stock suficiente' USING ERRCODE = 'P0001';
+            EXCEPTION WHEN raise_exception THEN
+                NULL;
+            END;
+
+            SELECT count(*), coalesce(sum(l.stock), 0) INTO shard_count, total
+            FROM (
+                SELECT stock FROM product_stock_shards
+                WHERE product_id = p_product_id
+                ORDER BY shard
+                FOR UPDATE
+            ) l;
+            IF shard_count = 0 THEN
+                RETURN NULL;
+            END IF;
+            IF total + p_delta < 0 THEN
+                RETURN false;
+            END IF;
+            IF p_delta >= 0 THEN
+                UPDATE product_stock_shards SET stock = stock + p_delta
+                WHERE product_id = p_product_id AND shard = start % shard_count;
+                RETURN true;
+            END IF;
+
+            FOR slot IN
+                SELECT shard, stock FROM product_stock_shards
+                WHERE product_id = p_product_id AND stock > 0
+                ORDER BY stock DESC
+            LOOP
+                UPDATE product_stock_shards SET stock = stock - least(slot.stock, remaining)
+                WHERE product_id = p_product_id AND shard = slot.shard;
+                remaining := remaining - least(slot.stock, remaining);
+                EXIT WHEN remaining = 0;
+            END LOOP;
+            RETURN true;
+        END
+        $$
+    """)
+
+    # Pliega el stock repartido: bloquea todos los slots, lleva el total a
+    # products.stock_current, completa el stock antes/después de los
+    # movimientos pendientes (hacia atrás desde el total, en orden de id) y
+    # reparte el total en partes iguales. El llamador debe tener bloqueada
+    # la fila del producto. Retorna el total.
+    op.execute("""
+        CREATE FUNCTION fold_stock_shards(p_product_id integer)
+        RETURNS integer
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            shard_count integer;
+            total integer;
+        BEGIN
+            SELECT count(*), coalesce(sum(l.stock), 0) INTO shard_count, total
+            FROM (
+                SELECT stock FROM product_stock_shards
+                WHERE product_id = p_product_id
+                ORDER BY shard
+                FOR UPDATE
+            ) l;
+            IF shard_count = 0 THEN
+                RETURN NULL;
+            END IF;
+
+            UPDATE inventory_movements m
+            SET stock_after = total - p.later,
+                stock_before = total - p.later - p.delta
+            FROM (
+                SELECT d.id, d.created_at, d.delta,
+                       coalesce(sum(d.delta) OVER (
+                           ORDER BY d.id DESC ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                       ), 0) AS later
+                FROM (
+                    SELECT id, created_at,
+                           CASE movement_type
+                               WHEN 'entry' THEN quantity
+                               WHEN 'transfer' THEN 0
+                               ELSE -quantity
+                           END AS delta
+                    FROM inventory_movements
+                    WHERE product_id = p_product_id AND stock_after IS NULL
+                ) d
+            ) p
+            WHERE m.product_id = p_product_id AND m.id = p.id AND m.created_at = p.created_at;
+
+            UPDATE product_stock_shards
+            SET stock = total / shard_count + (shard < total % shard_count)::int
+            WHERE product_id = p_product_id;
+            UPDATE products SET stock_current = total
+            WHERE id = p_product_id AND stock_current <> total;
+            RETURN total;
+        END
+        $$
+    """)
+
+    # El conteo diario de movimientos se repartía por producto: todos los
+    # movimientos de un SKU caliente caían en la misma fila. Por id del
+    # movimiento se reparten entre los slots (las lecturas suman todos).
+    op.execute(movements_trigger('r.id'))
+
+    # Disponibilidad: en un producto repartido el total exacto es la suma
+    # de sus slots (stock_current se actualiza al plegar)
+    op.execute("""
+        CREATE OR REPLACE VIEW product_stock_availability AS
+        SELECT p.id AS product_id,
+               s.stock_current,
+               coalesce(r.reserved, 0) AS stock_reserved,
+               s.stock_current - coalesce(r.reserved, 0) AS stock_available
+        FROM products p
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN p.stock_shards > 0
+                THEN (SELECT coalesce(sum(stock), 0)::int FROM product_stock_shards WHERE product_id = p.id)
+                ELSE p.stock_current
+            END AS stock_current
+        ) s
+        LEFT JOIN product_stock_reserved r ON r.product_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    # Pliega los productos repartidos antes de volver al modo normal
+    op.execute("""
+        SELECT fold_stock_shards(id) FROM (
+            SELECT id FROM products WHERE stock_shards > 0 ORDER BY id FOR UPDATE
+        ) p
+    """)
+    op.execute("""
+        CREATE OR REPLACE VIEW product_stock_availability AS
+        SELECT p.id AS product_id,
+               p.stock_current,
+               coalesce(r.reserved, 0) AS stock_reserved,
+               p.stock_current - coalesce(r.reserved, 0) AS stock_available
+        FROM products p
+        LEFT JOIN product_stock_reserved r ON r.product_id = p.id
+    """)
+    op.execute(movements_trigger('r.product_id'))
+    op.execute('DROP FUNCTION IF EXISTS fold_stock_shards(integer)')
+    op.execute('DROP FUNCTION IF EXISTS apply_stock_shard_delta(integer, integer, integer)')
+    op.execute('DROP INDEX IF EXISTS ix_inventory_movements_unfolded')
+    op.alter_column('inventory_movements', 'stock_after', nullable=False)
+    op.alter_column('inventory_movements', 'stock_before', nullable=False)
+    op.drop_table('product_stock_shards')
+    op.drop_column('products', 'stock_shards')
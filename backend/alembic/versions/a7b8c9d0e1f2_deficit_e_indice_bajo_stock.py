@@ -0,0 +1,47 @@
+"""columna generada deficit e indice parcial de bajo stock en products
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Columna generada: stock_current < stock_min compara dos columnas y
+    # ningún índice B-tree puede resolverlo; deficit > 0 sí.
+    # Agregar una columna STORED reescribe la tabla (bloqueo exclusivo).
+    op.add_column(
+        'products',
+        sa.Column(
+            'deficit',
+            sa.Integer(),
+            sa.Computed('stock_min - stock_current', persisted=True),
+            nullable=True,
+        ),
+    )
+
+    # Índice parcial: solo los productos bajo mínimo, en el orden de las alertas
+    op.create_index(
+        'ix_products_low_stock',
+        'products',
+        [sa.text('deficit DESC'), 'id'],
+        postgresql_where=sa.text('deficit > 0'),
+    )
+    op.execute('ANALYZE products')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_low_stock', table_name='products')
+    op.drop_column('products', 'deficit')
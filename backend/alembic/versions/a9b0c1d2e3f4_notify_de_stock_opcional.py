@@ -0,0 +1,71 @@
+"""notify de cambios de stock solo con el canal en vivo activo
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-18 02:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# Igual que en b4c5d6e7f8a9
+ROWS_PER_NOTIFY = 16
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9b0c1d2e3f4'
+down_revision: Union[str, None] = 'f8a9b0c1d2e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def stock_events_trigger(changed: str, guard: str = '') -> str:
+    """Función del trigger (ver ``b4c5d6e7f8a9``) con el filtro de filas ``changed``."""
+    return f"""
+        CREATE OR REPLACE FUNCTION stock_events_products_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN{guard}
+            PERFORM pg_notify('stock_events', c.payload)
+            FROM (
+                SELECT json_agg(json_build_array(
+                           d.id, d.category_id, d.sku, d.old_stock, d.new_stock, d.old_min, d.new_min
+                       ) ORDER BY d.id)::text AS payload
+                FROM (
+                    SELECT n.id, n.category_id, n.sku,
+                           o.stock_current AS old_stock, n.stock_current AS new_stock,
+                           o.stock_min AS old_min, n.stock_min AS new_min,
+                           (row_number() OVER (ORDER BY n.id) - 1) / {ROWS_PER_NOTIFY} AS chunk
+                    FROM new_rows n
+                    JOIN old_rows o ON o.id = n.id
+                    WHERE {changed}
+                ) d
+                GROUP BY d.chunk
+                ORDER BY d.chunk
+            ) c;
+            RETURN NULL;
+        END
+        $$
+    """
+
+
+def upgrade() -> None:
+    # NOTIFY toma al confirmar el lock global de la cola de notificaciones:
+    # con STOCK_EVENTS_ENABLED en False (el valor por defecto) nadie escucha
+    # y cada escritura de stock pagaba esa serialización. El trigger solo
+    # publica si la conexión trae inventory.stock_events = on (lo agrega
+    # database.session_settings con el canal activo); en otro caso sale
+    # antes de leer las tablas de transición. Los cambios que solo tocan el
+    # catálogo no publican nada. Postgres no admite lista de columnas en
+    # triggers con tablas de transición, así que el filtro va en el cuerpo.
+    op.execute(stock_events_trigger(
+        'n.stock_current IS DISTINCT FROM o.stock_current OR n.stock_min IS DISTINCT FROM o.stock_min',
+        """
+            IF current_setting('inventory.stock_events', true) IS DISTINCT FROM 'on' THEN
+                RETURN NULL;
+            END IF;""",
+    ))
+
+
+def downgrade() -> None:
+    op.execute(stock_events_trigger('n.stock_current <> o.stock_current OR n.stock_min <> o.stock_min'))
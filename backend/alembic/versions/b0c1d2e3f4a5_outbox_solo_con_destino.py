@@ -0,0 +1,135 @@
+"""outbox de movimientos solo con destino configurado
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0c1d2e3f4a5'
+down_revision: Union[str, None] = 'a9b0c1d2e3f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Sin inventory.outbox = on en la conexión no se agrega nada a la cola
+OUTBOX_GUARD = """
+            IF current_setting('inventory.outbox', true) IS DISTINCT FROM 'on' THEN
+                RETURN NULL;
+            END IF;"""
+
+
+def outbox_movements_trigger(guard: str = '') -> str:
+    """Trigger de la migración ``c5d6e7f8a9b0``, con ``guard`` al comienzo."""
+    return f"""
+        CREATE OR REPLACE FUNCTION inventory_outbox_movements_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN{guard}
+            INSERT INTO inventory_outbox (event_type, product_id, movement_id, payload)
+            SELECT 'movement_created', r.product_id, r.id, jsonb_build_object(
+                       'movement_id', r.id,
+                       'product_id', r.product_id,
+                       'sku', p.sku,
+                       'category_id', p.category_id,
+                       'movement_type', r.movement_type,
+                       'reason', r.reason,
+                       'quantity', r.quantity,
+                       'stock_before', r.stock_before,
+                       'stock_after', r.stock_after,
+                       'reference', r.reference,
+                       'notes', r.notes,
+                       'user_id', r.user_id,
+                       'created_at', r.created_at
+                   )
+            FROM new_rows r
+            JOIN products p ON p.id = r.product_id
+            ORDER BY r.id;
+            RETURN NULL;
+        END
+        $$
+    """
+
+
+def fold_stock_shards(folded_filter: str = '') -> str:
+    """Plegado de la migración ``d6e7f8a9b0c1``; ``folded_filter`` decide si emite eventos."""
+    return f"""
+        CREATE OR REPLACE FUNCTION fold_stock_shards(p_product_id integer)
+        RETURNS integer
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            shard_count integer;
+            total integer;
+        BEGIN
+            SELECT count(*), coalesce(sum(l.stock), 0) INTO shard_count, total
+            FROM (
+                SELECT stock FROM product_stock_shards
+                WHERE product_id = p_product_id
+                ORDER BY shard
+                FOR UPDATE
+            ) l;
+            IF shard_count = 0 THEN
+                RETURN NULL;
+            END IF;
+
+            WITH folded AS (
+                UPDATE inventory_movements m
+                SET stock_after = total - p.later,
+                    stock_before = total - p.later - p.delta
+                FROM (
+                    SELECT d.id, d.created_at, d.delta,
+                           coalesce(sum(d.delta) OVER (
+                               ORDER BY d.id DESC ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                           ), 0) AS later
+                    FROM (
+                        SELECT id, created_at,
+                               CASE movement_type
+                                   WHEN 'entry' THEN quantity
+                                   WHEN 'transfer' THEN 0
+                                   ELSE -quantity
+                               END AS delta
+                        FROM inventory_movements
+                        WHERE product_id = p_product_id AND stock_after IS NULL
+                    ) d
+                ) p
+                WHERE m.product_id = p_product_id AND m.id = p.id AND m.created_at = p.created_at
+                RETURNING m.id, m.product_id, m.stock_before, m.stock_after
+            )
+            INSERT INTO inventory_outbox (event_type, product_id, movement_id, payload)
+            SELECT 'movement_folded', f.product_id, f.id, jsonb_build_object(
+                       'movement_id', f.id,
+                       'product_id', f.product_id,
+                       'stock_before', f.stock_before,
+                       'stock_after', f.stock_after
+                   )
+            FROM folded f{folded_filter}
+            ORDER BY f.id;
+
+            UPDATE product_stock_shards
+            SET stock = total / shard_count + (shard < total % shard_count)::int
+            WHERE product_id = p_product_id;
+            UPDATE products SET stock_current = total
+            WHERE id = p_product_id AND stock_current <> total;
+            RETURN total;
+        END
+        $$
+    """
+
+
+def upgrade() -> None:
+    # Con OUTBOX_SINK=none (el valor por defecto) nada vacía la cola: cada
+    # movimiento agregaba una fila JSONB que nadie iba a borrar. Los
+    # triggers solo escriben si la conexión trae inventory.outbox = on, que
+    # database.session_settings agrega cuando hay un destino configurado.
+    # El plegado sigue completando los movimientos; solo omite los eventos.
+    op.execute(outbox_movements_trigger(OUTBOX_GUARD))
+    op.execute(fold_stock_shards("\n            WHERE current_setting('inventory.outbox', true) = 'on'"))
+
+
+def downgrade() -> None:
+    op.execute(fold_stock_shards())
+    op.execute(outbox_movements_trigger())
@@ -0,0 +1,65 @@
+"""notify de cambios de stock para el canal en vivo
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# Filas por NOTIFY: el payload tiene un máximo de 8000 bytes y cada fila
+# lleva el SKU (hasta 100 caracteres)
+ROWS_PER_NOTIFY = 16
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c5d6e7f8a9'
+down_revision: Union[str, None] = 'a3b4c5d6e7f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Trigger por sentencia: junta las filas cuyo stock_current o stock_min
+    # cambió y las publica en el canal stock_events como arrays JSON
+    # [id, category_id, sku, stock antes, stock después, mínimo antes,
+    # mínimo después]. NOTIFY se entrega al confirmar la transacción: un
+    # rollback no emite nada y los oyentes los reciben en orden de commit.
+    # Los productos repartidos cambian stock_current al plegarse.
+    op.execute(f"""
+        CREATE FUNCTION stock_events_products_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('stock_events', c.payload)
+            FROM (
+                SELECT json_agg(json_build_array(
+                           d.id, d.category_id, d.sku, d.old_stock, d.new_stock, d.old_min, d.new_min
+                       ) ORDER BY d.id)::text AS payload
+                FROM (
+                    SELECT n.id, n.category_id, n.sku,
+                           o.stock_current AS old_stock, n.stock_current AS new_stock,
+                           o.stock_min AS old_min, n.stock_min AS new_min,
+                           (row_number() OVER (ORDER BY n.id) - 1) / {ROWS_PER_NOTIFY} AS chunk
+                    FROM new_rows n
+                    JOIN old_rows o ON o.id = n.id
+                    WHERE n.stock_current <> o.stock_current OR n.stock_min <> o.stock_min
+                ) d
+                GROUP BY d.chunk
+                ORDER BY d.chunk
+            ) c;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER stock_events_products_update AFTER UPDATE ON products
+        REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION stock_events_products_trigger()
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS stock_events_products_update ON products')
+    op.execute('DROP FUNCTION IF EXISTS stock_events_products_trigger()')
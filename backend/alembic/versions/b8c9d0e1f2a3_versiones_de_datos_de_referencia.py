@@ -0,0 +1,65 @@
+"""tabla data_versions con versiones de categorias y proveedores mantenidas por triggers
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tablas versionadas: el nombre de la versión es el nombre de la tabla
+VERSIONED_TABLES = ('categories', 'suppliers')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    # Un incremento por sentencia y un NOTIFY "nombre:versión" que Postgres
+    # entrega al confirmar la transacción (no se envía si hay rollback).
+    op.execute("""
+        CREATE FUNCTION bump_data_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            INSERT INTO data_versions (name, version, updated_at)
+            VALUES (TG_ARGV[0], 1, now())
+            ON CONFLICT (name) DO UPDATE
+                SET version = data_versions.version + 1, updated_at = now()
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('data_versions', TG_ARGV[0] || ':' || new_version);
+            RETURN NULL;
+        END
+        $$
+    """)
+
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO data_versions (name, version) VALUES ('{table}', 1)")
+        op.execute(f"""
+            CREATE TRIGGER {table}_bump_data_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version('{table}')
+        """)
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_bump_data_version ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS bump_data_version()')
+    op.drop_table('data_versions')
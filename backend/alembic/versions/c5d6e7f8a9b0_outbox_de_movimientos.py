@@ -0,0 +1,84 @@
+"""outbox transaccional de movimientos de inventario
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-18 00:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d6e7f8a9b0'
+down_revision: Union[str, None] = 'b4c5d6e7f8a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cola de eventos pendientes de entregar: el relay las lee en orden de
+    # id y las borra al entregarlas, así que la tabla se mantiene chica. El
+    # autovacuum se ajusta a un número fijo de filas muertas en lugar de una
+    # fracción de una tabla que casi siempre está vacía.
+    op.create_table(
+        'inventory_outbox',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('movement_id', sa.Integer(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute("""
+        ALTER TABLE inventory_outbox
+        SET (autovacuum_vacuum_scale_factor = 0, autovacuum_vacuum_threshold = 10000)
+    """)
+
+    # Un evento por movimiento, en la misma transacción que lo inserta
+    # (cualquier camino: movimientos, ajustes, ventas, entradas masivas,
+    # servicios asíncronos). Por sentencia: una venta o una entrada masiva
+    # de N líneas es un solo INSERT a la cola. En productos repartidos el
+    # stock antes/después va NULL, igual que en el movimiento.
+    op.execute("""
+        CREATE FUNCTION inventory_outbox_movements_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO inventory_outbox (event_type, product_id, movement_id, payload)
+            SELECT 'movement_created', r.product_id, r.id, jsonb_build_object(
+                       'movement_id', r.id,
+                       'product_id', r.product_id,
+                       'sku', p.sku,
+                       'category_id', p.category_id,
+                       'movement_type', r.movement_type,
+                       'reason', r.reason,
+                       'quantity', r.quantity,
+                       'stock_before', r.stock_before,
+                       'stock_after', r.stock_after,
+                       'reference', r.reference,
+                       'notes', r.notes,
+                       'user_id', r.user_id,
+                       'created_at', r.created_at
+                   )
+            FROM new_rows r
+            JOIN products p ON p.id = r.product_id
+            ORDER BY r.id;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER inventory_outbox_movements_insert AFTER INSERT ON inventory_movements
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION inventory_outbox_movements_trigger()
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS inventory_outbox_movements_insert ON inventory_movements')
+    op.execute('DROP FUNCTION IF EXISTS inventory_outbox_movements_trigger()')
+    op.drop_table('inventory_outbox')
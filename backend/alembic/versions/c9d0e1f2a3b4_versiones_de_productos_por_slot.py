@@ -0,0 +1,116 @@
+"""data_versions por slot y versión de products para ETag
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mismo reparto que inventory_stats_snapshot (STATS_SLOTS)
+SLOTS = 16
+
+
+def upgrade() -> None:
+    # La versión de un nombre pasa a ser la suma de sus slots. Categorías y
+    # proveedores siguen usando solo el slot 0.
+    op.add_column('data_versions', sa.Column('slot', sa.SmallInteger(), nullable=False, server_default='0'))
+    op.drop_constraint('data_versions_pkey', 'data_versions', type_='primary')
+    op.create_primary_key('data_versions_pkey', 'data_versions', ['name', 'slot'])
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            INSERT INTO data_versions (name, slot, version, updated_at)
+            VALUES (TG_ARGV[0], 0, 1, now())
+            ON CONFLICT (name, slot) DO UPDATE
+                SET version = data_versions.version + 1, updated_at = now()
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('data_versions', TG_ARGV[0] || ':' || new_version);
+            RETURN NULL;
+        END
+        $$
+    """)
+
+    # products cambia con cada movimiento: un solo contador serializaría
+    # todas las escrituras. Cada sentencia incrementa solo los slots
+    # (product_id % 16) de las filas que tocó, igual que las estadísticas.
+    op.execute(f"""
+        CREATE FUNCTION bump_products_data_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO data_versions (name, slot, version, updated_at)
+                SELECT 'products', id % {SLOTS}, 1, now() FROM old_rows GROUP BY 2
+                ON CONFLICT (name, slot) DO UPDATE
+                    SET version = data_versions.version + 1, updated_at = now();
+            ELSE
+                INSERT INTO data_versions (name, slot, version, updated_at)
+                SELECT 'products', id % {SLOTS}, 1, now() FROM new_rows GROUP BY 2
+                ON CONFLICT (name, slot) DO UPDATE
+                    SET version = data_versions.version + 1, updated_at = now();
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER products_bump_data_version_insert AFTER INSERT ON products
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_products_data_version()
+    """)
+    op.execute("""
+        CREATE TRIGGER products_bump_data_version_update AFTER UPDATE ON products
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_products_data_version()
+    """)
+    op.execute("""
+        CREATE TRIGGER products_bump_data_version_delete AFTER DELETE ON products
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_products_data_version()
+    """)
+    op.execute(f"""
+        INSERT INTO data_versions (name, slot, version)
+        SELECT 'products', slot, 1 FROM generate_series(0, {SLOTS - 1}) AS slot
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS products_bump_data_version_delete ON products')
+    op.execute('DROP TRIGGER IF EXISTS products_bump_data_version_update ON products')
+    op.execute('DROP TRIGGER IF EXISTS products_bump_data_version_insert ON products')
+    op.execute('DROP FUNCTION IF EXISTS bump_products_data_version()')
+    op.execute("DELETE FROM data_versions WHERE name = 'products'")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            new_version bigint;
+        BEGIN
+            INSERT INTO data_versions (name, version, updated_at)
+            VALUES (TG_ARGV[0], 1, now())
+            ON CONFLICT (name) DO UPDATE
+                SET version = data_versions.version + 1, updated_at = now()
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('data_versions', TG_ARGV[0] || ':' || new_version);
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.drop_constraint('data_versions_pkey', 'data_versions', type_='primary')
+    op.drop_column('data_versions', 'slot')
+    op.create_primary_key('data_versions_pkey', 'data_versions', ['name'])
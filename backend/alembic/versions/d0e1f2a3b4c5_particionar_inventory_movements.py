@@ -0,0 +1,156 @@
+"""particionar inventory_movements por mes de created_at
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Meses futuros con partición creada de antemano (ver INVENTORY_PARTITIONS_AHEAD)
+MONTHS_AHEAD = 3
+
+# Índices de la tabla particionada: cada partición recibe los suyos
+PARTITIONED_INDEXES = (
+    ('ix_inventory_movements_created_at_id', 'created_at, id'),
+    ('ix_inventory_movements_product_id_created_at', 'product_id, created_at'),
+    ('ix_inventory_movements_movement_type', 'movement_type'),
+    ('ix_inventory_movements_user_id', 'user_id'),
+    ('ix_inventory_movements_reference', 'reference'),
+)
+
+# Índices de la tabla original (c7d8e9f0a1b2 y d4e5f6a7b8c9)
+PLAIN_INDEXES = (
+    ('ix_inventory_movements_id', 'id'),
+    ('ix_inventory_movements_product_id', 'product_id'),
+    ('ix_inventory_movements_movement_type', 'movement_type'),
+    ('ix_inventory_movements_user_id', 'user_id'),
+    ('ix_inventory_movements_created_at', 'created_at'),
+    ('ix_inventory_movements_reference', 'reference'),
+    ('ix_inventory_movements_created_at_id', 'created_at, id'),
+)
+
+
+def swap_table(partitioned: bool) -> None:
+    """
+    Reemplazar inventory_movements por una copia con otra estructura.
+
+    La tabla actual pasa a ``inventory_movements_old``, se crea la nueva con
+    las mismas columnas y defaults (``LIKE``), se copian las filas y se
+    elimina la vieja. La secuencia de ids se conserva.
+    """
+    old_indexes, new_indexes = (PLAIN_INDEXES, PARTITIONED_INDEXES) if partitioned else (PARTITIONED_INDEXES, PLAIN_INDEXES)
+    op.execute('DROP TRIGGER inventory_stats_movements_insert ON inventory_movements')
+    op.execute('DROP TRIGGER inventory_stats_movements_delete ON inventory_movements')
+    op.execute('ALTER TABLE inventory_movements RENAME TO inventory_movements_old')
+    # Los nombres de índices son globales: se liberan antes de crear la tabla nueva
+    for name, _ in old_indexes:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('ALTER TABLE inventory_movements_old RENAME CONSTRAINT inventory_movements_pkey TO inventory_movements_old_pkey')
+
+    op.execute(f"""
+        CREATE TABLE inventory_movements (
+            LIKE inventory_movements_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            CONSTRAINT inventory_movements_pkey PRIMARY KEY ({'id, created_at' if partitioned else 'id'}),
+            CONSTRAINT inventory_movements_product_id_fkey FOREIGN KEY (product_id)
+                REFERENCES products (id) ON DELETE RESTRICT,
+            CONSTRAINT inventory_movements_user_id_fkey FOREIGN KEY (user_id)
+                REFERENCES users (id) ON DELETE SET NULL
+        ) {'PARTITION BY RANGE (created_at)' if partitioned else ''}
+    """)
+    for name, columns in new_indexes:
+        op.execute(f'CREATE INDEX {name} ON inventory_movements ({columns})')
+
+    if partitioned:
+        # Red de seguridad: si falta la partición de un mes, el INSERT cae
+        # aquí en lugar de fallar; create_inventory_movement_partitions
+        # mueve esas filas al crear la partición que les corresponde.
+        op.execute('CREATE TABLE inventory_movements_default PARTITION OF inventory_movements DEFAULT')
+        op.execute(f"""
+            SELECT create_inventory_movement_partitions(
+                {MONTHS_AHEAD},
+                (SELECT min(created_at)::date FROM inventory_movements_old)
+            )
+        """)
+
+    op.execute('INSERT INTO inventory_movements SELECT * FROM inventory_movements_old')
+    op.execute('ALTER SEQUENCE inventory_movements_id_seq OWNED BY inventory_movements.id')
+    op.execute('DROP TABLE inventory_movements_old')
+
+    # Los triggers de estadísticas se crean después de la copia: las filas
+    # copiadas ya están contadas en inventory_movement_daily_counts. En una
+    # tabla particionada los triggers por sentencia con tablas de transición
+    # se definen en la tabla padre y ven las filas de todas las particiones.
+    op.execute("""
+        CREATE TRIGGER inventory_stats_movements_insert AFTER INSERT ON inventory_movements
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION inventory_stats_movements_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER inventory_stats_movements_delete AFTER DELETE ON inventory_movements
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION inventory_stats_movements_trigger()
+    """)
+
+
+def upgrade() -> None:
+    # Crea las particiones mensuales que falten desde ``from_month`` (por
+    # defecto el mes actual) hasta ``months_ahead`` meses adelante. Si la
+    # partición por defecto tiene filas de ese mes, se mueven a la nueva
+    # antes de adjuntarla. El advisory lock serializa a varios workers.
+    op.execute("""
+        CREATE FUNCTION create_inventory_movement_partitions(
+            months_ahead integer,
+            from_month date DEFAULT NULL
+        ) RETURNS integer
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            month_start date := date_trunc('month', coalesce(from_month, localtimestamp))::date;
+            last_month date := (date_trunc('month', localtimestamp) + make_interval(months => months_ahead))::date;
+            month_end date;
+            partition_name text;
+            created integer := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('inventory_movements_partitions'));
+            WHILE month_start <= last_month LOOP
+                month_end := (month_start + interval '1 month')::date;
+                partition_name := 'inventory_movements_' || to_char(month_start, 'YYYY_MM');
+                IF to_regclass(partition_name) IS NULL THEN
+                    EXECUTE format(
+                        'CREATE TABLE %I (LIKE inventory_movements INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                        partition_name
+                    );
+                    EXECUTE format(
+                        'WITH moved AS (DELETE FROM inventory_movements_default'
+                        ' WHERE created_at >= %L AND created_at < %L RETURNING *)'
+                        ' INSERT INTO %I SELECT * FROM moved',
+                        month_start, month_end, partition_name
+                    );
+                    EXECUTE format(
+                        'ALTER TABLE inventory_movements ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                        partition_name, month_start, month_end
+                    );
+                    created := created + 1;
+                END IF;
+                month_start := month_end;
+            END LOOP;
+            RETURN created;
+        END
+        $$
+    """)
+    swap_table(partitioned=True)
+
+
+def downgrade() -> None:
+    swap_table(partitioned=False)
+    op.execute('DROP FUNCTION IF EXISTS create_inventory_movement_partitions(integer, date)')
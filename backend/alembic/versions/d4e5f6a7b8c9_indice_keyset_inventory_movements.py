@@ -0,0 +1,30 @@
+"""indice compuesto (created_at, id) para paginacion por cursor de inventory_movements
+
+Revision ID: d4e5f6a7b8c9
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, None] = 'c7d8e9f0a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sirve ORDER BY created_at DESC, id DESC y el predicado (created_at, id) < (:c, :i)
+    op.create_index(
+        'ix_inventory_movements_created_at_id',
+        'inventory_movements',
+        ['created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inventory_movements_created_at_id', table_name='inventory_movements')
@@ -0,0 +1,139 @@
+"""bloqueo de stock en una pasada y eventos de plegado
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-18 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6e7f8a9b0c1'
+down_revision: Union[str, None] = 'c5d6e7f8a9b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Movimientos pendientes de un producto repartido con su stock antes/después,
+# hacia atrás desde el total, en orden de id
+FOLD_MOVEMENTS_UPDATE = """
+            UPDATE inventory_movements m
+            SET stock_after = total - p.later,
+                stock_before = total - p.later - p.delta
+            FROM (
+                SELECT d.id, d.created_at, d.delta,
+                       coalesce(sum(d.delta) OVER (
+                           ORDER BY d.id DESC ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                       ), 0) AS later
+                FROM (
+                    SELECT id, created_at,
+                           CASE movement_type
+                               WHEN 'entry' THEN quantity
+                               WHEN 'transfer' THEN 0
+                               ELSE -quantity
+                           END AS delta
+                    FROM inventory_movements
+                    WHERE product_id = p_product_id AND stock_after IS NULL
+                ) d
+            ) p
+            WHERE m.product_id = p_product_id AND m.id = p.id AND m.created_at = p.created_at"""
+
+
+def fold_stock_shards(fold_movements: str) -> str:
+    """Función de plegado (ver migración ``a3b4c5d6e7f8``) con ``fold_movements`` como paso central."""
+    return f"""
+        CREATE OR REPLACE FUNCTION fold_stock_shards(p_product_id integer)
+        RETURNS integer
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            shard_count integer;
+            total integer;
+        BEGIN
+            SELECT count(*), coalesce(sum(l.stock), 0) INTO shard_count, total
+            FROM (
+                SELECT stock FROM product_stock_shards
+                WHERE product_id = p_product_id
+                ORDER BY shard
+                FOR UPDATE
+            ) l;
+            IF shard_count = 0 THEN
+                RETURN NULL;
+            END IF;
+
+            {fold_movements};
+
+            UPDATE product_stock_shards
+            SET stock = total / shard_count + (shard < total % shard_count)::int
+            WHERE product_id = p_product_id;
+            UPDATE products SET stock_current = total
+            WHERE id = p_product_id AND stock_current <> total;
+            RETURN total;
+        END
+        $$
+    """
+
+
+def upgrade() -> None:
+    # Bloquea las filas de varios productos en una sola pasada en orden de
+    # id: los normales FOR UPDATE y los repartidos FOR KEY SHARE (no se
+    # bloquea entre escritores; su stock se cambia en los slots). El modo
+    # se lee antes de bloquear; si un producto repartido vuelve a modo
+    # normal mientras se espera, se sube el bloqueo de esa misma fila antes
+    # de pasar a la siguiente, así el orden global se mantiene. Uno normal
+    # que pasa a repartido queda con el bloqueo exclusivo, que alcanza.
+    op.execute("""
+        CREATE FUNCTION lock_stock_rows(p_ids integer[])
+        RETURNS TABLE (
+            id integer, stock_current integer, sku varchar, name varchar,
+            price numeric, is_active boolean, stock_shards smallint
+        )
+        LANGUAGE plpgsql AS $$
+        #variable_conflict use_column
+        DECLARE
+            v_id integer;
+            v_shards smallint;
+        BEGIN
+            FOR v_id IN SELECT DISTINCT u FROM unnest(p_ids) u ORDER BY u LOOP
+                SELECT p.stock_shards INTO v_shards FROM products p WHERE p.id = v_id;
+                CONTINUE WHEN NOT FOUND;
+                IF v_shards > 0 THEN
+                    SELECT p.stock_shards INTO v_shards FROM products p WHERE p.id = v_id FOR KEY SHARE;
+                    CONTINUE WHEN NOT FOUND;
+                END IF;
+                IF v_shards = 0 THEN
+                    PERFORM 1 FROM products p WHERE p.id = v_id FOR UPDATE;
+                    CONTINUE WHEN NOT FOUND;
+                END IF;
+                RETURN QUERY
+                    SELECT p.id, p.stock_current, p.sku, p.name, p.price, p.is_active, p.stock_shards
+                    FROM products p WHERE p.id = v_id;
+            END LOOP;
+        END
+        $$
+    """)
+
+    # El plegado completa el stock antes/después de los movimientos de un
+    # producto repartido, que salieron al outbox con esos valores en NULL:
+    # cada movimiento completado agrega un evento movement_folded con los
+    # valores definitivos, en la misma transacción.
+    op.execute(fold_stock_shards(f"""
+            WITH folded AS ({FOLD_MOVEMENTS_UPDATE}
+                RETURNING m.id, m.product_id, m.stock_before, m.stock_after
+            )
+            INSERT INTO inventory_outbox (event_type, product_id, movement_id, payload)
+            SELECT 'movement_folded', f.product_id, f.id, jsonb_build_object(
+                       'movement_id', f.id,
+                       'product_id', f.product_id,
+                       'stock_before', f.stock_before,
+                       'stock_after', f.stock_after
+                   )
+            FROM folded f
+            ORDER BY f.id"""))
+
+
+def downgrade() -> None:
+    op.execute(fold_stock_shards(FOLD_MOVEMENTS_UPDATE))
+    op.execute('DROP FUNCTION IF EXISTS lock_stock_rows(integer[])')
@@ -0,0 +1,70 @@
+"""conteo diario de movimientos en una zona horaria explícita
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-18 01:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7f8a9b0c1d2'
+down_revision: Union[str, None] = 'd6e7f8a9b0c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+STATS_SLOTS = 16
+
+
+def upsert_daily_counts(source: str, sign: int, day: str) -> str:
+    """Sumar (o restar) los movimientos de ``source`` a su día y slot."""
+    return f"""
+        INSERT INTO inventory_movement_daily_counts AS c (day, slot, movements)
+        SELECT {day}, r.id % {STATS_SLOTS}, {sign} * count(*)
+        FROM {source} r
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (day, slot) DO UPDATE SET movements = c.movements + EXCLUDED.movements
+    """
+
+
+def recount(day: str) -> None:
+    """Recrear el trigger con el día ``day`` y recontar todos los movimientos."""
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION inventory_stats_movements_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {upsert_daily_counts('new_rows', 1, day)};
+            ELSE
+                {upsert_daily_counts('old_rows', -1, day)};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    # SHARE deja leer pero frena las escrituras de movimientos hasta el
+    # commit: ninguna cae entre el borrado y el recuento
+    op.execute('LOCK TABLE inventory_movements IN SHARE MODE')
+    op.execute('DELETE FROM inventory_movement_daily_counts')
+    op.execute(upsert_daily_counts('inventory_movements', 1, day))
+
+
+def upgrade() -> None:
+    # El día salía de created_at::date, la fecha en la zona de la sesión que
+    # insertó, mientras las lecturas usaban la hora local del servidor de la
+    # aplicación. Ahora ambos usan INVENTORY_STATS_TIMEZONE. created_at es un
+    # timestamp sin zona con la hora de esa sesión (now() por defecto): el
+    # cast a timestamptz lo interpreta en la misma zona y da el instante real.
+    timezone = settings.INVENTORY_STATS_TIMEZONE.replace("'", "''")
+    recount(f"(r.created_at::timestamptz AT TIME ZONE '{timezone}')::date")
+
+
+def downgrade() -> None:
+    recount('r.created_at::date')
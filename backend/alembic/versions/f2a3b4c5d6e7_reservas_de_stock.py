@@ -0,0 +1,135 @@
+"""reservas de stock con vencimiento
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a3b4c5d6e7'
+down_revision: Union[str, None] = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def add_reserved(source: str) -> str:
+    """Sumar las unidades de ``source`` al total reservado de cada producto."""
+    return f"""
+        INSERT INTO product_stock_reserved AS r (product_id, reserved)
+        SELECT i.product_id, sum(i.quantity)
+        FROM {source} i
+        GROUP BY i.product_id
+        ORDER BY i.product_id
+        ON CONFLICT (product_id) DO UPDATE SET reserved = r.reserved + EXCLUDED.reserved
+    """
+
+
+def subtract_reserved(source: str) -> str:
+    """
+    Restar las unidades de ``source`` del total reservado de cada producto.
+
+    Un UPDATE ... FROM no garantiza el orden en que bloquea las filas, así
+    que primero se bloquean en orden de id: dos barridos o liberaciones que
+    comparten productos no pueden quedar en deadlock.
+    """
+    return f"""
+        PERFORM 1 FROM product_stock_reserved
+        WHERE product_id IN (SELECT product_id FROM {source})
+        ORDER BY product_id
+        FOR UPDATE;
+        UPDATE product_stock_reserved r
+        SET reserved = r.reserved - d.units
+        FROM (SELECT product_id, sum(quantity) AS units FROM {source} GROUP BY product_id) d
+        WHERE r.product_id = d.product_id
+    """
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stock_reservations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('reference', sa.String(length=100), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    )
+    op.create_index('ix_stock_reservations_expires_at', 'stock_reservations', ['expires_at'])
+    op.create_table(
+        'stock_reservation_items',
+        sa.Column('reservation_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('reservation_id', 'position'),
+        sa.ForeignKeyConstraint(['reservation_id'], ['stock_reservations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='RESTRICT'),
+        sa.CheckConstraint('quantity > 0', name='check_reservation_quantity_positive'),
+    )
+    op.create_index('ix_stock_reservation_items_product_id', 'stock_reservation_items', ['product_id'])
+    op.create_table(
+        'product_stock_reserved',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('reserved', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('product_id'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.CheckConstraint('reserved >= 0', name='check_reserved_positive'),
+    )
+
+    # Total reservado por producto, mantenido por sentencia con tablas de
+    # transición: una reserva de N líneas (o un barrido de vencidas, que
+    # borra en cascada) toca cada producto una sola vez y en orden de id.
+    op.execute(f"""
+        CREATE FUNCTION stock_reservation_items_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {add_reserved('new_rows')};
+            ELSE
+                {subtract_reserved('old_rows')};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER stock_reservation_items_insert AFTER INSERT ON stock_reservation_items
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION stock_reservation_items_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER stock_reservation_items_delete AFTER DELETE ON stock_reservation_items
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION stock_reservation_items_trigger()
+    """)
+
+    # Disponibilidad por producto para consultas y reportes
+    op.execute("""
+        CREATE VIEW product_stock_availability AS
+        SELECT p.id AS product_id,
+               p.stock_current,
+               coalesce(r.reserved, 0) AS stock_reserved,
+               p.stock_current - coalesce(r.reserved, 0) AS stock_available
+        FROM products p
+        LEFT JOIN product_stock_reserved r ON r.product_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP VIEW IF EXISTS product_stock_availability')
+    op.execute('DROP TRIGGER IF EXISTS stock_reservation_items_delete ON stock_reservation_items')
+    op.execute('DROP TRIGGER IF EXISTS stock_reservation_items_insert ON stock_reservation_items')
+    op.execute('DROP FUNCTION IF EXISTS stock_reservation_items_trigger()')
+    op.drop_table('product_stock_reserved')
+    op.drop_index('ix_stock_reservation_items_product_id', table_name='stock_reservation_items')
+    op.drop_table('stock_reservation_items')
+    op.drop_index('ix_stock_reservations_expires_at', table_name='stock_reservations')
+    op.drop_table('stock_reservations')
@@ -0,0 +1,161 @@
+"""snapshot de estadisticas de inventario mantenido por triggers
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+STATS_SLOTS = 16
+
+
+def product_contributions(source: str, sign: int) -> str:
+    """Aporte de cada producto activo de ``source`` a los agregados, con signo."""
+    return f"""
+        SELECT r.id % {STATS_SLOTS} AS slot,
+               {sign} AS total_products,
+               {sign} * r.stock_current * r.cost AS total_stock_value,
+               {sign} * (r.stock_current > 0 AND r.stock_current < r.stock_min)::int AS low_stock_count,
+               {sign} * (r.stock_current = 0)::int AS out_of_stock_count
+        FROM {source} r
+        WHERE r.is_active
+    """
+
+
+def upsert_snapshot(contributions: str) -> str:
+    """Sumar los aportes al snapshot; solo toca los slots cuyo agregado cambia."""
+    return f"""
+        INSERT INTO inventory_stats_snapshot AS s
+            (slot, total_products, total_stock_value, low_stock_count, out_of_stock_count, updated_at)
+        SELECT d.slot, sum(d.total_products), sum(d.total_stock_value),
+               sum(d.low_stock_count), sum(d.out_of_stock_count), now()
+        FROM ({contributions}) AS d
+        GROUP BY d.slot
+        HAVING sum(d.total_products) <> 0 OR sum(d.total_stock_value) <> 0
+            OR sum(d.low_stock_count) <> 0 OR sum(d.out_of_stock_count) <> 0
+        ORDER BY d.slot
+        ON CONFLICT (slot) DO UPDATE SET
+            total_products = s.total_products + EXCLUDED.total_products,
+            total_stock_value = s.total_stock_value + EXCLUDED.total_stock_value,
+            low_stock_count = s.low_stock_count + EXCLUDED.low_stock_count,
+            out_of_stock_count = s.out_of_stock_count + EXCLUDED.out_of_stock_count,
+            updated_at = EXCLUDED.updated_at
+    """
+
+
+def upsert_daily_counts(source: str, sign: int) -> str:
+    """Sumar (o restar) los movimientos de ``source`` a su día y slot."""
+    return f"""
+        INSERT INTO inventory_movement_daily_counts AS c (day, slot, movements)
+        SELECT r.created_at::date, r.product_id % {STATS_SLOTS}, {sign} * count(*)
+        FROM {source} r
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (day, slot) DO UPDATE SET movements = c.movements + EXCLUDED.movements
+    """
+
+
+def upgrade() -> None:
+    op.create_table(
+        'inventory_stats_snapshot',
+        sa.Column('slot', sa.SmallInteger(), autoincrement=False, nullable=False),
+        sa.Column('total_products', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_stock_value', sa.Numeric(18, 2), nullable=False, server_default='0'),
+        sa.Column('low_stock_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('out_of_stock_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('slot'),
+    )
+    op.create_table(
+        'inventory_movement_daily_counts',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('slot', sa.SmallInteger(), autoincrement=False, nullable=False),
+        sa.Column('movements', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('day', 'slot'),
+    )
+
+    # Triggers por sentencia con tablas de transición: un lote de N filas
+    # (p. ej. la entrada masiva) actualiza cada slot una sola vez.
+    op.execute(f"""
+        CREATE FUNCTION inventory_stats_products_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {upsert_snapshot(product_contributions('new_rows', 1))};
+            ELSIF TG_OP = 'UPDATE' THEN
+                {upsert_snapshot(product_contributions('new_rows', 1) + ' UNION ALL ' + product_contributions('old_rows', -1))};
+            ELSE
+                {upsert_snapshot(product_contributions('old_rows', -1))};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute(f"""
+        CREATE FUNCTION inventory_stats_movements_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {upsert_daily_counts('new_rows', 1)};
+            ELSE
+                {upsert_daily_counts('old_rows', -1)};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+
+    op.execute("""
+        CREATE TRIGGER inventory_stats_products_insert AFTER INSERT ON products
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION inventory_stats_products_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER inventory_stats_products_update AFTER UPDATE ON products
+        REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION inventory_stats_products_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER inventory_stats_products_delete AFTER DELETE ON products
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION inventory_stats_products_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER inventory_stats_movements_insert AFTER INSERT ON inventory_movements
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION inventory_stats_movements_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER inventory_stats_movements_delete AFTER DELETE ON inventory_movements
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION inventory_stats_movements_trigger()
+    """)
+
+    # Carga inicial. CREATE TRIGGER bloquea las escrituras sobre ambas tablas
+    # hasta el commit, así que ningún cambio queda fuera del snapshot.
+    op.execute(upsert_snapshot(product_contributions('products', 1)))
+    op.execute(upsert_daily_counts('inventory_movements', 1))
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS inventory_stats_movements_delete ON inventory_movements')
+    op.execute('DROP TRIGGER IF EXISTS inventory_stats_movements_insert ON inventory_movements')
+    op.execute('DROP TRIGGER IF EXISTS inventory_stats_products_delete ON products')
+    op.execute('DROP TRIGGER IF EXISTS inventory_stats_products_update ON products')
+    op.execute('DROP TRIGGER IF EXISTS inventory_stats_products_insert ON products')
+    op.execute('DROP FUNCTION IF EXISTS inventory_stats_movements_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS inventory_stats_products_trigger()')
+    op.drop_table('inventory_movement_daily_counts')
+    op.drop_table('inventory_stats_snapshot')
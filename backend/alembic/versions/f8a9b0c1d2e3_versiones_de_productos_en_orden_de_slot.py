@@ -0,0 +1,85 @@
+"""versiones de products incrementadas en orden de slot
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-18 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8a9b0c1d2e3'
+down_revision: Union[str, None] = 'e7f8a9b0c1d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mismo reparto que en c9d0e1f2a3b4
+SLOTS = 16
+
+
+def bump_slots(rows: str) -> str:
+    """Incrementar una vez cada slot de ``rows``, en orden de slot."""
+    return f"""
+                INSERT INTO data_versions (name, slot, version, updated_at)
+                SELECT 'products', id % {SLOTS}, 1, now() FROM {rows} GROUP BY 2 ORDER BY 2
+                ON CONFLICT (name, slot) DO UPDATE
+                    SET version = data_versions.version + 1, updated_at = now()"""
+
+
+def upgrade() -> None:
+    # Dos sentencias de varios productos (entrada masiva, venta, PATCH
+    # masivo, importación) tomaban los slots en el orden del hash aggregate
+    # y podían bloquearse entre sí: ORDER BY 2 los toma siempre en orden,
+    # como el trigger de estadísticas. En UPDATE solo cuentan las filas que
+    # cambiaron: un plegado sin diferencias o un PATCH con los mismos
+    # valores no toman el slot. El stock sigue incrementando la versión
+    # porque los listados lo muestran.
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION bump_products_data_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN{bump_slots('old_rows')};
+            ELSIF TG_OP = 'INSERT' THEN{bump_slots('new_rows')};
+            ELSE{bump_slots('(SELECT n.id FROM new_rows n JOIN old_rows o ON o.id = n.id WHERE n IS DISTINCT FROM o) c')};
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute('DROP TRIGGER IF EXISTS products_bump_data_version_update ON products')
+    op.execute("""
+        CREATE TRIGGER products_bump_data_version_update AFTER UPDATE ON products
+        REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_products_data_version()
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS products_bump_data_version_update ON products')
+    op.execute("""
+        CREATE TRIGGER products_bump_data_version_update AFTER UPDATE ON products
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_products_data_version()
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION bump_products_data_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO data_versions (name, slot, version, updated_at)
+                SELECT 'products', id % {SLOTS}, 1, now() FROM old_rows GROUP BY 2
+                ON CONFLICT (name, slot) DO UPDATE
+                    SET version = data_versions.version + 1, updated_at = now();
+            ELSE
+                INSERT INTO data_versions (name, slot, version, updated_at)
+                SELECT 'products', id % {SLOTS}, 1, now() FROM new_rows GROUP BY 2
+                ON CONFLICT (name, slot) DO UPDATE
+                    SET version = data_versions.version + 1, updated_at = now();
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
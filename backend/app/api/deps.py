@@ -1,18 +1,26 @@
 """
 Dependencias comunes para los endpoints de la API.
 """
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+from typing import Generator, Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.security.utils import get_authorization_scheme_param
+from starlette.requests import HTTPConnection
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db, get_async_db
 from app.core.security import decode_access_token
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, get_principal_async
 from app.services.category_service import CategoryService
 from app.services.supplier_service import SupplierService
 from app.services.product_service import ProductService
+from app.services.product_import_service import ProductImportService
 from app.services.inventory_service import InventoryService
+from app.services.sale_service import SaleService
+from app.services.reservation_service import ReservationService
+from app.services.async_product_service import AsyncProductService
+from app.services.async_inventory_service import AsyncInventoryService
 from app.models.user import User
 
 # OAuth2 scheme para autenticación con Bearer token
@@ -41,25 +49,73 @@ async def get_current_user(
     Raises:
         HTTPException: Si el token es inválido o el usuario no existe
     """
-    credentials_exception = HTTPException(
+    email = _token_subject(token)
+
+    # Obtener usuario
+    user = auth_service.get_current_user(email)
+    return _ensure_active(user)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Igual que ``get_current_user`` pero para los routers asíncronos:
+    no ocupa una sesión síncrona ni un hilo del threadpool.
+    """
+    email = _token_subject(token)
+    user = await get_principal_async(db, email)
+    return _ensure_active(user)
+
+
+async def get_current_user_stream(
+    connection: HTTPConnection,
+    token: Optional[str] = Query(None, description="Token JWT (EventSource y WebSocket no pueden enviar encabezados)")
+) -> User:
+    """
+    Usuario autenticado de una conexión larga (SSE o WebSocket).
+
+    Acepta el token en el header Authorization o en el parámetro ``token``.
+    Si el principal no está en caché abre una sesión solo para buscarlo:
+    una sesión de dependencia quedaría tomada mientras dure la conexión.
+    """
+    scheme, header_token = get_authorization_scheme_param(connection.headers.get("Authorization"))
+    token = header_token if scheme.lower() == "bearer" and header_token else token
+    if not token:
+        raise _credentials_exception()
+
+    email = _token_subject(token)
+    async with AsyncSessionLocal() as db:
+        user = await get_principal_async(db, email)
+    return _ensure_active(user)
+
+
+def _credentials_exception() -> HTTPException:
+    """Error 401 para credenciales inválidas."""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudo validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # Decodificar token
+
+def _token_subject(token: str) -> str:
+    """Decodificar el token y retornar su subject (email)."""
     payload = decode_access_token(token)
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     email: str = payload.get("sub")
     if email is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    return email
 
-    # Obtener usuario
-    user = auth_service.get_current_user(email)
+
+def _ensure_active(user: User | None) -> User:
+    """Validar que el usuario exista y esté activo."""
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.is_active:
         raise HTTPException(
@@ -108,6 +164,31 @@ def get_product_service(db: Session = Depends(get_db)) -> ProductService:
     return ProductService(db)
 
 
+def get_product_import_service(db: Session = Depends(get_db)) -> ProductImportService:
+    """Dependency para obtener el servicio de importación de productos."""
+    return ProductImportService(db)
+
+
 def get_inventory_service(db: Session = Depends(get_db)) -> InventoryService:
     """Dependency para obtener el servicio de inventario."""
     return InventoryService(db)
+
+
+def get_sale_service(db: Session = Depends(get_db)) -> SaleService:
+    """Dependency para obtener el servicio de ventas."""
+    return SaleService(db)
+
+
+def get_reservation_service(db: Session = Depends(get_db)) -> ReservationService:
+    """Dependency para obtener el servicio de reservas de stock."""
+    return ReservationService(db)
+
+
+def get_async_product_service(db: AsyncSession = Depends(get_async_db)) -> AsyncProductService:
+    """Dependency para obtener el servicio asíncrono de productos."""
+    return AsyncProductService(db)
+
+
+def get_async_inventory_service(db: AsyncSession = Depends(get_async_db)) -> AsyncInventoryService:
+    """Dependency para obtener el servicio asíncrono de inventario."""
+    return AsyncInventoryService(db)
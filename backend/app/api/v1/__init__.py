@@ -1,6 +1,12 @@
 """
 API v1 routers.
 """
-from app.api.v1 import auth, categories, suppliers, products, inventory
+from app.api.v1 import auth, categories, suppliers, products, inventory, sales, reservations, metrics
+from app.api.v1 import stock_events
+from app.api.v1 import async_products, async_inventory
 
-__all__ = ["auth", "categories", "suppliers", "products", "inventory"]
+__all__ = [
+    "auth", "categories", "suppliers", "products", "inventory", "sales", "reservations", "metrics",
+    "stock_events",
+    "async_products", "async_inventory",
+]
@@ -0,0 +1,122 @@
+"""
+Endpoints de movimientos de inventario sobre el stack asíncrono (AsyncSession).
+
+Se montan antes que ``inventory`` cuando "inventory" está en ASYNC_ROUTERS.
+El resto de rutas de inventario sigue servido por el router síncrono.
+"""
+from typing import Optional, List, Union
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_async_inventory_service, get_current_user_async
+from app.api.v1.inventory import movements_export_response
+from app.models.user import User
+from app.services.async_inventory_service import AsyncInventoryService
+from app.schemas.inventory import (
+    InventoryMovementCreate,
+    InventoryMovementResponse,
+    InventoryMovementList,
+    InventoryMovementCursorList,
+    InventoryMovementFilter,
+    MovementTypeEnum,
+    MovementReasonEnum,
+    ExportFormatEnum,
+)
+
+router = APIRouter(prefix="/inventory", tags=["Inventario"])
+
+
+@router.get("/movements", response_model=Union[InventoryMovementList, InventoryMovementCursorList])
+async def get_movements(
+    page: int = Query(1, ge=1, description="Número de página"),
+    page_size: int = Query(20, ge=1, le=100, description="Elementos por página"),
+    cursor: bool = Query(False, description="Paginar por cursor en lugar de por número de página"),
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (activa el modo cursor)"),
+    include_total: bool = Query(False, description="En modo cursor, calcular el total exacto en vez de estimarlo"),
+    product_id: Optional[int] = Query(None, description="Filtrar por producto"),
+    movement_type: Optional[MovementTypeEnum] = Query(None, description="Filtrar por tipo"),
+    reason: Optional[MovementReasonEnum] = Query(None, description="Filtrar por razón"),
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario"),
+    reference: Optional[str] = Query(None, description="Buscar por referencia"),
+    date_from: Optional[datetime] = Query(None, description="Fecha desde"),
+    date_to: Optional[datetime] = Query(None, description="Fecha hasta"),
+    service: AsyncInventoryService = Depends(get_async_inventory_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Obtener lista de movimientos de inventario con filtros y paginación."""
+    filters = InventoryMovementFilter(
+        product_id=product_id,
+        movement_type=movement_type,
+        reason=reason,
+        user_id=user_id,
+        reference=reference,
+        date_from=date_from,
+        date_to=date_to
+    )
+    if cursor or after:
+        return await service.get_movements_cursor(page_size, filters, after, include_total)
+    return await service.get_movements(page, page_size, filters)
+
+
+@router.get("/movements/export", response_class=StreamingResponse)
+async def export_movements(
+    request: Request,
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.CSV, alias="format", description="csv o ndjson"),
+    product_id: Optional[int] = Query(None, description="Filtrar por producto"),
+    movement_type: Optional[MovementTypeEnum] = Query(None, description="Filtrar por tipo"),
+    reason: Optional[MovementReasonEnum] = Query(None, description="Filtrar por razón"),
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario"),
+    reference: Optional[str] = Query(None, description="Buscar por referencia"),
+    date_from: Optional[datetime] = Query(None, description="Fecha desde"),
+    date_to: Optional[datetime] = Query(None, description="Fecha hasta"),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Exportar movimientos en CSV o NDJSON (ver el endpoint síncrono).
+
+    Debe declararse antes de ``/movements/{movement_id}``. El generador es
+    síncrono (cursor del servidor vía psycopg2); Starlette lo itera en el
+    threadpool sin bloquear el event loop.
+    """
+    filters = InventoryMovementFilter(
+        product_id=product_id,
+        movement_type=movement_type,
+        reason=reason,
+        user_id=user_id,
+        reference=reference,
+        date_from=date_from,
+        date_to=date_to
+    )
+    return movements_export_response(request, filters, export_format)
+
+
+@router.get("/movements/{movement_id}", response_model=InventoryMovementResponse)
+async def get_movement(
+    movement_id: int,
+    service: AsyncInventoryService = Depends(get_async_inventory_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Obtener detalle de un movimiento de inventario."""
+    return await service.get_movement(movement_id)
+
+
+@router.post("/movements", response_model=InventoryMovementResponse, status_code=status.HTTP_201_CREATED)
+async def create_movement(
+    data: InventoryMovementCreate,
+    service: AsyncInventoryService = Depends(get_async_inventory_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Crear un nuevo movimiento de inventario y actualizar el stock."""
+    return await service.create_movement(data, user=current_user)
+
+
+@router.get("/products/{product_id}/movements", response_model=List[InventoryMovementResponse])
+async def get_product_movements(
+    product_id: int,
+    limit: int = Query(50, ge=1, le=200, description="Cantidad máxima de movimientos"),
+    service: AsyncInventoryService = Depends(get_async_inventory_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Obtener historial de movimientos de un producto específico."""
+    return await service.get_product_movements(product_id, limit)
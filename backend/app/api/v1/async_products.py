@@ -0,0 +1,93 @@
+"""
+Endpoints de lectura de productos sobre el stack asíncrono (AsyncSession).
+
+Se montan antes que ``products`` cuando "products" está en ASYNC_ROUTERS;
+cubren todas las rutas GET para que el orden de resolución no cambie.
+"""
+from typing import Optional
+from decimal import Decimal
+from fastapi import APIRouter, Depends, Query
+
+from app.schemas.product import (
+    ProductResponse,
+    ProductWithRelations,
+    ProductListResponse,
+    ProductSearchResult,
+    ProductFilter,
+)
+from app.services.async_product_service import AsyncProductService
+from app.api.deps import get_async_product_service, get_current_user_async
+from app.models.user import User
+from app.utils.responses import FastJSONResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=ProductListResponse)
+async def get_products(
+    page: int = Query(1, ge=1, description="Número de página"),
+    page_size: int = Query(20, ge=1, le=100, description="Tamaño de página"),
+    search: Optional[str] = Query(None, description="Buscar por nombre, SKU o descripción"),
+    category_id: Optional[int] = Query(None, description="Filtrar por categoría"),
+    supplier_id: Optional[int] = Query(None, description="Filtrar por proveedor"),
+    is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
+    low_stock_only: bool = Query(False, description="Solo productos con stock bajo"),
+    min_price: Optional[Decimal] = Query(None, ge=0, description="Precio mínimo"),
+    max_price: Optional[Decimal] = Query(None, ge=0, description="Precio máximo"),
+    include_total: bool = Query(True, description="Calcular el total exacto (false: total estimado, más barato en catálogos grandes)"),
+    product_service: AsyncProductService = Depends(get_async_product_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Obtener productos con paginación y filtros."""
+    filters = ProductFilter(
+        search=search,
+        category_id=category_id,
+        supplier_id=supplier_id,
+        is_active=is_active,
+        low_stock_only=low_stock_only,
+        min_price=min_price,
+        max_price=max_price,
+    )
+    return FastJSONResponse(await product_service.get_all_serialized(page, page_size, filters, include_total))
+
+
+@router.get("/search", response_model=list[ProductSearchResult])
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Texto a buscar"),
+    limit: int = Query(10, ge=1, le=50, description="Cantidad máxima de resultados"),
+    only_active: bool = Query(True, description="Solo productos activos"),
+    product_service: AsyncProductService = Depends(get_async_product_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Buscar productos por relevancia (para el selector de productos)."""
+    return await product_service.search(q, limit, only_active)
+
+
+@router.get("/low-stock", response_model=list[ProductWithRelations])
+async def get_low_stock_products(
+    limit: int = Query(50, ge=1, le=200, description="Límite de productos"),
+    product_service: AsyncProductService = Depends(get_async_product_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Obtener productos con stock por debajo del mínimo."""
+    return await product_service.get_low_stock_products(limit)
+
+
+@router.get("/sku/{sku}", response_model=ProductResponse)
+async def get_product_by_sku(
+    sku: str,
+    product_service: AsyncProductService = Depends(get_async_product_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Obtener un producto por SKU."""
+    return await product_service.get_by_sku(sku)
+
+
+@router.get("/{product_id}", response_model=ProductWithRelations)
+async def get_product(
+    product_id: int,
+    product_service: AsyncProductService = Depends(get_async_product_service),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Obtener un producto por ID con sus relaciones."""
+    return await product_service.get_by_id(product_id, with_relations=True)
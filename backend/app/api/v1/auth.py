@@ -13,7 +13,7 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreate,
     auth_service: AuthService = Depends(get_auth_service)
 ):
@@ -25,11 +25,11 @@ def register(
     - **password**: Contraseña (mínimo 6 caracteres)
     - **role**: Rol del usuario (admin, seller, warehouse_keeper)
     """
-    return auth_service.register(user_data)
+    return await auth_service.register(user_data)
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     auth_service: AuthService = Depends(get_auth_service)
 ):
@@ -41,11 +41,11 @@ def login(
     - **username**: Email del usuario
     - **password**: Contraseña
     """
-    return auth_service.login(email=form_data.username, password=form_data.password)
+    return await auth_service.login(email=form_data.username, password=form_data.password)
 
 
 @router.post("/login/json", response_model=Token)
-def login_json(
+async def login_json(
     credentials: UserLogin,
     auth_service: AuthService = Depends(get_auth_service)
 ):
@@ -57,7 +57,7 @@ def login_json(
     - **email**: Email del usuario
     - **password**: Contraseña
     """
-    return auth_service.login(email=credentials.email, password=credentials.password)
+    return await auth_service.login(email=credentials.email, password=credentials.password)
 
 
 @router.get("/me", response_model=UserResponse)
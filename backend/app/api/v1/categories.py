@@ -30,6 +30,8 @@ def get_categories(
     - **skip**: Número de registros a saltar (paginación)
     - **limit**: Límite de registros a retornar
     - **with_product_count**: Si es true, incluye el conteo de productos por categoría
+
+    Responde con ``ETag`` y soporta ``If-None-Match`` (304), ver ConditionalGetMiddleware.
     """
     return category_service.get_all(skip, limit, with_product_count)
 
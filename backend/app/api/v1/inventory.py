@@ -1,26 +1,34 @@
 """
 Endpoints para gestión de inventario.
 """
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_active_admin
 from app.models.user import User
-from app.services.inventory_service import InventoryService
+from app.services.inventory_service import InventoryService, stream_movements_export
 from app.schemas.inventory import (
     InventoryMovementCreate,
     InventoryMovementResponse,
     InventoryMovementList,
+    InventoryMovementCursorList,
     InventoryMovementFilter,
     StockAdjustment,
     BatchStockEntryRequest,
     LowStockAlert,
     InventoryStats,
+    StockAsOf,
+    InventoryValuation,
+    StockAvailability,
+    StockShardsUpdate,
+    StockShardsStatus,
     MovementTypeEnum,
     MovementReasonEnum,
+    ExportFormatEnum,
 )
 
 router = APIRouter(prefix="/inventory", tags=["Inventario"])
@@ -33,10 +41,13 @@ def get_inventory_service(db: Session = Depends(get_db)) -> InventoryService:
 
 # ==================== MOVIMIENTOS ====================
 
-@router.get("/movements", response_model=InventoryMovementList)
+@router.get("/movements", response_model=Union[InventoryMovementList, InventoryMovementCursorList])
 def get_movements(
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(20, ge=1, le=100, description="Elementos por página"),
+    cursor: bool = Query(False, description="Paginar por cursor en lugar de por número de página"),
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (activa el modo cursor)"),
+    include_total: bool = Query(False, description="En modo cursor, calcular el total exacto en vez de estimarlo"),
     product_id: Optional[int] = Query(None, description="Filtrar por producto"),
     movement_type: Optional[MovementTypeEnum] = Query(None, description="Filtrar por tipo"),
     reason: Optional[MovementReasonEnum] = Query(None, description="Filtrar por razón"),
@@ -57,6 +68,10 @@ def get_movements(
     - **user_id**: Usuario que realizó el movimiento
     - **reference**: Número de referencia (factura, orden, etc.)
     - **date_from/date_to**: Rango de fechas
+
+    Modo cursor (``cursor=true`` o ``after=<token>``): devuelve ``next_cursor``
+    para pedir la siguiente página con ``after`` y un total estimado salvo que
+    se pida ``include_total=true``. Recomendado para scroll infinito.
     """
     filters = InventoryMovementFilter(
         product_id=product_id,
@@ -67,9 +82,73 @@ def get_movements(
         date_from=date_from,
         date_to=date_to
     )
+    if cursor or after:
+        return service.get_movements_cursor(page_size, filters, after, include_total)
     return service.get_movements(page, page_size, filters)
 
 
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.CSV: "text/csv; charset=utf-8",
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+}
+
+
+@router.get("/movements/export", response_class=StreamingResponse)
+def export_movements(
+    request: Request,
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.CSV, alias="format", description="csv o ndjson"),
+    product_id: Optional[int] = Query(None, description="Filtrar por producto"),
+    movement_type: Optional[MovementTypeEnum] = Query(None, description="Filtrar por tipo"),
+    reason: Optional[MovementReasonEnum] = Query(None, description="Filtrar por razón"),
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario"),
+    reference: Optional[str] = Query(None, description="Buscar por referencia"),
+    date_from: Optional[datetime] = Query(None, description="Fecha desde"),
+    date_to: Optional[datetime] = Query(None, description="Fecha hasta"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exportar movimientos de inventario en CSV o NDJSON, en orden cronológico.
+
+    Acepta los mismos filtros que el listado. Las filas se leen por lotes con
+    un cursor del servidor y se envían a medida que se generan, por lo que
+    la memoria usada no depende de la cantidad de movimientos.
+
+    Si el cliente envía ``Accept-Encoding: gzip`` la respuesta se comprime
+    al vuelo (``Content-Encoding: gzip``).
+    """
+    filters = InventoryMovementFilter(
+        product_id=product_id,
+        movement_type=movement_type,
+        reason=reason,
+        user_id=user_id,
+        reference=reference,
+        date_from=date_from,
+        date_to=date_to
+    )
+    return movements_export_response(request, filters, export_format)
+
+
+def movements_export_response(
+    request: Request,
+    filters: InventoryMovementFilter,
+    export_format: ExportFormatEnum
+) -> StreamingResponse:
+    """Armar el StreamingResponse de la exportación (compartido con el router asíncrono)."""
+    compress = "gzip" in request.headers.get("accept-encoding", "").lower()
+    filename = f"movimientos-{datetime.now():%Y%m%d-%H%M%S}.{export_format.value}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_movements_export(filters, export_format, compress),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
 @router.get("/movements/{movement_id}", response_model=InventoryMovementResponse)
 def get_movement(
     movement_id: int,
@@ -110,6 +189,22 @@ def get_product_movements(
     return service.get_product_movements(product_id, limit)
 
 
+@router.get("/products/{product_id}/stock-as-of", response_model=StockAsOf)
+def get_product_stock_as_of(
+    product_id: int,
+    at: Optional[datetime] = Query(None, description="Fecha y hora de la consulta (por defecto, ahora)"),
+    service: InventoryService = Depends(get_inventory_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Obtener el stock que tenía un producto en una fecha pasada.
+
+    Se calcula desde el checkpoint diario más reciente más los movimientos
+    posteriores, sin recorrer todo el historial.
+    """
+    return service.get_stock_as_of(product_id, at)
+
+
 # ==================== AJUSTES RÁPIDOS ====================
 
 @router.post("/adjust", response_model=InventoryMovementResponse, status_code=status.HTTP_201_CREATED)
@@ -146,10 +241,46 @@ def batch_stock_entry(
     return service.batch_stock_entry(data, user_id=current_user.id)
 
 
+@router.get("/products/{product_id}/stock-shards", response_model=StockShardsStatus)
+def get_stock_shards(
+    product_id: int,
+    service: InventoryService = Depends(get_inventory_service),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Modo de stock de un producto: normal (0) o repartido en N slots.
+
+    Solo administradores. En modo repartido incluye el stock de cada slot.
+    """
+    return service.get_stock_shards(product_id)
+
+
+@router.put("/products/{product_id}/stock-shards", response_model=StockShardsStatus)
+def set_stock_shards(
+    product_id: int,
+    data: StockShardsUpdate,
+    service: InventoryService = Depends(get_inventory_service),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Activar (N > 0) o desactivar (0) el modo repartido de un producto.
+
+    Solo administradores. Pensado para los pocos SKU que reciben escrituras
+    concurrentes constantes (ofertas, productos de caja): los movimientos
+    se reparten entre N slots en lugar de hacer fila sobre una sola fila.
+    El stock total se pliega en ``stock_current`` cada
+    ``STOCK_SHARD_FOLD_SECONDS``; hasta entonces los movimientos nuevos
+    tienen stock antes/después en null. No admite reservas.
+    """
+    return service.set_stock_shards(product_id, data)
+
+
 # ==================== ALERTAS ====================
 
 @router.get("/alerts/low-stock", response_model=LowStockAlert)
 def get_low_stock_alerts(
+    limit: int = Query(100, ge=1, le=1000, description="Productos por página"),
+    after: Optional[str] = Query(None, description="Cursor de la página anterior (next_cursor)"),
     service: InventoryService = Depends(get_inventory_service),
     current_user: User = Depends(get_current_user)
 ):
@@ -160,8 +291,11 @@ def get_low_stock_alerts(
     - **critical_count**: Productos sin stock (stock = 0)
     - **warning_count**: Productos bajo el stock mínimo
     - **products**: Lista de productos afectados ordenados por criticidad
+    - **next_cursor**: Si hay más productos, token para pedirlos con ``after``
+
+    Los conteos siempre corresponden al total de productos afectados, no a la página.
     """
-    return service.get_low_stock_products()
+    return service.get_low_stock_products(limit, after)
 
 
 # ==================== ESTADÍSTICAS ====================
@@ -183,9 +317,24 @@ def get_inventory_stats(
     return service.get_inventory_stats()
 
 
+@router.get("/valuation", response_model=InventoryValuation)
+def get_inventory_valuation(
+    at: Optional[datetime] = Query(None, description="Fecha y hora de la valorización (por defecto, ahora)"),
+    service: InventoryService = Depends(get_inventory_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Valorización del inventario en una fecha pasada.
+
+    Retorna las unidades y el valor de los productos activos a esa fecha,
+    valorizados al costo actual de cada producto.
+    """
+    return service.get_inventory_valuation(at)
+
+
 # ==================== VALIDACIONES ====================
 
-@router.get("/check-stock/{product_id}")
+@router.get("/check-stock/{product_id}", response_model=StockAvailability)
 def check_stock_available(
     product_id: int,
     quantity: int = Query(..., gt=0, description="Cantidad a verificar"),
@@ -195,11 +344,8 @@ def check_stock_available(
     """
     Verificar si hay stock disponible de un producto.
     
-    Útil antes de procesar una venta para validar disponibilidad.
+    Útil antes de procesar una venta para validar disponibilidad. El
+    disponible descuenta las unidades reservadas (``/reservations``); para
+    retenerlas hasta el checkout, crear una reserva en lugar de consultar.
     """
-    available = service.validate_stock_available(product_id, quantity)
-    return {
-        "product_id": product_id,
-        "quantity_requested": quantity,
-        "available": available
-    }
+    return service.get_stock_availability(product_id, quantity)
@@ -0,0 +1,23 @@
+"""
+Endpoints de métricas internas.
+"""
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_active_admin
+from app.core.metrics import collect_metrics
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("")
+def get_metrics(current_user: User = Depends(get_current_active_admin)) -> dict[str, Any]:
+    """
+    Obtener las métricas internas del worker que atiende la petición.
+
+    Solo administradores. Incluye, entre otras, la tasa de aciertos de la
+    caché de usuarios autenticados.
+    """
+    return collect_metrics()
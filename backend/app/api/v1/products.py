@@ -3,7 +3,7 @@ Endpoints de productos.
 """
 from typing import Optional
 from decimal import Decimal
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, File, status, Query, UploadFile
 from pydantic import BaseModel
 
 from app.schemas.product import (
@@ -12,12 +12,24 @@ from app.schemas.product import (
     ProductResponse,
     ProductWithRelations,
     ProductListResponse,
+    ProductSearchResult,
     ProductFilter,
+    ProductImportResult,
+    ProductBulkUpdateRequest,
+    ProductBulkUpdateResult,
 )
 from app.services.product_service import ProductService
+from app.services.product_import_service import ProductImportService
 from app.services.inventory_service import InventoryService
-from app.api.deps import get_product_service, get_inventory_service, get_current_user
+from app.api.deps import (
+    get_product_service,
+    get_product_import_service,
+    get_inventory_service,
+    get_current_user,
+    get_current_active_admin,
+)
 from app.models.user import User
+from app.utils.responses import FastJSONResponse
 from app.schemas.inventory import MovementReasonEnum
 
 router = APIRouter()
@@ -42,6 +54,7 @@ def get_products(
     low_stock_only: bool = Query(False, description="Solo productos con stock bajo"),
     min_price: Optional[Decimal] = Query(None, ge=0, description="Precio mínimo"),
     max_price: Optional[Decimal] = Query(None, ge=0, description="Precio máximo"),
+    include_total: bool = Query(True, description="Calcular el total exacto (false: total estimado, más barato en catálogos grandes)"),
     product_service: ProductService = Depends(get_product_service),
     current_user: User = Depends(get_current_user)
 ):
@@ -57,6 +70,7 @@ def get_products(
     - **low_stock_only**: Solo mostrar productos con stock bajo
     - **min_price**: Filtrar por precio mínimo
     - **max_price**: Filtrar por precio máximo
+    - **include_total**: Si es false, ``total`` es una estimación (``total_is_estimate``)
     """
     filters = ProductFilter(
         search=search,
@@ -67,7 +81,29 @@ def get_products(
         min_price=min_price,
         max_price=max_price,
     )
-    return product_service.get_all(page, page_size, filters)
+    # Datos propios de la base: se serializan directo, sin validar cada fila
+    return FastJSONResponse(product_service.get_all_serialized(page, page_size, filters, include_total))
+
+
+@router.get("/search", response_model=list[ProductSearchResult])
+def search_products(
+    q: str = Query(..., min_length=1, max_length=100, description="Texto a buscar"),
+    limit: int = Query(10, ge=1, le=50, description="Cantidad máxima de resultados"),
+    only_active: bool = Query(True, description="Solo productos activos"),
+    product_service: ProductService = Depends(get_product_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Buscar productos por relevancia (para el selector de productos).
+
+    Tolera errores de tipeo y coincide por prefijo de palabra en nombre,
+    SKU y descripción.
+
+    - **q**: Texto a buscar
+    - **limit**: Cantidad máxima de resultados (top-k)
+    - **only_active**: Solo productos activos
+    """
+    return product_service.search(q, limit, only_active)
 
 
 @router.get("/low-stock", response_model=list[ProductWithRelations])
@@ -134,6 +170,49 @@ def create_product(
     return product_service.create(product_data)
 
 
+@router.post("/import", response_model=ProductImportResult)
+def import_products(
+    file: UploadFile = File(..., description="Archivo .csv o .xlsx con encabezados"),
+    update_existing: bool = Query(True, description="Actualizar los productos cuyo SKU ya existe"),
+    dry_run: bool = Query(False, description="Solo validar, sin guardar cambios"),
+    import_service: ProductImportService = Depends(get_product_import_service),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Importar un catálogo de productos desde CSV o XLSX (solo administradores).
+
+    Columnas: **sku**, **name**, **cost**, **price** (obligatorias) y
+    description, category_id, supplier_id, stock_current, stock_min.
+    En CSV se acepta coma o punto y coma como separador.
+
+    - Los SKU existentes actualizan sus datos de catálogo; el stock de esos
+      productos no cambia (solo se modifica con movimientos)
+    - Las filas con errores no se importan y se listan con su número de fila
+    - Las filas válidas se guardan en una sola transacción
+    """
+    return import_service.import_file(file.file, file.filename or "", update_existing, dry_run)
+
+
+@router.patch("/bulk", response_model=ProductBulkUpdateResult)
+def bulk_update_products(
+    data: ProductBulkUpdateRequest,
+    product_service: ProductService = Depends(get_product_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Actualizar muchos productos a la vez, identificados por SKU.
+
+    Cada item trae el **sku** y solo los campos a cambiar (name, description,
+    category_id, supplier_id, stock_min, cost, price, is_active). Pensado
+    para listas de precios de proveedores: hasta 10.000 items por solicitud.
+
+    Retorna el resultado de cada SKU en el mismo orden: **updated**,
+    **not_found** o **invalid** (con el motivo). Los items inválidos o
+    inexistentes no impiden aplicar el resto.
+    """
+    return product_service.bulk_update(data.items)
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
 def update_product(
     product_id: int,
@@ -0,0 +1,64 @@
+"""
+Endpoints de reservas de stock (carritos y pedidos pendientes).
+"""
+from fastapi import APIRouter, Depends, status
+
+from app.api.deps import get_current_user, get_reservation_service
+from app.models.user import User
+from app.schemas.reservation import ReservationCreate, ReservationResponse
+from app.schemas.sale import SaleResponse
+from app.services.reservation_service import ReservationService
+
+router = APIRouter()
+
+
+@router.post("", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
+def create_reservation(
+    data: ReservationCreate,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Reservar stock para un carrito o pedido pendiente.
+
+    Retiene las unidades de todas las líneas hasta ``expires_at``: mientras
+    la reserva esté vigente no se pueden vender ni reservar para otro. Si
+    algún producto no tiene disponible suficiente no se reserva nada y la
+    respuesta 400 tiene el mismo formato que la de ``POST /sales``.
+    """
+    return service.reserve(data, user_id=current_user.id)
+
+
+@router.get("/{reservation_id}", response_model=ReservationResponse)
+def get_reservation(
+    reservation_id: int,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Obtener una reserva vigente."""
+    return service.get_reservation(reservation_id)
+
+
+@router.post("/{reservation_id}/confirm", response_model=SaleResponse, status_code=status.HTTP_201_CREATED)
+def confirm_reservation(
+    reservation_id: int,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Confirmar una reserva: se registra como venta y se descuenta el stock.
+
+    Responde igual que ``POST /sales``. Una reserva vencida responde 404.
+    """
+    return service.confirm(reservation_id, user_id=current_user.id)
+
+
+@router.delete("/{reservation_id}", status_code=status.HTTP_204_NO_CONTENT)
+def release_reservation(
+    reservation_id: int,
+    service: ReservationService = Depends(get_reservation_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Liberar una reserva: sus unidades vuelven a estar disponibles."""
+    service.release(reservation_id)
+    return None
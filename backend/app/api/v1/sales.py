@@ -0,0 +1,28 @@
+"""
+Endpoints de ventas.
+"""
+from fastapi import APIRouter, Depends, status
+
+from app.api.deps import get_current_user, get_sale_service
+from app.models.user import User
+from app.schemas.sale import SaleCreate, SaleResponse
+from app.services.sale_service import SaleService
+
+router = APIRouter()
+
+
+@router.post("", response_model=SaleResponse, status_code=status.HTTP_201_CREATED)
+def create_sale(
+    data: SaleCreate,
+    service: SaleService = Depends(get_sale_service),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Registrar una venta (checkout de un ticket).
+
+    Descuenta el stock de todas las líneas en una sola transacción y crea un
+    movimiento de salida (razón ``sale``) por línea. Si algún producto no
+    alcanza, no se descuenta nada y la respuesta 400 lista cada producto
+    faltante con sus líneas, la cantidad pedida y la disponible.
+    """
+    return service.checkout(data, user_id=current_user.id)
@@ -0,0 +1,148 @@
+"""
+Canal de cambios de stock en vivo: Server-Sent Events y WebSocket.
+
+Reemplaza el polling de ``/inventory/alerts/low-stock`` y
+``/inventory/stats``: el cliente abre el canal, lee el estado una vez y
+después aplica los eventos. Ante un ``resync`` debe volver a leerlo.
+"""
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.background import BackgroundTask
+
+from app.api.deps import get_current_user_stream
+from app.core.config import settings
+from app.core.events import EventSubscription
+from app.models.user import User
+from app.schemas.stock_event import StockEventFilter
+from app.services.stock_events import stock_event_broker
+
+router = APIRouter(prefix="/inventory", tags=["Inventario"])
+
+# Espera sugerida al EventSource antes de reconectar
+SSE_RETRY_MS = 3000
+
+
+def stream_filters(
+    product_id: List[int] = Query([], description="Productos a seguir (se puede repetir)"),
+    category_id: List[int] = Query([], description="Categorías a seguir (se puede repetir)"),
+) -> StockEventFilter:
+    """Filtros iniciales de la suscripción desde la query."""
+    try:
+        return StockEventFilter(product_ids=product_id, category_ids=category_id)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors())
+
+
+def ensure_enabled() -> None:
+    """El canal solo funciona con el listener de stock_events activo."""
+    if not settings.STOCK_EVENTS_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="El canal de eventos de stock no está habilitado"
+        )
+
+
+async def sse_frames(subscription: EventSubscription) -> AsyncIterator[str]:
+    """Eventos en formato SSE; lo que llega junto sale en una sola escritura."""
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            try:
+                batch = await asyncio.wait_for(
+                    subscription.get_batch(), settings.STOCK_EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Mantiene viva la conexión a través de proxies
+                yield ": ping\n\n"
+                continue
+            yield "".join(f"event: {event.name}\ndata: {event.data}\n\n" for event in batch)
+    finally:
+        stock_event_broker.unsubscribe(subscription)
+
+
+@router.get("/events/stream", response_class=StreamingResponse, dependencies=[Depends(ensure_enabled)])
+async def stream_stock_events(
+    filters: StockEventFilter = Depends(stream_filters),
+    current_user: User = Depends(get_current_user_stream)
+):
+    """
+    Cambios de stock en vivo por Server-Sent Events.
+
+    Emite ``stock_changed`` en cada cambio de stock o de mínimo y
+    ``threshold_crossed`` cuando el producto pasa entre normal, bajo el
+    mínimo y agotado. ``product_id`` y ``category_id`` (repetibles) limitan
+    los productos; se combinan por unión. Como EventSource no envía
+    encabezados, el token puede ir en el parámetro ``token``.
+    """
+    subscription = stock_event_broker.subscribe(filters.product_ids, filters.category_ids)
+    return StreamingResponse(
+        sse_frames(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Si el cliente se va antes de empezar el stream el generador no corre
+        background=BackgroundTask(stock_event_broker.unsubscribe, subscription),
+    )
+
+
+async def read_filters(websocket: WebSocket, subscription: EventSubscription) -> None:
+    """Aplicar los filtros que envía el cliente hasta que se desconecte."""
+    while True:
+        try:
+            message = await websocket.receive_text()
+        except WebSocketDisconnect:
+            return
+        try:
+            filters = StockEventFilter.model_validate_json(message)
+        except ValidationError as exc:
+            await websocket.send_text(json.dumps({"detail": exc.errors(include_url=False)}, default=str))
+            continue
+        stock_event_broker.update_filters(subscription, filters.product_ids, filters.category_ids)
+
+
+@router.websocket("/events/ws")
+async def stock_events_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    product_id: List[int] = Query([]),
+    category_id: List[int] = Query([]),
+):
+    """
+    Cambios de stock en vivo por WebSocket.
+
+    Mismos eventos y filtros iniciales que ``/events/stream``, un evento
+    JSON por mensaje. El cliente puede reemplazar sus filtros enviando
+    ``{"product_ids": [...], "category_ids": [...]}``.
+    """
+    if not settings.STOCK_EVENTS_ENABLED:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    try:
+        await get_current_user_stream(websocket, token)
+        filters = stream_filters(product_id, category_id)
+    except (HTTPException, RequestValidationError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = stock_event_broker.subscribe(filters.product_ids, filters.category_ids)
+    reader = asyncio.create_task(read_filters(websocket, subscription))
+    try:
+        while True:
+            getter = asyncio.ensure_future(subscription.get_batch())
+            done, _ = await asyncio.wait({getter, reader}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                break
+            for event in getter.result():
+                await websocket.send_text(event.data)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+        stock_event_broker.unsubscribe(subscription)
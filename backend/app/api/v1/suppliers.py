@@ -33,6 +33,8 @@ def get_suppliers(
     - **limit**: Límite de registros a retornar
     - **is_active**: Filtrar por estado activo/inactivo
     - **with_product_count**: Si es true, incluye el conteo de productos por proveedor
+
+    Responde con ``ETag`` y soporta ``If-None-Match`` (304), ver ConditionalGetMiddleware.
     """
     return supplier_service.get_all(skip, limit, is_active, with_product_count)
 
@@ -0,0 +1,205 @@
+"""
+Caché en memoria del proceso con expiración (TTL) y desalojo LRU.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Optional, Sequence
+
+from app.core.config import settings
+from app.core.metrics import register_metrics
+
+
+class TTLCache:
+    """
+    Caché LRU con TTL, segura entre hilos.
+
+    Es local a cada worker de uvicorn: la invalidación explícita solo aplica
+    al proceso que la ejecuta y el TTL acota cuánto puede durar un dato
+    desactualizado en los demás.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Obtener un valor vigente o ``default`` si no existe o expiró."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Guardar un valor, desalojando el menos usado si se supera maxsize."""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Eliminar una entrada si existe."""
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Vaciar la caché."""
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Métricas de uso de la caché."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """
+    Copia completa de una tabla de referencia (categorías, proveedores).
+
+    ``version`` es la de data_versions leída antes de cargar las filas: si
+    la tabla cambió durante la carga, la versión queda atrás y la próxima
+    notificación descarta el snapshot (nunca al revés).
+    """
+
+    name: str
+    version: int
+    items: Sequence[Any]
+    by_id: dict[int, Any] = field(repr=False)
+    loaded_at: float
+
+    @classmethod
+    def build(cls, name: str, version: int, items: Sequence[Any]) -> "ReferenceSnapshot":
+        return cls(
+            name=name,
+            version=version,
+            items=tuple(items),
+            by_id={item.id: item for item in items},
+            loaded_at=time.monotonic(),
+        )
+
+
+class ReferenceDataCache:
+    """
+    Snapshots de tablas de referencia pequeñas que cambian poco.
+
+    Cada snapshot se descarta por TTL, por una mutación en este worker
+    (``invalidate(name)``) o por una notificación de otro worker con una
+    versión más nueva (``invalidate(name, version)``). Un contador de
+    generación por nombre evita guardar un snapshot cuya carga empezó antes
+    de una invalidación.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshots: dict[str, ReferenceSnapshot] = {}
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.invalidations = 0
+
+    def get(self, name: str) -> Optional[ReferenceSnapshot]:
+        """Snapshot vigente de ``name`` o None."""
+        now = time.monotonic()
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+            if snapshot is None or snapshot.loaded_at + self.ttl <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return snapshot
+
+    def generation(self, name: str) -> tuple[int, int]:
+        """Generación actual de ``name``; se pasa a ``set`` al terminar la carga."""
+        with self._lock:
+            return self._epoch, self._generations.get(name, 0)
+
+    def set(self, name: str, snapshot: ReferenceSnapshot, generation: tuple[int, int]) -> bool:
+        """Guardar el snapshot si no hubo invalidaciones desde ``generation``."""
+        with self._lock:
+            if (self._epoch, self._generations.get(name, 0)) != generation:
+                return False
+            self._snapshots[name] = snapshot
+            self.loads += 1
+            return True
+
+    def invalidate(self, name: str, version: Optional[int] = None) -> None:
+        """
+        Descartar el snapshot de ``name``.
+
+        Con ``version`` (notificación de data_versions) se conserva si ya
+        está en esa versión o una posterior.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+            if version is not None and snapshot is not None and snapshot.version >= version:
+                return
+            self._snapshots.pop(name, None)
+            self._generations[name] = self._generations.get(name, 0) + 1
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Descartar todos los snapshots (p. ej. al perder la conexión de LISTEN)."""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._snapshots)
+            self._snapshots.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Métricas de uso de la caché."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "versions": {name: s.version for name, s in self._snapshots.items()},
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "loads": self.loads,
+                "invalidations": self.invalidations,
+            }
+
+
+# Usuarios autenticados, por subject del token (email)
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+register_metrics("auth_principal_cache", principal_cache.stats)
+
+# Categorías y proveedores (tablas completas), por nombre de tabla
+reference_cache = ReferenceDataCache(ttl=settings.REFERENCE_CACHE_TTL_SECONDS)
+register_metrics("reference_data_cache", reference_cache.stats)
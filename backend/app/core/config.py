@@ -33,15 +33,114 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Database URL for the async (asyncpg) engine."""
+        return self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    # Estadísticas del dashboard desde el snapshot mantenido por triggers
+    # (lecturas por clave primaria). En False se calculan sobre las tablas.
+    INVENTORY_STATS_FROM_SNAPSHOT: bool = True
+    # Zona horaria que define "hoy", la semana y el mes de las estadísticas.
+    # El trigger del conteo diario la fija al migrar (e7f8a9b0c1d2): si se
+    # cambia, hay que volver a correr esa migración para recontar los días.
+    INVENTORY_STATS_TIMEZONE: str = "UTC"
+
+    # Routers servidos por el stack asíncrono (AsyncSession + asyncpg).
+    # Valores posibles: "products", "inventory". Ej: ASYNC_ROUTERS='["products"]'
+    ASYNC_ROUTERS: list[str] = []
+
+    # Pool de conexiones (por worker: cada proceso de uvicorn tiene su engine).
+    # Conexiones máximas hacia Postgres = workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # Segundos esperando una conexión libre
+    DB_POOL_RECYCLE: int = 1800  # Segundos; -1 para no reciclar
+    # True: ping en cada checkout. False: ahorra ese round trip y confía en
+    # DB_POOL_RECYCLE y en la invalidación automática ante desconexiones
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 = sin límite
+    DB_APPLICATION_NAME: str = "inventario-api"
+
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
+    # Caché de usuarios autenticados (por worker)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10_000
+
+    # Caché de categorías y proveedores (por worker). Con LISTEN activo,
+    # cada worker escucha NOTIFY data_versions y descarta al instante lo que
+    # cambió en otro; sin él, el TTL acota cuánto puede durar un dato viejo.
+    REFERENCE_CACHE_TTL_SECONDS: int = 300
+    REFERENCE_CACHE_LISTEN: bool = False
+
+    # ETag / 304 en los listados de catálogo (ConditionalGetMiddleware)
+    ETAG_ENABLED: bool = True
+
+    # Particiones mensuales de inventory_movements: meses futuros creados de
+    # antemano y cada cuánto se revisan (0 desactiva la tarea de fondo)
+    INVENTORY_PARTITIONS_AHEAD: int = 3
+    INVENTORY_PARTITION_CHECK_SECONDS: int = 21600
+
+    # Checkpoints diarios de stock para consultas históricas: cada cuánto se
+    # revisa si falta el de ayer (0 desactiva la tarea de fondo)
+    STOCK_CHECKPOINT_CHECK_SECONDS: int = 3600
+
+    # Reservas de stock: duración por defecto y máxima, y barrido de las
+    # vencidas (cada cuánto y cuántas por transacción; 0 desactiva la tarea)
+    RESERVATION_TTL_SECONDS: int = 900
+    RESERVATION_MAX_TTL_SECONDS: int = 86400
+    RESERVATION_EXPIRY_CHECK_SECONDS: int = 30
+    RESERVATION_EXPIRY_BATCH_SIZE: int = 1000
+
+    # Modo repartido para productos de alta concurrencia: máximo de slots
+    # por producto y cada cuánto se pliegan en stock_current (0 desactiva)
+    STOCK_SHARDS_MAX: int = 64
+    STOCK_SHARD_FOLD_SECONDS: int = 5
+
+    # Canal de cambios de stock en vivo (SSE / WebSocket). Con él activo
+    # cada worker escucha NOTIFY stock_events y lo reparte a sus clientes
+    # (el trigger solo publica desde conexiones con el canal activo, así
+    # que escritores y oyentes deben compartir este valor); cola máxima por cliente (si se llena recibe "resync"), ids por filtro
+    # e intervalo de los heartbeats del stream SSE
+    STOCK_EVENTS_ENABLED: bool = False
+    STOCK_EVENTS_QUEUE_SIZE: int = 1000
+    STOCK_EVENTS_MAX_FILTER_IDS: int = 500
+    STOCK_EVENTS_HEARTBEAT_SECONDS: int = 15
+
+    # Outbox de movimientos para consumidores externos: cada cuánto corre
+    # el relay, eventos por lote y destino ("file" o "http") con su
+    # configuración. Sin destino ("none") los movimientos no escriben en el
+    # outbox y el relay no corre; con 0 segundos el relay no corre en este
+    # proceso y los eventos quedan en cola para otro que lo haga.
+    OUTBOX_RELAY_SECONDS: int = 1
+    OUTBOX_BATCH_SIZE: int = 1000
+    OUTBOX_SINK: str = "none"
+    OUTBOX_FILE_PATH: str = "outbox/inventory_events.ndjson"
+    OUTBOX_HTTP_URL: str = "http://127.0.0.1:9000/events"
+    OUTBOX_HTTP_TIMEOUT_SECONDS: float = 10.0
+
+    # Pool dedicado para bcrypt (por worker)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Exportaciones en streaming: filas por lote del cursor del servidor
+    EXPORT_BATCH_SIZE: int = 2000
+
+    # Importación masiva de productos: filas validadas por lote y
+    # cantidad máxima de errores detallados en la respuesta
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 5000
+    PRODUCT_IMPORT_MAX_ERRORS: int = 1000
+    # Actualización masiva por SKU: filas por sentencia UPDATE ... FROM VALUES
+    PRODUCT_BULK_UPDATE_CHUNK_SIZE: int = 1000
+
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
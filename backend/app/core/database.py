@@ -1,33 +1,208 @@
 """
 Database configuration and session management.
 """
+import threading
+import time
+from typing import Any
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.requests import HTTPConnection
 
 from app.core.config import settings
+from app.core.metrics import register_metrics
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mide cuánto se espera por una conexión libre."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        wait = time.perf_counter() - start
+        with self._stats_lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return connection
+
+    def _create_connection(self):
+        with self._stats_lock:
+            self.connects += 1
+        return super()._create_connection()
+
+    def stats(self) -> dict[str, Any]:
+        """Estado actual del pool y tiempos de espera acumulados."""
+        with self._stats_lock:
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "max_connections": self.size() + self._max_overflow,
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+def session_settings() -> dict[str, str]:
+    """
+    Parámetros de sesión de cada conexión (ambos engines).
+
+    ``inventory.stock_events`` e ``inventory.outbox`` los leen los
+    triggers: sin el canal en vivo activo no publican NOTIFY y sin destino
+    del outbox no le agregan eventos (migraciones ``a9b0c1d2e3f4`` y
+    ``b0c1d2e3f4a5``).
+    """
+    values: dict[str, str] = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        values["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if settings.STOCK_EVENTS_ENABLED:
+        values["inventory.stock_events"] = "on"
+    if settings.OUTBOX_SINK != "none":
+        values["inventory.outbox"] = "on"
+    return values
+
+
+def create_db_engine() -> Engine:
+    """
+    Crear el engine con la configuración de pool definida en Settings.
+
+    Cada conexión se abre con ``application_name`` (visible en
+    pg_stat_activity) y los parámetros de ``session_settings``.
+    """
+    connect_args: dict[str, Any] = {"application_name": settings.DB_APPLICATION_NAME}
+    options = session_settings()
+    if options:
+        connect_args["options"] = " ".join(f"-c {name}={value}" for name, value in options.items())
+
+    return create_engine(
+        settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+        echo=False,  # Set to True for SQL query logging during development
+    )
+
+
+def pool_stats() -> dict[str, Any]:
+    """Métricas del pool de conexiones del worker actual."""
+    stats = engine.pool.stats() if isinstance(engine.pool, InstrumentedQueuePool) else {}
+    stats["pre_ping"] = settings.DB_POOL_PRE_PING
+    stats["recycle_seconds"] = settings.DB_POOL_RECYCLE
+    stats["statement_timeout_ms"] = settings.DB_STATEMENT_TIMEOUT_MS
+    return stats
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=False,  # Set to True for SQL query logging during development
-)
+engine = create_db_engine()
+register_metrics("db_pool", pool_stats)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def create_async_db_engine() -> AsyncEngine:
+    """
+    Crear el engine asíncrono (asyncpg) con la misma configuración de pool.
+
+    Lo usan los routers listados en ASYNC_ROUTERS: cada petición espera a
+    Postgres sin ocupar un hilo del threadpool.
+    """
+    server_settings = {"application_name": settings.DB_APPLICATION_NAME, **session_settings()}
+
+    return create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"server_settings": server_settings},
+        echo=False,
+    )
+
+
+def async_pool_stats() -> dict[str, Any]:
+    """Ocupación del pool del engine asíncrono."""
+    pool = async_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+async_engine = create_async_db_engine()
+register_metrics("db_async_pool", async_pool_stats)
+
+# expire_on_commit=False: en async no se puede recargar atributos de forma implícita
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class for models
 Base = declarative_base()
 
 
-def get_db():
+# Claves de request.state con la sesión que ya abrió ConditionalGetMiddleware
+DB_STATE = "db"
+ASYNC_DB_STATE = "async_db"
+
+
+def get_db(connection: HTTPConnection):
     """
     Dependency for getting database sessions.
     Yields a database session and ensures it's closed after use.
+    Si la petición ya trae una (ConditionalGetMiddleware) se reutiliza y la
+    cierra quien la abrió.
     """
+    shared = getattr(connection.state, DB_STATE, None)
+    if shared is not None:
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(connection: HTTPConnection):
+    """
+    Dependency for getting async database sessions.
+    Yields an AsyncSession and ensures it's closed after use.
+    Igual que ``get_db``, reutiliza la sesión que ya trae la petición.
+    """
+    shared = getattr(connection.state, ASYNC_DB_STATE, None)
+    if shared is not None:
+        yield shared
+        return
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,206 @@
+"""
+Distribución en memoria de eventos a clientes conectados (SSE / WebSocket).
+"""
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class BrokerEvent:
+    """
+    Evento listo para enviar.
+
+    ``data`` es el JSON ya serializado: se arma una vez y lo comparten todos
+    los suscriptores. Sin ``product_id`` el evento va a todos, sin importar
+    sus filtros.
+    """
+    name: str
+    data: str
+    product_id: Optional[int] = None
+    category_id: Optional[int] = None
+
+
+class EventSubscription:
+    """
+    Cola de un cliente conectado, con sus filtros.
+
+    Se crea y se consume en el event loop del worker. Si el cliente no lee
+    a tiempo y la cola se llena, se descarta lo pendiente y se deja un único
+    evento ``overflow`` del broker: el cliente debe volver a leer el estado.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue[BrokerEvent] = asyncio.Queue(maxsize)
+        self.product_ids: frozenset[int] = frozenset()
+        self.category_ids: frozenset[int] = frozenset()
+        self.active = True
+
+    async def get_batch(self) -> list[BrokerEvent]:
+        """Esperar el próximo evento y retornar además los que ya estén en cola."""
+        batch = [await self.queue.get()]
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    def _offer(self, event: BrokerEvent, overflow: BrokerEvent) -> bool:
+        """Encolar un evento; retorna False si la cola estaba llena (ver la clase)."""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(overflow)
+            return False
+
+
+class _LoopSubscribers:
+    """Suscripciones de un event loop indexadas por filtro."""
+
+    def __init__(self):
+        self.unfiltered: set[EventSubscription] = set()
+        self.by_product: dict[int, set[EventSubscription]] = {}
+        self.by_category: dict[int, set[EventSubscription]] = {}
+        self.count = 0
+
+    def add(self, subscription: EventSubscription) -> None:
+        if not subscription.product_ids and not subscription.category_ids:
+            self.unfiltered.add(subscription)
+        for product_id in subscription.product_ids:
+            self.by_product.setdefault(product_id, set()).add(subscription)
+        for category_id in subscription.category_ids:
+            self.by_category.setdefault(category_id, set()).add(subscription)
+
+    def discard(self, subscription: EventSubscription) -> None:
+        self.unfiltered.discard(subscription)
+        for index, keys in ((self.by_product, subscription.product_ids), (self.by_category, subscription.category_ids)):
+            for key in keys:
+                targets = index.get(key)
+                if targets is not None:
+                    targets.discard(subscription)
+                    if not targets:
+                        del index[key]
+
+    def match(self, event: BrokerEvent) -> Iterable[EventSubscription]:
+        """Suscripciones que reciben ``event``: sin filtros, o por producto o por categoría."""
+        if event.product_id is None:
+            return {*self.unfiltered, *(s for t in self.by_product.values() for s in t),
+                    *(s for t in self.by_category.values() for s in t)}
+        by_product = self.by_product.get(event.product_id)
+        by_category = self.by_category.get(event.category_id) if event.category_id is not None else None
+        if not by_product and not by_category:
+            return self.unfiltered
+        return self.unfiltered.union(by_product or (), by_category or ())
+
+
+class EventBroker:
+    """
+    Reparte eventos publicados desde cualquier hilo a las suscripciones.
+
+    Un worker de uvicorn tiene un solo event loop, pero el broker agrupa las
+    suscripciones por loop: ``publish`` (p. ej. desde el hilo de LISTEN)
+    agenda un único despacho por loop con ``call_soon_threadsafe`` y el
+    filtrado y el encolado ocurren en ese loop, sin bloqueos. Los índices por
+    producto y categoría hacen que el costo de cada evento dependa de
+    cuántos clientes lo reciben y no de cuántos hay conectados.
+
+    Los filtros de una suscripción se combinan por unión: recibe los eventos
+    de los productos listados y los de las categorías listadas; sin
+    filtros, todos.
+    """
+
+    def __init__(self, maxsize: int, overflow: BrokerEvent):
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._loops: dict[asyncio.AbstractEventLoop, _LoopSubscribers] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    def subscribe(
+        self,
+        product_ids: Iterable[int] = (),
+        category_ids: Iterable[int] = (),
+    ) -> EventSubscription:
+        """Crear una suscripción en el event loop actual."""
+        loop = asyncio.get_running_loop()
+        subscription = EventSubscription(loop, self.maxsize)
+        subscription.product_ids = frozenset(product_ids)
+        subscription.category_ids = frozenset(category_ids)
+        with self._lock:
+            group = self._loops.setdefault(loop, _LoopSubscribers())
+            group.count += 1
+        group.add(subscription)
+        return subscription
+
+    def update_filters(
+        self,
+        subscription: EventSubscription,
+        product_ids: Iterable[int] = (),
+        category_ids: Iterable[int] = (),
+    ) -> None:
+        """Reemplazar los filtros de una suscripción (desde su event loop)."""
+        group = self._loops.get(subscription.loop)
+        if group is None or not subscription.active:
+            return
+        group.discard(subscription)
+        subscription.product_ids = frozenset(product_ids)
+        subscription.category_ids = frozenset(category_ids)
+        group.add(subscription)
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        """Quitar una suscripción (desde su event loop); se puede llamar más de una vez."""
+        with self._lock:
+            group = self._loops.get(subscription.loop)
+            if group is None or not subscription.active:
+                return
+            subscription.active = False
+            group.discard(subscription)
+            group.count -= 1
+            if group.count == 0:
+                del self._loops[subscription.loop]
+
+    def publish(self, events: Sequence[BrokerEvent]) -> None:
+        """Publicar eventos en orden; se puede llamar desde cualquier hilo."""
+        if not events:
+            return
+        with self._lock:
+            self.published += len(events)
+            loops = list(self._loops)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._dispatch, loop, events)
+            except RuntimeError:
+                # El loop ya se cerró sin desuscribir a sus clientes
+                with self._lock:
+                    self._loops.pop(loop, None)
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop, events: Sequence[BrokerEvent]) -> None:
+        group = self._loops.get(loop)
+        if group is None:
+            return
+        delivered = overflows = 0
+        for event in events:
+            for subscription in group.match(event):
+                if subscription._offer(event, self.overflow):
+                    delivered += 1
+                else:
+                    overflows += 1
+        with self._lock:
+            self.delivered += delivered
+            self.overflows += overflows
+
+    def stats(self) -> dict[str, Any]:
+        """Métricas del broker."""
+        with self._lock:
+            return {
+                "subscribers": sum(group.count for group in self._loops.values()),
+                "queue_size": self.maxsize,
+                "published": self.published,
+                "delivered": self.delivered,
+                "overflows": self.overflows,
+            }
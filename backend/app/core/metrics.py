@@ -0,0 +1,27 @@
+"""
+Registro de métricas internas del proceso.
+
+Cada componente registra una función que devuelve un dict con sus métricas
+actuales; el endpoint /metrics las reúne bajo el nombre registrado.
+"""
+from typing import Any, Callable
+
+MetricsProvider = Callable[[], dict[str, Any]]
+
+_providers: dict[str, MetricsProvider] = {}
+
+
+def register_metrics(name: str, provider: MetricsProvider) -> None:
+    """
+    Registrar una fuente de métricas.
+
+    Args:
+        name: Nombre con el que aparecen las métricas
+        provider: Función sin argumentos que retorna las métricas actuales
+    """
+    _providers[name] = provider
+
+
+def collect_metrics() -> dict[str, dict[str, Any]]:
+    """Obtener las métricas actuales de todas las fuentes registradas."""
+    return {name: provider() for name, provider in _providers.items()}
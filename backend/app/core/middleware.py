@@ -0,0 +1,118 @@
+"""
+Middleware de peticiones condicionales (ETag / If-None-Match).
+"""
+import logging
+from typing import Any, Awaitable, Callable, Collection, Mapping, Optional, Sequence
+
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders, QueryParams
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.database import ASYNC_DB_STATE, DB_STATE, AsyncSessionLocal, SessionLocal
+from app.core.security import decode_access_token
+from app.repositories.async_data_version_repository import AsyncDataVersionRepository
+from app.repositories.data_version_repository import DataVersionRepository
+from app.utils.etag import CACHE_CONTROL, etag_matches, not_modified
+
+logger = logging.getLogger(__name__)
+
+# Para cada ruta: qué versiones de data_versions determinan la respuesta
+VersionResolver = Callable[[QueryParams], Sequence[str]]
+
+
+class ConditionalGetMiddleware:
+    """
+    ETag para GETs de catálogo a partir de los contadores de data_versions.
+
+    Antes de ejecutar el endpoint lee las versiones de la ruta (una consulta
+    por clave primaria). Si coinciden con If-None-Match responde 304 sin
+    ejecutar la consulta ni serializar; si no, agrega el ETag a la respuesta
+    200. Las versiones se leen antes que los datos: si cambian entre medio,
+    el cliente guarda datos nuevos con un ETag viejo y solo pierde un 304.
+
+    La sesión de esa lectura queda en ``request.state`` y el endpoint la
+    reutiliza (``get_db`` / ``get_async_db``): una sola conexión del pool por
+    petición. Las rutas de ``async_paths`` las sirven routers asíncronos y
+    la sesión es una AsyncSession. La middleware la cierra al terminar.
+
+    Solo actúa con un token válido; sin él la petición sigue normalmente y
+    el endpoint responde 401.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        resources: Mapping[str, VersionResolver],
+        async_paths: Collection[str] = (),
+    ):
+        self.app = app
+        self.resources = dict(resources)
+        self.async_paths = frozenset(async_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        resolver = self.resources.get(scope["path"]) if scope["type"] == "http" else None
+        if resolver is None or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        if not _has_valid_token(request):
+            await self.app(scope, receive, send)
+            return
+
+        names = resolver(request.query_params)
+        if scope["path"] in self.async_paths:
+            async with AsyncSessionLocal() as db:
+                versions = await _guard(AsyncDataVersionRepository(db).get_versions(names))
+                await self._respond(request, receive, send, _etag(names, versions), db, ASYNC_DB_STATE)
+        else:
+            db = SessionLocal()
+            try:
+                versions = await _guard(run_in_threadpool(DataVersionRepository(db).get_versions, names))
+                await self._respond(request, receive, send, _etag(names, versions), db, DB_STATE)
+            finally:
+                await run_in_threadpool(db.close)
+
+    async def _respond(
+        self, request: Request, receive: Receive, send: Send, etag: Optional[str], db: Any, state_key: str
+    ) -> None:
+        scope = request.scope
+        if etag is None:
+            # Sin versiones el endpoint abre su propia sesión
+            await self.app(scope, receive, send)
+            return
+        if etag_matches(request, etag):
+            await not_modified(etag)(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = etag
+                headers["Cache-Control"] = CACHE_CONTROL
+            await send(message)
+
+        scope.setdefault("state", {})[state_key] = db
+        await self.app(scope, receive, send_with_etag)
+
+
+def _etag(names: Sequence[str], versions: Optional[dict[str, int]]) -> Optional[str]:
+    if versions is None:
+        return None
+    return 'W/"' + ".".join(f"{name}-{versions[name]}" for name in names) + '"'
+
+
+async def _guard(read: Awaitable[dict[str, int]]) -> Optional[dict[str, int]]:
+    """Versiones leídas, o None si la base falló (la petición sigue sin ETag)."""
+    try:
+        return await read
+    except SQLAlchemyError:
+        logger.warning("No se pudieron leer las versiones para el ETag", exc_info=True)
+        return None
+
+
+def _has_valid_token(request: Request) -> bool:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and decode_access_token(token) is not None
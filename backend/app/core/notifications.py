@@ -0,0 +1,95 @@
+"""
+Escucha de notificaciones de PostgreSQL (LISTEN/NOTIFY) en un hilo propio.
+"""
+import logging
+import select
+import threading
+from typing import Callable, Sequence
+
+import psycopg2
+import psycopg2.extensions
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+NotificationHandler = Callable[[str, str], None]
+
+
+class PostgresListener:
+    """
+    Hilo que mantiene una conexión dedicada con ``LISTEN`` sobre ``channels``.
+
+    Cada notificación llega a ``handler(canal, payload)``. La conexión no sale
+    del pool de la aplicación. Si se pierde, se llama a ``on_reconnect`` (las
+    notificaciones de ese intervalo se perdieron) y se reintenta con espera
+    creciente hasta ``stop``.
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[str],
+        handler: NotificationHandler,
+        on_reconnect: Callable[[], None] | None = None,
+        poll_interval: float = 5.0,
+    ):
+        self.channels = tuple(channels)
+        self.handler = handler
+        self.on_reconnect = on_reconnect
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Iniciar el hilo (daemon) si no está corriendo."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"pg-listen-{'-'.join(self.channels)}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Detener el hilo y cerrar la conexión."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _connect(self) -> psycopg2.extensions.connection:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = psycopg2.connect(dsn, application_name=f"{settings.DB_APPLICATION_NAME}-listen")
+        connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            for channel in self.channels:
+                cursor.execute(f'LISTEN "{channel}"')
+        return connection
+
+    def _run(self) -> None:
+        backoff = 1.0
+        first = True
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                if not first and self.on_reconnect:
+                    self.on_reconnect()
+                first = False
+                backoff = 1.0
+                while not self._stop.is_set():
+                    if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notification = connection.notifies.pop(0)
+                        try:
+                            self.handler(notification.channel, notification.payload)
+                        except Exception:
+                            logger.exception("Error procesando NOTIFY %s", notification.channel)
+            except psycopg2.Error:
+                logger.warning("Conexión LISTEN perdida; reintentando en %.0fs", backoff, exc_info=True)
+                first = False
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                if connection is not None:
+                    connection.close()
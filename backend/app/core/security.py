@@ -1,13 +1,20 @@
 """
 Security utilities for password hashing and JWT token handling.
 """
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import register_metrics
+
+T = TypeVar("T")
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -40,6 +47,108 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusyError(Exception):
+    """El pool de hashing tiene la cola llena."""
+
+
+class PasswordHasher:
+    """
+    Pool acotado de hilos para bcrypt con API asíncrona.
+
+    bcrypt libera el GIL mientras calcula, así que unos pocos hilos dedicados
+    dan paralelismo real sin ocupar el threadpool compartido de FastAPI ni
+    bloquear el event loop. Cuando hay más trabajos pendientes que
+    ``max_workers + max_queue`` se rechaza con PasswordHasherBusyError
+    (backpressure) en lugar de encolar sin límite.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Ejecutar ``func(*args)`` en el pool y esperar el resultado."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusyError()
+            self._pending += 1
+
+        enqueued_at = time.perf_counter()
+
+        def task() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._active += 1
+                wait = started_at - enqueued_at
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self.completed += 1
+                    self.total_run += time.perf_counter() - started_at
+
+        try:
+            return await asyncio.wrap_future(self._executor.submit(task))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """Métricas de cola y tiempos del pool."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.total_wait / self.completed * 1000, 2) if self.completed else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "avg_run_ms": round(self.total_run / self.completed * 1000, 2) if self.completed else 0.0,
+            }
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+register_metrics("password_hasher", password_hasher.stats)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verificar una contraseña en el pool de hashing sin bloquear el event loop.
+
+    Raises:
+        PasswordHasherBusyError: Si la cola del pool está llena
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hashear una contraseña en el pool de hashing sin bloquear el event loop.
+
+    Raises:
+        PasswordHasherBusyError: Si la cola del pool está llena
+    """
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
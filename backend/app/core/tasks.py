@@ -0,0 +1,27 @@
+"""
+Tareas periódicas de fondo por worker.
+"""
+import asyncio
+import logging
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(task: Callable[[], object], interval_seconds: float) -> None:
+    """
+    Ejecutar ``task`` (síncrona, en el threadpool) al arrancar y luego cada
+    ``interval_seconds``. Cualquier error se registra y se reintenta en la
+    siguiente vuelta (una falla no debe matar la tarea para el resto de la
+    vida del worker); solo la cancelación la termina.
+    """
+    while True:
+        try:
+            await run_in_threadpool(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Falló la tarea periódica %s", task.__name__)
+        await asyncio.sleep(interval_seconds)
@@ -1,10 +1,55 @@
 """
 Main FastAPI application entry point.
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from starlette.datastructures import QueryParams
+
 from app.core.config import settings
+from app.core.middleware import ConditionalGetMiddleware
+from app.core.tasks import run_periodically
+from app.services.movement_partitions import ensure_movement_partitions
+from app.services.stock_checkpoints import create_stock_checkpoint
+from app.services.reservation_expiry import expire_stock_reservations
+from app.services.stock_shards import fold_stock_shards
+from app.services.reference_data import reference_listener
+from app.services.stock_events import stock_event_listener
+from app.services.outbox_relay import get_outbox_sink, relay_inventory_outbox
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Tareas de fondo por worker: se inician al arrancar y se detienen al salir."""
+    if settings.REFERENCE_CACHE_LISTEN:
+        reference_listener.start()
+    if settings.STOCK_EVENTS_ENABLED:
+        stock_event_listener.start()
+    relay_seconds = settings.OUTBOX_RELAY_SECONDS if settings.OUTBOX_SINK != "none" else 0
+    if relay_seconds > 0:
+        # Un OUTBOX_SINK inválido falla al arrancar y no en cada vuelta
+        get_outbox_sink()
+    periodic = {
+        ensure_movement_partitions: settings.INVENTORY_PARTITION_CHECK_SECONDS,
+        create_stock_checkpoint: settings.STOCK_CHECKPOINT_CHECK_SECONDS,
+        expire_stock_reservations: settings.RESERVATION_EXPIRY_CHECK_SECONDS,
+        fold_stock_shards: settings.STOCK_SHARD_FOLD_SECONDS,
+        relay_inventory_outbox: relay_seconds,
+    }
+    tasks = [
+        asyncio.create_task(run_periodically(task, interval))
+        for task, interval in periodic.items()
+        if interval > 0
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    reference_listener.stop()
+    stock_event_listener.stop()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -14,8 +59,30 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
+    lifespan=lifespan,
 )
 
+
+def with_product_counts(*names: str):
+    """Versiones de un listado de referencia; con conteo de productos depende también de products."""
+    def resolve(query: QueryParams) -> tuple[str, ...]:
+        if query.get("with_product_count", "").lower() in ("true", "1"):
+            return (*names, "products")
+        return names
+    return resolve
+
+
+# ETag por versión de datos. Se registra antes que CORS para que las
+# respuestas 304 también lleven los encabezados CORS.
+if settings.ETAG_ENABLED:
+    catalog = ("products", "categories", "suppliers")
+    app.add_middleware(ConditionalGetMiddleware, resources={
+        f"{settings.API_V1_STR}/products": lambda query: catalog,
+        f"{settings.API_V1_STR}/inventory/alerts/low-stock": lambda query: catalog,
+        f"{settings.API_V1_STR}/categories": with_product_counts("categories"),
+        f"{settings.API_V1_STR}/suppliers": with_product_counts("suppliers"),
+    }, async_paths=[f"{settings.API_V1_STR}/products"] if "products" in settings.ASYNC_ROUTERS else [])
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -46,10 +113,23 @@ async def health_check():
 
 
 # Include API routers
-from app.api.v1 import auth, categories, suppliers, products, inventory
+from app.api.v1 import auth, categories, suppliers, products, inventory, sales, reservations, metrics
+from app.api.v1 import async_products, async_inventory, stock_events
+
+# Los routers asíncronos se registran antes que los síncronos con el mismo
+# prefijo, así sus rutas tienen prioridad y el resto sigue siendo síncrono.
+# Exponen el mismo contrato, por eso la documentación es la de los síncronos.
+if "products" in settings.ASYNC_ROUTERS:
+    app.include_router(async_products.router, prefix=f"{settings.API_V1_STR}/products", include_in_schema=False)
+if "inventory" in settings.ASYNC_ROUTERS:
+    app.include_router(async_inventory.router, prefix=f"{settings.API_V1_STR}", include_in_schema=False)
 
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["Autenticación"])
 app.include_router(categories.router, prefix=f"{settings.API_V1_STR}/categories", tags=["Categorías"])
 app.include_router(suppliers.router, prefix=f"{settings.API_V1_STR}/suppliers", tags=["Proveedores"])
 app.include_router(products.router, prefix=f"{settings.API_V1_STR}/products", tags=["Productos"])
 app.include_router(inventory.router, prefix=f"{settings.API_V1_STR}", tags=["Inventario"])
+app.include_router(sales.router, prefix=f"{settings.API_V1_STR}/sales", tags=["Ventas"])
+app.include_router(reservations.router, prefix=f"{settings.API_V1_STR}/reservations", tags=["Reservas"])
+app.include_router(stock_events.router, prefix=f"{settings.API_V1_STR}")
+app.include_router(metrics.router, prefix=f"{settings.API_V1_STR}/metrics", tags=["Métricas"])
@@ -6,6 +6,11 @@ from app.models.category import Category
 from app.models.supplier import Supplier
 from app.models.product import Product
 from app.models.inventory_movement import InventoryMovement, MovementType, MovementReason
+from app.models.inventory_stats import InventoryStatsSnapshot, MovementDailyCount, StockCheckpoint
+from app.models.stock_reservation import StockReservation, StockReservationItem, ReservedStock
+from app.models.stock_shard import StockShard
+from app.models.data_version import DataVersion
+from app.models.inventory_outbox import InventoryOutboxEvent
 
 __all__ = [
     "User", 
@@ -14,5 +19,14 @@ __all__ = [
     "Product", 
     "InventoryMovement",
     "MovementType",
-    "MovementReason"
+    "MovementReason",
+    "InventoryStatsSnapshot",
+    "MovementDailyCount",
+    "StockCheckpoint",
+    "StockReservation",
+    "StockReservationItem",
+    "ReservedStock",
+    "StockShard",
+    "DataVersion",
+    "InventoryOutboxEvent",
 ]
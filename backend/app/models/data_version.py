@@ -0,0 +1,29 @@
+"""
+Modelo de las versiones de datos mantenidas por triggers.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, SmallInteger, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class DataVersion(Base):
+    """
+    Contador de cambios de una tabla, repartido en slots.
+
+    La versión de un nombre es la suma de sus slots. Categorías y
+    proveedores usan solo el slot 0 (``bump_data_version``, que además
+    publica ``NOTIFY data_versions, 'nombre:versión'``); products reparte
+    por ``product_id % 16`` para no serializar sus escrituras.
+    Sirve para invalidar cachés y armar ETags sin consultar la tabla.
+    """
+
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    slot = Column(SmallInteger, primary_key=True, default=0)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<DataVersion {self.name}[{self.slot}]={self.version}>"
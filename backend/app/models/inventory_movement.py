@@ -1,7 +1,8 @@
 """
 Modelo de base de datos para movimientos de inventario.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, CheckConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, CheckConstraint, Index, text
+from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -43,33 +44,51 @@ class InventoryMovement(Base):
     __tablename__ = "inventory_movements"
     __table_args__ = (
         CheckConstraint("quantity > 0", name="check_quantity_positive"),
+        # Paginación por cursor: ORDER BY created_at DESC, id DESC
+        Index("ix_inventory_movements_created_at_id", "created_at", "id"),
+        # Historial de un producto: ORDER BY created_at DESC por partición
+        Index("ix_inventory_movements_product_id_created_at", "product_id", "created_at"),
+        # Movimientos de productos repartidos pendientes de plegar
+        Index(
+            "ix_inventory_movements_unfolded",
+            "product_id",
+            "id",
+            postgresql_where=text("stock_after IS NULL"),
+        ),
+        # Particionada por mes de created_at (una partición por mes, más una
+        # por defecto); las particiones se crean con create_inventory_movement_partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    # La clave primaria incluye created_at, la clave de partición
+    id = Column(Integer, primary_key=True, autoincrement=True)
     
     # Relación con producto
     product_id = Column(
         Integer, 
         ForeignKey("products.id", ondelete="RESTRICT"), 
-        nullable=False,
-        index=True
+        nullable=False
     )
     
-    # Tipo y razón del movimiento (usamos String para compatibilidad con enum PostgreSQL en minúsculas)
+    # Tipo y razón del movimiento: enums PostgreSQL con valores en minúsculas,
+    # mapeados como strings. Declarar el tipo real evita que asyncpg envíe los
+    # parámetros como VARCHAR.
     movement_type = Column(
-        String(20),
+        ENUM(*[t.value for t in MovementType], name="movement_type_enum", create_type=False),
         nullable=False,
         index=True
     )
     reason = Column(
-        String(30),
+        ENUM(*[r.value for r in MovementReason], name="movement_reason_enum", create_type=False),
         nullable=False
     )
     
     # Cantidades
     quantity = Column(Integer, nullable=False)  # Siempre positivo
-    stock_before = Column(Integer, nullable=False)  # Stock antes del movimiento
-    stock_after = Column(Integer, nullable=False)   # Stock después del movimiento
+    # Stock antes/después del movimiento. En productos con stock repartido
+    # (Product.stock_shards) quedan NULL hasta que fold_stock_shards los completa.
+    stock_before = Column(Integer, nullable=True)
+    stock_after = Column(Integer, nullable=True)
     
     # Referencia externa (número de factura, orden de compra, etc.)
     reference = Column(String(100), nullable=True, index=True)
@@ -85,8 +104,11 @@ class InventoryMovement(Base):
         index=True
     )
     
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Timestamps. En la base la columna es timestamp sin zona (migración
+    # c7d8e9f0a1b2): guarda now() en la zona de la sesión que insertó. Las
+    # consultas que la comparan con instantes con zona (stock histórico,
+    # conteo diario) la leen en la zona de la sesión, la misma.
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True)
 
     # Relaciones ORM
     product = relationship("Product", backref="inventory_movements")
@@ -0,0 +1,33 @@
+"""
+Modelo del outbox de eventos de inventario.
+
+El trigger de la migración ``c5d6e7f8a9b0`` agrega una fila
+``movement_created`` por cada movimiento insertado, en la misma
+transacción. En un producto repartido ese evento lleva el stock
+antes/después en NULL; el plegado agrega luego un ``movement_folded`` con
+los valores definitivos (migración ``d6e7f8a9b0c1``). Ambos escriben solo
+desde conexiones con un destino configurado (``inventory.outbox``, ver
+``session_settings``). La aplicación solo lee las filas y las borra al
+entregarlas (ver ``relay_inventory_outbox``).
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class InventoryOutboxEvent(Base):
+    """Evento pendiente de entregar a los consumidores externos."""
+
+    __tablename__ = "inventory_outbox"
+
+    id = Column(BigInteger, Identity(always=True), primary_key=True)
+    event_type = Column(String(50), nullable=False)
+    product_id = Column(Integer, nullable=False)
+    movement_id = Column(Integer, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<InventoryOutboxEvent {self.id} {self.event_type} movement={self.movement_id}>"
@@ -0,0 +1,59 @@
+"""
+Modelos de las tablas de estadísticas de inventario.
+
+Los triggers de la migración ``f6a7b8c9d0e1`` actualizan el snapshot y los
+conteos diarios de forma incremental en la misma transacción que modifica
+``products`` o inserta en ``inventory_movements``; la aplicación solo los
+lee. Los checkpoints de stock los escribe una tarea de fondo.
+"""
+from sqlalchemy import Column, ForeignKey, Integer, SmallInteger, Date, DateTime, Numeric
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+# Cantidad de filas (slots) por las que se reparten los contadores.
+# Cada producto aporta siempre al slot ``product_id % STATS_SLOTS`` para que
+# escrituras concurrentes sobre productos distintos no compitan por la misma fila.
+STATS_SLOTS = 16
+
+
+class InventoryStatsSnapshot(Base):
+    """Agregados de productos activos, repartidos por slot (sumar todas las filas)."""
+
+    __tablename__ = "inventory_stats_snapshot"
+
+    slot = Column(SmallInteger, primary_key=True, autoincrement=False)
+    total_products = Column(Integer, nullable=False, default=0)
+    total_stock_value = Column(Numeric(18, 2), nullable=False, default=0)
+    low_stock_count = Column(Integer, nullable=False, default=0)
+    out_of_stock_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<InventoryStatsSnapshot slot={self.slot}>"
+
+
+class MovementDailyCount(Base):
+    """Cantidad de movimientos por día y slot."""
+
+    __tablename__ = "inventory_movement_daily_counts"
+
+    day = Column(Date, primary_key=True)
+    slot = Column(SmallInteger, primary_key=True, autoincrement=False)
+    movements = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<MovementDailyCount {self.day} slot={self.slot}>"
+
+
+class StockCheckpoint(Base):
+    """Stock de un producto al cierre de un día (checkpoint para consultas históricas)."""
+
+    __tablename__ = "inventory_stock_checkpoints"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    stock = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<StockCheckpoint {self.day} product={self.product_id}>"
@@ -1,12 +1,25 @@
 """
 Modelo de base de datos para productos del inventario.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, CheckConstraint
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, Text, DateTime, Boolean, Numeric, ForeignKey, CheckConstraint,
+    Computed, Index, text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
 from app.core.database import Base
 
+# Documento de búsqueda: SKU y nombre pesan más que la descripción.
+# Se usa la configuración 'simple' (sin stemming) para que las búsquedas
+# por prefijo desde el selector de productos coincidan con lo escrito.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(sku, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'D')"
+)
+
 
 class Product(Base):
     """Modelo de producto del inventario."""
@@ -17,6 +30,23 @@ class Product(Base):
         CheckConstraint("stock_min >= 0", name="check_stock_min_positive"),
         CheckConstraint("cost >= 0", name="check_cost_positive"),
         CheckConstraint("price >= 0", name="check_price_positive"),
+        # Búsqueda: texto completo + trigramas (también sirven los ILIKE '%term%')
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_products_sku_trgm", "sku", postgresql_using="gin", postgresql_ops={"sku": "gin_trgm_ops"}),
+        Index(
+            "ix_products_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        # Bajo stock: índice parcial sobre el déficit, solo contiene los productos afectados
+        Index(
+            "ix_products_low_stock",
+            text("deficit DESC"),
+            "id",
+            postgresql_where=text("deficit > 0"),
+        ),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -31,6 +61,11 @@ class Product(Base):
     # Stock
     stock_current = Column(Integer, default=0, nullable=False)
     stock_min = Column(Integer, default=0, nullable=False)
+    # Unidades que faltan para el mínimo (> 0 significa bajo stock); la mantiene Postgres
+    deficit = Column(Integer, Computed("stock_min - stock_current", persisted=True))
+    # Modo alta concurrencia: con N > 0 el stock se reparte en N filas de
+    # product_stock_shards y stock_current es el total al último plegado
+    stock_shards = Column(SmallInteger, nullable=False, default=0, server_default="0")
 
     # Precios (Decimal para precisión monetaria)
     cost = Column(Numeric(10, 2), nullable=False)  # Costo de adquisición
@@ -40,6 +75,9 @@ class Product(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Columna generada para búsqueda de texto completo (no se carga por defecto)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
+
     # Relaciones ORM
     category = relationship("Category", back_populates="products")
     supplier = relationship("Supplier", back_populates="products")
@@ -0,0 +1,70 @@
+"""
+Modelos de reservas de stock (carritos y pedidos pendientes).
+
+Una reserva retiene unidades de varios productos hasta que se confirma
+(se convierte en venta), se libera o vence. ``product_stock_reserved`` lleva
+el total reservado por producto: lo mantiene un trigger de la migración
+``f2a3b4c5d6e7`` sobre ``stock_reservation_items``, así que la aplicación
+solo lo lee.
+"""
+from sqlalchemy import Column, ForeignKey, Integer, String, Text, DateTime, CheckConstraint, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class StockReservation(Base):
+    """Reserva de stock con vencimiento."""
+
+    __tablename__ = "stock_reservations"
+    __table_args__ = (
+        # El barrido de vencidas recorre este índice en orden
+        Index("ix_stock_reservations_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    reference = Column(String(100), nullable=True)
+    notes = Column(Text, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    items = relationship(
+        "StockReservationItem",
+        order_by="StockReservationItem.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def __repr__(self):
+        return f"<StockReservation {self.id} - vence {self.expires_at}>"
+
+
+class StockReservationItem(Base):
+    """Línea de una reserva (un producto, sus unidades reservadas)."""
+
+    __tablename__ = "stock_reservation_items"
+    __table_args__ = (
+        CheckConstraint("quantity > 0", name="check_reservation_quantity_positive"),
+        Index("ix_stock_reservation_items_product_id", "product_id"),
+    )
+
+    reservation_id = Column(
+        Integer, ForeignKey("stock_reservations.id", ondelete="CASCADE"), primary_key=True
+    )
+    position = Column(Integer, primary_key=True, autoincrement=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="RESTRICT"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+
+
+class ReservedStock(Base):
+    """Unidades reservadas de un producto (suma de las reservas vigentes)."""
+
+    __tablename__ = "product_stock_reserved"
+    __table_args__ = (
+        CheckConstraint("reserved >= 0", name="check_reserved_positive"),
+    )
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    reserved = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,28 @@
+"""
+Modelo del stock repartido de productos de alta concurrencia.
+
+Con ``Product.stock_shards = N`` el stock del producto vive en N filas
+(slots): cada escritor descuenta de un slot libre en lugar de esperar el
+bloqueo de la única fila de ``products``. Las funciones
+``apply_stock_shard_delta`` y ``fold_stock_shards`` de la migración
+``a3b4c5d6e7f8`` aplican los deltas y pliegan el total en ``stock_current``.
+"""
+from sqlalchemy import Column, ForeignKey, Integer, SmallInteger, CheckConstraint
+
+from app.core.database import Base
+
+
+class StockShard(Base):
+    """Parte del stock de un producto repartido (el total es la suma de sus slots)."""
+
+    __tablename__ = "product_stock_shards"
+    __table_args__ = (
+        CheckConstraint("stock >= 0", name="check_shard_stock_positive"),
+    )
+
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, autoincrement=False)
+    stock = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<StockShard producto={self.product_id} slot={self.shard} stock={self.stock}>"
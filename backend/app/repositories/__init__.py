@@ -5,12 +5,32 @@ from app.repositories.user_repository import UserRepository
 from app.repositories.category_repository import CategoryRepository
 from app.repositories.supplier_repository import SupplierRepository
 from app.repositories.product_repository import ProductRepository
+from app.repositories.product_import_repository import ProductImportRepository
 from app.repositories.inventory_repository import InventoryMovementRepository
+from app.repositories.inventory_stats_repository import InventoryStatsRepository
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+from app.repositories.reservation_repository import StockReservationRepository
+from app.repositories.stock_shard_repository import StockShardRepository
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.outbox_repository import InventoryOutboxRepository
+from app.repositories.async_product_repository import AsyncProductRepository
+from app.repositories.async_inventory_repository import AsyncInventoryMovementRepository
+from app.repositories.async_data_version_repository import AsyncDataVersionRepository
 
 __all__ = [
     "UserRepository",
     "CategoryRepository",
     "SupplierRepository",
     "ProductRepository",
+    "ProductImportRepository",
     "InventoryMovementRepository",
+    "InventoryStatsRepository",
+    "StockCheckpointRepository",
+    "StockReservationRepository",
+    "StockShardRepository",
+    "DataVersionRepository",
+    "InventoryOutboxRepository",
+    "AsyncProductRepository",
+    "AsyncInventoryMovementRepository",
+    "AsyncDataVersionRepository",
 ]
@@ -0,0 +1,22 @@
+"""
+Repositorio asíncrono de versiones de datos (AsyncSession + asyncpg).
+"""
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.data_version_repository import versions_query
+
+
+class AsyncDataVersionRepository:
+    """Lectura asíncrona de los contadores de cambios (ver DataVersionRepository)."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_versions(self, names: Iterable[str]) -> dict[str, int]:
+        """Versiones de varios nombres (suma de sus slots) en una sola consulta."""
+        names = list(names)
+        versions = {name: 0 for name in names}
+        versions.update({name: version for name, version in await self.db.execute(versions_query(names))})
+        return versions
@@ -0,0 +1,123 @@
+"""
+Repositorio asíncrono para movimientos de inventario (AsyncSession + asyncpg).
+"""
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.inventory_movement import InventoryMovement, MovementType, MovementReason
+from app.repositories.inventory_repository import keyset_before, movement_filters
+from app.schemas.inventory import InventoryMovementFilter
+from app.utils.pagination import estimate_count_async
+
+
+class AsyncInventoryMovementRepository:
+    """Repositorio asíncrono para movimientos de inventario."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, movement_id: int) -> Optional[InventoryMovement]:
+        """Obtener movimiento por ID con relaciones."""
+        query = self._with_relations(
+            select(InventoryMovement).where(InventoryMovement.id == movement_id)
+        )
+        return (await self.db.execute(query)).scalars().first()
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        filters: Optional[InventoryMovementFilter] = None
+    ) -> tuple[List[InventoryMovement], int]:
+        """
+        Obtener todos los movimientos con filtros y paginación.
+        Retorna (lista de movimientos, total).
+        """
+        total = await self.count(filters)
+        query = (
+            self._with_relations(select(InventoryMovement).filter(*movement_filters(filters)))
+            .order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list((await self.db.execute(query)).scalars()), total
+
+    async def get_page_after(
+        self,
+        limit: int = 20,
+        filters: Optional[InventoryMovementFilter] = None,
+        after: Optional[tuple[datetime, int]] = None
+    ) -> List[InventoryMovement]:
+        """Obtener una página por keyset sobre (created_at, id) descendente (``limit + 1`` filas)."""
+        query = select(InventoryMovement).filter(*movement_filters(filters))
+        if after is not None:
+            query = query.where(*keyset_before(after))
+        query = (
+            self._with_relations(query)
+            .order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
+            .limit(limit + 1)
+        )
+        return list((await self.db.execute(query)).scalars())
+
+    async def count(self, filters: Optional[InventoryMovementFilter] = None) -> int:
+        """Contar exactamente los movimientos que cumplen los filtros."""
+        query = select(func.count(InventoryMovement.id)).filter(*movement_filters(filters))
+        return (await self.db.execute(query)).scalar() or 0
+
+    async def estimate_count(self, filters: Optional[InventoryMovementFilter] = None) -> int:
+        """Estimar el total de movimientos con EXPLAIN (costo constante)."""
+        query = select(InventoryMovement.id).filter(*movement_filters(filters))
+        return await estimate_count_async(self.db, query)
+
+    async def get_by_product(
+        self,
+        product_id: int,
+        limit: int = 50
+    ) -> List[InventoryMovement]:
+        """Obtener los últimos movimientos de un producto."""
+        query = (
+            self._with_relations(
+                select(InventoryMovement).where(InventoryMovement.product_id == product_id)
+            )
+            .order_by(InventoryMovement.created_at.desc())
+            .limit(limit)
+        )
+        return list((await self.db.execute(query)).scalars())
+
+    async def add(
+        self,
+        product_id: int,
+        movement_type: MovementType,
+        reason: MovementReason,
+        quantity: int,
+        stock_before: Optional[int],
+        stock_after: Optional[int],
+        user_id: Optional[int] = None,
+        reference: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> InventoryMovement:
+        """Insertar un movimiento dentro de la transacción actual (sin commit)."""
+        movement = InventoryMovement(
+            product_id=product_id,
+            movement_type=movement_type.value,
+            reason=reason.value,
+            quantity=quantity,
+            stock_before=stock_before,
+            stock_after=stock_after,
+            user_id=user_id,
+            reference=reference,
+            notes=notes
+        )
+        self.db.add(movement)
+        await self.db.flush()
+        return movement
+
+    def _with_relations(self, query: Select) -> Select:
+        """Cargar producto y usuario en la misma consulta."""
+        return query.options(
+            joinedload(InventoryMovement.product),
+            joinedload(InventoryMovement.user)
+        )
@@ -0,0 +1,188 @@
+"""
+Repository asíncrono para lectura de productos (AsyncSession + asyncpg).
+"""
+from typing import Optional
+from decimal import Decimal
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.product import Product
+from app.models.stock_reservation import ReservedStock
+from app.models.stock_shard import StockShard
+from app.repositories.product_repository import (
+    product_filters,
+    product_page_query,
+    product_rows_query,
+    product_search_query,
+)
+from app.repositories.stock_shard_repository import LOCK_AND_APPLY_SHARD_DELTA
+from app.utils.pagination import estimate_count_async
+
+
+class AsyncProductRepository:
+    """
+    Repository asíncrono de productos.
+
+    En async no hay carga perezosa: toda relación que se vaya a serializar
+    se carga explícitamente en la misma consulta.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, product_id: int, with_relations: bool = False) -> Optional[Product]:
+        """Obtener producto por ID."""
+        query = select(Product).where(Product.id == product_id)
+        if with_relations:
+            query = query.options(
+                joinedload(Product.category),
+                joinedload(Product.supplier)
+            )
+        return (await self.db.execute(query)).scalars().first()
+
+    async def get_by_sku(self, sku: str) -> Optional[Product]:
+        """Obtener producto por SKU."""
+        result = await self.db.execute(select(Product).where(Product.sku == sku.upper()))
+        return result.scalars().first()
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        category_id: Optional[int] = None,
+        supplier_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        low_stock_only: bool = False,
+        search: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        with_relations: bool = False
+    ) -> list[Product]:
+        """Obtener todos los productos con filtros y paginación."""
+        query = select(Product).filter(*product_filters(
+            category_id=category_id,
+            supplier_id=supplier_id,
+            is_active=is_active,
+            low_stock_only=low_stock_only,
+            search=search,
+            min_price=min_price,
+            max_price=max_price,
+        ))
+        if with_relations:
+            query = query.options(
+                joinedload(Product.category),
+                joinedload(Product.supplier)
+            )
+        query = query.order_by(Product.name).offset(skip).limit(limit)
+        return list((await self.db.execute(query)).scalars())
+
+    async def count(
+        self,
+        category_id: Optional[int] = None,
+        supplier_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        low_stock_only: bool = False,
+        search: Optional[str] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None
+    ) -> int:
+        """Contar productos con filtros."""
+        query = select(func.count(Product.id)).filter(*product_filters(
+            category_id=category_id,
+            supplier_id=supplier_id,
+            is_active=is_active,
+            low_stock_only=low_stock_only,
+            search=search,
+            min_price=min_price,
+            max_price=max_price,
+        ))
+        return (await self.db.execute(query)).scalar_one()
+
+    async def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        include_total: bool = True,
+        **filters
+    ) -> tuple[list[Product], Optional[int]]:
+        """Página de productos y total con COUNT(*) OVER () (ver ``ProductRepository.get_page``)."""
+        rows = (await self.db.execute(product_page_query(skip, limit, include_total, **filters))).all()
+        products = [row.Product for row in rows]
+        if not include_total:
+            return products, None
+        if rows:
+            return products, rows[0].total
+        return products, (await self.count(**filters) if skip else 0)
+
+    async def get_page_rows(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        include_total: bool = True,
+        **filters
+    ) -> tuple[list[Row], Optional[int]]:
+        """Página como proyección plana de columnas (ver ``ProductRepository.get_page_rows``)."""
+        rows = (await self.db.execute(product_rows_query(skip, limit, include_total, **filters))).all()
+        if not include_total:
+            return rows, None
+        if rows:
+            return rows, rows[0].total
+        return rows, (await self.count(**filters) if skip else 0)
+
+    async def estimate_total(self, **filters) -> int:
+        """Estimar (EXPLAIN) cuántos productos cumplen los filtros."""
+        return await estimate_count_async(self.db, select(Product.id).where(*product_filters(**filters)))
+
+    async def search(self, term: str, limit: int = 10, only_active: bool = True) -> list[Row]:
+        """Búsqueda rankeada por relevancia (ver ``product_search_query``)."""
+        query = product_search_query(term, limit, only_active)
+        if query is None:
+            return []
+        return list(await self.db.execute(query))
+
+    async def apply_stock_delta(self, product_id: int, delta: int) -> Optional[Row]:
+        """
+        Aplicar un delta al stock con un único UPDATE condicional (sin commit).
+
+        Returns:
+            Fila (stock_current, sku, name) o None si el producto no existe,
+            el stock es insuficiente o está repartido.
+        """
+        stmt = (
+            update(Product)
+            .where(Product.id == product_id)
+            .where(Product.stock_shards == 0)
+            .where(Product.stock_current + delta >= 0)
+            .values(stock_current=Product.stock_current + delta)
+            .returning(Product.stock_current, Product.sku, Product.name)
+            .execution_options(synchronize_session=False)
+        )
+        return (await self.db.execute(stmt)).first()
+
+    async def get_reserved(self, product_id: int) -> int:
+        """Unidades reservadas de un producto (ver StockReservationRepository.get_reserved)."""
+        stmt = select(ReservedStock.reserved).where(ReservedStock.product_id == product_id)
+        return (await self.db.execute(stmt)).scalar() or 0
+
+    async def lock_and_apply_shard_delta(self, product_id: int, delta: int) -> Optional[Row]:
+        """Bloquear un producto repartido y sumarle un delta (ver StockShardRepository.lock_and_apply)."""
+        params = {"product_id": product_id, "delta": delta}
+        return (await self.db.execute(LOCK_AND_APPLY_SHARD_DELTA, params)).first()
+
+    async def get_shard_total(self, product_id: int) -> int:
+        """Stock total (suma de slots) de un producto repartido."""
+        stmt = select(func.coalesce(func.sum(StockShard.stock), 0)).where(StockShard.product_id == product_id)
+        return int((await self.db.execute(stmt)).scalar())
+
+    async def get_low_stock_products(self, limit: int = 50) -> list[Product]:
+        """Obtener productos con stock bajo."""
+        query = (
+            select(Product)
+            .options(joinedload(Product.category), joinedload(Product.supplier))
+            .where(Product.is_active)
+            .where(Product.deficit > 0)
+            .order_by(Product.stock_current)
+            .limit(limit)
+        )
+        return list((await self.db.execute(query)).scalars())
@@ -1,7 +1,7 @@
 """
 Repository para acceso a datos de categorías.
 """
-from typing import Optional
+from typing import Iterable, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
@@ -19,6 +19,13 @@ class CategoryRepository:
         """Obtener categoría por ID."""
         return self.db.query(Category).filter(Category.id == category_id).first()
 
+    def get_existing_ids(self, category_ids: Iterable[int]) -> set[int]:
+        """Ids de ``category_ids`` que existen, en una sola consulta."""
+        ids = list(set(category_ids))
+        if not ids:
+            return set()
+        return {row.id for row in self.db.query(Category.id).filter(Category.id.in_(ids))}
+
     def get_by_name(self, name: str) -> Optional[Category]:
         """Obtener categoría por nombre."""
         return self.db.query(Category).filter(Category.name == name).first()
@@ -27,6 +34,10 @@ class CategoryRepository:
         """Obtener todas las categorías con paginación."""
         return self.db.query(Category).order_by(Category.name).offset(skip).limit(limit).all()
 
+    def get_all_unpaginated(self) -> list[Category]:
+        """Obtener todas las categorías ordenadas por nombre (para la caché de referencia)."""
+        return self.db.query(Category).order_by(Category.name, Category.id).all()
+
     def get_all_with_product_count(self, skip: int = 0, limit: int = 100) -> list[tuple[Category, int]]:
         """Obtener categorías con conteo de productos."""
         return (
@@ -0,0 +1,37 @@
+"""
+Repositorio de versiones de datos (tabla data_versions).
+"""
+from typing import Iterable
+
+from sqlalchemy import BigInteger, Select, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models.data_version import DataVersion
+
+
+def versions_query(names: Iterable[str]) -> Select:
+    """Versión (suma de slots) de cada nombre con filas en data_versions."""
+    return (
+        select(DataVersion.name, cast(func.sum(DataVersion.version), BigInteger))
+        .where(DataVersion.name.in_(list(names)))
+        .group_by(DataVersion.name)
+    )
+
+
+class DataVersionRepository:
+    """Lectura de los contadores de cambios que mantienen los triggers."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_version(self, name: str) -> int:
+        """Versión actual de ``name`` (0 si todavía no tiene filas)."""
+        return self.get_versions([name])[name]
+
+    def get_versions(self, names: Iterable[str]) -> dict[str, int]:
+        """Versiones de varios nombres (suma de sus slots) en una sola consulta."""
+        names = list(names)
+        rows = self.db.execute(versions_query(names))
+        versions = {name: 0 for name in names}
+        versions.update({name: version for name, version in rows})
+        return versions
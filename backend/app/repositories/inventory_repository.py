@@ -1,14 +1,16 @@
 """
 Repositorio para operaciones CRUD de movimientos de inventario.
 """
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Query, Session, joinedload
+from sqlalchemy import ColumnElement, Row, Select, func, and_, or_, insert, select, text, tuple_
 
 from app.models.inventory_movement import InventoryMovement, MovementType, MovementReason
 from app.models.product import Product
+from app.models.user import User
 from app.schemas.inventory import InventoryMovementFilter
+from app.utils.pagination import estimate_count
 
 
 class InventoryMovementRepository:
@@ -39,38 +41,12 @@ class InventoryMovementRepository:
         Obtener todos los movimientos con filtros y paginación.
         Retorna (lista de movimientos, total).
         """
-        query = (
-            self.db.query(InventoryMovement)
-            .options(
-                joinedload(InventoryMovement.product),
-                joinedload(InventoryMovement.user)
-            )
-        )
-
-        # Aplicar filtros
-        if filters:
-            if filters.product_id:
-                query = query.filter(InventoryMovement.product_id == filters.product_id)
-            if filters.movement_type:
-                query = query.filter(InventoryMovement.movement_type == filters.movement_type)
-            if filters.reason:
-                query = query.filter(InventoryMovement.reason == filters.reason)
-            if filters.user_id:
-                query = query.filter(InventoryMovement.user_id == filters.user_id)
-            if filters.reference:
-                query = query.filter(InventoryMovement.reference.ilike(f"%{filters.reference}%"))
-            if filters.date_from:
-                query = query.filter(InventoryMovement.created_at >= filters.date_from)
-            if filters.date_to:
-                query = query.filter(InventoryMovement.created_at <= filters.date_to)
-
-        # Contar total
-        total = query.count()
+        total = self.count(filters)
 
         # Ordenar por fecha descendente y paginar
         movements = (
-            query
-            .order_by(InventoryMovement.created_at.desc())
+            self._with_relations(self.db.query(InventoryMovement).filter(*movement_filters(filters)))
+            .order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
             .offset(skip)
             .limit(limit)
             .all()
@@ -78,6 +54,63 @@ class InventoryMovementRepository:
 
         return movements, total
 
+    def get_page_after(
+        self,
+        limit: int = 20,
+        filters: Optional[InventoryMovementFilter] = None,
+        after: Optional[tuple[datetime, int]] = None
+    ) -> List[InventoryMovement]:
+        """
+        Obtener una página por keyset sobre (created_at, id) descendente.
+
+        Usa el índice compuesto (created_at, id), por lo que el costo no
+        depende de la profundidad. Trae ``limit + 1`` filas para que el
+        llamador sepa si hay más páginas.
+        """
+        query = self.db.query(InventoryMovement).filter(*movement_filters(filters))
+        if after is not None:
+            query = query.filter(*keyset_before(after))
+        return (
+            self._with_relations(query)
+            .order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+    def count(self, filters: Optional[InventoryMovementFilter] = None) -> int:
+        """Contar exactamente los movimientos que cumplen los filtros."""
+        query = self.db.query(func.count(InventoryMovement.id)).filter(*movement_filters(filters))
+        return query.scalar() or 0
+
+    def estimate_count(self, filters: Optional[InventoryMovementFilter] = None) -> int:
+        """
+        Estimar el total de movimientos con el planificador de PostgreSQL.
+
+        Ejecuta EXPLAIN sobre la consulta filtrada en lugar de contarla, por
+        lo que el costo es constante aunque la tabla tenga millones de filas.
+        """
+        query = self.db.query(InventoryMovement.id).filter(*movement_filters(filters))
+        return estimate_count(self.db, query.statement)
+
+    def iter_export_batches(
+        self,
+        filters: Optional[InventoryMovementFilter] = None,
+        batch_size: int = 2000
+    ) -> Iterator[Sequence[Row]]:
+        """
+        Recorrer los movimientos filtrados en lotes de ``batch_size`` filas.
+
+        ``yield_per`` abre un cursor del lado del servidor: solo un lote vive
+        en memoria a la vez, sin importar cuántas filas cumplan los filtros.
+        """
+        result = self.db.execute(
+            movement_export_query(filters).execution_options(yield_per=batch_size)
+        )
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
     def get_by_product(
         self,
         product_id: int,
@@ -99,8 +132,8 @@ class InventoryMovementRepository:
         movement_type: MovementType,
         reason: MovementReason,
         quantity: int,
-        stock_before: int,
-        stock_after: int,
+        stock_before: Optional[int],
+        stock_after: Optional[int],
         user_id: Optional[int] = None,
         reference: Optional[str] = None,
         notes: Optional[str] = None
@@ -122,6 +155,81 @@ class InventoryMovementRepository:
         self.db.refresh(movement)
         return movement
 
+    def add(
+        self,
+        product_id: int,
+        movement_type: MovementType,
+        reason: MovementReason,
+        quantity: int,
+        stock_before: Optional[int],
+        stock_after: Optional[int],
+        user_id: Optional[int] = None,
+        reference: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> InventoryMovement:
+        """
+        Insertar un movimiento dentro de la transacción actual (sin commit).
+        created_at es parte de la clave primaria (la clave de partición):
+        el INSERT la devuelve con el id en el mismo round trip.
+        """
+        movement = InventoryMovement(
+            product_id=product_id,
+            movement_type=movement_type.value,
+            reason=reason.value,
+            quantity=quantity,
+            stock_before=stock_before,
+            stock_after=stock_after,
+            user_id=user_id,
+            reference=reference,
+            notes=notes
+        )
+        self.db.add(movement)
+        self.db.flush()
+        return movement
+
+    def bulk_add(self, rows: List[dict]) -> List[tuple[int, datetime]]:
+        """
+        Insertar muchos movimientos con INSERT multi-fila (sin commit).
+
+        Cada dict debe traer las columnas de InventoryMovement; movement_type y
+        reason ya como string. Retorna las claves (id, created_at) en el mismo
+        orden de ``rows``.
+        """
+        if not rows:
+            return []
+        result = self.db.execute(
+            insert(InventoryMovement).returning(
+                InventoryMovement.id, InventoryMovement.created_at, sort_by_parameter_order=True
+            ),
+            rows
+        )
+        # RETURNING no garantiza orden: SQLAlchemy lo correlaciona con ``rows``
+        return [tuple(row) for row in result]
+
+    def get_by_keys(self, keys: List[tuple[int, datetime]]) -> List[InventoryMovement]:
+        """
+        Obtener varios movimientos con relaciones, en el orden de ``keys``.
+
+        Filtrar también por created_at permite descartar las particiones de
+        otros meses; sin él se consultaría el índice de cada partición.
+        """
+        if not keys:
+            return []
+        movements = (
+            self.db.query(InventoryMovement)
+            .options(
+                joinedload(InventoryMovement.product),
+                joinedload(InventoryMovement.user)
+            )
+            .filter(
+                InventoryMovement.created_at.in_({created_at for _, created_at in keys}),
+                InventoryMovement.id.in_([movement_id for movement_id, _ in keys])
+            )
+            .all()
+        )
+        by_id = {m.id: m for m in movements}
+        return [by_id[movement_id] for movement_id, _ in keys if movement_id in by_id]
+
     def count_by_period(
         self,
         start_date: datetime,
@@ -153,6 +261,16 @@ class InventoryMovementRepository:
         start_of_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         return self.count_by_period(start_of_month)
 
+    def create_partitions(self, months_ahead: int) -> int:
+        """
+        Crear las particiones mensuales que falten hasta ``months_ahead``
+        meses adelante (sin commit). Retorna cuántas se crearon.
+        """
+        return self.db.execute(
+            text("SELECT create_inventory_movement_partitions(:months_ahead)"),
+            {"months_ahead": months_ahead}
+        ).scalar_one()
+
     def get_last_movement(self, product_id: int) -> Optional[InventoryMovement]:
         """Obtener el último movimiento de un producto."""
         return (
@@ -161,3 +279,97 @@ class InventoryMovementRepository:
             .order_by(InventoryMovement.created_at.desc())
             .first()
         )
+
+    def _with_relations(self, query: Query) -> Query:
+        """Cargar producto y usuario en la misma consulta."""
+        return query.options(
+            joinedload(InventoryMovement.product),
+            joinedload(InventoryMovement.user)
+        )
+
+
+EXPORT_COLUMNS = (
+    "id",
+    "created_at",
+    "product_id",
+    "product_sku",
+    "product_name",
+    "movement_type",
+    "reason",
+    "quantity",
+    "stock_before",
+    "stock_after",
+    "reference",
+    "notes",
+    "user_id",
+    "user_email",
+)
+
+
+def movement_export_query(filters: Optional[InventoryMovementFilter]) -> Select:
+    """
+    Proyección plana para exportar movimientos, en orden cronológico.
+
+    Solo columnas (sin entidades ORM), con las etiquetas de ``EXPORT_COLUMNS``.
+    """
+    return (
+        select(
+            InventoryMovement.id,
+            InventoryMovement.created_at,
+            InventoryMovement.product_id,
+            Product.sku.label("product_sku"),
+            Product.name.label("product_name"),
+            InventoryMovement.movement_type,
+            InventoryMovement.reason,
+            InventoryMovement.quantity,
+            InventoryMovement.stock_before,
+            InventoryMovement.stock_after,
+            InventoryMovement.reference,
+            InventoryMovement.notes,
+            InventoryMovement.user_id,
+            User.email.label("user_email"),
+        )
+        .join(Product, Product.id == InventoryMovement.product_id)
+        .outerjoin(User, User.id == InventoryMovement.user_id)
+        .where(*movement_filters(filters))
+        .order_by(InventoryMovement.created_at, InventoryMovement.id)
+    )
+
+
+def keyset_before(after: tuple[datetime, int]) -> List[ColumnElement[bool]]:
+    """
+    Condición de keyset (created_at, id) < ``after``.
+
+    PostgreSQL no poda particiones a partir de la comparación de tuplas, así
+    que se agrega ``created_at <= after[0]``, equivalente pero podable.
+    """
+    return [
+        InventoryMovement.created_at <= after[0],
+        tuple_(InventoryMovement.created_at, InventoryMovement.id) < tuple_(*after),
+    ]
+
+
+def movement_filters(filters: Optional[InventoryMovementFilter]) -> List[ColumnElement[bool]]:
+    """
+    Construir las condiciones de búsqueda de movimientos.
+
+    Compartido por los repositorios síncrono y asíncrono.
+    """
+    conditions: List[ColumnElement[bool]] = []
+    if not filters:
+        return conditions
+    if filters.product_id:
+        conditions.append(InventoryMovement.product_id == filters.product_id)
+    if filters.movement_type:
+        conditions.append(InventoryMovement.movement_type == filters.movement_type)
+    if filters.reason:
+        conditions.append(InventoryMovement.reason == filters.reason)
+    if filters.user_id:
+        conditions.append(InventoryMovement.user_id == filters.user_id)
+    if filters.reference:
+        conditions.append(InventoryMovement.reference.ilike(f"%{filters.reference}%"))
+    if filters.date_from:
+        conditions.append(InventoryMovement.created_at >= filters.date_from)
+    if filters.date_to:
+        conditions.append(InventoryMovement.created_at <= filters.date_to)
+    return conditions
@@ -0,0 +1,77 @@
+"""
+Repositorio de estadísticas agregadas de inventario.
+"""
+from datetime import date, datetime
+from sqlalchemy import Row, func, select, true
+from sqlalchemy.orm import Session
+
+from app.models.inventory_movement import InventoryMovement
+from app.models.inventory_stats import InventoryStatsSnapshot, MovementDailyCount
+from app.models.product import Product
+
+
+class InventoryStatsRepository:
+    """
+    Lectura de las estadísticas del dashboard en una sola consulta.
+
+    Ambos métodos retornan una fila con las columnas total_products,
+    total_stock_value, low_stock_count, out_of_stock_count,
+    movements_today, movements_this_week y movements_this_month.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_live(self, today: datetime, week_start: datetime, month_start: datetime) -> Row:
+        """Calcular los agregados sobre products e inventory_movements con COUNT(*) FILTER."""
+        active = Product.is_active
+        products = (
+            select(
+                func.count().filter(active).label("total_products"),
+                func.coalesce(
+                    func.sum(Product.stock_current * Product.cost).filter(active), 0
+                ).label("total_stock_value"),
+                func.count().filter(
+                    active, Product.stock_current > 0, Product.deficit > 0
+                ).label("low_stock_count"),
+                func.count().filter(active, Product.stock_current == 0).label("out_of_stock_count"),
+            )
+            .subquery()
+        )
+
+        created_at = InventoryMovement.created_at
+        movements = (
+            select(
+                func.count().filter(created_at >= today).label("movements_today"),
+                func.count().filter(created_at >= week_start).label("movements_this_week"),
+                func.count().filter(created_at >= month_start).label("movements_this_month"),
+            )
+            .where(created_at >= min(week_start, month_start))
+            .subquery()
+        )
+
+        # Ambas subconsultas devuelven una fila: el JOIN ON true las combina
+        return self.db.execute(select(products, movements).select_from(products.join(movements, true()))).one()
+
+    def get_snapshot(self, today: date, week_start: date, month_start: date) -> Row:
+        """Leer los agregados mantenidos por triggers (lecturas por clave primaria)."""
+        products = select(
+            func.coalesce(func.sum(InventoryStatsSnapshot.total_products), 0).label("total_products"),
+            func.coalesce(func.sum(InventoryStatsSnapshot.total_stock_value), 0).label("total_stock_value"),
+            func.coalesce(func.sum(InventoryStatsSnapshot.low_stock_count), 0).label("low_stock_count"),
+            func.coalesce(func.sum(InventoryStatsSnapshot.out_of_stock_count), 0).label("out_of_stock_count"),
+        ).subquery()
+
+        day = MovementDailyCount.day
+        total = MovementDailyCount.movements
+        movements = (
+            select(
+                func.coalesce(func.sum(total).filter(day >= today), 0).label("movements_today"),
+                func.coalesce(func.sum(total).filter(day >= week_start), 0).label("movements_this_week"),
+                func.coalesce(func.sum(total).filter(day >= month_start), 0).label("movements_this_month"),
+            )
+            .where(day >= min(week_start, month_start))
+            .subquery()
+        )
+
+        return self.db.execute(select(products, movements).select_from(products.join(movements, true()))).one()
@@ -0,0 +1,88 @@
+"""
+Repositorio del outbox de eventos de inventario.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import Row, Text, cast, delete, func, select, text
+from sqlalchemy.orm import Session
+
+from app.models.inventory_outbox import InventoryOutboxEvent
+
+
+class InventoryOutboxRepository:
+    """
+    Repository para el outbox de inventario.
+
+    Las filas las inserta el trigger de ``inventory_movements``; aquí solo
+    se leen y se borran al entregarlas. Ninguna operación hace commit.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def try_lock(self) -> bool:
+        """
+        Advisory lock de sesión para que un solo worker entregue (y en orden).
+
+        Dura entre transacciones: la sesión debe estar atada a una conexión
+        y liberarlo con ``unlock``.
+        """
+        return self.db.execute(
+            text("SELECT pg_try_advisory_lock(hashtext('inventory_outbox_relay'))")
+        ).scalar_one()
+
+    def unlock(self) -> None:
+        """Liberar el lock de ``try_lock``."""
+        self.db.execute(text("SELECT pg_advisory_unlock(hashtext('inventory_outbox_relay'))"))
+
+    def get_batch(self, limit: int) -> Sequence[Row]:
+        """
+        Próximos ``limit`` eventos pendientes en orden de id.
+
+        Returns:
+            Filas (id, created_at, body), con ``body`` el evento ya
+            serializado como JSON por Postgres: el relay lo entrega sin
+            decodificarlo
+        """
+        body = func.jsonb_build_object(
+            "id", InventoryOutboxEvent.id,
+            "type", InventoryOutboxEvent.event_type,
+            "created_at", InventoryOutboxEvent.created_at,
+            "data", InventoryOutboxEvent.payload,
+        )
+        return self.db.execute(
+            select(InventoryOutboxEvent.id, InventoryOutboxEvent.created_at, cast(body, Text).label("body"))
+            .order_by(InventoryOutboxEvent.id)
+            .limit(limit)
+        ).all()
+
+    def delete(self, ids: Sequence[int]) -> None:
+        """
+        Borrar eventos entregados.
+
+        Por id y no por rango: una transacción que confirma tarde puede
+        dejar visible un evento con id menor al último entregado.
+        """
+        self.db.execute(
+            delete(InventoryOutboxEvent)
+            .where(InventoryOutboxEvent.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    def get_backlog(self) -> Optional[Row]:
+        """
+        Tamaño y antigüedad de lo pendiente, por el índice de la clave primaria.
+
+        Returns:
+            Fila (pending, oldest_created_at), con ``pending`` una cota
+            superior (rango de ids), o None si no hay pendientes
+        """
+        newest = select(func.max(InventoryOutboxEvent.id)).scalar_subquery()
+        return self.db.execute(
+            select(
+                (newest - InventoryOutboxEvent.id + 1).label("pending"),
+                InventoryOutboxEvent.created_at.label("oldest_created_at"),
+            )
+            .order_by(InventoryOutboxEvent.id)
+            .limit(1)
+        ).first()
@@ -0,0 +1,130 @@
+"""
+Repositorio para la importación masiva de productos (COPY + upsert).
+"""
+import csv
+import io
+from typing import Iterable, Sequence
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+
+STAGING_TABLE = "product_import_staging"
+
+# Columnas de la tabla de staging, en el orden del COPY
+STAGING_COLUMNS = (
+    "row_number",
+    "sku",
+    "name",
+    "description",
+    "category_id",
+    "supplier_id",
+    "stock_current",
+    "stock_min",
+    "cost",
+    "price",
+)
+
+
+class ProductImportRepository:
+    """
+    Carga de productos por lotes a través de una tabla temporal de staging.
+
+    Todo ocurre en la transacción de la sesión: la tabla de staging se crea
+    con ``ON COMMIT DROP`` y el llamador decide el commit o el rollback.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_staging(self) -> None:
+        """Crear la tabla temporal de staging (vive hasta el fin de la transacción)."""
+        self.db.execute(text(f"""
+            CREATE TEMP TABLE {STAGING_TABLE} (
+                row_number integer NOT NULL,
+                sku varchar(100) NOT NULL,
+                name varchar(255) NOT NULL,
+                description text,
+                category_id integer,
+                supplier_id integer,
+                stock_current integer NOT NULL,
+                stock_min integer NOT NULL,
+                cost numeric(10, 2) NOT NULL,
+                price numeric(10, 2) NOT NULL
+            ) ON COMMIT DROP
+        """))
+
+    def copy_to_staging(self, rows: Iterable[Sequence]) -> None:
+        """
+        Cargar filas ya validadas en staging con COPY FROM STDIN.
+
+        Cada fila trae los valores en el orden de ``STAGING_COLUMNS``. Se
+        arma un CSV en memoria por lote y se envía en un solo round trip.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(["" if value is None else value for value in row])
+        if not buffer.tell():
+            return
+        buffer.seek(0)
+
+        # COPY no pasa por el ORM: se usa el cursor psycopg2 de la misma conexión
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def existing_skus(self, skus: Iterable[str]) -> set[str]:
+        """SKUs de ``skus`` que ya están en products, en una sola consulta."""
+        values = list(set(skus))
+        if not values:
+            return set()
+        return set(self.db.execute(select(Product.sku).where(Product.sku.in_(values))).scalars())
+
+    def upsert_from_staging(self, update_existing: bool = True) -> tuple[int, int]:
+        """
+        Pasar staging a products con un único INSERT ... SELECT.
+
+        Los SKU existentes actualizan sus datos de catálogo (no el stock, que
+        solo cambia por movimientos) o se ignoran si ``update_existing`` es
+        False. Retorna (creados, actualizados), distinguidos por ``xmax = 0``
+        en las filas devueltas.
+        """
+        if update_existing:
+            conflict = """
+                ON CONFLICT (sku) DO UPDATE SET
+                    name = EXCLUDED.name,
+                    description = EXCLUDED.description,
+                    category_id = EXCLUDED.category_id,
+                    supplier_id = EXCLUDED.supplier_id,
+                    stock_min = EXCLUDED.stock_min,
+                    cost = EXCLUDED.cost,
+                    price = EXCLUDED.price,
+                    updated_at = now()
+            """
+        else:
+            conflict = "ON CONFLICT (sku) DO NOTHING"
+
+        row = self.db.execute(text(f"""
+            WITH upserted AS (
+                INSERT INTO products
+                    (sku, name, description, category_id, supplier_id,
+                     stock_current, stock_min, cost, price, is_active)
+                SELECT sku, name, description, category_id, supplier_id,
+                       stock_current, stock_min, cost, price, true
+                FROM {STAGING_TABLE}
+                ORDER BY row_number
+                {conflict}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT count(*) FILTER (WHERE inserted) AS created,
+                   count(*) FILTER (WHERE NOT inserted) AS updated
+            FROM upserted
+        """)).one()
+        return row.created, row.updated
@@ -1,12 +1,42 @@
 """
 Repository para acceso a datos de productos.
 """
-from typing import Optional
+import re
+from typing import Any, Iterable, Optional, Sequence
 from decimal import Decimal
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
+from sqlalchemy import (
+    ColumnElement, Integer, Row, Select, String, bindparam, case, cast, column, func, or_, select, text,
+    true, update, values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 
+from app.models.category import Category
 from app.models.product import Product
+from app.models.supplier import Supplier
+from app.schemas.category import CategoryResponse
+from app.schemas.product import ProductResponse
+from app.schemas.supplier import SupplierResponse
+from app.utils.pagination import estimate_count
+
+
+# UPDATE de apply_stock_deltas: unnest con dos arrays recorre ambos en paralelo
+_stock_deltas = select(
+    func.unnest(bindparam("ids", type_=ARRAY(Integer))).label("id"),
+    func.unnest(bindparam("deltas", type_=ARRAY(Integer))).label("delta"),
+).subquery("stock_deltas")
+STOCK_DELTAS_UPDATE = (
+    update(Product)
+    .where(Product.id == _stock_deltas.c.id)
+    .values(stock_current=Product.stock_current + _stock_deltas.c.delta)
+    .execution_options(synchronize_session=False)
+)
+
+# Ver la función lock_stock_rows de la migración d6e7f8a9b0c1
+LOCK_STOCK_ROWS = text("""
+    SELECT id, stock_current, sku, name, price, is_active, stock_shards
+    FROM lock_stock_rows(:ids)
+""").bindparams(bindparam("ids", type_=ARRAY(Integer)))
 
 
 class ProductRepository:
@@ -52,33 +82,15 @@ class ProductRepository:
             )
 
         # Aplicar filtros
-        if category_id is not None:
-            query = query.filter(Product.category_id == category_id)
-
-        if supplier_id is not None:
-            query = query.filter(Product.supplier_id == supplier_id)
-
-        if is_active is not None:
-            query = query.filter(Product.is_active == is_active)
-
-        if low_stock_only:
-            query = query.filter(Product.stock_current < Product.stock_min)
-
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.sku.ilike(search_term),
-                    Product.description.ilike(search_term)
-                )
-            )
-
-        if min_price is not None:
-            query = query.filter(Product.price >= min_price)
-
-        if max_price is not None:
-            query = query.filter(Product.price <= max_price)
+        query = query.filter(*product_filters(
+            category_id=category_id,
+            supplier_id=supplier_id,
+            is_active=is_active,
+            low_stock_only=low_stock_only,
+            search=search,
+            min_price=min_price,
+            max_price=max_price,
+        ))
 
         return query.order_by(Product.name).offset(skip).limit(limit).all()
 
@@ -93,38 +105,87 @@ class ProductRepository:
         max_price: Optional[Decimal] = None
     ) -> int:
         """Contar productos con filtros."""
-        query = self.db.query(func.count(Product.id))
-
-        if category_id is not None:
-            query = query.filter(Product.category_id == category_id)
-
-        if supplier_id is not None:
-            query = query.filter(Product.supplier_id == supplier_id)
-
-        if is_active is not None:
-            query = query.filter(Product.is_active == is_active)
-
-        if low_stock_only:
-            query = query.filter(Product.stock_current < Product.stock_min)
-
-        if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.sku.ilike(search_term),
-                    Product.description.ilike(search_term)
-                )
-            )
-
-        if min_price is not None:
-            query = query.filter(Product.price >= min_price)
-
-        if max_price is not None:
-            query = query.filter(Product.price <= max_price)
-
+        query = self.db.query(func.count(Product.id)).filter(*product_filters(
+            category_id=category_id,
+            supplier_id=supplier_id,
+            is_active=is_active,
+            low_stock_only=low_stock_only,
+            search=search,
+            min_price=min_price,
+            max_price=max_price,
+        ))
         return query.scalar()
 
+    def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        include_total: bool = True,
+        **filters
+    ) -> tuple[list[Product], Optional[int]]:
+        """
+        Obtener una página de productos (con categoría y proveedor) y el total.
+
+        Con ``include_total`` el total sale de COUNT(*) OVER () en la misma
+        consulta, sin repetir el filtro en un segundo SELECT count. Sin él
+        no se calcula y se retorna None.
+
+        Args:
+            skip: Filas a saltar
+            limit: Tamaño de página
+            include_total: Calcular el total exacto de filas que cumplen el filtro
+            **filters: Argumentos de ``product_filters``
+
+        Returns:
+            Tupla (productos, total o None)
+        """
+        rows = self.db.execute(product_page_query(skip, limit, include_total, **filters)).all()
+        products = [row.Product for row in rows]
+        if not include_total:
+            return products, None
+        if rows:
+            return products, rows[0].total
+        # Página vacía: la ventana no trae filas, el total sale de un conteo aparte
+        return products, (self.count(**filters) if skip else 0)
+
+    def get_page_rows(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        include_total: bool = True,
+        **filters
+    ) -> tuple[list[Row], Optional[int]]:
+        """
+        Igual que ``get_page`` pero como proyección plana de columnas.
+
+        No materializa entidades ORM: cada fila trae las columnas del
+        producto y las de categoría/proveedor con prefijo (ver
+        ``product_rows_query``), listas para serializar.
+        """
+        rows = self.db.execute(product_rows_query(skip, limit, include_total, **filters)).all()
+        if not include_total:
+            return rows, None
+        if rows:
+            return rows, rows[0].total
+        return rows, (self.count(**filters) if skip else 0)
+
+    def estimate_total(self, **filters) -> int:
+        """Estimar (EXPLAIN) cuántos productos cumplen los filtros."""
+        return estimate_count(self.db, select(Product.id).where(*product_filters(**filters)))
+
+    def search(self, term: str, limit: int = 10, only_active: bool = True) -> list[Row]:
+        """
+        Búsqueda rankeada por relevancia (texto completo + trigramas).
+
+        Returns:
+            Filas (id, sku, name, price, stock_current, stock_min, is_active, relevance)
+            ordenadas de mayor a menor relevancia
+        """
+        query = product_search_query(term, limit, only_active)
+        if query is None:
+            return []
+        return list(self.db.execute(query))
+
     def create(self, product_data: dict) -> Product:
         """Crear un nuevo producto."""
         product = Product(**product_data)
@@ -176,6 +237,108 @@ class ProductRepository:
         self.db.refresh(product)
         return product
 
+    def apply_stock_delta(self, product_id: int, delta: int) -> Optional[Row]:
+        """
+        Aplicar un delta al stock con un único UPDATE condicional.
+
+        El incremento se hace en la base de datos (stock_current + delta) y
+        solo si el resultado no queda negativo, por lo que dos terminales
+        concurrentes no pueden pisarse ni dejar stock negativo. Lo reservado
+        no entra en el predicado: bajo contención Postgres reevalúa la fila
+        nueva del producto pero no las demás tablas, así que el llamador lo
+        lee después, con la fila ya bloqueada (ver InventoryService._apply_movement).
+        No hace commit: el llamador decide el límite de la transacción.
+
+        Returns:
+            Fila (stock_current, sku, name) con el stock resultante, o None si
+            el producto no existe, el stock es insuficiente o está repartido
+            (ver StockShardRepository.lock_and_apply).
+        """
+        stmt = (
+            update(Product)
+            .where(Product.id == product_id)
+            .where(Product.stock_shards == 0)
+            .where(Product.stock_current + delta >= 0)
+            .values(stock_current=Product.stock_current + delta)
+            .returning(Product.stock_current, Product.sku, Product.name)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).first()
+
+    def lock_stock_rows(self, product_ids: Iterable[int]) -> dict[int, Row]:
+        """
+        Bloquear las filas de varios productos en una sola pasada en orden de id.
+
+        Bloquear siempre en el mismo orden evita deadlocks entre lotes
+        concurrentes que comparten productos. Los productos en modo normal
+        se bloquean FOR UPDATE; los repartidos (stock_shards > 0) FOR KEY
+        SHARE, que no se bloquea entre escritores: su stock se cambia en
+        los slots (StockShardRepository). El modo de cada fila lo elige la
+        función ``lock_stock_rows`` (migración ``d6e7f8a9b0c1``). No hace commit.
+
+        Returns:
+            Diccionario id -> fila (id, stock_current, sku, name, price,
+            is_active, stock_shards) de los productos encontrados
+        """
+        rows = self.db.execute(LOCK_STOCK_ROWS, {"ids": list(set(product_ids))})
+        return {row.id: row for row in rows}
+
+    def apply_stock_deltas(self, deltas: dict[int, int]) -> None:
+        """
+        Aplicar deltas de stock a varios productos con un único UPDATE ... FROM unnest(...).
+        No hace commit: el llamador decide el límite de la transacción.
+
+        Los ids y deltas viajan como dos arrays: el SQL no depende de la
+        cantidad de productos, así que se compila una vez y queda en la
+        caché de SQLAlchemy (con VALUES se recompilaba en cada llamada).
+        """
+        if not deltas:
+            return
+
+        self.db.execute(
+            STOCK_DELTAS_UPDATE,
+            {"ids": list(deltas.keys()), "deltas": list(deltas.values())}
+        )
+
+    def bulk_update_by_sku(self, fields: Sequence[str], rows: Sequence[Sequence[Any]]) -> dict[str, int]:
+        """
+        Actualizar ``fields`` de varios productos con un único UPDATE ... FROM (VALUES ...).
+
+        Cada fila trae el SKU seguido de los valores en el orden de ``fields``.
+        Retorna ``{sku: id}`` de los productos actualizados; los SKU ausentes
+        no existen. No hace commit.
+        """
+        if not rows:
+            return {}
+
+        columns = Product.__table__.c
+        changes = values(
+            column("sku", String),
+            *(column(field, columns[field].type) for field in fields),
+            name="changes"
+        ).data([tuple(row) for row in rows])
+
+        # Cast explícito: una columna de VALUES con solo NULL se infiere como text
+        assignments = {field: cast(changes.c[field], columns[field].type) for field in fields}
+        result = self.db.execute(
+            update(Product)
+            .where(Product.sku == changes.c.sku)
+            .values(**assignments, updated_at=func.now())
+            .returning(Product.sku, Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        return {sku: product_id for sku, product_id in result}
+
+    def get_for_update(self, product_id: int) -> Optional[Product]:
+        """Obtener producto por ID bloqueando la fila hasta el fin de la transacción."""
+        return (
+            self.db.query(Product)
+            .filter(Product.id == product_id)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+
     def delete(self, product_id: int, soft: bool = True) -> bool:
         """Eliminar un producto (soft delete por defecto)."""
         product = self.get_by_id(product_id)
@@ -203,23 +366,235 @@ class ProductRepository:
         return (
             self.db.query(Product)
             .options(joinedload(Product.category), joinedload(Product.supplier))
-            .filter(Product.is_active == True)
-            .filter(Product.stock_current < Product.stock_min)
+            .filter(Product.is_active)
+            .filter(Product.deficit > 0)
             .order_by(Product.stock_current)
             .limit(limit)
             .all()
         )
 
+    def get_low_stock_alerts(
+        self,
+        limit: int = 100,
+        after: Optional[tuple[int, int]] = None
+    ) -> list[Row]:
+        """
+        Página de alertas de bajo stock en una sola consulta de proyección.
+
+        Ordena por déficit descendente (más críticos primero) y luego por id,
+        paginando por keyset sobre (deficit, id), que es justamente el orden
+        del índice parcial ix_products_low_stock. Cada fila trae solo las
+        columnas de LowStockProduct (nombres de categoría y proveedor vía
+        LEFT JOIN) más los totales del conjunto completo, calculados en la
+        misma consulta: total_products y critical_count.
+        """
+        query = low_stock_alerts_query(limit, after)
+        return list(self.db.execute(query))
+
     def get_by_category(self, category_id: int, only_active: bool = True) -> list[Product]:
         """Obtener productos por categoría."""
         query = self.db.query(Product).filter(Product.category_id == category_id)
         if only_active:
-            query = query.filter(Product.is_active == True)
+            query = query.filter(Product.is_active)
         return query.order_by(Product.name).all()
 
     def get_by_supplier(self, supplier_id: int, only_active: bool = True) -> list[Product]:
         """Obtener productos por proveedor."""
         query = self.db.query(Product).filter(Product.supplier_id == supplier_id)
         if only_active:
-            query = query.filter(Product.is_active == True)
+            query = query.filter(Product.is_active)
         return query.order_by(Product.name).all()
+
+
+def product_filters(
+    category_id: Optional[int] = None,
+    supplier_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    low_stock_only: bool = False,
+    search: Optional[str] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None
+) -> list[ColumnElement[bool]]:
+    """
+    Construir las condiciones de filtrado de productos.
+
+    Compartido por el listado, el conteo y el repositorio asíncrono para que
+    el predicado se defina en un solo lugar.
+    """
+    conditions: list[ColumnElement[bool]] = []
+
+    if category_id is not None:
+        conditions.append(Product.category_id == category_id)
+
+    if supplier_id is not None:
+        conditions.append(Product.supplier_id == supplier_id)
+
+    if is_active is not None:
+        conditions.append(Product.is_active == is_active)
+
+    if low_stock_only:
+        # Columna generada + índice parcial ix_products_low_stock
+        conditions.append(Product.deficit > 0)
+
+    if search:
+        search_term = f"%{search}%"
+        conditions.append(
+            or_(
+                Product.name.ilike(search_term),
+                Product.sku.ilike(search_term),
+                Product.description.ilike(search_term)
+            )
+        )
+
+    if min_price is not None:
+        conditions.append(Product.price >= min_price)
+
+    if max_price is not None:
+        conditions.append(Product.price <= max_price)
+
+    return conditions
+
+
+
+def product_page_query(skip: int = 0, limit: int = 20, include_total: bool = True, **filters) -> Select:
+    """
+    Construir el listado paginado de productos con sus relaciones.
+
+    Con ``include_total`` agrega la columna ``total`` = COUNT(*) OVER (): la
+    ventana se evalúa sobre todas las filas filtradas antes de OFFSET/LIMIT,
+    así que listado y total salen de un solo recorrido.
+    """
+    columns = [Product]
+    if include_total:
+        columns.append(func.count().over().label("total"))
+
+    return (
+        select(*columns)
+        .where(*product_filters(**filters))
+        .options(joinedload(Product.category), joinedload(Product.supplier))
+        .order_by(Product.name, Product.id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def product_rows_query(skip: int = 0, limit: int = 20, include_total: bool = True, **filters) -> Select:
+    """
+    Construir el listado paginado como proyección plana (sin entidades ORM).
+
+    Las columnas se nombran como los campos de ProductResponse; las de
+    categoría y proveedor llevan el prefijo ``category__`` / ``supplier__``.
+    Mismos filtros, orden y total (COUNT(*) OVER ()) que ``product_page_query``.
+    """
+    columns = [getattr(Product, field).label(field) for field in ProductResponse.model_fields]
+    columns += [getattr(Category, field).label(f"category__{field}") for field in CategoryResponse.model_fields]
+    columns += [getattr(Supplier, field).label(f"supplier__{field}") for field in SupplierResponse.model_fields]
+    if include_total:
+        columns.append(func.count().over().label("total"))
+
+    return (
+        select(*columns)
+        .select_from(Product)
+        .outerjoin(Category, Product.category_id == Category.id)
+        .outerjoin(Supplier, Product.supplier_id == Supplier.id)
+        .where(*product_filters(**filters))
+        .order_by(Product.name, Product.id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+def product_search_query(term: str, limit: int = 10, only_active: bool = True) -> Optional[Select]:
+    """
+    Construir la búsqueda rankeada de productos, o None si no hay palabras.
+
+    Combina el tsvector generado (prefijos por palabra), la similitud de
+    trigramas sobre el nombre (tolera errores de tipeo) y el prefijo del
+    SKU; todos los predicados están servidos por índices GIN.
+    """
+    words = re.findall(r"\w+", term.lower())
+    if not words:
+        return None
+
+    ts_query = func.to_tsquery("simple", " & ".join(f"{word}:*" for word in words))
+    term = term.strip()
+    relevance = (
+        func.ts_rank_cd(Product.search_vector, ts_query)
+        + func.similarity(Product.name, term)
+        + case((Product.sku == term.upper(), 1.0), else_=0.0)
+    ).label("relevance")
+
+    query = (
+        select(
+            Product.id,
+            Product.sku,
+            Product.name,
+            Product.price,
+            Product.stock_current,
+            Product.stock_min,
+            Product.is_active,
+            relevance,
+        )
+        .where(
+            or_(
+                Product.search_vector.op("@@")(ts_query),
+                Product.name.op("%")(term),
+                Product.sku.ilike(f"{term.upper()}%"),
+            )
+        )
+        .order_by(relevance.desc(), Product.name)
+        .limit(limit)
+    )
+    if only_active:
+        query = query.where(Product.is_active)
+    return query
+
+
+def low_stock_alerts_query(limit: int = 100, after: Optional[tuple[int, int]] = None) -> Select:
+    """
+    Construir la consulta de alertas de bajo stock (ver ``get_low_stock_alerts``).
+
+    Filtra y ordena por la columna generada ``deficit`` para que la resuelva
+    el índice parcial ix_products_low_stock.
+    """
+    low_stock = (Product.is_active, Product.deficit > 0)
+
+    totals = (
+        select(
+            func.count().label("total_products"),
+            func.count().filter(Product.stock_current == 0).label("critical_count"),
+        )
+        .where(*low_stock)
+        .subquery()
+    )
+
+    query = (
+        select(
+            Product.id,
+            Product.sku,
+            Product.name,
+            Product.stock_current,
+            Product.stock_min,
+            Product.deficit.label("stock_deficit"),
+            Category.name.label("category_name"),
+            Supplier.name.label("supplier_name"),
+            totals.c.total_products,
+            totals.c.critical_count,
+        )
+        .select_from(Product)
+        .outerjoin(Category, Product.category_id == Category.id)
+        .outerjoin(Supplier, Product.supplier_id == Supplier.id)
+        .join(totals, true())
+        .where(*low_stock)
+    )
+    if after is not None:
+        # (deficit, id) posterior al cursor en orden (deficit DESC, id ASC)
+        last_deficit, last_id = after
+        query = query.where(
+            # Cota redundante para que el índice empiece el recorrido en el cursor
+            Product.deficit <= last_deficit,
+            or_(
+                Product.deficit < last_deficit,
+                (Product.deficit == last_deficit) & (Product.id > last_id),
+            ),
+        )
+    return query.order_by(Product.deficit.desc(), Product.id).limit(limit + 1)
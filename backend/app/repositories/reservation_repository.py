@@ -0,0 +1,116 @@
+"""
+Repositorio de reservas de stock.
+"""
+from datetime import timedelta
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import Row, delete, func, insert, select, text
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.stock_reservation import ReservedStock, StockReservation, StockReservationItem
+
+
+class StockReservationRepository:
+    """
+    Repository para reservas de stock.
+
+    Ninguna operación hace commit: el servicio decide el límite de la
+    transacción. El total reservado por producto lo mantiene el trigger de
+    ``stock_reservation_items``; aquí solo se lee.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add(
+        self,
+        lines: Sequence[tuple[int, int]],
+        ttl_seconds: int,
+        user_id: Optional[int] = None,
+        reference: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> StockReservation:
+        """Crear una reserva con sus líneas (product_id, quantity) que vence en ``ttl_seconds``."""
+        reservation = StockReservation(
+            user_id=user_id,
+            reference=reference,
+            notes=notes,
+            expires_at=func.now() + timedelta(seconds=ttl_seconds),
+        )
+        self.db.add(reservation)
+        self.db.flush()
+        # Un solo INSERT para todas las líneas: el trigger suma por sentencia
+        self.db.execute(insert(StockReservationItem), [
+            {"reservation_id": reservation.id, "position": position, "product_id": product_id, "quantity": quantity}
+            for position, (product_id, quantity) in enumerate(lines)
+        ])
+        self.db.refresh(reservation, ["expires_at", "created_at", "items"])
+        return reservation
+
+    def get(self, reservation_id: int) -> Optional[StockReservation]:
+        """Obtener una reserva con sus líneas."""
+        return self.db.execute(
+            select(StockReservation)
+            .options(selectinload(StockReservation.items))
+            .where(StockReservation.id == reservation_id)
+        ).scalar_one_or_none()
+
+    def lock(self, reservation_id: int) -> Optional[StockReservation]:
+        """
+        Bloquear (FOR UPDATE) una reserva y cargar sus líneas.
+
+        Al confirmar se bloquea primero la reserva y después sus productos;
+        el barrido de vencidas salta las reservas bloqueadas.
+        """
+        return self.db.execute(
+            select(StockReservation)
+            .options(selectinload(StockReservation.items))
+            .where(StockReservation.id == reservation_id)
+            .with_for_update(of=StockReservation)
+            .execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+
+    def delete(self, reservation_id: int) -> None:
+        """Eliminar una reserva; sus líneas se borran en cascada y liberan el stock."""
+        self.db.execute(delete(StockReservation).where(StockReservation.id == reservation_id))
+
+    def get_reserved(self, product_ids: Iterable[int]) -> dict[int, int]:
+        """Unidades reservadas por producto (solo los que tienen fila)."""
+        rows = self.db.execute(
+            select(ReservedStock.product_id, ReservedStock.reserved)
+            .where(ReservedStock.product_id.in_(list(product_ids)))
+        )
+        return {row.product_id: row.reserved for row in rows}
+
+    def get_availability(self, product_id: int) -> Optional[Row]:
+        """Stock actual, reservado y disponible de un producto (vista product_stock_availability)."""
+        return self.db.execute(
+            text("""
+                SELECT product_id, stock_current, stock_reserved, stock_available
+                FROM product_stock_availability
+                WHERE product_id = :product_id
+            """),
+            {"product_id": product_id}
+        ).first()
+
+    def delete_expired(self, limit: int) -> int:
+        """
+        Eliminar hasta ``limit`` reservas vencidas, las más antiguas primero.
+
+        SKIP LOCKED salta las que se están confirmando o liberando en ese
+        momento, así el barrido nunca espera a una transacción de venta.
+        Retorna la cantidad eliminada.
+        """
+        expired = (
+            select(StockReservation.id)
+            .where(StockReservation.expires_at <= func.now())
+            .order_by(StockReservation.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = self.db.execute(
+            delete(StockReservation)
+            .where(StockReservation.id.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -0,0 +1,141 @@
+"""
+Repositorio de checkpoints de stock y consultas de stock histórico.
+"""
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Optional
+
+from sqlalchemy import Row, func, select, text
+from sqlalchemy.orm import Session
+
+from app.models.inventory_stats import StockCheckpoint
+
+# Stock de ``p`` al instante :at. Con checkpoint (``c``) solo se reproducen
+# los movimientos posteriores a su cierre: el último stock_after gana, y el
+# filtro por created_at limita la búsqueda a las particiones de esos días.
+# Sin checkpoint (producto más nuevo que el último) se busca en todo su
+# historial; antes de su primer movimiento el stock es el stock_before de
+# ese movimiento y, si nunca tuvo movimientos, el stock actual.
+#
+# "Último" es por id, no por created_at: created_at es el inicio de la
+# transacción, mientras que el id se toma con la fila del producto ya
+# bloqueada, así que sigue el orden en que se aplicaron los movimientos.
+# Los movimientos de productos repartidos aún sin plegar (stock en null) se
+# saltean: hasta el próximo plegado valen los del plegado anterior.
+#
+# Los instantes llegan con zona. El created_at de los movimientos es un
+# timestamp sin zona (ver InventoryMovement.created_at): Postgres lo compara
+# con ellos leyéndolo en la zona de la sesión.
+STOCK_AS_OF = """
+    CASE WHEN c.product_id IS NOT NULL THEN coalesce(
+        (SELECT m.stock_after FROM inventory_movements m
+         WHERE m.product_id = p.id AND m.created_at >= :checkpoint_end AND m.created_at <= :at
+           AND m.stock_after IS NOT NULL
+         ORDER BY m.id DESC LIMIT 1),
+        c.stock
+    ) ELSE coalesce(
+        (SELECT m.stock_after FROM inventory_movements m
+         WHERE m.product_id = p.id AND m.created_at <= :at
+           AND m.stock_after IS NOT NULL
+         ORDER BY m.id DESC LIMIT 1),
+        (SELECT m.stock_before FROM inventory_movements m
+         WHERE m.product_id = p.id AND m.created_at > :at
+           AND m.stock_before IS NOT NULL
+         ORDER BY m.id LIMIT 1),
+        p.stock_current
+    ) END
+"""
+
+CHECKPOINT_JOIN = """
+    LEFT JOIN inventory_stock_checkpoints c
+        ON c.day = :checkpoint_day AND c.product_id = p.id
+"""
+
+
+class StockCheckpointRepository:
+    """
+    Checkpoints diarios de stock por producto.
+
+    Cada día con checkpoint tiene una fila por producto existente al cierre,
+    así que el stock a cualquier fecha cuesta una lectura por clave primaria
+    más los movimientos desde ese cierre, no todo el historial.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def latest_day(self, before: Optional[date] = None) -> Optional[date]:
+        """Último día con checkpoint (estrictamente anterior a ``before`` si se indica)."""
+        query = select(func.max(StockCheckpoint.day))
+        if before is not None:
+            query = query.where(StockCheckpoint.day < before)
+        return self.db.execute(query).scalar()
+
+    def try_lock(self) -> bool:
+        """Advisory lock de transacción para que un solo worker cree checkpoints."""
+        return self.db.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext('inventory_stock_checkpoints'))")
+        ).scalar_one()
+
+    def create_for_day(self, day: date, zone: tzinfo) -> int:
+        """
+        Guardar el stock de todos los productos al cierre de ``day`` en ``zone`` (sin commit).
+
+        Parte del checkpoint anterior más reciente. Retorna las filas creadas.
+        """
+        day_end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=zone)
+        # created_at tiene resolución de microsegundos: el último instante del día
+        params = self._params(day_end - timedelta(microseconds=1), self.latest_day(day))
+        result = self.db.execute(text(f"""
+            INSERT INTO inventory_stock_checkpoints (day, product_id, stock)
+            SELECT :day, p.id, {STOCK_AS_OF}
+            FROM products p
+            {CHECKPOINT_JOIN}
+            WHERE p.created_at < :day_end
+            ON CONFLICT (day, product_id) DO NOTHING
+        """), {**params, "day": day, "day_end": day_end})
+        return result.rowcount
+
+    def get_product_stock(self, product_id: int, at: datetime) -> Optional[Row]:
+        """
+        Stock de un producto al instante ``at`` (con zona; el día del
+        checkpoint es el de esa zona).
+
+        Retorna id, sku, name, cost, existed (si ya estaba creado en ``at``),
+        stock y checkpoint_day, o None si el producto no existe.
+        """
+        params = self._params(at, self.latest_day(at.date()))
+        return self.db.execute(text(f"""
+            SELECT p.id, p.sku, p.name, p.cost, p.created_at <= :at AS existed,
+                   {STOCK_AS_OF} AS stock,
+                   CAST(:checkpoint_day AS date) AS checkpoint_day
+            FROM products p
+            {CHECKPOINT_JOIN}
+            WHERE p.id = :product_id
+        """), {**params, "product_id": product_id}).first()
+
+    def get_valuation(self, at: datetime) -> Row:
+        """
+        Unidades y valor de los productos activos al instante ``at``.
+
+        Retorna total_products, total_units, total_value y checkpoint_day.
+        """
+        params = self._params(at, self.latest_day(at.date()))
+        return self.db.execute(text(f"""
+            SELECT count(*) AS total_products,
+                   coalesce(sum(s.stock), 0) AS total_units,
+                   coalesce(sum(s.stock * p.cost), 0) AS total_value,
+                   CAST(:checkpoint_day AS date) AS checkpoint_day
+            FROM products p
+            {CHECKPOINT_JOIN}
+            CROSS JOIN LATERAL (SELECT {STOCK_AS_OF} AS stock) s
+            WHERE p.is_active AND p.created_at <= :at
+        """), params).one()
+
+    @staticmethod
+    def _params(at: datetime, checkpoint_day: Optional[date]) -> dict:
+        # El cierre del checkpoint en la misma zona que ``at``
+        checkpoint_end = (
+            datetime.combine(checkpoint_day + timedelta(days=1), time.min, tzinfo=at.tzinfo)
+            if checkpoint_day is not None else None
+        )
+        return {"at": at, "checkpoint_day": checkpoint_day, "checkpoint_end": checkpoint_end}
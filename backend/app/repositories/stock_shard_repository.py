@@ -0,0 +1,142 @@
+"""
+Repositorio del stock repartido (modo alta concurrencia).
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import Row, delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.stock_shard import StockShard
+
+# Un round trip por delta: los caminos rápido y lento viven en la función
+APPLY_SHARD_DELTA = text("SELECT apply_stock_shard_delta(:product_id, :delta, :shards)")
+FOLD_SHARDS = text("SELECT fold_stock_shards(:product_id)")
+
+# Movimiento individual: bloqueo FOR KEY SHARE del producto y delta en un
+# solo round trip. MATERIALIZED asegura que la función corre con la fila
+# ya bloqueada.
+LOCK_AND_APPLY_SHARD_DELTA = text("""
+    WITH p AS MATERIALIZED (
+        SELECT id, stock_shards, sku, name FROM products
+        WHERE id = :product_id AND stock_shards > 0
+        FOR KEY SHARE
+    )
+    SELECT apply_stock_shard_delta(p.id, :delta, p.stock_shards) AS applied, p.sku, p.name
+    FROM p
+""")
+
+
+class StockShardRepository:
+    """
+    Repository para el stock repartido en slots.
+
+    Orden de bloqueos (igual en todos los caminos): primero la fila del
+    producto y después sus slots. Los escritores toman la fila con FOR KEY
+    SHARE, que no se bloquea entre ellos ni con el UPDATE de stock_current
+    del plegado; solo cambiar de modo o ajustar el stock la toma en
+    exclusiva. Ninguna operación hace commit.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_delta(self, product_id: int, delta: int, shards: int) -> Optional[bool]:
+        """
+        Sumar ``delta`` al stock repartido de un producto ya bloqueado.
+
+        Retorna False si el total no alcanza y None si el producto no está repartido.
+        """
+        return self.db.execute(
+            APPLY_SHARD_DELTA, {"product_id": product_id, "delta": delta, "shards": shards}
+        ).scalar()
+
+    def lock_and_apply(self, product_id: int, delta: int) -> Optional[Row]:
+        """
+        Bloquear (FOR KEY SHARE) un producto repartido y sumarle ``delta``.
+
+        Returns:
+            Fila (applied, sku, name), con applied False si el total no
+            alcanza, o None si el producto no existe o no está repartido
+        """
+        return self.db.execute(
+            LOCK_AND_APPLY_SHARD_DELTA, {"product_id": product_id, "delta": delta}
+        ).first()
+
+    def apply_deltas(self, deltas: dict[int, int], shards: dict[int, int]) -> list[int]:
+        """
+        Aplicar deltas a varios productos repartidos ya bloqueados, en orden de id.
+
+        ``shards`` es la cantidad de slots de cada producto. Retorna los ids
+        cuyo total no alcanzó (el llamador debe hacer rollback).
+        """
+        return [
+            product_id for product_id in sorted(deltas)
+            if not self.apply_delta(product_id, deltas[product_id], shards[product_id])
+        ]
+
+    def fold(self, product_id: int) -> Optional[int]:
+        """
+        Plegar los slots en stock_current y completar los movimientos pendientes.
+
+        El llamador debe tener bloqueada la fila del producto (FOR NO KEY
+        UPDATE o FOR UPDATE). Retorna el total, o None si no está repartido.
+        """
+        return self.db.execute(FOLD_SHARDS, {"product_id": product_id}).scalar()
+
+    def lock_for_fold(self, product_id: int) -> bool:
+        """
+        Bloquear (FOR NO KEY UPDATE) un producto repartido para plegarlo.
+
+        Retorna False si ya no está repartido o si otro worker lo está
+        plegando o cambiando de modo (SKIP LOCKED: no hay que esperarlo).
+        """
+        return self.db.execute(
+            select(Product.id)
+            .where(Product.id == product_id, Product.stock_shards > 0)
+            .with_for_update(key_share=True, skip_locked=True)
+        ).first() is not None
+
+    def get_sharded_product_ids(self) -> list[int]:
+        """Ids de los productos en modo repartido."""
+        return list(self.db.execute(
+            select(Product.id).where(Product.stock_shards > 0).order_by(Product.id)
+        ).scalars())
+
+    def get_shards(self, product_id: int) -> list[int]:
+        """Stock de cada slot de un producto, en orden de slot."""
+        return list(self.db.execute(
+            select(StockShard.stock).where(StockShard.product_id == product_id).order_by(StockShard.shard)
+        ).scalars())
+
+    def get_totals(self, product_ids: Iterable[int]) -> dict[int, int]:
+        """Stock total (suma de slots) de varios productos repartidos."""
+        rows = self.db.execute(
+            select(StockShard.product_id, func.sum(StockShard.stock))
+            .where(StockShard.product_id.in_(list(product_ids)))
+            .group_by(StockShard.product_id)
+        )
+        return {product_id: int(total) for product_id, total in rows}
+
+    def create(self, product_id: int, shards: int, stock: int) -> None:
+        """Repartir ``stock`` en ``shards`` slots en partes iguales y marcar el producto."""
+        self.db.execute(insert(StockShard), [
+            {"product_id": product_id, "shard": shard, "stock": stock // shards + (shard < stock % shards)}
+            for shard in range(shards)
+        ])
+        self.db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(stock_shards=shards)
+            .execution_options(synchronize_session=False)
+        )
+
+    def remove(self, product_id: int) -> None:
+        """Eliminar los slots de un producto (ya plegado) y volver al modo normal."""
+        self.db.execute(delete(StockShard).where(StockShard.product_id == product_id))
+        self.db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(stock_shards=0)
+            .execution_options(synchronize_session=False)
+        )
@@ -1,7 +1,7 @@
 """
 Repository para acceso a datos de proveedores.
 """
-from typing import Optional
+from typing import Iterable, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
@@ -19,6 +19,14 @@ class SupplierRepository:
         """Obtener proveedor por ID."""
         return self.db.query(Supplier).filter(Supplier.id == supplier_id).first()
 
+    def get_active_status(self, supplier_ids: Iterable[int]) -> dict[int, bool]:
+        """``{id: is_active}`` de los proveedores de ``supplier_ids`` que existen."""
+        ids = list(set(supplier_ids))
+        if not ids:
+            return {}
+        rows = self.db.query(Supplier.id, Supplier.is_active).filter(Supplier.id.in_(ids))
+        return {row.id: row.is_active for row in rows}
+
     def get_all(
         self,
         skip: int = 0,
@@ -33,6 +41,10 @@ class SupplierRepository:
 
         return query.order_by(Supplier.name).offset(skip).limit(limit).all()
 
+    def get_all_unpaginated(self) -> list[Supplier]:
+        """Obtener todos los proveedores ordenados por nombre (para la caché de referencia)."""
+        return self.db.query(Supplier).order_by(Supplier.name, Supplier.id).all()
+
     def get_all_with_product_count(
         self,
         skip: int = 0,
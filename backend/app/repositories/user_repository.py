@@ -5,6 +5,7 @@ Implementa el patrón Repository para abstraer las operaciones de BD.
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from app.core.cache import principal_cache
 from app.models.user import User
 
 
@@ -36,11 +37,16 @@ class UserRepository:
         if not user:
             return None
 
+        previous_email = user.email
         for key, value in user_data.items():
             setattr(user, key, value)
 
         self.db.commit()
         self.db.refresh(user)
+
+        # Rol, estado o email pueden haber cambiado
+        principal_cache.invalidate(previous_email)
+        principal_cache.invalidate(user.email)
         return user
 
     def delete(self, user_id: int) -> bool:
@@ -51,6 +57,7 @@ class UserRepository:
 
         user.is_active = False
         self.db.commit()
+        principal_cache.invalidate(user.email)
         return True
 
     def exists_by_email(self, email: str) -> bool:
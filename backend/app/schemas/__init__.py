@@ -30,7 +30,15 @@ from app.schemas.product import (
     ProductResponse,
     ProductWithRelations,
     ProductListResponse,
+    ProductSearchResult,
     ProductFilter,
+    ProductImportRowError,
+    ProductImportResult,
+    ProductBulkUpdateItem,
+    ProductBulkUpdateRequest,
+    ProductBulkUpdateStatus,
+    ProductBulkUpdateOutcome,
+    ProductBulkUpdateResult,
 )
 from app.schemas.inventory import (
     MovementTypeEnum,
@@ -39,6 +47,7 @@ from app.schemas.inventory import (
     InventoryMovementCreate,
     InventoryMovementResponse,
     InventoryMovementList,
+    InventoryMovementCursorList,
     InventoryMovementFilter,
     StockAdjustment,
     BatchStockEntry,
@@ -46,6 +55,27 @@ from app.schemas.inventory import (
     LowStockProduct,
     LowStockAlert,
     InventoryStats,
+    StockAsOf,
+    InventoryValuation,
+    StockAvailability,
+)
+from app.schemas.sale import (
+    SaleLine,
+    SaleCreate,
+    SaleLineResult,
+    SaleResponse,
+    StockShortage,
+)
+from app.schemas.reservation import (
+    ReservationCreate,
+    ReservationItem,
+    ReservationResponse,
+)
+from app.schemas.stock_event import (
+    StockEventTypeEnum,
+    StockLevelEnum,
+    StockEvent,
+    StockEventFilter,
 )
 
 __all__ = [
@@ -75,7 +105,15 @@ __all__ = [
     "ProductResponse",
     "ProductWithRelations",
     "ProductListResponse",
+    "ProductSearchResult",
     "ProductFilter",
+    "ProductImportRowError",
+    "ProductImportResult",
+    "ProductBulkUpdateItem",
+    "ProductBulkUpdateRequest",
+    "ProductBulkUpdateStatus",
+    "ProductBulkUpdateOutcome",
+    "ProductBulkUpdateResult",
     # Inventory
     "MovementTypeEnum",
     "MovementReasonEnum",
@@ -83,6 +121,7 @@ __all__ = [
     "InventoryMovementCreate",
     "InventoryMovementResponse",
     "InventoryMovementList",
+    "InventoryMovementCursorList",
     "InventoryMovementFilter",
     "StockAdjustment",
     "BatchStockEntry",
@@ -90,4 +129,19 @@ __all__ = [
     "LowStockProduct",
     "LowStockAlert",
     "InventoryStats",
+    "StockAsOf",
+    "InventoryValuation",
+    "StockAvailability",
+    "SaleLine",
+    "SaleCreate",
+    "SaleLineResult",
+    "SaleResponse",
+    "StockShortage",
+    "ReservationCreate",
+    "ReservationItem",
+    "ReservationResponse",
+    "StockEventTypeEnum",
+    "StockLevelEnum",
+    "StockEvent",
+    "StockEventFilter",
 ]
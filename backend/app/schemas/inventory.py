@@ -1,7 +1,7 @@
 """
 Schemas Pydantic para movimientos de inventario.
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field, ConfigDict
 from enum import Enum
@@ -72,6 +72,11 @@ class StockAdjustment(BaseModel):
     notes: Optional[str] = Field(None, description="Notas del ajuste")
 
 
+class StockShardsUpdate(BaseModel):
+    """Schema para activar o desactivar el modo repartido de un producto."""
+    shards: int = Field(..., ge=0, description="Cantidad de slots (0 vuelve al modo normal)")
+
+
 class BatchStockEntry(BaseModel):
     """Schema para entrada masiva de stock (compra)."""
     product_id: int = Field(..., description="ID del producto")
@@ -112,8 +117,9 @@ class InventoryMovementResponse(BaseModel):
     movement_type: MovementTypeEnum
     reason: MovementReasonEnum
     quantity: int
-    stock_before: int
-    stock_after: int
+    # Null en productos repartidos hasta el próximo plegado
+    stock_before: Optional[int]
+    stock_after: Optional[int]
     reference: Optional[str]
     notes: Optional[str]
     user_id: Optional[int]
@@ -135,6 +141,16 @@ class InventoryMovementList(BaseModel):
     pages: int
 
 
+class InventoryMovementCursorList(BaseModel):
+    """Schema para página de movimientos paginada por cursor."""
+    items: List[InventoryMovementResponse]
+    page_size: int
+    next_cursor: Optional[str] = Field(None, description="Token para pedir la siguiente página (after)")
+    has_more: bool
+    total: int
+    total_is_estimate: bool = Field(..., description="True si el total es una estimación del planificador")
+
+
 # ==================== ALERT SCHEMAS ====================
 
 class LowStockProduct(BaseModel):
@@ -157,10 +173,18 @@ class LowStockAlert(BaseModel):
     critical_count: int = Field(..., description="Sin stock")
     warning_count: int = Field(..., description="Bajo stock mínimo")
     products: List[LowStockProduct]
+    next_cursor: Optional[str] = Field(None, description="Token para pedir la siguiente página (after)")
+    has_more: bool = False
 
 
 # ==================== FILTER SCHEMAS ====================
 
+class ExportFormatEnum(str, Enum):
+    """Formatos de exportación de movimientos."""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class InventoryMovementFilter(BaseModel):
     """Filtros para búsqueda de movimientos."""
     product_id: Optional[int] = None
@@ -183,3 +207,41 @@ class InventoryStats(BaseModel):
     movements_today: int
     movements_this_week: int
     movements_this_month: int
+
+
+class StockAsOf(BaseModel):
+    """Stock de un producto en una fecha pasada."""
+    product_id: int
+    sku: str
+    name: str
+    at: datetime
+    stock: int
+    stock_value: float = Field(..., description="Stock por el costo actual del producto")
+    checkpoint_day: Optional[date] = Field(None, description="Checkpoint diario desde el que se reprodujeron los movimientos")
+
+
+class InventoryValuation(BaseModel):
+    """Valorización del inventario en una fecha pasada."""
+    at: datetime
+    total_products: int
+    total_units: int
+    total_stock_value: float = Field(..., description="Unidades por el costo actual de cada producto")
+    checkpoint_day: Optional[date] = Field(None, description="Checkpoint diario desde el que se reprodujeron los movimientos")
+
+
+class StockAvailability(BaseModel):
+    """Disponibilidad de un producto: stock actual menos unidades reservadas."""
+    product_id: int
+    quantity_requested: int
+    available: bool
+    stock_current: int
+    stock_reserved: int
+    stock_available: int
+
+
+class StockShardsStatus(BaseModel):
+    """Modo de stock de un producto y, si está repartido, el stock de cada slot."""
+    product_id: int
+    shards: int = Field(..., description="Cantidad de slots (0 = modo normal)")
+    stock_current: int = Field(..., description="Stock total exacto (suma de los slots si está repartido)")
+    shard_stock: List[int] = Field(default_factory=list, description="Stock de cada slot, en orden")
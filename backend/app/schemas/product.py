@@ -3,6 +3,7 @@ Schemas Pydantic para validación de datos de productos.
 """
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
@@ -89,6 +90,22 @@ class ProductListResponse(BaseModel):
     page: int
     page_size: int
     pages: int
+    total_is_estimate: bool = False
+
+
+class ProductSearchResult(BaseModel):
+    """Schema liviano para resultados del buscador de productos."""
+    id: int
+    sku: str
+    name: str
+    price: Decimal
+    stock_current: int
+    stock_min: int
+    is_active: bool
+    relevance: float
+
+    class Config:
+        from_attributes = True
 
 
 class ProductFilter(BaseModel):
@@ -100,3 +117,55 @@ class ProductFilter(BaseModel):
     low_stock_only: bool = False
     min_price: Optional[Decimal] = None
     max_price: Optional[Decimal] = None
+
+
+class ProductImportRowError(BaseModel):
+    """Error de una fila del archivo de importación."""
+    row: int
+    sku: Optional[str] = None
+    message: str
+
+
+class ProductImportResult(BaseModel):
+    """Resultado de una importación masiva de productos."""
+    total_rows: int
+    created: int
+    updated: int
+    skipped: int = 0
+    failed: int
+    dry_run: bool = False
+    errors: list[ProductImportRowError]
+    errors_truncated: bool = False
+
+
+class ProductBulkUpdateItem(ProductUpdate):
+    """Cambios parciales de un producto identificado por SKU (solo se aplican los campos enviados)."""
+    sku: str = Field(..., min_length=1, max_length=100)
+
+
+class ProductBulkUpdateRequest(BaseModel):
+    """Lote de actualizaciones por SKU."""
+    items: list[ProductBulkUpdateItem] = Field(..., min_length=1, max_length=10000)
+
+
+class ProductBulkUpdateStatus(str, Enum):
+    """Resultado de cada SKU en una actualización masiva."""
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+    INVALID = "invalid"
+
+
+class ProductBulkUpdateOutcome(BaseModel):
+    """Resultado de un SKU."""
+    sku: str
+    status: ProductBulkUpdateStatus
+    product_id: Optional[int] = None
+    message: Optional[str] = None
+
+
+class ProductBulkUpdateResult(BaseModel):
+    """Resultado de una actualización masiva, en el orden de la solicitud."""
+    updated: int
+    not_found: int
+    invalid: int
+    results: list[ProductBulkUpdateOutcome]
@@ -0,0 +1,42 @@
+"""
+Schemas Pydantic para reservas de stock.
+"""
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.sale import SaleLine
+
+
+class ReservationCreate(BaseModel):
+    """Reserva de un carrito o pedido pendiente: todas las líneas se reservan juntas o ninguna."""
+    items: list[SaleLine] = Field(..., min_length=1, max_length=500, description="Líneas a reservar")
+    ttl_seconds: Optional[int] = Field(
+        None, ge=1, description="Segundos hasta el vencimiento (por defecto RESERVATION_TTL_SECONDS)"
+    )
+    reference: Optional[str] = Field(None, max_length=100, description="Carrito, pedido o ticket")
+    notes: Optional[str] = Field(None, description="Notas")
+
+
+class ReservationItem(BaseModel):
+    """Línea reservada."""
+    product_id: int
+    quantity: int
+
+    class Config:
+        from_attributes = True
+
+
+class ReservationResponse(BaseModel):
+    """Reserva vigente."""
+    id: int
+    reference: Optional[str]
+    notes: Optional[str]
+    user_id: Optional[int]
+    expires_at: datetime
+    created_at: datetime
+    items: list[ReservationItem]
+
+    class Config:
+        from_attributes = True
+
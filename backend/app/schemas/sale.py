@@ -0,0 +1,50 @@
+"""
+Schemas Pydantic para ventas (checkout).
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class SaleLine(BaseModel):
+    """Línea de un ticket de venta."""
+    product_id: int = Field(..., description="ID del producto")
+    quantity: int = Field(..., gt=0, description="Cantidad vendida")
+
+
+class SaleCreate(BaseModel):
+    """Ticket de venta: todas las líneas se descuentan juntas o ninguna."""
+    items: list[SaleLine] = Field(..., min_length=1, max_length=500, description="Líneas del ticket")
+    reference: Optional[str] = Field(None, max_length=100, description="Número de ticket o factura")
+    notes: Optional[str] = Field(None, description="Notas")
+
+
+class SaleLineResult(BaseModel):
+    """Línea vendida, con el movimiento que la registra."""
+    movement_id: int
+    product_id: int
+    sku: str
+    name: str
+    quantity: int
+    unit_price: Decimal
+    subtotal: Decimal
+    stock_after: Optional[int] = Field(None, description="Null en productos repartidos hasta el plegado")
+
+
+class SaleResponse(BaseModel):
+    """Resultado de una venta."""
+    reference: Optional[str]
+    created_at: datetime
+    total_items: int
+    total_amount: Decimal
+    lines: list[SaleLineResult]
+
+
+class StockShortage(BaseModel):
+    """Producto sin stock suficiente para el ticket (cantidad sumada de todas sus líneas)."""
+    product_id: int
+    sku: str
+    lines: list[int] = Field(..., description="Posiciones (desde 0) de las líneas del producto")
+    requested: int
+    available: int
@@ -0,0 +1,48 @@
+"""
+Schemas Pydantic del canal de cambios de stock en vivo.
+"""
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+class StockEventTypeEnum(str, Enum):
+    """Tipos de evento del canal de stock."""
+    STOCK_CHANGED = "stock_changed"
+    THRESHOLD_CROSSED = "threshold_crossed"
+    # El cliente perdió eventos (cola llena o reconexión a la base): debe
+    # volver a leer alertas y estadísticas
+    RESYNC = "resync"
+
+
+class StockLevelEnum(str, Enum):
+    """Nivel de stock respecto del mínimo (mismo criterio que las estadísticas)."""
+    OK = "ok"
+    LOW = "low"
+    OUT = "out"
+
+
+class StockEvent(BaseModel):
+    """Evento del canal de stock; los campos de producto faltan en ``resync``."""
+    type: StockEventTypeEnum
+    product_id: Optional[int] = None
+    sku: Optional[str] = None
+    category_id: Optional[int] = None
+    stock_before: Optional[int] = None
+    stock_after: Optional[int] = None
+    stock_min: Optional[int] = None
+    previous_level: Optional[StockLevelEnum] = None
+    level: Optional[StockLevelEnum] = None
+    reason: Optional[str] = Field(None, description="Motivo del resync")
+
+
+class StockEventFilter(BaseModel):
+    """
+    Filtros de una suscripción (mensaje del cliente por WebSocket).
+
+    Se combinan por unión; sin filtros se reciben todos los productos.
+    """
+    product_ids: List[int] = Field(default_factory=list, max_length=settings.STOCK_EVENTS_MAX_FILTER_IDS)
+    category_ids: List[int] = Field(default_factory=list, max_length=settings.STOCK_EVENTS_MAX_FILTER_IDS)
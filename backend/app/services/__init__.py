@@ -5,12 +5,22 @@ from app.services.auth_service import AuthService
 from app.services.category_service import CategoryService
 from app.services.supplier_service import SupplierService
 from app.services.product_service import ProductService
+from app.services.product_import_service import ProductImportService
 from app.services.inventory_service import InventoryService
+from app.services.sale_service import SaleService
+from app.services.reservation_service import ReservationService
+from app.services.async_product_service import AsyncProductService
+from app.services.async_inventory_service import AsyncInventoryService
 
 __all__ = [
     "AuthService",
     "CategoryService",
     "SupplierService",
     "ProductService",
+    "ProductImportService",
     "InventoryService",
+    "SaleService",
+    "ReservationService",
+    "AsyncProductService",
+    "AsyncInventoryService",
 ]
@@ -0,0 +1,208 @@
+"""
+Servicio asíncrono de inventario.
+Misma lógica y respuestas que InventoryService sobre AsyncSession, para las
+lecturas de movimientos y el registro de movimientos individuales.
+"""
+from typing import List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.inventory_movement import MovementType, MovementReason
+from app.models.user import User
+from app.repositories.async_inventory_repository import AsyncInventoryMovementRepository
+from app.repositories.async_product_repository import AsyncProductRepository
+from app.schemas.inventory import (
+    InventoryMovementCreate,
+    InventoryMovementResponse,
+    InventoryMovementList,
+    InventoryMovementCursorList,
+    InventoryMovementFilter,
+    ProductMinimal,
+    UserMinimal,
+)
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+class AsyncInventoryService:
+    """Servicio asíncrono para gestión de inventario."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.movement_repo = AsyncInventoryMovementRepository(db)
+        self.product_repo = AsyncProductRepository(db)
+
+    async def get_movement(self, movement_id: int) -> InventoryMovementResponse:
+        """Obtener un movimiento por ID."""
+        movement = await self.movement_repo.get_by_id(movement_id)
+        if not movement:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Movimiento no encontrado"
+            )
+        return InventoryMovementResponse.model_validate(movement)
+
+    async def get_movements(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        filters: Optional[InventoryMovementFilter] = None
+    ) -> InventoryMovementList:
+        """Obtener movimientos con paginación y filtros."""
+        skip = (page - 1) * page_size
+        movements, total = await self.movement_repo.get_all(skip, page_size, filters)
+
+        pages = (total + page_size - 1) // page_size if page_size > 0 else 0
+
+        return InventoryMovementList(
+            items=[InventoryMovementResponse.model_validate(m) for m in movements],
+            total=total,
+            page=page,
+            page_size=page_size,
+            pages=pages
+        )
+
+    async def get_movements_cursor(
+        self,
+        page_size: int = 20,
+        filters: Optional[InventoryMovementFilter] = None,
+        after: Optional[str] = None,
+        include_total: bool = False
+    ) -> InventoryMovementCursorList:
+        """Obtener movimientos paginados por cursor (keyset)."""
+        position = None
+        if after:
+            try:
+                position = decode_cursor(after)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor inválido"
+                )
+
+        movements = await self.movement_repo.get_page_after(page_size, filters, position)
+        has_more = len(movements) > page_size
+        movements = movements[:page_size]
+
+        next_cursor = None
+        if has_more:
+            last = movements[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        if include_total:
+            total = await self.movement_repo.count(filters)
+        else:
+            total = await self.movement_repo.estimate_count(filters)
+
+        return InventoryMovementCursorList(
+            items=[InventoryMovementResponse.model_validate(m) for m in movements],
+            page_size=page_size,
+            next_cursor=next_cursor,
+            has_more=has_more,
+            total=total,
+            total_is_estimate=not include_total
+        )
+
+    async def get_product_movements(
+        self,
+        product_id: int,
+        limit: int = 50
+    ) -> List[InventoryMovementResponse]:
+        """Obtener historial de movimientos de un producto."""
+        if not await self.product_repo.get_by_id(product_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Producto no encontrado"
+            )
+
+        movements = await self.movement_repo.get_by_product(product_id, limit)
+        return [InventoryMovementResponse.model_validate(m) for m in movements]
+
+    async def create_movement(
+        self,
+        data: InventoryMovementCreate,
+        user: Optional[User] = None
+    ) -> InventoryMovementResponse:
+        """
+        Crear un movimiento de inventario con UPDATE condicional + INSERT
+        en una sola transacción (ver ``InventoryService.create_movement``).
+        """
+        movement_type = MovementType(data.movement_type.value)
+        reason = MovementReason(data.reason.value)
+
+        if movement_type == MovementType.ENTRY:
+            delta = data.quantity
+        elif movement_type in (MovementType.EXIT, MovementType.ADJUSTMENT):
+            delta = -data.quantity
+        else:
+            delta = 0
+
+        row = await self.product_repo.apply_stock_delta(data.product_id, delta)
+        if row is not None:
+            stock_after = row.stock_current
+            stock_before = stock_after - delta
+            # Lo reservado se lee con la fila ya bloqueada por el UPDATE
+            if delta < 0:
+                reserved = await self.product_repo.get_reserved(data.product_id)
+                if stock_after < reserved:
+                    await self.db.rollback()
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Stock insuficiente. Stock disponible: {stock_before - reserved} "
+                               f"(reservado: {reserved}), cantidad solicitada: {data.quantity}"
+                    )
+        else:
+            # Producto repartido, inexistente o stock insuficiente
+            row = await self.product_repo.lock_and_apply_shard_delta(data.product_id, delta)
+            if row is None:
+                product = await self.product_repo.get_by_id(data.product_id)
+                # Leer antes del rollback: en async no se recargan atributos expirados
+                stock_current = product.stock_current if product else None
+                await self.db.rollback()
+                if not product:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Producto no encontrado"
+                    )
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Stock insuficiente. Stock actual: {stock_current}, cantidad solicitada: {data.quantity}"
+                )
+            if not row.applied:
+                stock_current = await self.product_repo.get_shard_total(data.product_id)
+                await self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Stock insuficiente. Stock actual: {stock_current}, cantidad solicitada: {data.quantity}"
+                )
+            stock_before = stock_after = None
+
+        movement = await self.movement_repo.add(
+            product_id=data.product_id,
+            movement_type=movement_type,
+            reason=reason,
+            quantity=data.quantity,
+            stock_before=stock_before,
+            stock_after=stock_after,
+            user_id=user.id if user else None,
+            reference=data.reference,
+            notes=data.notes
+        )
+
+        response = InventoryMovementResponse(
+            id=movement.id,
+            product_id=movement.product_id,
+            movement_type=movement.movement_type,
+            reason=movement.reason,
+            quantity=movement.quantity,
+            stock_before=movement.stock_before,
+            stock_after=movement.stock_after,
+            reference=movement.reference,
+            notes=movement.notes,
+            user_id=movement.user_id,
+            created_at=movement.created_at,
+            product=ProductMinimal(id=data.product_id, sku=row.sku, name=row.name),
+            user=UserMinimal.model_validate(user) if user else None
+        )
+
+        await self.db.commit()
+        return response
@@ -0,0 +1,133 @@
+"""
+Servicio asíncrono de productos (lecturas).
+Misma lógica y respuestas que ProductService sobre AsyncSession.
+"""
+from typing import Optional
+import math
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.async_product_repository import AsyncProductRepository
+from app.schemas.product import (
+    ProductResponse,
+    ProductWithRelations,
+    ProductListResponse,
+    ProductSearchResult,
+    ProductFilter,
+)
+from app.services.product_service import product_row_to_dict, to_product_with_relations
+
+
+class AsyncProductService:
+    """Servicio asíncrono para consulta de productos."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.product_repo = AsyncProductRepository(db)
+
+    async def get_by_id(self, product_id: int, with_relations: bool = False) -> ProductResponse | ProductWithRelations:
+        """
+        Obtener un producto por ID.
+
+        Raises:
+            HTTPException: Si no existe
+        """
+        product = await self.product_repo.get_by_id(product_id, with_relations)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Producto no encontrado"
+            )
+
+        if with_relations:
+            return to_product_with_relations(product)
+
+        return ProductResponse.model_validate(product)
+
+    async def get_by_sku(self, sku: str) -> ProductResponse:
+        """
+        Obtener un producto por SKU.
+
+        Raises:
+            HTTPException: Si no existe
+        """
+        product = await self.product_repo.get_by_sku(sku)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Producto no encontrado"
+            )
+        return ProductResponse.model_validate(product)
+
+    async def get_all(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        filters: Optional[ProductFilter] = None,
+        include_total: bool = True
+    ) -> ProductListResponse:
+        """Obtener todos los productos con paginación y filtros (ver ``ProductService.get_all``)."""
+        skip = (page - 1) * page_size
+
+        filter_params = {}
+        if filters:
+            filter_params = filters.model_dump()
+
+        products, total = await self.product_repo.get_page(
+            skip=skip,
+            limit=page_size,
+            include_total=include_total,
+            **filter_params
+        )
+        if total is None:
+            total = await self.product_repo.estimate_total(**filter_params)
+        pages = math.ceil(total / page_size) if total > 0 else 1
+
+        return ProductListResponse(
+            items=[to_product_with_relations(p) for p in products],
+            total=total,
+            page=page,
+            page_size=page_size,
+            pages=pages,
+            total_is_estimate=not include_total
+        )
+
+    async def get_all_serialized(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        filters: Optional[ProductFilter] = None,
+        include_total: bool = True
+    ) -> dict:
+        """Listado listo para FastJSONResponse (ver ``ProductService.get_all_serialized``)."""
+        skip = (page - 1) * page_size
+        filter_params = filters.model_dump() if filters else {}
+
+        rows, total = await self.product_repo.get_page_rows(
+            skip=skip,
+            limit=page_size,
+            include_total=include_total,
+            **filter_params
+        )
+        if total is None:
+            total = await self.product_repo.estimate_total(**filter_params)
+
+        return {
+            "items": [product_row_to_dict(row) for row in rows],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": math.ceil(total / page_size) if total > 0 else 1,
+            "total_is_estimate": not include_total,
+        }
+
+    async def search(self, term: str, limit: int = 10, only_active: bool = True) -> list[ProductSearchResult]:
+        """Buscar productos por relevancia (nombre, SKU o descripción)."""
+        rows = await self.product_repo.search(term, limit, only_active)
+        return [ProductSearchResult.model_validate(row) for row in rows]
+
+    async def get_low_stock_products(self, limit: int = 50) -> list[ProductWithRelations]:
+        """Obtener productos con stock bajo."""
+        products = await self.product_repo.get_low_stock_products(limit)
+        return [to_product_with_relations(p) for p in products]
@@ -6,14 +6,32 @@ from datetime import timedelta
 from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.core.security import verify_password, get_password_hash, create_access_token
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.security import (
+    PasswordHasherBusyError,
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
 from app.core.config import settings
+from app.core.cache import principal_cache
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserResponse, Token
 from app.models.user import User
 
+# Columnas del usuario que guarda la caché de principales: las que leen las
+# dependencias y /auth/me. Nunca el hash de la contraseña.
+PRINCIPAL_FIELDS = ("id", "email", "full_name", "role", "is_active", "created_at", "updated_at")
+
+
+def cache_principal(email: str, user: User) -> None:
+    """Guardar en la caché de principales los campos públicos de ``user``."""
+    principal_cache.set(email, {field: getattr(user, field) for field in PRINCIPAL_FIELDS})
+
 
 class AuthService:
     """Servicio de autenticación y gestión de usuarios."""
@@ -22,10 +40,13 @@ class AuthService:
         self.db = db
         self.user_repo = UserRepository(db)
 
-    def register(self, user_data: UserCreate) -> UserResponse:
+    async def register(self, user_data: UserCreate) -> UserResponse:
         """
         Registrar un nuevo usuario.
 
+        El acceso a BD corre en el threadpool y el hash de la contraseña en
+        el pool dedicado de bcrypt, sin bloquear el event loop.
+
         Args:
             user_data: Datos del usuario a registrar
 
@@ -33,27 +54,30 @@ class AuthService:
             Usuario creado
 
         Raises:
-            HTTPException: Si el email ya está registrado
+            HTTPException: Si el email ya está registrado o el pool de hashing está saturado
         """
         # Verificar si el email ya existe
-        if self.user_repo.exists_by_email(user_data.email):
+        if await run_in_threadpool(self.user_repo.exists_by_email, user_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El email ya está registrado"
             )
 
         # Hash de la contraseña
-        password_hash = get_password_hash(user_data.password)
+        try:
+            password_hash = await get_password_hash_async(user_data.password)
+        except PasswordHasherBusyError:
+            raise self._busy_exception()
 
         # Crear usuario
         user_dict = user_data.model_dump(exclude={"password"})
         user_dict["password_hash"] = password_hash
 
-        user = self.user_repo.create(user_dict)
+        user = await run_in_threadpool(self.user_repo.create, user_dict)
 
         return UserResponse.model_validate(user)
 
-    def login(self, email: str, password: str) -> Token:
+    async def login(self, email: str, password: str) -> Token:
         """
         Autenticar usuario y generar token.
 
@@ -65,10 +89,10 @@ class AuthService:
             Token de acceso
 
         Raises:
-            HTTPException: Si las credenciales son inválidas
+            HTTPException: Si las credenciales son inválidas o el pool de hashing está saturado
         """
         # Buscar usuario
-        user = self.user_repo.get_by_email(email)
+        user = await run_in_threadpool(self.user_repo.get_by_email, email)
 
         if not user:
             raise HTTPException(
@@ -78,7 +102,12 @@ class AuthService:
             )
 
         # Verificar contraseña
-        if not verify_password(password, user.password_hash):
+        try:
+            password_ok = await verify_password_async(password, user.password_hash)
+        except PasswordHasherBusyError:
+            raise self._busy_exception()
+
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email o contraseña incorrectos",
@@ -105,10 +134,50 @@ class AuthService:
         """
         Obtener usuario actual por email.
 
+        Usa la caché de principales: en un acierto el usuario se reconstruye
+        con ``PRINCIPAL_FIELDS`` y se adjunta a la sesión sin consultar la
+        base de datos (password_hash queda sin cargar).
+
         Args:
             email: Email del usuario
 
         Returns:
             Usuario encontrado o None
         """
-        return self.user_repo.get_by_email(email)
+        cached = principal_cache.get(email)
+        if cached is not None:
+            user = User(**cached)
+            make_transient_to_detached(user)
+            return self.db.merge(user, load=False)
+
+        user = self.user_repo.get_by_email(email)
+        if user is not None:
+            cache_principal(email, user)
+        return user
+
+    def _busy_exception(self) -> HTTPException:
+        """Error para cuando el pool de hashing rechaza trabajo (backpressure)."""
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servicio de autenticación saturado, intente nuevamente",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def get_principal_async(db: AsyncSession, email: str) -> Optional[User]:
+    """
+    Obtener el usuario autenticado para los routers asíncronos.
+
+    Comparte la caché de principales con ``AuthService.get_current_user``; en
+    un acierto retorna el usuario desacoplado sin tocar la base de datos.
+    """
+    cached = principal_cache.get(email)
+    if cached is not None:
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return user
+
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    if user is not None:
+        cache_principal(email, user)
+    return user
@@ -7,6 +7,7 @@ from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.cache import reference_cache
 from app.repositories.category_repository import CategoryRepository
 from app.schemas.category import (
     CategoryCreate,
@@ -15,6 +16,7 @@ from app.schemas.category import (
     CategoryWithProductCount,
 )
 from app.models.category import Category
+from app.services.reference_data import CATEGORIES, category_snapshot, find_category
 
 
 class CategoryService:
@@ -44,6 +46,7 @@ class CategoryService:
             )
 
         category = self.category_repo.create(category_data.model_dump())
+        reference_cache.invalidate(CATEGORIES)
         return CategoryResponse.model_validate(category)
 
     def get_by_id(self, category_id: int) -> CategoryResponse:
@@ -59,13 +62,13 @@ class CategoryService:
         Raises:
             HTTPException: Si no existe
         """
-        category = self.category_repo.get_by_id(category_id)
+        category = find_category(self.db, category_id)
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Categoría no encontrada"
             )
-        return CategoryResponse.model_validate(category)
+        return category
 
     def get_all(
         self,
@@ -94,8 +97,8 @@ class CategoryService:
                 for cat, count in results
             ]
 
-        categories = self.category_repo.get_all(skip, limit)
-        return [CategoryResponse.model_validate(cat) for cat in categories]
+        # Sin conteo de productos el listado sale de la caché de referencia
+        return list(category_snapshot(self.db).items[skip:skip + limit])
 
     def update(self, category_id: int, category_data: CategoryUpdate) -> CategoryResponse:
         """
@@ -129,6 +132,7 @@ class CategoryService:
 
         update_data = category_data.model_dump(exclude_unset=True)
         updated = self.category_repo.update(category_id, update_data)
+        reference_cache.invalidate(CATEGORIES)
         return CategoryResponse.model_validate(updated)
 
     def delete(self, category_id: int) -> bool:
@@ -157,7 +161,9 @@ class CategoryService:
                 detail="No se puede eliminar la categoría porque tiene productos asociados"
             )
 
-        return self.category_repo.delete(category_id)
+        deleted = self.category_repo.delete(category_id)
+        reference_cache.invalidate(CATEGORIES)
+        return deleted
 
     def count(self) -> int:
         """Contar total de categorías."""
@@ -1,30 +1,48 @@
 """
 Servicio de lógica de negocio para gestión de inventario.
 """
-from typing import List, Optional
-from datetime import datetime
+from collections import defaultdict
+from typing import Iterator, List, Optional
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from fastapi import HTTPException, status
 
+from app.core.config import settings
+from app.core.database import SessionLocal
 from app.models.inventory_movement import InventoryMovement, MovementType, MovementReason
-from app.models.product import Product
-from app.repositories.inventory_repository import InventoryMovementRepository
+from app.models.user import User
+from app.repositories.inventory_repository import EXPORT_COLUMNS, InventoryMovementRepository
+from app.repositories.inventory_stats_repository import InventoryStatsRepository
 from app.repositories.product_repository import ProductRepository
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+from app.repositories.reservation_repository import StockReservationRepository
+from app.repositories.stock_shard_repository import StockShardRepository
 from app.schemas.inventory import (
     InventoryMovementCreate,
     InventoryMovementResponse,
     InventoryMovementList,
+    InventoryMovementCursorList,
     InventoryMovementFilter,
+    ProductMinimal,
+    UserMinimal,
     StockAdjustment,
     BatchStockEntry,
     BatchStockEntryRequest,
     LowStockProduct,
     LowStockAlert,
     InventoryStats,
+    StockAsOf,
+    InventoryValuation,
+    StockAvailability,
+    StockShardsUpdate,
+    StockShardsStatus,
     MovementTypeEnum,
     MovementReasonEnum,
+    ExportFormatEnum,
 )
+from app.utils.export import csv_chunks, gzip_chunks, ndjson_chunks
+from app.utils.pagination import encode_cursor, decode_cursor, encode_key_cursor, decode_key_cursor
 
 
 class InventoryService:
@@ -34,6 +52,10 @@ class InventoryService:
         self.db = db
         self.movement_repo = InventoryMovementRepository(db)
         self.product_repo = ProductRepository(db)
+        self.stats_repo = InventoryStatsRepository(db)
+        self.checkpoint_repo = StockCheckpointRepository(db)
+        self.reservation_repo = StockReservationRepository(db)
+        self.shard_repo = StockShardRepository(db)
 
     def get_movement(self, movement_id: int) -> InventoryMovement:
         """Obtener un movimiento por ID."""
@@ -65,6 +87,52 @@ class InventoryService:
             pages=pages
         )
 
+    def get_movements_cursor(
+        self,
+        page_size: int = 20,
+        filters: Optional[InventoryMovementFilter] = None,
+        after: Optional[str] = None,
+        include_total: bool = False
+    ) -> InventoryMovementCursorList:
+        """
+        Obtener movimientos paginados por cursor (keyset).
+
+        El costo es O(page_size) sin importar la profundidad. El total exacto
+        es opcional; por defecto se devuelve una estimación del planificador.
+        """
+        position = None
+        if after:
+            try:
+                position = decode_cursor(after)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor inválido"
+                )
+
+        movements = self.movement_repo.get_page_after(page_size, filters, position)
+        has_more = len(movements) > page_size
+        movements = movements[:page_size]
+
+        next_cursor = None
+        if has_more:
+            last = movements[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        if include_total:
+            total = self.movement_repo.count(filters)
+        else:
+            total = self.movement_repo.estimate_count(filters)
+
+        return InventoryMovementCursorList(
+            items=[InventoryMovementResponse.model_validate(m) for m in movements],
+            page_size=page_size,
+            next_cursor=next_cursor,
+            has_more=has_more,
+            total=total,
+            total_is_estimate=not include_total
+        )
+
     def get_product_movements(
         self,
         product_id: int,
@@ -90,55 +158,34 @@ class InventoryService:
         """
         Crear un movimiento de inventario.
         Actualiza automáticamente el stock del producto.
-        """
-        # Obtener producto
-        product = self.product_repo.get_by_id(data.product_id)
-        if not product:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Producto no encontrado"
-            )
 
-        # Calcular nuevo stock
-        stock_before = product.stock_current
-        
+        El stock se modifica con un UPDATE condicional atómico y el movimiento
+        se inserta en la misma transacción: un solo commit por movimiento y
+        sin carreras entre terminales concurrentes.
+        """
         # Convertir enum de schema a enum de modelo
         movement_type = MovementType(data.movement_type.value)
         reason = MovementReason(data.reason.value)
-        
+
         if movement_type == MovementType.ENTRY:
-            stock_after = stock_before + data.quantity
+            delta = data.quantity
         elif movement_type in (MovementType.EXIT, MovementType.ADJUSTMENT):
-            stock_after = stock_before - data.quantity
-            if stock_after < 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Stock insuficiente. Stock actual: {stock_before}, cantidad solicitada: {data.quantity}"
-                )
+            delta = -data.quantity
         else:
             # Para transferencias u otros tipos futuros
-            stock_after = stock_before
+            delta = 0
 
-        # Crear movimiento
-        movement = self.movement_repo.create(
+        return self._apply_movement(
             product_id=data.product_id,
             movement_type=movement_type,
             reason=reason,
             quantity=data.quantity,
-            stock_before=stock_before,
-            stock_after=stock_after,
+            delta=delta,
             user_id=user_id,
             reference=data.reference,
             notes=data.notes
         )
 
-        # Actualizar stock del producto
-        self.product_repo.update_stock(product.id, stock_after)
-
-        # Recargar con relaciones
-        movement = self.movement_repo.get_by_id(movement.id)
-        return InventoryMovementResponse.model_validate(movement)
-
     def add_stock(
         self,
         product_id: int,
@@ -188,50 +235,79 @@ class InventoryService:
         Ajustar el stock de un producto a un valor específico.
         Crea un movimiento de ajuste automáticamente.
         """
-        product = self.product_repo.get_by_id(data.product_id)
+        # Bloquear la fila para que el valor leído no cambie antes del UPDATE
+        product = self.product_repo.get_for_update(data.product_id)
         if not product:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Producto no encontrado"
             )
 
-        stock_before = product.stock_current
+        # En modo repartido el total exacto sale de plegar los slots; el
+        # bloqueo exclusivo deja afuera a los escritores mientras tanto
+        if product.stock_shards:
+            stock_before = self.shard_repo.fold(data.product_id)
+        else:
+            stock_before = product.stock_current
         stock_after = data.new_stock
-        difference = abs(stock_after - stock_before)
+        delta = stock_after - stock_before
 
-        if difference == 0:
+        if delta == 0:
+            self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="El nuevo stock es igual al actual"
             )
 
+        # Con la fila bloqueada, lo reservado no puede cambiar hasta el commit
+        # (las reservas bloquean el producto antes de sumar sus unidades)
+        if delta < 0:
+            reserved = self.reservation_repo.get_reserved([data.product_id]).get(data.product_id, 0)
+            if stock_after < reserved:
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"El nuevo stock ({stock_after}) es menor que lo reservado ({reserved})"
+                )
+
         # Determinar tipo de movimiento
-        if stock_after > stock_before:
+        if delta > 0:
             movement_type = MovementType.ENTRY
         else:
             movement_type = MovementType.ADJUSTMENT
-
         reason = MovementReason(data.reason.value)
+        notes = data.notes or f"Ajuste de stock: {stock_before} → {stock_after}"
+
+        if product.stock_shards:
+            self.shard_repo.apply_delta(data.product_id, delta, product.stock_shards)
+            self.shard_repo.fold(data.product_id)
+            return self._record_movement(
+                product_id=data.product_id,
+                sku=product.sku,
+                name=product.name,
+                movement_type=movement_type,
+                reason=reason,
+                quantity=abs(delta),
+                stock_before=stock_before,
+                stock_after=stock_after,
+                user_id=user_id,
+                reference=None,
+                notes=notes
+            )
 
-        # Crear movimiento de ajuste
-        movement = self.movement_repo.create(
+        return self._apply_movement(
             product_id=data.product_id,
             movement_type=movement_type,
             reason=reason,
-            quantity=difference,
-            stock_before=stock_before,
-            stock_after=stock_after,
+            quantity=abs(delta),
+            delta=delta,
             user_id=user_id,
             reference=None,
-            notes=data.notes or f"Ajuste de stock: {stock_before} → {stock_after}"
+            notes=notes,
+            check_reserved=False
         )
 
-        # Actualizar stock del producto
-        self.product_repo.update_stock(product.id, stock_after)
-
-        movement = self.movement_repo.get_by_id(movement.id)
-        return InventoryMovementResponse.model_validate(movement)
-
     def batch_stock_entry(
         self,
         data: BatchStockEntryRequest,
@@ -240,116 +316,423 @@ class InventoryService:
         """
         Entrada masiva de stock (para compras).
         Procesa múltiples productos en una sola transacción.
+
+        Operaciones en bloque, independientes del número de líneas:
+        bloqueo de productos en orden de id, un UPDATE para todos los deltas,
+        un INSERT multi-fila para los movimientos y una consulta final.
         """
-        results = []
-        
+        deltas: dict[int, int] = defaultdict(int)
         for item in data.items:
-            movement = self.add_stock(
-                product_id=item.product_id,
-                quantity=item.quantity,
-                reason=MovementReasonEnum.PURCHASE,
-                reference=item.reference or data.reference,
-                notes=item.notes,
-                user_id=user_id
-            )
-            results.append(movement)
-        
-        return results
-
-    def get_low_stock_products(self) -> LowStockAlert:
-        """Obtener productos con bajo stock o sin stock."""
-        # Query para productos con stock menor al mínimo
-        products = (
-            self.db.query(Product)
-            .filter(Product.is_active == True)
-            .filter(Product.stock_current < Product.stock_min)
-            .order_by(
-                (Product.stock_current - Product.stock_min).asc()  # Más críticos primero
+            deltas[item.product_id] += item.quantity
+
+        locked = self.product_repo.lock_stock_rows(deltas.keys())
+        missing = sorted(set(deltas) - set(locked))
+        if missing:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Productos no encontrados: {', '.join(str(pid) for pid in missing)}"
             )
-            .all()
-        )
 
-        low_stock_products = []
-        critical_count = 0
-        warning_count = 0
+        sharded = {pid: row.stock_shards for pid, row in locked.items() if row.stock_shards}
+        self.product_repo.apply_stock_deltas({pid: delta for pid, delta in deltas.items() if pid not in sharded})
+        self.shard_repo.apply_deltas({pid: deltas[pid] for pid in sharded}, sharded)
+
+        # Stock antes/después de cada línea, respetando el orden del lote
+        # (desconocido en los productos repartidos hasta el plegado)
+        running_stock = {pid: row.stock_current for pid, row in locked.items()}
+        rows = []
+        for item in data.items:
+            stock_before = stock_after = None
+            if item.product_id not in sharded:
+                stock_before = running_stock[item.product_id]
+                stock_after = stock_before + item.quantity
+                running_stock[item.product_id] = stock_after
+            rows.append({
+                "product_id": item.product_id,
+                "movement_type": MovementType.ENTRY.value,
+                "reason": MovementReason.PURCHASE.value,
+                "quantity": item.quantity,
+                "stock_before": stock_before,
+                "stock_after": stock_after,
+                "user_id": user_id,
+                "reference": item.reference or data.reference,
+                "notes": item.notes,
+            })
+
+        movement_keys = self.movement_repo.bulk_add(rows)
+        self.db.commit()
+
+        movements = self.movement_repo.get_by_keys(movement_keys)
+        return [InventoryMovementResponse.model_validate(m) for m in movements]
 
-        for product in products:
-            deficit = product.stock_min - product.stock_current
-            
-            if product.stock_current == 0:
-                critical_count += 1
-            else:
-                warning_count += 1
+    def get_low_stock_products(self, limit: int = 100, after: Optional[str] = None) -> LowStockAlert:
+        """
+        Obtener productos con bajo stock o sin stock, más críticos primero.
 
-            low_stock_products.append(LowStockProduct(
-                id=product.id,
-                sku=product.sku,
-                name=product.name,
-                stock_current=product.stock_current,
-                stock_min=product.stock_min,
-                stock_deficit=deficit,
-                category_name=product.category.name if product.category else None,
-                supplier_name=product.supplier.name if product.supplier else None
-            ))
+        Una sola consulta trae la página (proyección con nombres de categoría
+        y proveedor) y los totales del conjunto completo. Para catálogos con
+        miles de productos bajo mínimo se pagina con ``after``.
+        """
+        position = None
+        if after:
+            try:
+                position = decode_key_cursor(after, 2)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor inválido"
+                )
+
+        rows = self.product_repo.get_low_stock_alerts(limit, position)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        if rows:
+            total_products, critical_count = rows[0].total_products, rows[0].critical_count
+        else:
+            total_products = critical_count = 0
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_key_cursor(last.stock_deficit, last.id)
 
         return LowStockAlert(
-            total_products=len(products),
+            total_products=total_products,
             critical_count=critical_count,
-            warning_count=warning_count,
-            products=low_stock_products
+            warning_count=total_products - critical_count,
+            products=[LowStockProduct.model_validate(row) for row in rows],
+            next_cursor=next_cursor,
+            has_more=has_more
         )
 
     def get_inventory_stats(self) -> InventoryStats:
-        """Obtener estadísticas generales del inventario."""
-        # Total de productos activos
-        total_products = (
-            self.db.query(func.count(Product.id))
-            .filter(Product.is_active == True)
-            .scalar() or 0
-        )
+        """
+        Obtener estadísticas generales del inventario en un solo round trip.
 
-        # Valor total del inventario (stock_current * cost)
-        total_value = (
-            self.db.query(func.sum(Product.stock_current * Product.cost))
-            .filter(Product.is_active == True)
-            .scalar() or 0
-        )
+        Por defecto lee el snapshot que los triggers mantienen al escribir
+        productos y movimientos; con INVENTORY_STATS_FROM_SNAPSHOT=False usa
+        agregación condicional sobre las tablas. Los días se cuentan en
+        INVENTORY_STATS_TIMEZONE, la misma zona con la que el trigger agrupa.
+        """
+        now = datetime.now(ZoneInfo(settings.INVENTORY_STATS_TIMEZONE))
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_start = today - timedelta(days=today.weekday())
+        month_start = today.replace(day=1)
 
-        # Productos con bajo stock
-        low_stock_count = (
-            self.db.query(func.count(Product.id))
-            .filter(Product.is_active == True)
-            .filter(Product.stock_current < Product.stock_min)
-            .filter(Product.stock_current > 0)
-            .scalar() or 0
+        if settings.INVENTORY_STATS_FROM_SNAPSHOT:
+            row = self.stats_repo.get_snapshot(today.date(), week_start.date(), month_start.date())
+        else:
+            row = self.stats_repo.get_live(today, week_start, month_start)
+
+        return InventoryStats(
+            total_products=row.total_products,
+            total_stock_value=float(row.total_stock_value),
+            low_stock_count=row.low_stock_count,
+            out_of_stock_count=row.out_of_stock_count,
+            movements_today=row.movements_today,
+            movements_this_week=row.movements_this_week,
+            movements_this_month=row.movements_this_month
         )
 
-        # Productos sin stock
-        out_of_stock_count = (
-            self.db.query(func.count(Product.id))
-            .filter(Product.is_active == True)
-            .filter(Product.stock_current == 0)
-            .scalar() or 0
+    def get_stock_as_of(self, product_id: int, at: Optional[datetime] = None) -> StockAsOf:
+        """
+        Stock de un producto en el instante ``at`` (por defecto, ahora).
+
+        Parte del checkpoint diario más reciente anterior a ``at`` y solo
+        revisa los movimientos desde ese cierre. El valor usa el costo actual:
+        no se guarda historial de costos.
+        """
+        at = as_of_instant(at)
+        row = self.checkpoint_repo.get_product_stock(product_id, at)
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Producto no encontrado"
+            )
+        stock = row.stock if row.existed else 0
+        return StockAsOf(
+            product_id=row.id,
+            sku=row.sku,
+            name=row.name,
+            at=at,
+            stock=stock,
+            stock_value=float(stock * row.cost),
+            checkpoint_day=row.checkpoint_day
         )
 
-        # Movimientos por período
-        movements_today = self.movement_repo.count_today()
-        movements_week = self.movement_repo.count_this_week()
-        movements_month = self.movement_repo.count_this_month()
+    def get_inventory_valuation(self, at: Optional[datetime] = None) -> InventoryValuation:
+        """
+        Unidades y valor de los productos activos en el instante ``at``.
 
-        return InventoryStats(
-            total_products=total_products,
-            total_stock_value=float(total_value),
-            low_stock_count=low_stock_count,
-            out_of_stock_count=out_of_stock_count,
-            movements_today=movements_today,
-            movements_this_week=movements_week,
-            movements_this_month=movements_month
+        Mismo cálculo que ``get_stock_as_of`` para todos los productos en una
+        consulta; con ``at`` = ahora coincide con ``total_stock_value`` de las
+        estadísticas.
+        """
+        at = as_of_instant(at)
+        row = self.checkpoint_repo.get_valuation(at)
+        return InventoryValuation(
+            at=at,
+            total_products=row.total_products,
+            total_units=row.total_units,
+            total_stock_value=float(row.total_value),
+            checkpoint_day=row.checkpoint_day
         )
 
     def validate_stock_available(self, product_id: int, quantity: int) -> bool:
-        """Validar si hay stock disponible para una cantidad específica."""
+        """Validar si hay stock disponible (descontando lo reservado) para una cantidad específica."""
+        row = self.reservation_repo.get_availability(product_id)
+        if not row:
+            return False
+        return row.stock_available >= quantity
+
+    def get_stock_availability(self, product_id: int, quantity: int) -> StockAvailability:
+        """
+        Stock actual, reservado y disponible de un producto.
+
+        Es una lectura por clave primaria de ``products`` y del total
+        reservado, que mantiene un trigger: no bloquea ni recorre reservas.
+        Un producto inexistente se informa como no disponible y sin stock.
+        """
+        row = self.reservation_repo.get_availability(product_id)
+        if not row:
+            return StockAvailability(
+                product_id=product_id,
+                quantity_requested=quantity,
+                available=False,
+                stock_current=0,
+                stock_reserved=0,
+                stock_available=0
+            )
+        return StockAvailability(
+            product_id=product_id,
+            quantity_requested=quantity,
+            available=row.stock_available >= quantity,
+            stock_current=row.stock_current,
+            stock_reserved=row.stock_reserved,
+            stock_available=row.stock_available
+        )
+
+    def get_stock_shards(self, product_id: int) -> StockShardsStatus:
+        """Modo de stock de un producto y el stock de cada slot."""
         product = self.product_repo.get_by_id(product_id)
         if not product:
-            return False
-        return product.stock_current >= quantity
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Producto no encontrado"
+            )
+        shard_stock = self.shard_repo.get_shards(product_id) if product.stock_shards else []
+        return StockShardsStatus(
+            product_id=product_id,
+            shards=product.stock_shards,
+            stock_current=sum(shard_stock) if product.stock_shards else product.stock_current,
+            shard_stock=shard_stock
+        )
+
+    def set_stock_shards(self, product_id: int, data: StockShardsUpdate) -> StockShardsStatus:
+        """
+        Activar, cambiar o desactivar el modo repartido de un producto.
+
+        Con el producto bloqueado en exclusiva (espera a los escritores en
+        curso) se pliegan los slots actuales en stock_current y se reparte
+        de nuevo en ``shards`` slots; 0 vuelve al modo normal. Un producto
+        con reservas vigentes no puede pasar a modo repartido (409).
+        """
+        if data.shards > settings.STOCK_SHARDS_MAX:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"El máximo de slots por producto es {settings.STOCK_SHARDS_MAX}"
+            )
+
+        product = self.product_repo.get_for_update(product_id)
+        if not product:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Producto no encontrado"
+            )
+        stock = product.stock_current
+        if product.stock_shards:
+            stock = self.shard_repo.fold(product_id)
+            self.shard_repo.remove(product_id)
+        if data.shards:
+            if self.reservation_repo.get_reserved([product_id]).get(product_id):
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="El producto tiene reservas vigentes"
+                )
+            self.shard_repo.create(product_id, data.shards, stock)
+        self.db.commit()
+        return self.get_stock_shards(product_id)
+
+    def _apply_movement(
+        self,
+        product_id: int,
+        movement_type: MovementType,
+        reason: MovementReason,
+        quantity: int,
+        delta: int,
+        user_id: Optional[int],
+        reference: Optional[str],
+        notes: Optional[str],
+        check_reserved: bool = True
+    ) -> InventoryMovementResponse:
+        """
+        Aplicar un delta de stock y registrar su movimiento en una transacción.
+
+        Round trips: UPDATE ... RETURNING, INSERT ... RETURNING y COMMIT.
+        La respuesta se arma con los datos devueltos, sin recargar el movimiento.
+        Una salida no puede tomar unidades reservadas: lo reservado se lee
+        después del UPDATE, con la fila ya bloqueada, igual que en
+        SaleService.lock_lines (``check_reserved=False`` si el llamador ya
+        lo verificó bajo su bloqueo). En un producto repartido el delta va a
+        sus slots y el movimiento queda sin stock antes/después hasta el
+        próximo plegado.
+        """
+        row = self.product_repo.apply_stock_delta(product_id, delta)
+        if row is not None:
+            stock_after = row.stock_current
+            stock_before = stock_after - delta
+            if check_reserved and delta < 0:
+                reserved = self.reservation_repo.get_reserved([product_id]).get(product_id, 0)
+                if stock_after < reserved:
+                    self.db.rollback()
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Stock insuficiente. Stock disponible: {stock_before - reserved} "
+                               f"(reservado: {reserved}), cantidad solicitada: {quantity}"
+                    )
+        else:
+            # El UPDATE no afectó filas: producto repartido, inexistente o stock insuficiente
+            row = self.shard_repo.lock_and_apply(product_id, delta)
+            if row is None:
+                product = self.product_repo.get_by_id(product_id)
+                self.db.rollback()
+                if not product:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Producto no encontrado"
+                    )
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Stock insuficiente. Stock actual: {product.stock_current}, cantidad solicitada: {quantity}"
+                )
+            if not row.applied:
+                total = self.shard_repo.get_totals([product_id]).get(product_id, 0)
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Stock insuficiente. Stock actual: {total}, cantidad solicitada: {quantity}"
+                )
+            stock_before = stock_after = None
+
+        return self._record_movement(
+            product_id=product_id,
+            sku=row.sku,
+            name=row.name,
+            movement_type=movement_type,
+            reason=reason,
+            quantity=quantity,
+            stock_before=stock_before,
+            stock_after=stock_after,
+            user_id=user_id,
+            reference=reference,
+            notes=notes
+        )
+
+    def _record_movement(
+        self,
+        product_id: int,
+        sku: str,
+        name: str,
+        movement_type: MovementType,
+        reason: MovementReason,
+        quantity: int,
+        stock_before: Optional[int],
+        stock_after: Optional[int],
+        user_id: Optional[int],
+        reference: Optional[str],
+        notes: Optional[str]
+    ) -> InventoryMovementResponse:
+        """Insertar el movimiento de un stock ya modificado, armar la respuesta y hacer commit."""
+        movement = self.movement_repo.add(
+            product_id=product_id,
+            movement_type=movement_type,
+            reason=reason,
+            quantity=quantity,
+            stock_before=stock_before,
+            stock_after=stock_after,
+            user_id=user_id,
+            reference=reference,
+            notes=notes
+        )
+
+        # El usuario autenticado ya está en el identity map de la sesión
+        user = self.db.get(User, user_id) if user_id else None
+        response = InventoryMovementResponse(
+            id=movement.id,
+            product_id=movement.product_id,
+            movement_type=movement.movement_type,
+            reason=movement.reason,
+            quantity=movement.quantity,
+            stock_before=movement.stock_before,
+            stock_after=movement.stock_after,
+            reference=movement.reference,
+            notes=movement.notes,
+            user_id=movement.user_id,
+            created_at=movement.created_at,
+            product=ProductMinimal(id=product_id, sku=sku, name=name),
+            user=UserMinimal.model_validate(user) if user else None
+        )
+
+        self.db.commit()
+        return response
+
+
+def as_of_instant(at: Optional[datetime]) -> datetime:
+    """
+    Normalizar el instante de una consulta histórica.
+
+    Retorna un instante con zona en INVENTORY_STATS_TIMEZONE, la zona de los
+    días de checkpoints y estadísticas; una fecha sin zona se interpreta en
+    ella. Sin fecha se usa ahora; una fecha futura es un error.
+    """
+    zone = ZoneInfo(settings.INVENTORY_STATS_TIMEZONE)
+    now = datetime.now(zone)
+    if at is None:
+        return now
+    at = at.replace(tzinfo=zone) if at.tzinfo is None else at.astimezone(zone)
+    if at > now:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="La fecha no puede ser futura"
+        )
+    return at
+
+
+def stream_movements_export(
+    filters: Optional[InventoryMovementFilter],
+    export_format: ExportFormatEnum,
+    compress: bool = False
+) -> Iterator[bytes]:
+    """
+    Generar la exportación de movimientos como flujo de bytes.
+
+    Usa su propia sesión: el cuerpo de un StreamingResponse se envía después
+    de cerrar la sesión de la dependencia ``get_db``. La sesión vive mientras
+    dura la descarga y se cierra aunque el cliente corte la conexión.
+    """
+    db = SessionLocal()
+    try:
+        batches = InventoryMovementRepository(db).iter_export_batches(
+            filters, batch_size=settings.EXPORT_BATCH_SIZE
+        )
+        if export_format == ExportFormatEnum.CSV:
+            chunks = csv_chunks(EXPORT_COLUMNS, batches)
+        else:
+            chunks = ndjson_chunks(EXPORT_COLUMNS, batches)
+        yield from gzip_chunks(chunks) if compress else chunks
+    finally:
+        db.close()
@@ -0,0 +1,26 @@
+"""
+Mantenimiento de las particiones mensuales de inventory_movements.
+
+La tabla está particionada por mes de ``created_at``. Las particiones se
+crean con meses de anticipación (INVENTORY_PARTITIONS_AHEAD); si aun así
+falta alguna, los movimientos caen en la partición por defecto y se mueven
+a la suya cuando se crea.
+"""
+import logging
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.inventory_repository import InventoryMovementRepository
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_movement_partitions(months_ahead: int = settings.INVENTORY_PARTITIONS_AHEAD) -> int:
+    """Crear las particiones que falten hasta ``months_ahead`` meses adelante; retorna cuántas."""
+    with SessionLocal() as db:
+        created = InventoryMovementRepository(db).create_partitions(months_ahead)
+        db.commit()
+    if created:
+        logger.info("Creadas %d particiones de inventory_movements", created)
+    return created
+
@@ -0,0 +1,155 @@
+"""
+Relay del outbox de inventario (ver InventoryOutboxRepository).
+
+Cada vuelta entrega los eventos pendientes por lotes, en orden de id, al
+destino configurado y después los borra. La lectura confirma antes de
+enviar: ninguna transacción queda abierta mientras el destino responde
+(hasta OUTBOX_HTTP_TIMEOUT_SECONDS). Si el destino falla o el worker cae
+antes de borrar, el lote sigue en la cola y se reintenta: entrega al
+menos una vez. Con varios workers, un advisory lock de sesión deja a uno
+solo leyendo, entregando y borrando.
+
+Orden: los movimientos de un producto toman su fila con un bloqueo hasta
+el commit, así que sus ids (y sus eventos) siguen el orden en que cambió
+el stock. Entre productos distintos, una transacción que confirma tarde
+puede entregar un id menor después de uno mayor.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.metrics import register_metrics
+from app.repositories.outbox_repository import InventoryOutboxRepository
+from app.services.outbox_sinks import OutboxBatch, OutboxSink, OutboxSinkError, create_outbox_sink
+
+logger = logging.getLogger(__name__)
+
+# Ventana del throughput reportado en las métricas
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+
+class OutboxRelayMetrics:
+    """Métricas del relay en este worker: volumen, throughput y atraso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._window: deque[tuple[float, int]] = deque()
+        self.delivered = 0
+        self.batches = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_delivered_id: Optional[int] = None
+        self.last_delivery_at: Optional[datetime] = None
+        self.delivery_lag_seconds = 0.0
+        self.send_seconds = 0.0
+        self.pending = 0
+        self.oldest_pending_seconds = 0.0
+
+    def record_batch(self, batch: OutboxBatch, oldest: datetime, send_seconds: float) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._window.append((time.monotonic(), len(batch.events)))
+            self.delivered += len(batch.events)
+            self.batches += 1
+            self.last_delivered_id = batch.last_id
+            self.last_delivery_at = now
+            # Cuánto esperó el evento más viejo del lote desde su commit
+            self.delivery_lag_seconds = max(0.0, (now - oldest).total_seconds())
+            self.send_seconds = send_seconds
+
+    def record_failure(self, error: str) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+
+    def record_backlog(self, pending: int, oldest: Optional[datetime]) -> None:
+        with self._lock:
+            self.pending = pending
+            self.oldest_pending_seconds = (
+                max(0.0, (datetime.now(timezone.utc) - oldest).total_seconds()) if oldest else 0.0
+            )
+
+    def stats(self) -> dict[str, Any]:
+        cutoff = time.monotonic() - THROUGHPUT_WINDOW_SECONDS
+        with self._lock:
+            while self._window and self._window[0][0] < cutoff:
+                self._window.popleft()
+            return {
+                "sink": _sink.describe() if _sink else settings.OUTBOX_SINK,
+                "delivered": self.delivered,
+                "batches": self.batches,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "last_delivered_id": self.last_delivered_id,
+                "last_delivery_at": self.last_delivery_at.isoformat() if self.last_delivery_at else None,
+                "events_per_second": round(sum(n for _, n in self._window) / THROUGHPUT_WINDOW_SECONDS, 2),
+                "delivery_lag_seconds": round(self.delivery_lag_seconds, 3),
+                "last_send_seconds": round(self.send_seconds, 4),
+                "pending": self.pending,
+                "oldest_pending_seconds": round(self.oldest_pending_seconds, 3),
+            }
+
+
+relay_metrics = OutboxRelayMetrics()
+register_metrics("inventory_outbox", relay_metrics.stats)
+
+_sink: Optional[OutboxSink] = None
+
+
+def get_outbox_sink() -> OutboxSink:
+    """Destino configurado en OUTBOX_SINK (uno por worker)."""
+    global _sink
+    if _sink is None:
+        _sink = create_outbox_sink()
+    return _sink
+
+
+def relay_inventory_outbox(sink: Optional[OutboxSink] = None) -> int:
+    """Entregar todo lo pendiente; retorna cuántos eventos se entregaron."""
+    sink = sink or get_outbox_sink()
+    batch_size = settings.OUTBOX_BATCH_SIZE
+    total = 0
+    # Sesión atada a una conexión: el lock es de sesión y abarca las
+    # transacciones de todos los lotes
+    with engine.connect() as connection, SessionLocal(bind=connection) as db:
+        repo = InventoryOutboxRepository(db)
+        locked = repo.try_lock()
+        db.commit()
+        try:
+            while locked:
+                rows = repo.get_batch(batch_size)
+                db.commit()
+                if not rows:
+                    break
+                batch = OutboxBatch(rows[0].id, rows[-1].id, [row.body for row in rows])
+                start = time.perf_counter()
+                try:
+                    sink.send(batch)
+                except OutboxSinkError as exc:
+                    relay_metrics.record_failure(str(exc))
+                    logger.warning("Outbox: no se pudo entregar %d-%d: %s", batch.first_id, batch.last_id, exc)
+                    break
+                send_seconds = time.perf_counter() - start
+                repo.delete([row.id for row in rows])
+                db.commit()
+                relay_metrics.record_batch(batch, min(row.created_at for row in rows), send_seconds)
+                total += len(rows)
+                if len(rows) < batch_size:
+                    break
+        finally:
+            if locked:
+                db.rollback()
+                repo.unlock()
+                db.commit()
+
+        backlog = repo.get_backlog()
+        db.rollback()
+        relay_metrics.record_backlog(backlog.pending if backlog else 0, backlog.oldest_created_at if backlog else None)
+    if total:
+        logger.debug("Outbox: %d eventos entregados a %s", total, sink.describe())
+    return total
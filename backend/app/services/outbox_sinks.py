@@ -0,0 +1,117 @@
+"""
+Destinos del outbox de inventario.
+
+Un destino recibe lotes de eventos ya serializados, en orden, y debe
+fallar con ``OutboxSinkError`` si no pudo guardarlos: el relay no borra el
+lote y lo reintenta en la siguiente vuelta (entrega al menos una vez; el
+consumidor descarta repetidos por ``id``). Se elige con OUTBOX_SINK; otros
+destinos se agregan con ``register_outbox_sink``.
+"""
+import os
+import urllib.error
+import urllib.request
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+
+class OutboxSinkError(Exception):
+    """El destino no confirmó el lote."""
+
+
+@dataclass(frozen=True)
+class OutboxBatch:
+    """Lote de eventos (JSON) en orden de id."""
+    first_id: int
+    last_id: int
+    events: list[str]
+
+
+class OutboxSink(ABC):
+    """Destino de los eventos del outbox."""
+
+    name: str = ""
+
+    @abstractmethod
+    def send(self, batch: OutboxBatch) -> None:
+        """Entregar el lote completo o lanzar ``OutboxSinkError``."""
+
+    def describe(self) -> str:
+        return self.name
+
+
+class FileSink(OutboxSink):
+    """Agrega los eventos a un archivo NDJSON (una línea por evento)."""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, batch: OutboxBatch) -> None:
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write("\n".join(batch.events) + "\n")
+                file.flush()
+                # Confirmado solo cuando está en disco: después el lote se borra
+                os.fsync(file.fileno())
+        except OSError as exc:
+            raise OutboxSinkError(f"No se pudo escribir {self.path}: {exc}") from exc
+
+    def describe(self) -> str:
+        return f"file:{self.path}"
+
+
+class HttpSink(OutboxSink):
+    """
+    Envía cada lote como un array JSON en un POST; cualquier 2xx confirma.
+
+    ``Idempotency-Key`` identifica el lote (rango de ids) para que el
+    receptor pueda ignorar un reintento.
+    """
+
+    name = "http"
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, batch: OutboxBatch) -> None:
+        body = ("[" + ",".join(batch.events) + "]").encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, method="POST", headers={
+            "Content-Type": "application/json",
+            "Idempotency-Key": f"inventory-outbox-{batch.first_id}-{batch.last_id}",
+        })
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except (urllib.error.URLError, OSError) as exc:
+            raise OutboxSinkError(f"POST {self.url} falló: {exc}") from exc
+
+    def describe(self) -> str:
+        return f"http:{self.url}"
+
+
+_factories: dict[str, Callable[[], OutboxSink]] = {
+    FileSink.name: lambda: FileSink(settings.OUTBOX_FILE_PATH),
+    HttpSink.name: lambda: HttpSink(settings.OUTBOX_HTTP_URL, settings.OUTBOX_HTTP_TIMEOUT_SECONDS),
+}
+
+
+def register_outbox_sink(name: str, factory: Callable[[], OutboxSink]) -> None:
+    """Registrar un destino para usarlo con ``OUTBOX_SINK=name``."""
+    _factories[name] = factory
+
+
+def create_outbox_sink(name: Optional[str] = None) -> OutboxSink:
+    """Crear el destino ``name`` (por defecto OUTBOX_SINK)."""
+    name = name or settings.OUTBOX_SINK
+    factory = _factories.get(name)
+    if factory is None:
+        raise ValueError(f"Destino de outbox desconocido: {name!r} (disponibles: {', '.join(_factories)})")
+    return factory()
@@ -0,0 +1,213 @@
+"""
+Servicio de importación masiva de productos desde CSV o XLSX.
+"""
+from itertools import islice
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.product_import_repository import ProductImportRepository
+from app.schemas.product import ProductCreate, ProductImportResult, ProductImportRowError
+from app.services.product_references import MAX_AMOUNT, MAX_INTEGER, ProductReferenceChecker
+from app.utils.import_readers import ImportFileError, ImportRow, iter_csv_rows, iter_xlsx_rows
+
+IMPORT_FIELDS = tuple(ProductCreate.model_fields)
+TEXT_FIELDS = ("sku", "name", "description")
+
+
+class ProductImportService:
+    """
+    Importación de catálogos completos en una sola transacción.
+
+    El archivo se recorre en streaming y se valida por lotes: los campos con
+    ``ProductCreate`` y las referencias (categorías, proveedores y, si no se
+    actualizan existentes, SKUs) con una consulta por lote. Las filas
+    válidas se cargan con COPY a una tabla de staging y pasan a products con
+    un único upsert. Las filas inválidas no se importan y se informan con
+    su número de fila.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.import_repo = ProductImportRepository(db)
+        self.references = ProductReferenceChecker(db)
+
+    def import_file(
+        self,
+        file: BinaryIO,
+        filename: str,
+        update_existing: bool = True,
+        dry_run: bool = False
+    ) -> ProductImportResult:
+        """
+        Importar productos desde ``file``.
+
+        Args:
+            file: Archivo binario (CSV o XLSX)
+            filename: Nombre original, define el formato por su extensión
+            update_existing: Actualizar los SKU existentes (si es False, son errores)
+            dry_run: Validar y calcular el resultado sin guardar cambios
+
+        Returns:
+            Conteo de filas creadas, actualizadas y con error
+
+        Raises:
+            HTTPException: Si el formato no es soportado o el archivo no se puede leer
+        """
+        rows = self._read(file, filename)
+        errors: list[ProductImportRowError] = []
+        seen_skus: dict[str, int] = {}
+        total_rows = valid_rows = 0
+
+        try:
+            self.import_repo.create_staging()
+            for chunk in _chunks(rows, settings.PRODUCT_IMPORT_CHUNK_SIZE):
+                total_rows += len(chunk)
+                valid = self._validate_chunk(chunk, seen_skus, update_existing, errors)
+                valid_rows += len(valid)
+                self.import_repo.copy_to_staging(valid)
+
+            created, updated = self.import_repo.upsert_from_staging(update_existing)
+            if dry_run:
+                self.db.rollback()
+            else:
+                self.db.commit()
+        except ImportFileError as exc:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No se pudo leer el archivo: {exc}"
+            )
+        except Exception:
+            self.db.rollback()
+            raise
+
+        errors.sort(key=lambda error: error.row)
+        max_errors = settings.PRODUCT_IMPORT_MAX_ERRORS
+        return ProductImportResult(
+            total_rows=total_rows,
+            created=created,
+            updated=updated,
+            skipped=valid_rows - created - updated,
+            failed=len(errors),
+            dry_run=dry_run,
+            errors=errors[:max_errors],
+            errors_truncated=len(errors) > max_errors
+        )
+
+    def _read(self, file: BinaryIO, filename: str) -> Iterator[ImportRow]:
+        """Elegir el lector según la extensión del archivo."""
+        extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        if extension == "csv":
+            return iter_csv_rows(file)
+        if extension == "xlsx":
+            return iter_xlsx_rows(file)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato no soportado: use un archivo .csv o .xlsx"
+        )
+
+    def _validate_chunk(
+        self,
+        chunk: list[ImportRow],
+        seen_skus: dict[str, int],
+        update_existing: bool,
+        errors: list[ProductImportRowError]
+    ) -> list[tuple]:
+        """
+        Validar un lote y retornar las filas listas para staging.
+
+        Los errores se agregan a ``errors``; ``seen_skus`` detecta SKUs
+        repetidos entre lotes.
+        """
+        parsed: list[tuple[int, ProductCreate]] = []
+        for row_number, raw in chunk:
+            product, message = _parse_row(raw)
+            if product is None:
+                sku = raw.get("sku")
+                errors.append(ProductImportRowError(
+                    row=row_number,
+                    sku=str(sku) if sku is not None else None,
+                    message=message
+                ))
+                continue
+            first_row = seen_skus.setdefault(product.sku, row_number)
+            if first_row != row_number:
+                errors.append(ProductImportRowError(
+                    row=row_number,
+                    sku=product.sku,
+                    message=f"SKU duplicado en el archivo (fila {first_row})"
+                ))
+                continue
+            parsed.append((row_number, product))
+
+        self.references.load(
+            (product.category_id for _, product in parsed),
+            (product.supplier_id for _, product in parsed),
+        )
+        existing_skus = (
+            set() if update_existing
+            else self.import_repo.existing_skus(product.sku for _, product in parsed)
+        )
+
+        valid = []
+        for row_number, product in parsed:
+            message = self._reference_error(product, existing_skus)
+            if message:
+                errors.append(ProductImportRowError(row=row_number, sku=product.sku, message=message))
+                continue
+            valid.append((
+                row_number,
+                product.sku,
+                product.name,
+                product.description,
+                product.category_id,
+                product.supplier_id,
+                product.stock_current,
+                product.stock_min,
+                product.cost,
+                product.price,
+            ))
+        return valid
+
+    def _reference_error(self, product: ProductCreate, existing_skus: set[str]) -> Optional[str]:
+        """Mismas reglas que ``ProductService.create`` sobre datos ya consultados."""
+        if product.sku in existing_skus:
+            return f"Ya existe un producto con el SKU: {product.sku}"
+        return self.references.error(product.category_id, product.supplier_id)
+
+
+def _parse_row(raw: dict[str, Any]) -> tuple[Optional[ProductCreate], str]:
+    """Validar una fila con ProductCreate; retorna (producto, "") o (None, mensaje)."""
+    data = {field: raw[field] for field in IMPORT_FIELDS if raw.get(field) is not None}
+    for field in TEXT_FIELDS:
+        # Celdas numéricas de XLSX en columnas de texto (ej. SKU 12345)
+        if field in data and not isinstance(data[field], str):
+            data[field] = str(data[field])
+    for field in ("cost", "price"):
+        # Planillas en español: "1,50" como decimal
+        value = data.get(field)
+        if isinstance(value, str) and "," in value and "." not in value:
+            data[field] = value.replace(",", ".")
+    try:
+        product = ProductCreate.model_validate(data)
+    except ValidationError as exc:
+        return None, "; ".join(
+            f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in exc.errors()
+        )
+
+    if product.cost >= MAX_AMOUNT or product.price >= MAX_AMOUNT:
+        return None, "cost/price: el monto excede el máximo permitido"
+    if product.stock_current > MAX_INTEGER or product.stock_min > MAX_INTEGER:
+        return None, "stock_current/stock_min: el valor excede el máximo permitido"
+    return product, ""
+
+
+def _chunks(rows: Iterable[ImportRow], size: int) -> Iterator[list[ImportRow]]:
+    """Agrupar las filas en listas de ``size`` elementos."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,53 @@
+"""
+Validación por lotes de las referencias de productos (categoría y proveedor).
+"""
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.supplier_repository import SupplierRepository
+
+# Límites de las columnas de products (numeric(10, 2) e integer): en cargas
+# masivas un valor fuera de rango abortaría la sentencia de todo el lote
+MAX_AMOUNT = Decimal("100000000")
+MAX_INTEGER = 2**31 - 1
+
+
+class ProductReferenceChecker:
+    """
+    Verifica categorías y proveedores de muchos productos con pocas consultas.
+
+    ``load`` consulta de una vez los ids aún no vistos y los recuerda, así
+    un catálogo con miles de filas hace una consulta por lote y no por fila.
+    Los mensajes son los mismos que usa ``ProductService``.
+    """
+
+    def __init__(self, db: Session):
+        self.category_repo = CategoryRepository(db)
+        self.supplier_repo = SupplierRepository(db)
+        self._categories: dict[int, bool] = {}
+        self._suppliers: dict[int, Optional[bool]] = {}
+
+    def load(self, category_ids: Iterable[Optional[int]], supplier_ids: Iterable[Optional[int]]) -> None:
+        """Consultar en bloque las categorías y proveedores aún no vistos."""
+        new_categories = {i for i in category_ids if i is not None and i not in self._categories}
+        new_suppliers = {i for i in supplier_ids if i is not None and i not in self._suppliers}
+
+        existing = self.category_repo.get_existing_ids(new_categories)
+        self._categories.update({i: i in existing for i in new_categories})
+        suppliers = self.supplier_repo.get_active_status(new_suppliers)
+        self._suppliers.update({i: suppliers.get(i) for i in new_suppliers})
+
+    def error(self, category_id: Optional[int], supplier_id: Optional[int]) -> Optional[str]:
+        """Mensaje de error para las referencias dadas (ya cargadas), o None si son válidas."""
+        if category_id is not None and not self._categories[category_id]:
+            return "La categoría especificada no existe"
+        if supplier_id is not None:
+            supplier_active = self._suppliers[supplier_id]
+            if supplier_active is None:
+                return "El proveedor especificado no existe"
+            if not supplier_active:
+                return "El proveedor especificado está inactivo"
+        return None
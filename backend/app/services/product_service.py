@@ -2,13 +2,16 @@
 Servicio de productos.
 Contiene la lógica de negocio para gestión de productos.
 """
+from collections import Counter, defaultdict
 from typing import Optional
 from decimal import Decimal
 import math
 
 from fastapi import HTTPException, status
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.repositories.product_repository import ProductRepository
 from app.repositories.category_repository import CategoryRepository
 from app.repositories.supplier_repository import SupplierRepository
@@ -18,9 +21,17 @@ from app.schemas.product import (
     ProductResponse,
     ProductWithRelations,
     ProductListResponse,
+    ProductSearchResult,
     ProductFilter,
+    ProductBulkUpdateItem,
+    ProductBulkUpdateOutcome,
+    ProductBulkUpdateResult,
+    ProductBulkUpdateStatus,
 )
 from app.models.product import Product
+from app.schemas.category import CategoryResponse
+from app.schemas.supplier import SupplierResponse
+from app.services.product_references import MAX_AMOUNT, MAX_INTEGER, ProductReferenceChecker
 
 
 class ProductService:
@@ -52,7 +63,10 @@ class ProductService:
                 detail=f"Ya existe un producto con el SKU: {product_data.sku.upper()}"
             )
 
-        # Verificar categoría existe
+        # Verificar categoría existe. Las escrituras validan en la base (por
+        # clave primaria) y no en la caché de referencia, que sin
+        # REFERENCE_CACHE_LISTEN puede estar atrasada hasta su TTL: una
+        # categoría borrada terminaría en un IntegrityError y no en un 400
         if product_data.category_id:
             if not self.category_repo.get_by_id(product_data.category_id):
                 raise HTTPException(
@@ -99,7 +113,7 @@ class ProductService:
             )
 
         if with_relations:
-            return self._to_product_with_relations(product)
+            return to_product_with_relations(product)
 
         return ProductResponse.model_validate(product)
 
@@ -128,15 +142,21 @@ class ProductService:
         self,
         page: int = 1,
         page_size: int = 20,
-        filters: Optional[ProductFilter] = None
+        filters: Optional[ProductFilter] = None,
+        include_total: bool = True
     ) -> ProductListResponse:
         """
         Obtener todos los productos con paginación y filtros.
 
+        Página y total salen de una sola consulta (COUNT(*) OVER ()). Con
+        ``include_total=False`` el total es una estimación del planificador,
+        útil cuando el filtro abarca gran parte de un catálogo grande.
+
         Args:
             page: Número de página (1-indexed)
             page_size: Tamaño de página
             filters: Filtros opcionales
+            include_total: Calcular el total exacto
 
         Returns:
             Lista paginada de productos
@@ -155,25 +175,156 @@ class ProductService:
                 "max_price": filters.max_price,
             }
 
-        products = self.product_repo.get_all(
+        products, total = self.product_repo.get_page(
             skip=skip,
             limit=page_size,
-            with_relations=True,
+            include_total=include_total,
             **filter_params
         )
-
-        total = self.product_repo.count(**filter_params)
+        if total is None:
+            total = self.product_repo.estimate_total(**filter_params)
         pages = math.ceil(total / page_size) if total > 0 else 1
 
-        items = [self._to_product_with_relations(p) for p in products]
+        items = [to_product_with_relations(p) for p in products]
 
         return ProductListResponse(
             items=items,
             total=total,
             page=page,
             page_size=page_size,
-            pages=pages
+            pages=pages,
+            total_is_estimate=not include_total
+        )
+
+    def get_all_serialized(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        filters: Optional[ProductFilter] = None,
+        include_total: bool = True
+    ) -> dict:
+        """
+        Igual que ``get_all`` pero retorna el dict listo para serializar.
+
+        Arma cada item directamente desde la proyección plana de columnas,
+        sin entidades ORM ni validación Pydantic por fila (datos de la
+        propia base). Se envía con FastJSONResponse.
+        """
+        skip = (page - 1) * page_size
+        filter_params = filters.model_dump() if filters else {}
+
+        rows, total = self.product_repo.get_page_rows(
+            skip=skip,
+            limit=page_size,
+            include_total=include_total,
+            **filter_params
         )
+        if total is None:
+            total = self.product_repo.estimate_total(**filter_params)
+
+        return {
+            "items": [product_row_to_dict(row) for row in rows],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": math.ceil(total / page_size) if total > 0 else 1,
+            "total_is_estimate": not include_total,
+        }
+
+    def bulk_update(self, items: list[ProductBulkUpdateItem]) -> ProductBulkUpdateResult:
+        """
+        Aplicar cambios parciales a muchos productos identificados por SKU.
+
+        Las referencias (categoría, proveedor) se validan con una consulta
+        para todo el lote. Los items se agrupan por el conjunto de campos
+        enviados y cada grupo se aplica con un UPDATE ... FROM (VALUES ...)
+        por bloque de PRODUCT_BULK_UPDATE_CHUNK_SIZE, en una sola
+        transacción. Los items inválidos no se aplican y no afectan al resto.
+
+        Returns:
+            Resultado por SKU, en el orden de la solicitud
+        """
+        outcomes: dict[int, ProductBulkUpdateOutcome] = {}
+        groups: dict[tuple[str, ...], list[int]] = defaultdict(list)
+        seen_skus: set[str] = set()
+        candidates: list[tuple[int, tuple[str, ...]]] = []
+
+        for index, item in enumerate(items):
+            fields = tuple(field for field in BULK_UPDATE_FIELDS if field in item.model_fields_set)
+            message = _bulk_item_error(item, fields, seen_skus)
+            seen_skus.add(item.sku)
+            if message:
+                outcomes[index] = ProductBulkUpdateOutcome(
+                    sku=item.sku, status=ProductBulkUpdateStatus.INVALID, message=message
+                )
+            else:
+                candidates.append((index, fields))
+
+        references = ProductReferenceChecker(self.db)
+        references.load(
+            (items[index].category_id for index, _ in candidates),
+            (items[index].supplier_id for index, _ in candidates),
+        )
+        for index, fields in candidates:
+            item = items[index]
+            message = references.error(
+                item.category_id if "category_id" in fields else None,
+                item.supplier_id if "supplier_id" in fields else None,
+            )
+            if message:
+                outcomes[index] = ProductBulkUpdateOutcome(
+                    sku=item.sku, status=ProductBulkUpdateStatus.INVALID, message=message
+                )
+            else:
+                groups[fields].append(index)
+
+        chunk_size = settings.PRODUCT_BULK_UPDATE_CHUNK_SIZE
+        try:
+            for fields, indexes in groups.items():
+                for start in range(0, len(indexes), chunk_size):
+                    chunk = indexes[start:start + chunk_size]
+                    updated = self.product_repo.bulk_update_by_sku(
+                        fields,
+                        [(items[i].sku, *(getattr(items[i], field) for field in fields)) for i in chunk]
+                    )
+                    for i in chunk:
+                        product_id = updated.get(items[i].sku)
+                        outcomes[i] = ProductBulkUpdateOutcome(
+                            sku=items[i].sku,
+                            status=(
+                                ProductBulkUpdateStatus.UPDATED if product_id
+                                else ProductBulkUpdateStatus.NOT_FOUND
+                            ),
+                            product_id=product_id
+                        )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        results = [outcomes[index] for index in range(len(items))]
+        counts = Counter(outcome.status for outcome in results)
+        return ProductBulkUpdateResult(
+            updated=counts[ProductBulkUpdateStatus.UPDATED],
+            not_found=counts[ProductBulkUpdateStatus.NOT_FOUND],
+            invalid=counts[ProductBulkUpdateStatus.INVALID],
+            results=results
+        )
+
+    def search(self, term: str, limit: int = 10, only_active: bool = True) -> list[ProductSearchResult]:
+        """
+        Buscar productos por relevancia (nombre, SKU o descripción).
+
+        Args:
+            term: Texto buscado
+            limit: Cantidad máxima de resultados
+            only_active: Solo productos activos
+
+        Returns:
+            Productos ordenados por relevancia
+        """
+        rows = self.product_repo.search(term, limit, only_active)
+        return [ProductSearchResult.model_validate(row) for row in rows]
 
     def update(self, product_id: int, product_data: ProductUpdate) -> ProductResponse:
         """
@@ -261,7 +412,7 @@ class ProductService:
             Lista de productos con stock bajo
         """
         products = self.product_repo.get_low_stock_products(limit)
-        return [self._to_product_with_relations(p) for p in products]
+        return [to_product_with_relations(p) for p in products]
 
     def update_stock(self, product_id: int, quantity: int) -> ProductResponse:
         """
@@ -302,25 +453,66 @@ class ProductService:
         """Contar total de productos."""
         return self.product_repo.count(is_active=is_active, low_stock_only=low_stock_only)
 
-    def _to_product_with_relations(self, product: Product) -> ProductWithRelations:
-        """Convertir producto a schema con relaciones."""
-        from app.schemas.category import CategoryResponse
-        from app.schemas.supplier import SupplierResponse
-
-        data = ProductResponse.model_validate(product).model_dump()
-
-        # Agregar relaciones
-        data["category"] = (
-            CategoryResponse.model_validate(product.category)
-            if product.category else None
-        )
-        data["supplier"] = (
-            SupplierResponse.model_validate(product.supplier)
-            if product.supplier else None
-        )
-
-        # Agregar propiedades calculadas
-        data["is_low_stock"] = product.is_low_stock
-        data["profit_margin"] = product.profit_margin
 
-        return ProductWithRelations(**data)
+# Campos que acepta la actualización masiva (el SKU es la clave) y los que no admiten NULL
+BULK_UPDATE_FIELDS = tuple(field for field in ProductBulkUpdateItem.model_fields if field != "sku")
+NOT_NULL_FIELDS = {"name", "stock_min", "cost", "price", "is_active"}
+
+
+def _bulk_item_error(item: ProductBulkUpdateItem, fields: tuple[str, ...], seen_skus: set[str]) -> Optional[str]:
+    """Validaciones de un item que no requieren consultar la base."""
+    if item.sku in seen_skus:
+        return "SKU repetido en la solicitud"
+    if not fields:
+        return "No se enviaron campos para actualizar"
+    null_fields = [field for field in fields if field in NOT_NULL_FIELDS and getattr(item, field) is None]
+    if null_fields:
+        return f"{', '.join(null_fields)}: no admite null"
+    if any(
+        getattr(item, field) is not None and getattr(item, field) >= MAX_AMOUNT
+        for field in ("cost", "price") if field in fields
+    ):
+        return "cost/price: el monto excede el máximo permitido"
+    if "stock_min" in fields and item.stock_min > MAX_INTEGER:
+        return "stock_min: el valor excede el máximo permitido"
+    return None
+
+
+def to_product_with_relations(product: Product) -> ProductWithRelations:
+    """
+    Convertir producto (con categoría y proveedor cargados) a schema con relaciones.
+
+    Una sola validación: from_attributes lee las relaciones y las
+    propiedades calculadas (is_low_stock, profit_margin) del modelo.
+    """
+    return ProductWithRelations.model_validate(product)
+
+
+PRODUCT_FIELDS = tuple(ProductResponse.model_fields)
+CATEGORY_FIELDS = tuple(CategoryResponse.model_fields)
+SUPPLIER_FIELDS = tuple(SupplierResponse.model_fields)
+
+
+def product_row_to_dict(row: Row) -> dict:
+    """
+    Convertir una fila de ``product_rows_query`` al formato de ProductWithRelations.
+
+    Mismos campos y mismo orden que el schema; los valores se serializan
+    con FastJSONResponse.
+    """
+    mapping = row._mapping
+    data = {field: mapping[field] for field in PRODUCT_FIELDS}
+
+    data["category"] = (
+        {field: mapping[f"category__{field}"] for field in CATEGORY_FIELDS}
+        if mapping["category__id"] is not None else None
+    )
+    data["supplier"] = (
+        {field: mapping[f"supplier__{field}"] for field in SUPPLIER_FIELDS}
+        if mapping["supplier__id"] is not None else None
+    )
+
+    cost, price = data["cost"], data["price"]
+    data["is_low_stock"] = data["stock_current"] < data["stock_min"]
+    data["profit_margin"] = float((price - cost) / cost * 100) if cost and cost > 0 else 0.0
+    return data
@@ -0,0 +1,98 @@
+"""
+Lectura de categorías y proveedores a través de la caché de referencia.
+
+Las tablas se cargan completas en un ``ReferenceSnapshot`` por worker y se
+sirven desde memoria (búsquedas por id y listados). La versión de
+cada snapshot es la de ``data_versions``, que los triggers incrementan en
+cada cambio; con REFERENCE_CACHE_LISTEN los workers reciben esos cambios
+por NOTIFY y descartan su copia al instante; sin eso una copia puede
+quedar atrasada hasta REFERENCE_CACHE_TTL_SECONDS, así que las escrituras
+de productos validan sus referencias en la base y no aquí.
+"""
+import logging
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import ReferenceSnapshot, reference_cache
+from app.core.notifications import PostgresListener
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.supplier_repository import SupplierRepository
+from app.schemas.category import CategoryResponse
+from app.schemas.supplier import SupplierResponse
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = "categories"
+SUPPLIERS = "suppliers"
+DATA_VERSIONS_CHANNEL = "data_versions"
+
+
+def category_snapshot(db: Session) -> ReferenceSnapshot:
+    """Snapshot de categorías (CategoryResponse ordenadas por nombre)."""
+    return _snapshot(db, CATEGORIES, lambda: [
+        CategoryResponse.model_validate(category)
+        for category in CategoryRepository(db).get_all_unpaginated()
+    ])
+
+
+def supplier_snapshot(db: Session) -> ReferenceSnapshot:
+    """Snapshot de proveedores (SupplierResponse ordenados por nombre)."""
+    return _snapshot(db, SUPPLIERS, lambda: [
+        SupplierResponse.model_validate(supplier)
+        for supplier in SupplierRepository(db).get_all_unpaginated()
+    ])
+
+
+def find_category(db: Session, category_id: int) -> Optional[CategoryResponse]:
+    """
+    Buscar una categoría por id en la caché.
+
+    Si no está, se confirma en la base: puede haberse creado en otro worker
+    después de cargar el snapshot, que en ese caso se descarta.
+    """
+    category = category_snapshot(db).by_id.get(category_id)
+    if category is None:
+        found = CategoryRepository(db).get_by_id(category_id)
+        if found is not None:
+            reference_cache.invalidate(CATEGORIES)
+            category = CategoryResponse.model_validate(found)
+    return category
+
+
+def find_supplier(db: Session, supplier_id: int) -> Optional[SupplierResponse]:
+    """Buscar un proveedor por id en la caché (con la misma confirmación que ``find_category``)."""
+    supplier = supplier_snapshot(db).by_id.get(supplier_id)
+    if supplier is None:
+        found = SupplierRepository(db).get_by_id(supplier_id)
+        if found is not None:
+            reference_cache.invalidate(SUPPLIERS)
+            supplier = SupplierResponse.model_validate(found)
+    return supplier
+
+
+def _snapshot(db: Session, name: str, load: Callable[[], Sequence]) -> ReferenceSnapshot:
+    snapshot = reference_cache.get(name)
+    if snapshot is None:
+        generation = reference_cache.generation(name)
+        # La versión se lee antes que las filas (ver ReferenceSnapshot)
+        version = DataVersionRepository(db).get_version(name)
+        snapshot = ReferenceSnapshot.build(name, version, load())
+        reference_cache.set(name, snapshot, generation)
+    return snapshot
+
+
+def handle_data_version_notification(channel: str, payload: str) -> None:
+    """Procesar ``NOTIFY data_versions, 'nombre:versión'``."""
+    name, _, version = payload.rpartition(":")
+    if name in (CATEGORIES, SUPPLIERS) and version.isdigit():
+        reference_cache.invalidate(name, int(version))
+
+
+# Un listener por worker; se inicia en el arranque si REFERENCE_CACHE_LISTEN
+reference_listener = PostgresListener(
+    [DATA_VERSIONS_CHANNEL],
+    handle_data_version_notification,
+    on_reconnect=reference_cache.clear,
+)
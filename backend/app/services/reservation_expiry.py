@@ -0,0 +1,33 @@
+"""
+Barrido de reservas de stock vencidas (ver StockReservationRepository).
+
+Cada vuelta elimina las reservas vencidas por lotes, recorriendo el índice
+de ``expires_at`` desde la más antigua. Las líneas se borran en cascada y el
+trigger descuenta sus unidades del total reservado de cada producto. Con
+varios workers cada uno salta las filas que otro ya bloqueó.
+"""
+import logging
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.reservation_repository import StockReservationRepository
+
+logger = logging.getLogger(__name__)
+
+
+def expire_stock_reservations() -> int:
+    """Eliminar todas las reservas vencidas; retorna cuántas se eliminaron."""
+    batch_size = settings.RESERVATION_EXPIRY_BATCH_SIZE
+    total = 0
+    with SessionLocal() as db:
+        repo = StockReservationRepository(db)
+        while True:
+            # Un commit por lote: las transacciones quedan cortas
+            deleted = repo.delete_expired(batch_size)
+            db.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+    if total:
+        logger.info("Reservas de stock vencidas eliminadas: %d", total)
+    return total
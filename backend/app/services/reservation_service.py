@@ -0,0 +1,107 @@
+"""
+Servicio de reservas de stock: reservar, confirmar y liberar.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.stock_reservation import StockReservation
+from app.repositories.reservation_repository import StockReservationRepository
+from app.schemas.reservation import ReservationCreate, ReservationResponse
+from app.schemas.sale import SaleCreate, SaleLine, SaleResponse
+from app.services.sale_service import SaleService
+
+
+class ReservationService:
+    """
+    Reservas de stock para carritos y pedidos pendientes.
+
+    Reservar bloquea los productos igual que una venta y verifica contra el
+    disponible (stock actual menos lo ya reservado), así dos terminales no
+    pueden prometer las mismas unidades. Confirmar convierte la reserva en
+    venta; liberar o vencer la elimina. El stock actual solo cambia al
+    confirmar. Los productos en modo repartido no admiten reservas: su
+    disponible no se serializa en una fila.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.reservation_repo = StockReservationRepository(db)
+        self.sale_service = SaleService(db)
+
+    def reserve(self, data: ReservationCreate, user_id: Optional[int] = None) -> ReservationResponse:
+        """Reservar todas las líneas o ninguna (400 con las líneas sin disponible)."""
+        ttl_seconds = data.ttl_seconds or settings.RESERVATION_TTL_SECONDS
+        if ttl_seconds > settings.RESERVATION_MAX_TTL_SECONDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"La duración máxima de una reserva es {settings.RESERVATION_MAX_TTL_SECONDS} segundos"
+            )
+
+        _, locked = self.sale_service.lock_lines(data.items)
+        sharded = sorted(pid for pid, row in locked.items() if row.stock_shards)
+        if sharded:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Productos en modo repartido no admiten reservas: {', '.join(str(pid) for pid in sharded)}"
+            )
+        reservation = self.reservation_repo.add(
+            [(line.product_id, line.quantity) for line in data.items],
+            ttl_seconds=ttl_seconds,
+            user_id=user_id,
+            reference=data.reference,
+            notes=data.notes
+        )
+        response = ReservationResponse.model_validate(reservation)
+        self.db.commit()
+        return response
+
+    def get_reservation(self, reservation_id: int) -> ReservationResponse:
+        """Obtener una reserva vigente."""
+        reservation = self.reservation_repo.get(reservation_id)
+        if not reservation or is_expired(reservation):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Reserva no encontrada o vencida"
+            )
+        return ReservationResponse.model_validate(reservation)
+
+    def confirm(self, reservation_id: int, user_id: Optional[int] = None) -> SaleResponse:
+        """Convertir una reserva vigente en venta (ver SaleService.checkout)."""
+        reservation = self._lock(reservation_id)
+        data = SaleCreate(
+            items=[SaleLine(product_id=item.product_id, quantity=item.quantity) for item in reservation.items],
+            reference=reservation.reference,
+            notes=reservation.notes,
+        )
+        return self.sale_service.checkout(data, user_id=user_id, reservation_id=reservation.id)
+
+    def release(self, reservation_id: int) -> None:
+        """Liberar una reserva vigente: sus unidades vuelven a estar disponibles."""
+        self._lock(reservation_id)
+        self.reservation_repo.delete(reservation_id)
+        self.db.commit()
+
+    def _lock(self, reservation_id: int) -> StockReservation:
+        reservation = self.reservation_repo.lock(reservation_id)
+        if reservation and is_expired(reservation):
+            # Vencida pero aún no barrida: se elimina ya y sus unidades se liberan
+            self.reservation_repo.delete(reservation_id)
+            self.db.commit()
+            reservation = None
+        if not reservation:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Reserva no encontrada o vencida"
+            )
+        return reservation
+
+
+def is_expired(reservation: StockReservation) -> bool:
+    """Indica si la reserva venció (sus unidades siguen reservadas hasta que se elimina)."""
+    return reservation.expires_at <= datetime.now(timezone.utc)
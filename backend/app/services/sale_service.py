@@ -0,0 +1,201 @@
+"""
+Servicio de ventas: checkout de tickets con descuento de stock.
+"""
+from collections import defaultdict
+from decimal import Decimal
+from typing import Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.models.inventory_movement import MovementType, MovementReason
+from app.repositories.inventory_repository import InventoryMovementRepository
+from app.repositories.product_repository import ProductRepository
+from app.repositories.reservation_repository import StockReservationRepository
+from app.repositories.stock_shard_repository import StockShardRepository
+from app.schemas.sale import SaleCreate, SaleLine, SaleLineResult, SaleResponse, StockShortage
+
+
+class SaleService:
+    """
+    Checkout de ventas.
+
+    Un ticket se procesa en una transacción con una cantidad fija de round
+    trips, sin importar cuántas líneas tenga: bloqueo de los productos en
+    orden de id (el mismo orden que la entrada masiva, así tickets y
+    recepciones concurrentes no se bloquean mutuamente en ciclo), un UPDATE
+    para todos los descuentos, un INSERT multi-fila de movimientos SALE y el
+    COMMIT. Si falta stock en cualquier línea no se escribe nada y se
+    informan todas las líneas afectadas. Las unidades reservadas por otros
+    (carritos, pedidos pendientes) no se pueden vender.
+
+    Los productos en modo repartido (ver StockShardRepository) se descuentan
+    de sus slots, un round trip por producto, y sus movimientos quedan sin
+    stock antes/después hasta el próximo plegado.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.product_repo = ProductRepository(db)
+        self.movement_repo = InventoryMovementRepository(db)
+        self.reservation_repo = StockReservationRepository(db)
+        self.shard_repo = StockShardRepository(db)
+
+    def checkout(
+        self,
+        data: SaleCreate,
+        user_id: Optional[int] = None,
+        reservation_id: Optional[int] = None
+    ) -> SaleResponse:
+        """
+        Registrar una venta descontando el stock de todas sus líneas.
+
+        Con ``reservation_id`` la venta confirma esa reserva (que el llamador
+        ya bloqueó): sus unidades cuentan como disponibles para esta venta y
+        la reserva se elimina en la misma transacción.
+        """
+        quantities, locked = self.lock_lines(data.items, from_reservation=reservation_id is not None)
+        if reservation_id is not None:
+            self.reservation_repo.delete(reservation_id)
+
+        sharded = {pid: row.stock_shards for pid, row in locked.items() if row.stock_shards}
+        self.product_repo.apply_stock_deltas(
+            {pid: -quantity for pid, quantity in quantities.items() if pid not in sharded}
+        )
+        failed = self.shard_repo.apply_deltas({pid: -quantities[pid] for pid in sharded}, sharded)
+        if failed:
+            totals = self.shard_repo.get_totals(failed)
+            self.db.rollback()
+            _, line_positions = group_lines(data.items)
+            raise shortage_error([
+                StockShortage(
+                    product_id=product_id,
+                    sku=locked[product_id].sku,
+                    lines=line_positions[product_id],
+                    requested=quantities[product_id],
+                    available=totals.get(product_id, 0),
+                )
+                for product_id in failed
+            ])
+
+        # Stock antes/después de cada línea, respetando el orden del ticket
+        # (desconocido en los productos repartidos hasta el plegado)
+        running_stock = {pid: row.stock_current for pid, row in locked.items()}
+        rows = []
+        for line in data.items:
+            stock_before = stock_after = None
+            if line.product_id not in sharded:
+                stock_before = running_stock[line.product_id]
+                stock_after = stock_before - line.quantity
+                running_stock[line.product_id] = stock_after
+            rows.append({
+                "product_id": line.product_id,
+                "movement_type": MovementType.EXIT.value,
+                "reason": MovementReason.SALE.value,
+                "quantity": line.quantity,
+                "stock_before": stock_before,
+                "stock_after": stock_after,
+                "user_id": user_id,
+                "reference": data.reference,
+                "notes": data.notes,
+            })
+
+        movement_keys = self.movement_repo.bulk_add(rows)
+        self.db.commit()
+
+        # La respuesta se arma con lo que ya está en memoria, sin recargar
+        lines = []
+        for (movement_id, _), line, row in zip(movement_keys, data.items, rows):
+            product = locked[line.product_id]
+            lines.append(SaleLineResult(
+                movement_id=movement_id,
+                product_id=line.product_id,
+                sku=product.sku,
+                name=product.name,
+                quantity=line.quantity,
+                unit_price=product.price,
+                subtotal=product.price * line.quantity,
+                stock_after=row["stock_after"],
+            ))
+        return SaleResponse(
+            reference=data.reference,
+            created_at=movement_keys[0][1],
+            total_items=sum(line.quantity for line in lines),
+            total_amount=sum((line.subtotal for line in lines), Decimal(0)),
+            lines=lines,
+        )
+
+    def lock_lines(
+        self,
+        items: Sequence[SaleLine],
+        from_reservation: bool = False
+    ) -> tuple[dict[int, int], dict[int, Row]]:
+        """
+        Bloquear los productos de las líneas y verificar que alcance el stock.
+
+        Disponible es el stock actual menos lo reservado; con
+        ``from_reservation`` las líneas son las de una reserva vigente y sus
+        propias unidades no se descuentan. El total reservado se lee después
+        de tomar los bloqueos: en READ COMMITTED esa segunda lectura ve las reservas
+        confirmadas por quien tenía el bloqueo antes. Ante un error hace
+        rollback y lanza 404 (productos inexistentes o inactivos) o 400 con
+        todas las líneas sin stock. Los productos repartidos no se verifican
+        acá: su stock se comprueba al descontarlo de los slots.
+
+        Returns:
+            Cantidad total por producto y filas bloqueadas (ver ProductRepository.lock_stock_rows)
+        """
+        quantities, line_positions = group_lines(items)
+        locked = self.product_repo.lock_stock_rows(quantities.keys())
+        unavailable = sorted(
+            product_id for product_id in quantities
+            if product_id not in locked or not locked[product_id].is_active
+        )
+        if unavailable:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Productos no encontrados o inactivos: {', '.join(str(pid) for pid in unavailable)}"
+            )
+
+        reserved = self.reservation_repo.get_reserved(quantities.keys())
+        if from_reservation:
+            reserved = {pid: units - quantities[pid] for pid, units in reserved.items()}
+        shortages = [
+            StockShortage(
+                product_id=product_id,
+                sku=locked[product_id].sku,
+                lines=line_positions[product_id],
+                requested=quantity,
+                available=available,
+            )
+            for product_id, quantity in quantities.items()
+            if not locked[product_id].stock_shards
+            and (available := locked[product_id].stock_current - reserved.get(product_id, 0)) < quantity
+        ]
+        if shortages:
+            self.db.rollback()
+            raise shortage_error(shortages)
+        return quantities, locked
+
+
+def group_lines(items: Sequence[SaleLine]) -> tuple[dict[int, int], dict[int, list[int]]]:
+    """Cantidad total y posiciones de línea de cada producto."""
+    quantities: dict[int, int] = defaultdict(int)
+    line_positions: dict[int, list[int]] = defaultdict(list)
+    for position, line in enumerate(items):
+        quantities[line.product_id] += line.quantity
+        line_positions[line.product_id].append(position)
+    return quantities, line_positions
+
+
+def shortage_error(shortages: Sequence[StockShortage]) -> HTTPException:
+    """Error 400 con todas las líneas sin stock."""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={
+            "message": "Stock insuficiente",
+            "shortages": [shortage.model_dump() for shortage in shortages],
+        }
+    )
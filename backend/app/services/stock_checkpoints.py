@@ -0,0 +1,40 @@
+"""
+Creación de los checkpoints diarios de stock (ver StockCheckpointRepository).
+
+Cada vuelta de la tarea guarda el cierre de ayer si aún no existe. Se espera
+una hora después de medianoche para que las transacciones abiertas al cierre
+del día ya hayan confirmado sus movimientos. Si la tarea no corrió algún día
+solo queda un hueco: las consultas parten del checkpoint anterior. Los
+días son los de INVENTORY_STATS_TIMEZONE, como en las estadísticas.
+"""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.stock_checkpoint_repository import StockCheckpointRepository
+
+logger = logging.getLogger(__name__)
+
+CLOSING_DELAY = timedelta(hours=1)
+
+
+def create_stock_checkpoint(day: Optional[date] = None) -> int:
+    """Crear el checkpoint de ``day`` (por defecto ayer) si falta; retorna las filas creadas."""
+    zone = ZoneInfo(settings.INVENTORY_STATS_TIMEZONE)
+    if day is None:
+        day = (datetime.now(zone) - CLOSING_DELAY).date() - timedelta(days=1)
+    with SessionLocal() as db:
+        repo = StockCheckpointRepository(db)
+        # Con varios workers, uno lo crea y el resto sigue de largo
+        if not repo.try_lock():
+            return 0
+        latest = repo.latest_day()
+        if latest is not None and latest >= day:
+            return 0
+        created = repo.create_for_day(day, zone)
+        db.commit()
+    logger.info("Checkpoint de stock del %s: %d productos", day, created)
+    return created
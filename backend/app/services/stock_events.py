@@ -0,0 +1,105 @@
+"""
+Canal de cambios de stock en vivo.
+
+El trigger stock_events_products_update publica por NOTIFY cada cambio de
+stock_current o stock_min al confirmarse la transacción, venga de donde
+venga (movimientos, ventas, ajustes, plegado de productos repartidos,
+importaciones), si la conexión que escribe tiene el canal activo
+(``inventory.stock_events``, ver ``session_settings``). Con
+STOCK_EVENTS_ENABLED cada worker lo escucha, lo traduce a eventos
+``stock_changed`` y ``threshold_crossed`` y los reparte a sus clientes
+SSE / WebSocket a través de ``stock_event_broker``.
+"""
+import json
+import logging
+
+from app.core.config import settings
+from app.core.events import BrokerEvent, EventBroker
+from app.core.metrics import register_metrics
+from app.core.notifications import PostgresListener
+from app.schemas.stock_event import StockEvent, StockEventTypeEnum, StockLevelEnum
+
+logger = logging.getLogger(__name__)
+
+STOCK_EVENTS_CHANNEL = "stock_events"
+
+
+def stock_level(stock: int, stock_min: int) -> StockLevelEnum:
+    """Nivel de stock: agotado, bajo el mínimo o normal."""
+    if stock == 0:
+        return StockLevelEnum.OUT
+    if stock < stock_min:
+        return StockLevelEnum.LOW
+    return StockLevelEnum.OK
+
+
+def parse_stock_notification(payload: str) -> list[StockEvent]:
+    """
+    Traducir un NOTIFY stock_events a eventos, en el orden de las filas.
+
+    Cada fila es [id, category_id, sku, stock antes, stock después, mínimo
+    antes, mínimo después]; si cambia el nivel se agrega además un
+    ``threshold_crossed``.
+    """
+    events = []
+    for product_id, category_id, sku, old_stock, new_stock, old_min, new_min in json.loads(payload):
+        common = {"product_id": product_id, "sku": sku, "category_id": category_id, "stock_min": new_min}
+        previous_level = stock_level(old_stock, old_min)
+        level = stock_level(new_stock, new_min)
+        events.append(StockEvent(
+            type=StockEventTypeEnum.STOCK_CHANGED,
+            stock_before=old_stock,
+            stock_after=new_stock,
+            level=level,
+            **common,
+        ))
+        if level != previous_level:
+            events.append(StockEvent(
+                type=StockEventTypeEnum.THRESHOLD_CROSSED,
+                stock_after=new_stock,
+                previous_level=previous_level,
+                level=level,
+                **common,
+            ))
+    return events
+
+
+def to_broker_event(event: StockEvent) -> BrokerEvent:
+    """Serializar un evento una sola vez para todos los clientes."""
+    return BrokerEvent(
+        name=event.type.value,
+        data=event.model_dump_json(exclude_none=True),
+        product_id=event.product_id,
+        category_id=event.category_id,
+    )
+
+
+def resync_event(reason: str) -> BrokerEvent:
+    """Evento ``resync`` (va a todos los clientes, sin importar sus filtros)."""
+    return to_broker_event(StockEvent(type=StockEventTypeEnum.RESYNC, reason=reason))
+
+
+def handle_stock_notification(channel: str, payload: str) -> None:
+    """Procesar ``NOTIFY stock_events`` (en el hilo del listener)."""
+    try:
+        events = parse_stock_notification(payload)
+    except (ValueError, TypeError):
+        logger.warning("Payload de stock_events inválido: %.200s", payload)
+        return
+    stock_event_broker.publish([to_broker_event(event) for event in events])
+
+
+def broadcast_resync() -> None:
+    """Avisar a todos los clientes que pudieron perder eventos (reconexión del listener)."""
+    stock_event_broker.publish([resync_event("reconnect")])
+
+
+stock_event_broker = EventBroker(settings.STOCK_EVENTS_QUEUE_SIZE, resync_event("overflow"))
+register_metrics("stock_events", stock_event_broker.stats)
+
+# Un listener por worker; se inicia en el arranque si STOCK_EVENTS_ENABLED
+stock_event_listener = PostgresListener(
+    [STOCK_EVENTS_CHANNEL],
+    handle_stock_notification,
+    on_reconnect=broadcast_resync,
+)
@@ -0,0 +1,31 @@
+"""
+Plegado periódico del stock repartido (ver StockShardRepository).
+
+Cada vuelta lleva la suma de los slots de cada producto repartido a
+``stock_current``, completa el stock antes/después de los movimientos
+registrados desde el plegado anterior y reparte el total en partes
+iguales entre los slots. Un commit por producto: el bloqueo de la fila
+(FOR NO KEY UPDATE) no frena a los escritores, que toman FOR KEY SHARE,
+y el de los slots dura solo lo que tarda el plegado.
+"""
+import logging
+
+from app.core.database import SessionLocal
+from app.repositories.stock_shard_repository import StockShardRepository
+
+logger = logging.getLogger(__name__)
+
+
+def fold_stock_shards() -> int:
+    """Plegar todos los productos repartidos; retorna cuántos se plegaron."""
+    folded = 0
+    with SessionLocal() as db:
+        repo = StockShardRepository(db)
+        for product_id in repo.get_sharded_product_ids():
+            if repo.lock_for_fold(product_id):
+                repo.fold(product_id)
+                folded += 1
+            db.commit()
+    if folded:
+        logger.debug("Productos repartidos plegados: %d", folded)
+    return folded
@@ -7,6 +7,7 @@ from typing import Optional
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.cache import reference_cache
 from app.repositories.supplier_repository import SupplierRepository
 from app.schemas.supplier import (
     SupplierCreate,
@@ -15,6 +16,7 @@ from app.schemas.supplier import (
     SupplierWithProductCount,
 )
 from app.models.supplier import Supplier
+from app.services.reference_data import SUPPLIERS, find_supplier, supplier_snapshot
 
 
 class SupplierService:
@@ -35,6 +37,7 @@ class SupplierService:
             Proveedor creado
         """
         supplier = self.supplier_repo.create(supplier_data.model_dump())
+        reference_cache.invalidate(SUPPLIERS)
         return SupplierResponse.model_validate(supplier)
 
     def get_by_id(self, supplier_id: int) -> SupplierResponse:
@@ -50,13 +53,13 @@ class SupplierService:
         Raises:
             HTTPException: Si no existe
         """
-        supplier = self.supplier_repo.get_by_id(supplier_id)
+        supplier = find_supplier(self.db, supplier_id)
         if not supplier:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Proveedor no encontrado"
             )
-        return SupplierResponse.model_validate(supplier)
+        return supplier
 
     def get_all(
         self,
@@ -87,8 +90,11 @@ class SupplierService:
                 for sup, count in results
             ]
 
-        suppliers = self.supplier_repo.get_all(skip, limit, is_active)
-        return [SupplierResponse.model_validate(sup) for sup in suppliers]
+        # Sin conteo de productos el listado sale de la caché de referencia
+        suppliers = supplier_snapshot(self.db).items
+        if is_active is not None:
+            suppliers = [sup for sup in suppliers if sup.is_active == is_active]
+        return list(suppliers[skip:skip + limit])
 
     def update(self, supplier_id: int, supplier_data: SupplierUpdate) -> SupplierResponse:
         """
@@ -113,6 +119,7 @@ class SupplierService:
 
         update_data = supplier_data.model_dump(exclude_unset=True)
         updated = self.supplier_repo.update(supplier_id, update_data)
+        reference_cache.invalidate(SUPPLIERS)
         return SupplierResponse.model_validate(updated)
 
     def delete(self, supplier_id: int, soft: bool = True) -> bool:
@@ -136,7 +143,9 @@ class SupplierService:
                 detail="Proveedor no encontrado"
             )
 
-        return self.supplier_repo.delete(supplier_id, soft)
+        deleted = self.supplier_repo.delete(supplier_id, soft)
+        reference_cache.invalidate(SUPPLIERS)
+        return deleted
 
     def search(self, query: str, skip: int = 0, limit: int = 100) -> list[SupplierResponse]:
         """
@@ -0,0 +1,28 @@
+"""
+Utilidades para peticiones condicionales HTTP (ETag / If-None-Match).
+"""
+from fastapi import Request, Response, status
+
+# El cliente puede guardar la respuesta pero debe revalidarla en cada uso
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Comparar ``etag`` con If-None-Match (comparación débil, RFC 9110 §13.1.2).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Respuesta 304 sin cuerpo."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
@@ -0,0 +1,64 @@
+"""
+Generadores de exportación en streaming (CSV / NDJSON) con gzip opcional.
+
+Trabajan sobre lotes de filas (``Result.partitions``) y emiten un bloque de
+bytes por lote, así la memoria no depende del total de filas exportadas.
+"""
+import csv
+import io
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+
+import orjson
+
+
+def _csv_value(value: Any) -> Any:
+    """Valor de una celda CSV: fechas ISO 8601 y nulos vacíos."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """Tipos que orjson no serializa de forma nativa."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def csv_chunks(columns: Sequence[str], batches: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    """Encabezado y luego un bloque CSV por lote de filas."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(columns: Sequence[str], batches: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    """Un objeto JSON por línea; un bloque por lote de filas."""
+    option = orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+    for batch in batches:
+        yield b"".join(
+            orjson.dumps(dict(zip(columns, row)), default=_json_default, option=option)
+            for row in batch
+        )
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Comprimir un flujo de bytes en formato gzip a medida que se genera."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,91 @@
+"""
+Lectura en streaming de archivos tabulares (CSV / XLSX) para importaciones.
+
+Cada lector recorre el archivo fila por fila y entrega ``(número de fila,
+dict columna → valor)``, con los encabezados normalizados a minúsculas y
+las celdas vacías como ``None``. La numeración coincide con la que ve el
+usuario en su planilla (el encabezado es la fila 1).
+"""
+import codecs
+import csv
+import zipfile
+from typing import Any, BinaryIO, Iterator, Optional
+
+ImportRow = tuple[int, dict[str, Any]]
+
+
+class ImportFileError(ValueError):
+    """El archivo no se puede leer con el formato indicado."""
+
+
+def _normalize_header(header: Any) -> str:
+    return str(header or "").strip().lower()
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def iter_csv_rows(file: BinaryIO, encoding: str = "utf-8-sig") -> Iterator[ImportRow]:
+    """Leer un CSV (separador coma o punto y coma, detectado en el encabezado)."""
+    try:
+        yield from _iter_csv_rows(file, encoding)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ImportFileError(f"CSV inválido: {exc}") from exc
+
+
+def _iter_csv_rows(file: BinaryIO, encoding: str) -> Iterator[ImportRow]:
+    text = codecs.getreader(encoding)(file)
+    header_line = text.readline()
+    if not header_line:
+        return
+    delimiter = ";" if header_line.count(";") > header_line.count(",") else ","
+    headers = [_normalize_header(h) for h in next(csv.reader([header_line], delimiter=delimiter))]
+
+    # Se cuentan registros y no líneas (line_num): una celda entre comillas
+    # con saltos de línea sigue siendo una sola fila de la planilla
+    reader = csv.reader(text, delimiter=delimiter)
+    for row_number, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        yield row_number, {
+            header: _normalize_value(value)
+            for header, value in zip(headers, values)
+            if header
+        }
+
+
+def iter_xlsx_rows(file: BinaryIO, sheet: Optional[str] = None) -> Iterator[ImportRow]:
+    """
+    Leer la primera hoja (o ``sheet``) de un XLSX en modo solo lectura.
+
+    Requiere ``openpyxl``; en modo read_only las filas se leen del XML a
+    medida que se recorren, sin cargar la planilla completa.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise ImportFileError("La importación de XLSX requiere el paquete openpyxl") from exc
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, KeyError, OSError) as exc:
+        raise ImportFileError(f"XLSX inválido: {exc}") from exc
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        headers = [_normalize_header(h) for h in next(rows, ())]
+
+        for row_number, values in enumerate(rows, start=2):
+            if all(v is None or (isinstance(v, str) and not v.strip()) for v in values):
+                continue
+            yield row_number, {
+                header: _normalize_value(value)
+                for header, value in zip(headers, values)
+                if header
+            }
+    finally:
+        workbook.close()
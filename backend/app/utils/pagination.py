@@ -0,0 +1,118 @@
+"""
+Utilidades de paginación por cursor (keyset).
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    Codificar la posición (created_at, id) como token opaco url-safe.
+
+    Args:
+        created_at: Fecha del último elemento de la página
+        item_id: ID del último elemento de la página
+
+    Returns:
+        Token para el parámetro ``after``
+    """
+    payload = json.dumps({"c": created_at.isoformat(), "i": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decodificar un token generado por ``encode_cursor``.
+
+    Args:
+        cursor: Token recibido en el parámetro ``after``
+
+    Returns:
+        Tupla (created_at, id)
+
+    Raises:
+        ValueError: Si el token no es válido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Cursor inválido") from exc
+
+
+def encode_key_cursor(*values: int) -> str:
+    """
+    Codificar una posición de claves enteras (p. ej. (deficit, id)) como token opaco.
+
+    Args:
+        values: Valores de ordenamiento del último elemento de la página
+
+    Returns:
+        Token para el parámetro ``after``
+    """
+    payload = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_key_cursor(cursor: str, size: int) -> tuple[int, ...]:
+    """
+    Decodificar un token generado por ``encode_key_cursor``.
+
+    Args:
+        cursor: Token recibido en el parámetro ``after``
+        size: Cantidad de claves esperadas
+
+    Returns:
+        Tupla con las claves
+
+    Raises:
+        ValueError: Si el token no es válido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("Cursor inválido")
+        return tuple(int(value) for value in values)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Cursor inválido") from exc
+
+
+def explain(db: Session, statement: Select) -> dict:
+    """Nodo raíz del plan (EXPLAIN FORMAT JSON, sin ejecutar) de ``statement``."""
+    compiled = statement.compile(dialect=db.get_bind().dialect)
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def estimate_count(db: Session, statement: Select) -> int:
+    """
+    Estimar cuántas filas devuelve ``statement`` con el planificador de PostgreSQL.
+
+    Ejecuta EXPLAIN en lugar de contar: el costo es constante aunque la
+    consulta abarque millones de filas, a cambio de un total aproximado.
+    """
+    return int(explain(db, statement)["Plan Rows"])
+
+
+async def estimate_count_async(db: AsyncSession, statement: Select) -> int:
+    """Versión para AsyncSession de ``estimate_count`` (asyncpg usa parámetros posicionales)."""
+    connection = await db.connection()
+    compiled = statement.compile(dialect=connection.dialect)
+    plan = (await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}",
+        tuple(compiled.params[name] for name in compiled.positiontup or ())
+    )).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,33 @@
+"""
+Respuestas JSON serializadas con orjson.
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _default(value: Any) -> Any:
+    """Tipos que orjson no serializa de forma nativa."""
+    if isinstance(value, Decimal):
+        # Igual que Pydantic en modo JSON: los montos viajan como string
+        return str(value)
+    raise TypeError
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse con la misma salida que los schemas Pydantic.
+
+    Pensada para endpoints que devuelven dicts ya armados a partir de filas
+    de la base de datos (datos confiables), evitando validar cada fila
+    contra el ``response_model``. Fechas UTC con sufijo "Z" y Decimal como string.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
@@ -0,0 +1,143 @@
+"""
+Benchmark de throughput: routers síncronos vs. asíncronos (ASYNC_ROUTERS).
+
+Levanta el backend dos veces con uvicorn (un solo worker), una con los
+routers síncronos y otra con ASYNC_ROUTERS='["products","inventory"]', y
+lanza la misma carga concurrente de lecturas contra ambos.
+
+Reporta req/s, latencias p50/p95 y errores de cada stack.
+
+Uso (desde backend/, con la base de datos disponible):
+    python -m scripts.benchmarks.bench_async_vs_sync
+    python -m scripts.benchmarks.bench_async_vs_sync --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+import httpx
+
+PATHS = [
+    "/products?page_size=20",
+    "/products/low-stock?limit=20",
+    "/inventory/movements?page_size=20&cursor=true",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil simple (valores en ms)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * pct) - 1)]
+
+
+def start_server(port: int, async_routers: list[str]) -> subprocess.Popen:
+    """Levantar uvicorn con la selección de routers indicada."""
+    env = dict(os.environ, ASYNC_ROUTERS=json.dumps(async_routers))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", "1", "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30) -> None:
+    """Esperar a que el servidor responda /health."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"El servidor en {base_url} no respondió")
+
+
+async def get_token(api: str) -> str:
+    """Registrar un usuario de benchmark y obtener su token."""
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+    async with httpx.AsyncClient(timeout=30) as client:
+        await client.post(f"{api}/auth/register", json={
+            "email": email, "full_name": "Benchmark", "password": password, "role": "seller",
+        })
+        response = await client.post(f"{api}/auth/login/json", json={"email": email, "password": password})
+        return response.json()["access_token"]
+
+
+async def load(api: str, token: str, requests: int, concurrency: int) -> dict:
+    """Lanzar ``requests`` lecturas con ``concurrency`` en vuelo."""
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    limits = httpx.Limits(max_connections=concurrency + 10)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        # Calentar caché de principales y pools
+        for path in PATHS:
+            await client.get(f"{api}{path}", headers=headers)
+
+        async def one(i: int) -> None:
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(f"{api}{PATHS[i % len(PATHS)]}", headers=headers)
+                except httpx.HTTPError:
+                    errors += 1
+                    return
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 0.95),
+        "errors": errors,
+    }
+
+
+async def run(args: argparse.Namespace, label: str, async_routers: list[str]) -> None:
+    base_url = f"http://127.0.0.1:{args.port}"
+    api = f"{base_url}/api/v1"
+    server = start_server(args.port, async_routers)
+    try:
+        await wait_ready(base_url)
+        token = await get_token(api)
+        result = await load(api, token, args.requests, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+    print(
+        f"{label:<6} {result['rps']:8.1f} req/s  p50={result['p50']:.1f}ms "
+        f"p95={result['p95']:.1f}ms  errores={result['errors']}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"peticiones={args.requests} concurrencia={args.concurrency} rutas={PATHS}")
+    await run(args, "sync", [])
+    await run(args, "async", ["products", "inventory"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,133 @@
+"""
+Benchmark de /inventory/batch-entry (InventoryService.batch_stock_entry).
+
+Mide el throughput (líneas/segundo) del motor en bloque frente al camino
+línea por línea (un create_movement y un commit por ítem) para recepciones
+de 10, 1.000 y 50.000 líneas.
+
+Uso (desde backend/, contra la base configurada en .env):
+    python -m scripts.benchmarks.bench_batch_entry
+    python -m scripts.benchmarks.bench_batch_entry --sizes 10 1000 --per-line-max 1000
+
+Crea productos temporales con SKU "BENCH-BATCH-*" y los elimina al terminar.
+"""
+import argparse
+import time
+
+from sqlalchemy import delete, insert, select
+
+from app.core.database import SessionLocal
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+from app.schemas.inventory import (
+    BatchStockEntry,
+    BatchStockEntryRequest,
+    InventoryMovementCreate,
+    MovementReasonEnum,
+    MovementTypeEnum,
+)
+from app.services.inventory_service import InventoryService
+
+SKU_PREFIX = "BENCH-BATCH-"
+
+
+def seed_products(count: int) -> list[int]:
+    """Crear ``count`` productos temporales y retornar sus ids."""
+    db = SessionLocal()
+    try:
+        ids = db.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [
+                {
+                    "sku": f"{SKU_PREFIX}{i:06d}",
+                    "name": f"Producto benchmark {i}",
+                    "stock_current": 0,
+                    "stock_min": 0,
+                    "cost": 1,
+                    "price": 2,
+                    "is_active": True,
+                }
+                for i in range(count)
+            ],
+        ).scalars().all()
+        db.commit()
+        return list(ids)
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    """Eliminar movimientos y productos creados por el benchmark."""
+    db = SessionLocal()
+    try:
+        bench_ids = select(Product.id).where(Product.sku.like(f"{SKU_PREFIX}%"))
+        db.execute(delete(InventoryMovement).where(InventoryMovement.product_id.in_(bench_ids)))
+        db.execute(delete(Product).where(Product.sku.like(f"{SKU_PREFIX}%")))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_bulk(product_ids: list[int], lines: int) -> float:
+    """Ejecutar una recepción con el motor en bloque y retornar los segundos."""
+    items = [
+        BatchStockEntry(product_id=product_ids[i % len(product_ids)], quantity=1)
+        for i in range(lines)
+    ]
+    request = BatchStockEntryRequest(items=items, reference="BENCH")
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        InventoryService(db).batch_stock_entry(request)
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def run_per_line(product_ids: list[int], lines: int) -> float:
+    """Ejecutar la misma recepción con un movimiento y un commit por línea."""
+    db = SessionLocal()
+    try:
+        service = InventoryService(db)
+        start = time.perf_counter()
+        for i in range(lines):
+            service.create_movement(InventoryMovementCreate(
+                product_id=product_ids[i % len(product_ids)],
+                movement_type=MovementTypeEnum.ENTRY,
+                reason=MovementReasonEnum.PURCHASE,
+                quantity=1,
+                reference="BENCH",
+            ))
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 50_000])
+    parser.add_argument(
+        "--per-line-max",
+        type=int,
+        default=1_000,
+        help="Tamaño máximo para el que se mide también el camino línea por línea",
+    )
+    args = parser.parse_args()
+
+    cleanup()
+    product_ids = seed_products(max(args.sizes))
+    try:
+        print(f"{'líneas':>8} {'modo':>10} {'segundos':>10} {'líneas/s':>12}")
+        for lines in args.sizes:
+            modes = [("bulk", run_bulk)]
+            if lines <= args.per_line_max:
+                modes.append(("per-line", run_per_line))
+            for mode, runner in modes:
+                elapsed = runner(product_ids, lines)
+                print(f"{lines:>8} {mode:>10} {elapsed:>10.3f} {lines / elapsed:>12.0f}")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Benchmark de un SKU caliente: 64 escritores concurrentes sobre un producto.
+
+Compara el modo normal (todas las escrituras hacen fila sobre la fila del
+producto) con el modo repartido en N slots (ver StockShardRepository),
+con el plegado periódico corriendo en paralelo como en producción. Los
+escritores son procesos × hilos que llaman a InventoryService.create_movement
+(9 salidas de 1 unidad por cada entrada de 5) durante ``--seconds``.
+
+Además muestrea pg_stat_activity para informar cuántas sesiones esperan
+en promedio un bloqueo: en una máquina con pocos núcleos el throughput lo
+limita la CPU de los propios escritores, y ese promedio es el que muestra
+la contención que el modo repartido elimina.
+
+Después de cada corrida verifica la conservación (stock final = inicial +
+entradas - salidas, también contra los movimientos) y, en la fase de
+agotamiento, que con poco stock se vendan exactamente las unidades que
+había: ningún slot queda negativo y el resto recibe 400.
+
+Uso (desde backend/, contra la base configurada en .env):
+    python -m scripts.benchmarks.bench_hot_sku
+    python -m scripts.benchmarks.bench_hot_sku --processes 4 --threads 16 --shards 0 8 32 --seconds 10
+
+Crea un producto temporal con SKU "BENCH-HOT-*" y lo elimina al terminar.
+"""
+import argparse
+import multiprocessing
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from sqlalchemy import case, create_engine, delete, func, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+from app.models.stock_shard import StockShard
+from app.schemas.inventory import (
+    InventoryMovementCreate,
+    MovementReasonEnum,
+    MovementTypeEnum,
+    StockShardsUpdate,
+)
+from app.services.inventory_service import InventoryService
+from app.services.stock_shards import fold_stock_shards
+
+SKU_PREFIX = "BENCH-HOT-"
+ENTRY_EVERY = 10
+ENTRY_QUANTITY = 5
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil simple (valores en ms)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * pct) - 1)]
+
+
+def seed_product(stock: int, shards: int) -> int:
+    """Crear el producto caliente con ``stock`` unidades y ``shards`` slots (0 = normal)."""
+    db = SessionLocal()
+    try:
+        product_id = db.execute(insert(Product).returning(Product.id), {
+            "sku": f"{SKU_PREFIX}{uuid.uuid4().hex[:8].upper()}",
+            "name": "Producto caliente benchmark",
+            "stock_current": stock,
+            "stock_min": 0,
+            "cost": 1,
+            "price": 2,
+            "is_active": True,
+        }).scalar_one()
+        db.commit()
+        if shards:
+            InventoryService(db).set_stock_shards(product_id, StockShardsUpdate(shards=shards))
+        return product_id
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    """Eliminar movimientos y productos creados por el benchmark (los slots caen en cascada)."""
+    db = SessionLocal()
+    try:
+        bench_ids = select(Product.id).where(Product.sku.like(f"{SKU_PREFIX}%"))
+        db.execute(delete(InventoryMovement).where(InventoryMovement.product_id.in_(bench_ids)))
+        db.execute(delete(Product).where(Product.sku.like(f"{SKU_PREFIX}%")))
+        db.commit()
+    finally:
+        db.close()
+
+
+def writer_process(product_id: int, threads: int, seconds: float, drain: bool, seed: int) -> dict:
+    """
+    Correr ``threads`` escritores en este proceso hasta que pase ``seconds``.
+
+    Con ``drain`` solo hay salidas (fase de agotamiento) y cada hilo termina
+    al recibir el primer 400.
+    """
+    # Motor propio por proceso: un fork no debe compartir conexiones del padre
+    engine = create_engine(settings.DATABASE_URL, pool_size=threads, max_overflow=0)
+    Session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    exit_data = InventoryMovementCreate(
+        product_id=product_id, movement_type=MovementTypeEnum.EXIT, reason=MovementReasonEnum.SALE, quantity=1
+    )
+    entry_data = InventoryMovementCreate(
+        product_id=product_id, movement_type=MovementTypeEnum.ENTRY,
+        reason=MovementReasonEnum.PURCHASE, quantity=ENTRY_QUANTITY
+    )
+    deadline = time.perf_counter() + seconds
+
+    def run(thread: int) -> dict:
+        result = {"exits": 0, "entries": 0, "rejected": 0, "latencies": []}
+        db = Session()
+        service = InventoryService(db)
+        position = seed * threads + thread
+        try:
+            while time.perf_counter() < deadline:
+                is_entry = not drain and position % ENTRY_EVERY == 0
+                position += 1
+                start = time.perf_counter()
+                try:
+                    service.create_movement(entry_data if is_entry else exit_data)
+                except HTTPException as exc:
+                    if exc.status_code != 400:
+                        raise
+                    result["rejected"] += 1
+                    if drain:
+                        break
+                    continue
+                result["latencies"].append((time.perf_counter() - start) * 1000)
+                result["entries" if is_entry else "exits"] += 1
+        finally:
+            db.close()
+        return result
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(run, range(threads)))
+    engine.dispose()
+    return {
+        "exits": sum(r["exits"] for r in results),
+        "entries": sum(r["entries"] for r in results),
+        "rejected": sum(r["rejected"] for r in results),
+        "latencies": [value for r in results for value in r["latencies"]],
+    }
+
+
+def fold_loop(stop: threading.Event, interval: float) -> None:
+    """Plegar los productos repartidos cada ``interval`` segundos, como la tarea de fondo."""
+    while not stop.wait(interval):
+        fold_stock_shards()
+
+
+LOCK_WAITS = text("""
+    SELECT count(*) FROM pg_stat_activity
+    WHERE datname = current_database() AND wait_event_type = 'Lock'
+""")
+
+
+def sample_lock_waits(stop: threading.Event, samples: list[int]) -> None:
+    """Cada 50 ms, cuántas sesiones están esperando un bloqueo."""
+    with SessionLocal() as db:
+        while not stop.wait(0.05):
+            samples.append(db.execute(LOCK_WAITS).scalar_one())
+            db.rollback()
+
+
+def run_writers(args: argparse.Namespace, product_id: int, seconds: float, drain: bool) -> tuple[dict, float]:
+    stop = threading.Event()
+    samples: list[int] = []
+    folder = threading.Thread(target=fold_loop, args=(stop, args.fold_interval), daemon=True)
+    sampler = threading.Thread(target=sample_lock_waits, args=(stop, samples), daemon=True)
+    folder.start()
+    sampler.start()
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+        parts = pool.starmap(writer_process, [
+            (product_id, args.threads, seconds, drain, seed) for seed in range(args.processes)
+        ])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    folder.join()
+    sampler.join()
+    fold_stock_shards()
+    totals = {
+        key: sum(part[key] for part in parts) for key in ("exits", "entries", "rejected")
+    }
+    totals["latencies"] = [value for part in parts for value in part["latencies"]]
+    totals["lock_wait"] = statistics.fmean(samples) if samples else 0.0
+    return totals, elapsed
+
+
+def final_state(product_id: int) -> tuple[int, int, int, int]:
+    """Stock plegado, suma de slots, slots negativos y stock neto según los movimientos."""
+    db = SessionLocal()
+    try:
+        stock = db.execute(select(Product.stock_current).where(Product.id == product_id)).scalar_one()
+        shard_sum, negative = db.execute(
+            select(func.coalesce(func.sum(StockShard.stock), 0), func.count().filter(StockShard.stock < 0))
+            .where(StockShard.product_id == product_id)
+        ).one()
+        net = db.execute(
+            select(func.coalesce(func.sum(case(
+                (InventoryMovement.movement_type == "entry", InventoryMovement.quantity),
+                else_=-InventoryMovement.quantity,
+            )), 0)).where(InventoryMovement.product_id == product_id)
+        ).scalar_one()
+        return stock, shard_sum, negative, net
+    finally:
+        db.close()
+
+
+def bench_mode(args: argparse.Namespace, shards: int) -> None:
+    label = f"repartido x{shards}" if shards else "normal"
+    initial = args.stock
+    product_id = seed_product(initial, shards)
+    totals, elapsed = run_writers(args, product_id, args.seconds, drain=False)
+    stock, shard_sum, negative, net = final_state(product_id)
+    expected = initial + totals["entries"] * ENTRY_QUANTITY - totals["exits"]
+    ok = stock == expected and initial + net == expected and negative == 0 and (not shards or shard_sum == stock)
+    ops = totals["exits"] + totals["entries"]
+    latencies = totals["latencies"]
+    print(f"{label:<14} ops={ops:<7} {ops / elapsed:8.0f} ops/s  p50={statistics.median(latencies):6.1f}ms "
+          f"p95={percentile(latencies, 0.95):6.1f}ms p99={percentile(latencies, 0.99):6.1f}ms  "
+          f"esperando bloqueo={totals['lock_wait']:4.1f}  conservación={'OK' if ok else 'ERROR'} (stock={stock} esperado={expected})")
+
+    # Agotamiento: poco stock y todos los escritores sacando de a una unidad
+    drain_product = seed_product(args.drain_stock, shards)
+    totals, _ = run_writers(args, drain_product, float("inf"), drain=True)
+    stock, shard_sum, negative, _ = final_state(drain_product)
+    ok = totals["exits"] == args.drain_stock and stock == 0 and shard_sum == 0 and negative == 0
+    print(f"{'':<14} agotamiento: vendidas={totals['exits']} de {args.drain_stock} "
+          f"rechazadas={totals['rejected']} slots negativos={negative} {'OK' if ok else 'ERROR'}")
+
+
+def main(args: argparse.Namespace) -> None:
+    cleanup()
+    print(f"escritores={args.processes * args.threads} ({args.processes} procesos x {args.threads} hilos) "
+          f"duración={args.seconds}s plegado cada {args.fold_interval}s")
+    try:
+        for shards in args.shards:
+            bench_mode(args, shards)
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--shards", type=int, nargs="+", default=[0, 16, 64])
+    parser.add_argument("--stock", type=int, default=1_000_000)
+    parser.add_argument("--drain-stock", type=int, default=2000)
+    parser.add_argument("--fold-interval", type=float, default=settings.STOCK_SHARD_FOLD_SECONDS)
+    main(parser.parse_args())
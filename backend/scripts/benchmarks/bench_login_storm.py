@@ -0,0 +1,100 @@
+"""
+Prueba de carga: tormenta de logins (inicio de turno).
+
+Lanza muchos logins concurrentes contra un servidor en ejecución y, en
+paralelo, sondea un endpoint autenticado de lectura para medir cómo afecta
+la tormenta a la latencia del resto de la API.
+
+Reporta:
+- throughput de login (logins/s), latencias p50/p95 y rechazos 503
+- latencia p50/p95 del endpoint sondeado antes y durante la tormenta
+
+Uso (con el backend levantado):
+    python -m scripts.benchmarks.bench_login_storm --base-url http://localhost:8000
+    python -m scripts.benchmarks.bench_login_storm --logins 500 --concurrency 100
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil simple (valores en ms)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * pct) - 1)]
+
+
+async def probe(client: httpx.AsyncClient, path: str, headers: dict, stop: asyncio.Event, interval: float) -> list[float]:
+    """Sondear ``path`` hasta que se active ``stop``; retorna latencias en ms."""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def main(args: argparse.Namespace) -> None:
+    api = f"{args.base_url}/api/v1"
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await client.post(f"{api}/auth/register", json={
+            "email": email, "full_name": "Benchmark", "password": password, "role": "seller",
+        })
+        token = (await client.post(f"{api}/auth/login/json", json={"email": email, "password": password})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        probe_path = f"{api}{args.probe_path}"
+
+        # Línea base sin tormenta
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, probe_path, headers, stop, args.probe_interval))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await baseline_task
+
+        # Tormenta de logins
+        semaphore = asyncio.Semaphore(args.concurrency)
+        login_latencies: list[float] = []
+        statuses: dict[int, int] = {}
+
+        async def login() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(f"{api}/auth/login/json", json={"email": email, "password": password})
+                login_latencies.append((time.perf_counter() - start) * 1000)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        stop = asyncio.Event()
+        storm_probe_task = asyncio.create_task(probe(client, probe_path, headers, stop, args.probe_interval))
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        during = await storm_probe_task
+
+    print(f"logins={args.logins} concurrencia={args.concurrency} duración={elapsed:.2f}s")
+    print(f"throughput login: {statuses.get(200, 0) / elapsed:.1f} logins/s  estados={statuses}")
+    print(f"latencia login: p50={statistics.median(login_latencies):.0f}ms p95={percentile(login_latencies, 0.95):.0f}ms")
+    print(f"{args.probe_path} sin tormenta: p50={statistics.median(baseline):.1f}ms p95={percentile(baseline, 0.95):.1f}ms")
+    print(f"{args.probe_path} durante tormenta: p50={statistics.median(during):.1f}ms p95={percentile(during, 0.95):.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-path", default="/products?page_size=1")
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,168 @@
+"""
+Benchmark de inventory_movements particionada por mes vs tabla sin particionar.
+
+Genera un historial sintético en el servidor (generate_series) en dos tablas
+de un esquema temporal con las mismas columnas que inventory_movements: una
+sin particionar con los índices previos a la partición y otra particionada
+por mes con los índices actuales. Mide la mediana de:
+- conteo del mes en curso (``count_by_period`` / estadísticas)
+- conteo de un mes histórico (filtros ``date_from``/``date_to``)
+- página por keyset en lo profundo del historial (``get_page_after``)
+- últimos movimientos de un producto (``get_by_product``)
+- retención: borrar el mes más antiguo (DELETE vs DROP de la partición)
+
+Uso (desde backend/, con la migración de particiones aplicada):
+    python -m scripts.benchmarks.bench_movement_partitions
+    python -m scripts.benchmarks.bench_movement_partitions --rows 50000000 --months 60
+
+El esquema "bench_partitions" se elimina al terminar.
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+
+SCHEMA = "bench_partitions"
+PRODUCTS = 5000
+
+QUERIES = {
+    "conteo mes actual": """
+        SELECT count(*) FROM {table} WHERE created_at >= :month_start
+    """,
+    "conteo mes histórico": """
+        SELECT count(*) FROM {table}
+        WHERE created_at >= :old_month AND created_at <= :old_month_end
+    """,
+    "keyset profundo": """
+        SELECT id FROM {table}
+        WHERE created_at <= :cursor_at AND (created_at, id) < (:cursor_at, :cursor_id)
+        ORDER BY created_at DESC, id DESC LIMIT 21
+    """,
+    "historial producto": """
+        SELECT id FROM {table} WHERE product_id = :product_id
+        ORDER BY created_at DESC LIMIT 50
+    """,
+}
+
+
+def add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def seed(rows: int, months: int) -> date:
+    """Crear ambas tablas y llenarlas con ``rows`` movimientos en ``months`` meses; retorna el primer mes."""
+    first_month = add_months(date.today().replace(day=1), -(months - 1))
+    end = add_months(first_month, months)
+    db = SessionLocal()
+    try:
+        db.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        db.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        db.execute(text(f"CREATE TABLE {SCHEMA}.plain (LIKE public.inventory_movements, PRIMARY KEY (id))"))
+        db.execute(text(f"""
+            CREATE TABLE {SCHEMA}.partitioned (LIKE public.inventory_movements, PRIMARY KEY (id, created_at))
+            PARTITION BY RANGE (created_at)
+        """))
+        for i in range(months):
+            start = add_months(first_month, i)
+            db.execute(text(f"""
+                CREATE TABLE {SCHEMA}.partitioned_{start:%Y_%m} PARTITION OF {SCHEMA}.partitioned
+                FOR VALUES FROM ('{start}') TO ('{add_months(start, 1)}')
+            """))
+
+        for table in ("plain", "partitioned"):
+            started = time.perf_counter()
+            db.execute(text(f"""
+                INSERT INTO {SCHEMA}.{table}
+                    (id, product_id, movement_type, reason, quantity, stock_before, stock_after,
+                     user_id, reference, notes, created_at, updated_at)
+                SELECT g, 1 + g % {PRODUCTS}, 'entry', 'purchase', 1 + g % 7, 0, 1,
+                       NULL, NULL, NULL, ts, ts
+                FROM generate_series(1, :rows) AS g,
+                     LATERAL (SELECT CAST(:start AS timestamp)
+                                     + (CAST(:end AS timestamp) - CAST(:start AS timestamp)) * CAST((g - 0.5) / :rows AS float8) AS ts) t
+            """), {"rows": rows, "start": first_month, "end": end})
+            db.commit()
+            print(f"carga {table}: {time.perf_counter() - started:.1f}s")
+
+        # Índices previos a la partición y los de la tabla particionada
+        for columns in ("created_at, id", "created_at", "product_id"):
+            db.execute(text(f"CREATE INDEX ON {SCHEMA}.plain ({columns})"))
+        for columns in ("created_at, id", "product_id, created_at"):
+            db.execute(text(f"CREATE INDEX ON {SCHEMA}.partitioned ({columns})"))
+        db.execute(text(f"ANALYZE {SCHEMA}.plain"))
+        db.execute(text(f"ANALYZE {SCHEMA}.partitioned"))
+        db.commit()
+        return first_month
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def timed(db, sql: str, params: dict, repeat: int) -> float:
+    """Mediana en ms de ``repeat`` ejecuciones."""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.execute(text(sql), params).all()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    first_month = seed(args.rows, args.months)
+    db = SessionLocal()
+    try:
+        old_month = add_months(first_month, args.months // 4)
+        cursor_at, cursor_id = db.execute(text(
+            f"SELECT created_at, id FROM {SCHEMA}.plain WHERE id = :id"
+        ), {"id": args.rows // 10}).one()
+        params = {
+            "month_start": date.today().replace(day=1),
+            "old_month": old_month,
+            "old_month_end": add_months(old_month, 1),
+            "cursor_at": cursor_at,
+            "cursor_id": cursor_id,
+            "product_id": PRODUCTS // 2,
+        }
+
+        print(f"filas={args.rows} meses={args.months}")
+        for name, sql in QUERIES.items():
+            plain = timed(db, sql.format(table=f"{SCHEMA}.plain"), params, args.repeat)
+            partitioned = timed(db, sql.format(table=f"{SCHEMA}.partitioned"), params, args.repeat)
+            print(f"{name:<22} sin particionar={plain:9.2f}ms  particionada={partitioned:9.2f}ms")
+
+        start = time.perf_counter()
+        db.execute(text(f"DELETE FROM {SCHEMA}.plain WHERE created_at < :end"), {"end": add_months(first_month, 1)})
+        db.commit()
+        plain = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        db.execute(text(f"DROP TABLE {SCHEMA}.partitioned_{first_month:%Y_%m}"))
+        db.commit()
+        partitioned = (time.perf_counter() - start) * 1000
+        print(f"{'retención (1 mes)':<22} sin particionar={plain:9.2f}ms  particionada={partitioned:9.2f}ms")
+    finally:
+        db.close()
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
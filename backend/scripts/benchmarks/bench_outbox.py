@@ -0,0 +1,225 @@
+"""
+Benchmark del outbox de inventario contra un receptor HTTP local.
+
+Levanta en proceso un receptor HTTP que hace de consumidor externo (con
+``--fail-every N`` guarda el lote y aun así responde 500 cada N pedidos,
+como un ACK perdido) y, mientras ``--writers`` hilos registran
+``--movements`` movimientos sobre ``--products`` productos, corre el relay
+con HttpSink hasta vaciar la cola. Con ``--backlog`` primero escribe todo
+y después mide cuánto tarda el relay en vaciar la cola acumulada.
+
+Reporta el throughput de escritura y de entrega, el atraso commit→receptor
+y verifica la entrega al menos una vez: todos los movimientos llegan, los
+repetidos son solo los de lotes reintentados y, por producto, llegan en el
+orden de sus ids.
+
+Uso (desde backend/, contra la base configurada en .env; sin otro relay
+corriendo, con el backend detenido u OUTBOX_RELAY_SECONDS=0). Los
+movimientos solo escriben el outbox con un destino configurado, así que
+OUTBOX_SINK no puede ser "none" (el benchmark usa su propio HttpSink):
+    OUTBOX_SINK=http python -m scripts.benchmarks.bench_outbox
+    OUTBOX_SINK=http python -m scripts.benchmarks.bench_outbox --movements 20000 --writers 8 --batch-size 500 --fail-every 5
+
+Crea productos temporales con SKU "BENCH-OBX-*" y los elimina (con sus
+movimientos) al terminar.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import delete, insert, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.inventory_movement import InventoryMovement
+from app.models.inventory_outbox import InventoryOutboxEvent
+from app.models.product import Product
+from app.schemas.inventory import InventoryMovementCreate, MovementReasonEnum, MovementTypeEnum
+from app.services.inventory_service import InventoryService
+from app.services.outbox_relay import relay_inventory_outbox, relay_metrics
+from app.services.outbox_sinks import HttpSink
+
+SKU_PREFIX = "BENCH-OBX-"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil simple (valores en ms)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * pct) - 1)]
+
+
+class Receiver:
+    """Receptor HTTP local: guarda cada evento recibido con la hora de llegada."""
+
+    def __init__(self, fail_every: int):
+        self.fail_every = fail_every
+        self.requests = 0
+        self.events: list[tuple[dict, float]] = []
+        self.lock = threading.Lock()
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                received_at = time.time()
+                with receiver.lock:
+                    receiver.requests += 1
+                    receiver.events.extend((event, received_at) for event in json.loads(body))
+                    fail = receiver.fail_every and receiver.requests % receiver.fail_every == 0
+                self.send_response(500 if fail else 204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/events"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+def seed_products(count: int, stock: int) -> list[int]:
+    db = SessionLocal()
+    try:
+        ids = db.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [
+                {
+                    "sku": f"{SKU_PREFIX}{i:06d}",
+                    "name": f"Producto outbox benchmark {i}",
+                    "stock_current": stock,
+                    "stock_min": 0,
+                    "cost": 1,
+                    "price": 2,
+                    "is_active": True,
+                }
+                for i in range(count)
+            ],
+        ).scalars().all()
+        db.commit()
+        return list(ids)
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    """Eliminar eventos, movimientos y productos creados por el benchmark."""
+    db = SessionLocal()
+    try:
+        bench_ids = select(Product.id).where(Product.sku.like(f"{SKU_PREFIX}%"))
+        db.execute(delete(InventoryOutboxEvent).where(InventoryOutboxEvent.product_id.in_(bench_ids)))
+        db.execute(delete(InventoryMovement).where(InventoryMovement.product_id.in_(bench_ids)))
+        db.execute(delete(Product).where(Product.sku.like(f"{SKU_PREFIX}%")))
+        db.commit()
+    finally:
+        db.close()
+
+
+def write_movements(product_ids: list[int], count: int, writers: int) -> float:
+    """Registrar ``count`` salidas de una unidad repartidas entre los productos; retorna segundos."""
+    def run(writer: int) -> None:
+        db = SessionLocal()
+        service = InventoryService(db)
+        try:
+            for position in range(writer, count, writers):
+                service.create_movement(InventoryMovementCreate(
+                    product_id=product_ids[position % len(product_ids)],
+                    movement_type=MovementTypeEnum.EXIT,
+                    reason=MovementReasonEnum.SALE,
+                    quantity=1,
+                ))
+        finally:
+            db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        list(pool.map(run, range(writers)))
+    return time.perf_counter() - start
+
+
+def main(args: argparse.Namespace) -> None:
+    if settings.OUTBOX_SINK == "none":
+        raise SystemExit("OUTBOX_SINK=none: los movimientos no escriben el outbox (ver el uso)")
+    settings.OUTBOX_BATCH_SIZE = args.batch_size
+    cleanup()
+    receiver = Receiver(args.fail_every)
+    sink = HttpSink(receiver.url, timeout=10)
+    product_ids = seed_products(args.products, args.movements)
+    try:
+        writing = threading.Event()
+        if args.backlog:
+            write_seconds = write_movements(product_ids, args.movements, args.writers)
+        relay_start = time.perf_counter()
+
+        def relay_loop() -> None:
+            # Hasta que terminen los escritores y la cola quede vacía
+            while True:
+                delivered = relay_inventory_outbox(sink)
+                if not writing.is_set() and not delivered and not relay_metrics.pending:
+                    break
+                time.sleep(args.interval)
+
+        if args.backlog:
+            relay_loop()
+        else:
+            writing.set()
+            relay = threading.Thread(target=relay_loop)
+            relay.start()
+            write_seconds = write_movements(product_ids, args.movements, args.writers)
+            writing.clear()
+            relay.join()
+        relay_seconds = time.perf_counter() - relay_start
+
+        db = SessionLocal()
+        try:
+            movements = dict(db.execute(
+                select(InventoryMovement.id, InventoryMovement.product_id)
+                .where(InventoryMovement.product_id.in_(product_ids))
+            ).all())
+        finally:
+            db.close()
+
+        received = [(event, at) for event, at in receiver.events if event["data"]["movement_id"] in movements]
+        unique = {event["id"] for event, _ in received}
+        per_product: dict[int, list[int]] = {}
+        seen: set[int] = set()
+        for event, _ in received:
+            if event["id"] in seen:
+                continue
+            seen.add(event["id"])
+            per_product.setdefault(event["data"]["product_id"], []).append(event["data"]["movement_id"])
+        in_order = all(ids == sorted(ids) for ids in per_product.values())
+        complete = {event["data"]["movement_id"] for event, _ in received} == set(movements)
+        lags = [
+            (at - datetime.fromisoformat(event["created_at"]).timestamp()) * 1000 for event, at in received
+        ]
+
+        print(f"movimientos={args.movements} productos={args.products} escritores={args.writers} "
+              f"lote={args.batch_size} falla cada={args.fail_every or '-'}")
+        print(f"escritura: {args.movements / write_seconds:.0f} movimientos/s")
+        print(f"entrega: {len(unique) / relay_seconds:.0f} eventos/s  pedidos={receiver.requests} "
+              f"fallas={relay_metrics.failures} repetidos={len(received) - len(unique)}")
+        print(f"atraso commit→receptor: p50={statistics.median(lags):.0f}ms p95={percentile(lags, 0.95):.0f}ms "
+              f"max={max(lags):.0f}ms")
+        print(f"completo={'OK' if complete else 'ERROR'} orden por producto={'OK' if in_order else 'ERROR'}")
+    finally:
+        receiver.server.shutdown()
+        cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movements", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=50)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--interval", type=float, default=0.1, help="Pausa del relay entre vueltas (s)")
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--backlog", action="store_true", help="Escribir todo antes de iniciar el relay")
+    main(parser.parse_args())
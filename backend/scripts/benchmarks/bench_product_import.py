@@ -0,0 +1,115 @@
+"""
+Benchmark de la importación masiva de productos (ProductImportService).
+
+Genera un catálogo CSV sintético en memoria y mide filas/s de:
+- importación inicial (todas las filas se crean)
+- reimportación del mismo archivo (todas las filas se actualizan)
+- referencia: ``ProductService.create`` fila por fila sobre una muestra
+
+Uso (desde backend/):
+    python -m scripts.benchmarks.bench_product_import
+    python -m scripts.benchmarks.bench_product_import --rows 50000 --sample 500
+
+Los productos sintéticos usan SKU "BENCH-IMPORT-*" y se eliminan al terminar.
+"""
+import argparse
+import io
+import random
+import time
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+from app.schemas.product import ProductCreate
+from app.services.product_import_service import ProductImportService
+from app.services.product_service import ProductService
+
+SKU_PREFIX = "BENCH-IMPORT-"
+
+
+def build_csv(rows: int, category_ids: list[int], start: int = 0) -> bytes:
+    """Catálogo sintético con ~10% de filas inválidas (precio negativo o SKU repetido)."""
+    lines = ["sku,name,description,category_id,stock_current,stock_min,cost,price"]
+    for i in range(start, start + rows):
+        sku = f"{SKU_PREFIX}{i:08d}"
+        price = f"{random.uniform(1, 500):.2f}"
+        if i % 20 == 7:
+            price = "-1"
+        elif i % 20 == 13:
+            sku = f"{SKU_PREFIX}{i - 1:08d}"
+        category = random.choice(category_ids) if category_ids else ""
+        lines.append(
+            f"{sku},Producto sintético {i},Descripción del producto {i},{category},"
+            f"{random.randint(0, 200)},{random.randint(0, 50)},{random.uniform(1, 300):.2f},{price}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def run_import(payload: bytes) -> tuple[float, dict]:
+    """Importar ``payload`` en una sesión nueva; retorna (segundos, resultado)."""
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        result = ProductImportService(db).import_file(io.BytesIO(payload), "catalogo.csv")
+        return time.perf_counter() - start, result.model_dump(exclude={"errors"})
+    finally:
+        db.close()
+
+
+def run_per_row(sample: int, category_ids: list[int]) -> float:
+    """Crear ``sample`` productos con ProductService.create; retorna filas/s."""
+    db = SessionLocal()
+    try:
+        service = ProductService(db)
+        start = time.perf_counter()
+        for i in range(sample):
+            service.create(ProductCreate(
+                sku=f"{SKU_PREFIX}ROW-{i:06d}",
+                name=f"Producto fila a fila {i}",
+                category_id=random.choice(category_ids) if category_ids else None,
+                stock_current=random.randint(0, 200),
+                stock_min=random.randint(0, 50),
+                cost=Decimal("10.00"),
+                price=Decimal("12.50"),
+            ))
+        return sample / (time.perf_counter() - start)
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.execute(text("DELETE FROM products WHERE sku LIKE :prefix"), {"prefix": f"{SKU_PREFIX}%"})
+        db.commit()
+    finally:
+        db.close()
+
+
+def main(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        category_ids = list(db.execute(text("SELECT id FROM categories LIMIT 50")).scalars())
+    finally:
+        db.close()
+
+    payload = build_csv(args.rows, category_ids)
+    print(f"filas={args.rows} tamaño={len(payload) / 1e6:.1f}MB categorías={len(category_ids)}")
+    cleanup()
+    try:
+        elapsed, result = run_import(payload)
+        print(f"importación inicial: {elapsed:.2f}s  {args.rows / elapsed:,.0f} filas/s  {result}")
+        elapsed, result = run_import(payload)
+        print(f"reimportación (upsert): {elapsed:.2f}s  {args.rows / elapsed:,.0f} filas/s  {result}")
+        if args.sample:
+            print(f"ProductService.create fila a fila: {run_per_row(args.sample, category_ids):,.0f} filas/s")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--sample", type=int, default=500)
+    main(parser.parse_args())
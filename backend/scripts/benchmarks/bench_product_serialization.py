@@ -0,0 +1,95 @@
+"""
+Benchmark de serialización del listado de productos (GET /products).
+
+Compara, sobre páginas de 100 productos, el costo por fila de:
+- ORM + Pydantic: entidades con joinedload, ProductWithRelations por fila y
+  ProductListResponse serializado con Pydantic (camino anterior).
+- Proyección + orjson: ``ProductService.get_all_serialized`` (filas planas
+  convertidas a dict) y FastJSONResponse.
+
+Ambos caminos incluyen la consulta; también se mide solo la serialización
+para aislar el costo de CPU. Verifica que el JSON producido sea idéntico.
+
+Uso (desde backend/, con productos en la base):
+    python -m scripts.benchmarks.bench_product_serialization
+    python -m scripts.benchmarks.bench_product_serialization --rounds 200 --page-size 100
+"""
+import argparse
+import statistics
+import time
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from app.core.database import SessionLocal
+from app.schemas.product import ProductWithRelations
+from app.services.product_service import ProductService, product_row_to_dict, to_product_with_relations
+from app.utils.responses import FastJSONResponse
+
+ProductListItems = TypeAdapter(list[ProductWithRelations])
+
+
+def measure(fn: Callable[[], object], rounds: int) -> list[float]:
+    """Ejecutar ``fn`` ``rounds`` veces; retorna latencias en ms."""
+    latencies = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: list[float], rows: int) -> float:
+    """Imprimir mediana por página y por fila; retorna la mediana por fila en µs."""
+    median = statistics.median(latencies)
+    per_row = median * 1000 / rows if rows else 0.0
+    print(f"{label:<34} página p50={median:7.2f}ms  por fila={per_row:6.1f}µs")
+    return per_row
+
+
+def main(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        service = ProductService(db)
+
+        def pydantic_path() -> bytes:
+            return service.get_all(1, args.page_size).model_dump_json().encode()
+
+        def orjson_path() -> bytes:
+            return FastJSONResponse(service.get_all_serialized(1, args.page_size)).body
+
+        old_body, new_body = pydantic_path(), orjson_path()
+        if old_body != new_body:
+            raise SystemExit("El JSON de ambos caminos difiere")
+        rows = len(service.get_all_serialized(1, args.page_size)["items"])
+        if not rows:
+            raise SystemExit("No hay productos para medir")
+        print(f"filas por página={rows} bytes={len(new_body)} rondas={args.rounds}")
+
+        old = report("ORM + Pydantic (consulta+JSON)", measure(pydantic_path, args.rounds), rows)
+        new = report("Proyección + orjson (consulta+JSON)", measure(orjson_path, args.rounds), rows)
+        print(f"mejora de punta a punta: {old / new:.1f}x")
+
+        # Solo conversión y serialización, con los datos ya cargados
+        products, _ = service.product_repo.get_page(limit=args.page_size)
+        product_rows, _ = service.product_repo.get_page_rows(limit=args.page_size)
+        old = report(
+            "Pydantic (sin consulta)",
+            measure(lambda: ProductListItems.dump_json([to_product_with_relations(p) for p in products]), args.rounds),
+            rows,
+        )
+        new = report(
+            "dict + orjson (sin consulta)",
+            measure(lambda: FastJSONResponse([product_row_to_dict(r) for r in product_rows]).body, args.rounds),
+            rows,
+        )
+        print(f"mejora de serialización: {old / new:.1f}x")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=100)
+    main(parser.parse_args())
@@ -0,0 +1,159 @@
+"""
+Prueba de carga de POST /sales (SaleService.checkout).
+
+Crea productos temporales con stock de sobra directamente en la base, lanza
+tickets concurrentes de varias líneas contra un servidor en ejecución y
+reporta:
+- throughput (tickets/s y líneas/s) y latencias p50/p95/p99
+- estados de respuesta (201 o errores)
+- consistencia: el stock descontado coincide con las unidades vendidas
+
+Un pool de productos pequeño (--products) aumenta la contención: más
+tickets esperan el bloqueo de las mismas filas.
+
+Uso (con el backend levantado, desde backend/):
+    python -m scripts.benchmarks.bench_sales_checkout --base-url http://localhost:8000
+    python -m scripts.benchmarks.bench_sales_checkout --tickets 5000 --concurrency 32 --lines 5 --products 200
+
+Los productos usan SKU "BENCH-SALES-*" y se eliminan (con sus movimientos) al terminar.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete, insert, select
+
+from app.core.database import SessionLocal
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+
+SKU_PREFIX = "BENCH-SALES-"
+INITIAL_STOCK = 1_000_000
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil simple (valores en ms)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * pct) - 1)]
+
+
+def seed_products(count: int) -> list[int]:
+    """Crear ``count`` productos temporales con stock inicial y retornar sus ids."""
+    db = SessionLocal()
+    try:
+        ids = db.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [
+                {
+                    "sku": f"{SKU_PREFIX}{i:06d}",
+                    "name": f"Producto venta benchmark {i}",
+                    "stock_current": INITIAL_STOCK,
+                    "stock_min": 0,
+                    "cost": 1,
+                    "price": 2,
+                    "is_active": True,
+                }
+                for i in range(count)
+            ],
+        ).scalars().all()
+        db.commit()
+        return list(ids)
+    finally:
+        db.close()
+
+
+def sold_units() -> int:
+    """Unidades descontadas de los productos del benchmark."""
+    db = SessionLocal()
+    try:
+        stocks = db.execute(select(Product.stock_current).where(Product.sku.like(f"{SKU_PREFIX}%"))).scalars().all()
+        return sum(INITIAL_STOCK - stock for stock in stocks)
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    """Eliminar movimientos y productos creados por el benchmark."""
+    db = SessionLocal()
+    try:
+        bench_ids = select(Product.id).where(Product.sku.like(f"{SKU_PREFIX}%"))
+        db.execute(delete(InventoryMovement).where(InventoryMovement.product_id.in_(bench_ids)))
+        db.execute(delete(Product).where(Product.sku.like(f"{SKU_PREFIX}%")))
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_ticket(rng: random.Random, product_ids: list[int], lines: int) -> dict:
+    return {
+        "items": [
+            {"product_id": product_id, "quantity": rng.randint(1, 3)}
+            for product_id in rng.sample(product_ids, min(lines, len(product_ids)))
+        ],
+        "reference": f"BENCH-{uuid.uuid4().hex[:10]}",
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    api = f"{args.base_url}/api/v1"
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+
+    cleanup()
+    product_ids = seed_products(args.products)
+    rng = random.Random(42)
+    tickets = [build_ticket(rng, product_ids, args.lines) for _ in range(args.tickets)]
+    expected_units = sum(item["quantity"] for ticket in tickets for item in ticket["items"])
+
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency + 10)
+        async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+            await client.post(f"{api}/auth/register", json={
+                "email": email, "full_name": "Benchmark", "password": password, "role": "seller",
+            })
+            token = (await client.post(f"{api}/auth/login/json", json={"email": email, "password": password})).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            queue: asyncio.Queue = asyncio.Queue()
+            for ticket in tickets:
+                queue.put_nowait(ticket)
+            latencies: list[float] = []
+            statuses: dict[int, int] = {}
+
+            async def worker() -> None:
+                while not queue.empty():
+                    ticket = queue.get_nowait()
+                    start = time.perf_counter()
+                    response = await client.post(f"{api}/sales", json=ticket, headers=headers)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - start
+
+        ok = statuses.get(201, 0)
+        print(f"tickets={args.tickets} líneas/ticket={args.lines} productos={args.products} concurrencia={args.concurrency}")
+        print(f"throughput: {ok / elapsed:.1f} tickets/s  {ok * args.lines / elapsed:.0f} líneas/s  estados={statuses}")
+        print(f"latencia: p50={statistics.median(latencies):.1f}ms p95={percentile(latencies, 0.95):.1f}ms p99={percentile(latencies, 0.99):.1f}ms")
+        if ok == args.tickets:
+            units = sold_units()
+            print(f"consistencia: unidades vendidas={expected_units} stock descontado={units} {'OK' if units == expected_units else 'ERROR'}")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--lines", type=int, default=5)
+    parser.add_argument("--products", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,192 @@
+"""
+Prueba de carga del canal de cambios de stock en vivo (SSE).
+
+Contra un servidor con STOCK_EVENTS_ENABLED, abre ``--clients`` streams
+SSE (la mitad filtrados por el producto de prueba y la otra mitad por su
+categoría) y, en proceso, registra ``--movements`` salidas de una unidad
+a ``--rate`` por segundo. Mide la latencia desde el commit de cada
+movimiento hasta que cada cliente recibe su evento, y verifica que todos
+reciban todos los eventos, en orden y sin ``resync``.
+
+Con varios workers de uvicorn los clientes quedan repartidos entre ellos:
+cada worker recibe los cambios por su propio LISTEN.
+
+Uso (con el backend levantado, desde backend/):
+    python -m scripts.benchmarks.bench_stock_events --base-url http://localhost:8000
+    python -m scripts.benchmarks.bench_stock_events --clients 500 --movements 1000 --rate 200
+
+Crea una categoría y un producto temporales ("BENCH-EVT-*") y los elimina
+al terminar.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete, insert, select
+
+from app.core.database import SessionLocal
+from app.models.category import Category
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+from app.schemas.inventory import InventoryMovementCreate, MovementReasonEnum, MovementTypeEnum
+from app.services.inventory_service import InventoryService
+
+SKU_PREFIX = "BENCH-EVT-"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil simple (valores en ms)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * pct) - 1)]
+
+
+def seed_product(stock: int) -> tuple[int, int]:
+    """Crear la categoría y el producto de prueba; retorna (product_id, category_id)."""
+    db = SessionLocal()
+    try:
+        category_id = db.execute(insert(Category).returning(Category.id), {
+            "name": f"{SKU_PREFIX}{uuid.uuid4().hex[:8]}",
+        }).scalar_one()
+        product_id = db.execute(insert(Product).returning(Product.id), {
+            "sku": f"{SKU_PREFIX}{uuid.uuid4().hex[:8].upper()}",
+            "name": "Producto eventos benchmark",
+            "category_id": category_id,
+            "stock_current": stock,
+            "stock_min": 0,
+            "cost": 1,
+            "price": 2,
+            "is_active": True,
+        }).scalar_one()
+        db.commit()
+        return product_id, category_id
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    """Eliminar movimientos, productos y categorías creados por el benchmark."""
+    db = SessionLocal()
+    try:
+        bench_ids = select(Product.id).where(Product.sku.like(f"{SKU_PREFIX}%"))
+        db.execute(delete(InventoryMovement).where(InventoryMovement.product_id.in_(bench_ids)))
+        db.execute(delete(Product).where(Product.sku.like(f"{SKU_PREFIX}%")))
+        db.execute(delete(Category).where(Category.name.like(f"{SKU_PREFIX}%")))
+        db.commit()
+    finally:
+        db.close()
+
+
+def produce(product_id: int, count: int, rate: float, committed: dict[int, float]) -> None:
+    """Registrar ``count`` salidas de una unidad; guarda la hora de commit por stock resultante."""
+    db = SessionLocal()
+    service = InventoryService(db)
+    data = InventoryMovementCreate(
+        product_id=product_id, movement_type=MovementTypeEnum.EXIT, reason=MovementReasonEnum.SALE, quantity=1
+    )
+    try:
+        start = time.perf_counter()
+        for position in range(count):
+            delay = start + position / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            movement = service.create_movement(data)
+            committed[movement.stock_after] = time.time()
+    finally:
+        db.close()
+
+
+async def client(
+    http: httpx.AsyncClient, url: str, params: dict, expected: int, ready: asyncio.Event, result: dict
+) -> None:
+    """Leer el stream hasta recibir ``expected`` eventos stock_changed."""
+    received: list[tuple[int, float]] = []
+    async with http.stream("GET", url, params=params) as response:
+        response.raise_for_status()
+        ready.set()
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                if event == "resync":
+                    result["resyncs"] += 1
+                elif event == "stock_changed":
+                    received.append((json.loads(line[6:])["stock_after"], time.time()))
+                    if len(received) == expected:
+                        break
+    result["clients"].append(received)
+
+
+async def bench(args: argparse.Namespace, product_id: int, category_id: int) -> None:
+    api = f"{args.base_url}/api/v1"
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+    limits = httpx.Limits(max_connections=args.clients + 10)
+    async with httpx.AsyncClient(timeout=httpx.Timeout(60, read=None), limits=limits) as http:
+        await http.post(f"{api}/auth/register", json={
+            "email": email, "full_name": "Benchmark", "password": password, "role": "seller",
+        })
+        token = (await http.post(f"{api}/auth/login/json", json={"email": email, "password": password})).json()["access_token"]
+
+        result = {"clients": [], "resyncs": 0}
+        readies = []
+        tasks = []
+        for position in range(args.clients):
+            ready = asyncio.Event()
+            readies.append(ready)
+            params = {"token": token}
+            params["product_id" if position % 2 == 0 else "category_id"] = product_id if position % 2 == 0 else category_id
+            tasks.append(asyncio.create_task(
+                client(http, f"{api}/inventory/events/stream", params, args.movements, ready, result)
+            ))
+        await asyncio.wait_for(asyncio.gather(*(ready.wait() for ready in readies)), 60)
+        # Los encabezados salen antes de que la suscripción quede activa en el servidor
+        await asyncio.sleep(0.5)
+
+        committed: dict[int, float] = {}
+        producer = threading.Thread(target=produce, args=(product_id, args.movements, args.rate, committed))
+        start = time.perf_counter()
+        producer.start()
+        await asyncio.wait_for(asyncio.gather(*tasks), args.movements / args.rate + 60)
+        elapsed = time.perf_counter() - start
+        producer.join()
+
+    latencies = [
+        (received_at - committed[stock]) * 1000
+        for received in result["clients"] for stock, received_at in received
+    ]
+    in_order = all(
+        [stock for stock, _ in received] == sorted(committed, reverse=True) for received in result["clients"]
+    )
+    delivered = len(latencies)
+    print(f"clientes={args.clients} movimientos={args.movements} tasa={args.rate}/s")
+    print(f"eventos entregados={delivered} ({delivered / elapsed:.0f}/s) resyncs={result['resyncs']} "
+          f"orden={'OK' if in_order else 'ERROR'}")
+    print(f"latencia commit→cliente: p50={statistics.median(latencies):.1f}ms "
+          f"p95={percentile(latencies, 0.95):.1f}ms p99={percentile(latencies, 0.99):.1f}ms "
+          f"max={max(latencies):.1f}ms")
+
+
+def main(args: argparse.Namespace) -> None:
+    cleanup()
+    product_id, category_id = seed_product(args.movements + 1)
+    try:
+        asyncio.run(bench(args, product_id, category_id))
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--movements", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=100)
+    main(parser.parse_args())
@@ -0,0 +1,224 @@
+"""
+Prueba de carga de reservas de stock y del barrido de vencidas.
+
+Contra un servidor en ejecución, lanza clientes concurrentes que reservan
+carritos de varias líneas sobre un pool chico de productos con stock
+limitado; la mitad de las reservas se confirma y el resto se libera.
+Reporta throughput y latencias por operación y verifica que nunca se haya
+reservado o vendido más de lo que había.
+
+Después mide el barrido en proceso: crea ``--expired`` reservas ya vencidas
+y cronometra ``expire_stock_reservations``.
+
+Uso (con el backend levantado, desde backend/):
+    python -m scripts.benchmarks.bench_stock_reservations --base-url http://localhost:8000
+    python -m scripts.benchmarks.bench_stock_reservations --carts 3000 --concurrency 32 --expired 200000
+
+Los productos usan SKU "BENCH-RESV-*" y se eliminan (con sus movimientos y
+reservas) al terminar.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete, insert, select, text
+
+from app.core.database import SessionLocal
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+from app.models.stock_reservation import StockReservation, StockReservationItem
+from app.services.reservation_expiry import expire_stock_reservations
+
+SKU_PREFIX = "BENCH-RESV-"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil simple (valores en ms)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * pct) - 1)]
+
+
+def seed_products(count: int, stock: int) -> list[int]:
+    """Crear ``count`` productos temporales con ``stock`` unidades y retornar sus ids."""
+    db = SessionLocal()
+    try:
+        ids = db.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [
+                {
+                    "sku": f"{SKU_PREFIX}{i:06d}",
+                    "name": f"Producto reserva benchmark {i}",
+                    "stock_current": stock,
+                    "stock_min": 0,
+                    "cost": 1,
+                    "price": 2,
+                    "is_active": True,
+                }
+                for i in range(count)
+            ],
+        ).scalars().all()
+        db.commit()
+        return list(ids)
+    finally:
+        db.close()
+
+
+def bench_ids():
+    return select(Product.id).where(Product.sku.like(f"{SKU_PREFIX}%"))
+
+
+def consistency(initial_stock: int) -> tuple[int, int]:
+    """Productos con stock o disponible negativos, y unidades totales que faltan o sobran."""
+    db = SessionLocal()
+    try:
+        row = db.execute(text("""
+            SELECT count(*) FILTER (WHERE a.stock_current < 0 OR a.stock_available < 0),
+                   coalesce(sum(:initial - a.stock_current - coalesce(m.sold, 0)), 0)
+            FROM product_stock_availability a
+            JOIN products p ON p.id = a.product_id
+            LEFT JOIN (
+                SELECT product_id, sum(quantity) AS sold FROM inventory_movements GROUP BY product_id
+            ) m ON m.product_id = a.product_id
+            WHERE p.sku LIKE :prefix
+        """), {"initial": initial_stock, "prefix": f"{SKU_PREFIX}%"}).one()
+        return row[0], row[1]
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    """Eliminar reservas, movimientos y productos creados por el benchmark."""
+    db = SessionLocal()
+    try:
+        db.execute(delete(StockReservation).where(StockReservation.id.in_(
+            select(StockReservationItem.reservation_id).where(StockReservationItem.product_id.in_(bench_ids()))
+        )))
+        db.execute(delete(InventoryMovement).where(InventoryMovement.product_id.in_(bench_ids())))
+        db.execute(delete(Product).where(Product.sku.like(f"{SKU_PREFIX}%")))
+        db.commit()
+    finally:
+        db.close()
+
+
+def build_cart(rng: random.Random, product_ids: list[int], lines: int) -> dict:
+    return {
+        "items": [
+            {"product_id": product_id, "quantity": rng.randint(1, 3)}
+            for product_id in rng.sample(product_ids, min(lines, len(product_ids)))
+        ],
+        "reference": f"CART-{uuid.uuid4().hex[:10]}",
+    }
+
+
+async def bench_api(args: argparse.Namespace, product_ids: list[int]) -> None:
+    api = f"{args.base_url}/api/v1"
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+    rng = random.Random(42)
+    carts = [build_cart(rng, product_ids, args.lines) for _ in range(args.carts)]
+
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await client.post(f"{api}/auth/register", json={
+            "email": email, "full_name": "Benchmark", "password": password, "role": "seller",
+        })
+        token = (await client.post(f"{api}/auth/login/json", json={"email": email, "password": password})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for position, cart in enumerate(carts):
+            queue.put_nowait((position, cart))
+        latencies: dict[str, list[float]] = {"reserve": [], "confirm": [], "release": [], "check": []}
+        statuses: dict[str, dict[int, int]] = {name: {} for name in latencies}
+
+        async def call(name: str, method: str, url: str, **kwargs) -> httpx.Response:
+            start = time.perf_counter()
+            response = await client.request(method, url, headers=headers, **kwargs)
+            latencies[name].append((time.perf_counter() - start) * 1000)
+            statuses[name][response.status_code] = statuses[name].get(response.status_code, 0) + 1
+            return response
+
+        async def worker() -> None:
+            while not queue.empty():
+                position, cart = queue.get_nowait()
+                item = cart["items"][0]
+                await call("check", "GET", f"{api}/inventory/check-stock/{item['product_id']}",
+                           params={"quantity": item["quantity"]})
+                response = await call("reserve", "POST", f"{api}/reservations", json=cart)
+                if response.status_code != 201:
+                    continue
+                reservation_id = response.json()["id"]
+                if position % 2 == 0:
+                    await call("confirm", "POST", f"{api}/reservations/{reservation_id}/confirm")
+                else:
+                    await call("release", "DELETE", f"{api}/reservations/{reservation_id}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    print(f"carritos={args.carts} líneas={args.lines} productos={args.products} "
+          f"stock={args.stock} concurrencia={args.concurrency}")
+    print(f"throughput: {args.carts / elapsed:.1f} carritos/s")
+    for name, values in latencies.items():
+        if values:
+            print(f"{name:<8} n={len(values):<6} p50={statistics.median(values):7.1f}ms "
+                  f"p95={percentile(values, 0.95):7.1f}ms estados={statuses[name]}")
+
+
+def bench_sweep(product_ids: list[int], expired: int, lines: int) -> None:
+    """Crear ``expired`` reservas vencidas con ``lines`` líneas y medir el barrido."""
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            INSERT INTO stock_reservations (reference, expires_at)
+            SELECT 'BENCH-EXPIRED', now() - interval '1 minute'
+            FROM generate_series(1, :count)
+        """), {"count": expired})
+        db.execute(text("""
+            INSERT INTO stock_reservation_items (reservation_id, position, product_id, quantity)
+            SELECT r.id, l.position, (:product_ids)[1 + (r.id + l.position) % cardinality(:product_ids)], 1
+            FROM stock_reservations r, generate_series(0, :lines - 1) AS l(position)
+            WHERE r.reference = 'BENCH-EXPIRED'
+        """), {"product_ids": product_ids, "lines": lines})
+        db.commit()
+    finally:
+        db.close()
+
+    start = time.perf_counter()
+    deleted = expire_stock_reservations()
+    elapsed = time.perf_counter() - start
+    print(f"barrido: {deleted} reservas vencidas ({deleted * lines} líneas) en {elapsed:.2f}s "
+          f"= {deleted / elapsed:.0f} reservas/s")
+
+
+def main(args: argparse.Namespace) -> None:
+    cleanup()
+    product_ids = seed_products(args.products, args.stock)
+    try:
+        asyncio.run(bench_api(args, product_ids))
+        negative, unaccounted = consistency(args.stock)
+        print(f"consistencia: productos con stock/disponible negativo={negative} "
+              f"unidades sin explicar={unaccounted} {'OK' if negative == 0 and unaccounted == 0 else 'ERROR'}")
+        if args.expired:
+            bench_sweep(product_ids, args.expired, args.lines)
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--carts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--products", type=int, default=50)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--expired", type=int, default=50000)
+    main(parser.parse_args())
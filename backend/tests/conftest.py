@@ -0,0 +1,97 @@
+"""
+Fixtures de pytest.
+
+Los tests de integración corren contra la base configurada en .env
+(DATABASE_URL) con las migraciones aplicadas; sin conexión se saltean.
+"""
+import os
+from typing import Callable
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# Los triggers solo escriben el outbox con un destino configurado (ver
+# database.session_settings); los tests no corren el relay en segundo plano
+os.environ.setdefault("OUTBOX_SINK", "file")
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.schemas.inventory import StockShardsUpdate  # noqa: E402
+from app.services.inventory_service import InventoryService  # noqa: E402
+
+# SKU de los productos que crean los tests (se eliminan al terminar cada uno)
+TEST_SKU_PREFIX = "TEST-"
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Verificar una vez que la base responde."""
+    try:
+        with SessionLocal() as db:
+            db.execute(text("SELECT 1"))
+    except OperationalError as exc:
+        pytest.skip(f"Base de datos no disponible: {exc.orig}")
+
+
+@pytest.fixture
+def outbox_enabled():
+    """Saltear si las conexiones no escriben el outbox (OUTBOX_SINK=none)."""
+    if settings.OUTBOX_SINK == "none":
+        pytest.skip("Outbox desactivado (OUTBOX_SINK=none)")
+
+
+@pytest.fixture
+def db(database):
+    """Sesión por test; lo que no se confirmó se descarta al terminar."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def make_product(database) -> Callable[..., int]:
+    """
+    Crear productos de prueba; retorna su id.
+
+    Al terminar el test se eliminan con sus reservas, movimientos y eventos
+    del outbox.
+    """
+    created: list[int] = []
+
+    def make(stock: int = 0, stock_min: int = 0, price: str = "2.00", shards: int = 0) -> int:
+        with SessionLocal() as db:
+            product = Product(
+                sku=f"{TEST_SKU_PREFIX}{uuid4().hex[:12].upper()}",
+                name="Producto de prueba",
+                cost=1,
+                price=price,
+                stock_current=stock,
+                stock_min=stock_min,
+            )
+            db.add(product)
+            db.commit()
+            created.append(product.id)
+            if shards:
+                InventoryService(db).set_stock_shards(product.id, StockShardsUpdate(shards=shards))
+            return product.id
+
+    yield make
+
+    if created:
+        with SessionLocal() as db:
+            params = {"ids": created}
+            db.execute(text("""
+                DELETE FROM stock_reservations WHERE id IN (
+                    SELECT reservation_id FROM stock_reservation_items WHERE product_id = ANY(:ids)
+                )
+            """), params)
+            db.execute(text("DELETE FROM inventory_outbox WHERE product_id = ANY(:ids)"), params)
+            db.execute(text("DELETE FROM inventory_movements WHERE product_id = ANY(:ids)"), params)
+            db.execute(text("DELETE FROM products WHERE id = ANY(:ids)"), params)
+            db.commit()
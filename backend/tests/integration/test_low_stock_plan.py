@@ -0,0 +1,80 @@
+"""
+Regresión del plan de las consultas de bajo stock.
+
+Con un catálogo donde solo una pequeña fracción está bajo el mínimo, las
+consultas reales del repositorio deben usar el índice parcial
+ix_products_low_stock. El conteo con low_stock_only=true también: el
+listado ordena por nombre y puede preferir ix_products_name, que además
+evita el seq scan, por eso no se verifica.
+"""
+import pytest
+from sqlalchemy import func, select, text
+
+from app.core.database import SessionLocal
+from app.models.product import Product
+from app.repositories.product_repository import low_stock_alerts_query, product_filters
+from app.utils.pagination import explain
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+SKU_PREFIX = "TEST-LOWSTOCK-"
+INDEX_NAME = "ix_products_low_stock"
+PRODUCTS = 50_000
+# Uno de cada LOW_STOCK_EVERY productos queda bajo el mínimo
+LOW_STOCK_EVERY = 200
+
+QUERIES = {
+    "alertas (primera página)": low_stock_alerts_query(100),
+    "alertas (con cursor)": low_stock_alerts_query(100, after=(5, 0)),
+    "GET /products/low-stock": (
+        select(Product.id)
+        .where(Product.is_active, Product.deficit > 0)
+        .order_by(Product.stock_current)
+        .limit(50)
+    ),
+    "conteo low_stock_only": (
+        select(func.count(Product.id))
+        .where(*product_filters(low_stock_only=True, is_active=True))
+    ),
+}
+
+
+def _delete_catalog() -> None:
+    with SessionLocal() as db:
+        db.execute(text("DELETE FROM products WHERE sku LIKE :p"), {"p": f"{SKU_PREFIX}%"})
+        db.commit()
+
+
+@pytest.fixture(scope="module")
+def catalog(database):
+    """Catálogo sintético con estadísticas al día; se elimina al terminar."""
+    _delete_catalog()
+    with SessionLocal() as db:
+        db.execute(
+            text("""
+                INSERT INTO products (sku, name, stock_current, stock_min, cost, price, is_active)
+                SELECT :prefix || lpad(g::text, 8, '0'), 'producto ' || g,
+                       CASE WHEN g % :every = 0 THEN g % 5 ELSE 100 END, 10, 1, 2, true
+                FROM generate_series(1, :n) AS g
+            """),
+            {"prefix": SKU_PREFIX, "every": LOW_STOCK_EVERY, "n": PRODUCTS},
+        )
+        db.commit()
+        db.execute(text("ANALYZE products"))
+        db.commit()
+    yield
+    _delete_catalog()
+
+
+def index_names(node: dict) -> set[str]:
+    """Índices que aparecen en un nodo del plan y sus hijos."""
+    found = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        found |= index_names(child)
+    return found
+
+
+@pytest.mark.parametrize("label", list(QUERIES))
+def test_low_stock_queries_use_partial_index(catalog, db, label):
+    indexes = index_names(explain(db, QUERIES[label]))
+    assert INDEX_NAME in indexes, f"{label}: {sorted(indexes) or 'sin índices (seq scan)'}"
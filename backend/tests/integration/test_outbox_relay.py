@@ -0,0 +1,57 @@
+"""
+Relay del outbox: entrega en orden, al menos una vez.
+"""
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.models.inventory_outbox import InventoryOutboxEvent
+from app.services.inventory_service import InventoryService
+from app.services.outbox_relay import relay_inventory_outbox
+from app.services.outbox_sinks import OutboxBatch, OutboxSink, OutboxSinkError
+
+pytestmark = pytest.mark.integration
+
+
+class RecordingSink(OutboxSink):
+    """Guarda los eventos recibidos; con ``fail`` rechaza cada lote."""
+
+    name = "recording"
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.events: list[dict] = []
+
+    def send(self, batch: OutboxBatch) -> None:
+        if self.fail:
+            raise OutboxSinkError("destino caído")
+        self.events.extend(json.loads(event) for event in batch.events)
+
+
+def test_relay_delivers_movements_in_order_and_retries_failures(db, make_product, outbox_enabled):
+    product_id = make_product(stock=0)
+    service = InventoryService(db)
+    movements = [service.add_stock(product_id, quantity) for quantity in (5, 2, 4)]
+    movement_ids = [movement.id for movement in movements]
+
+    def queued() -> list[int]:
+        db.rollback()
+        return list(db.scalars(
+            select(InventoryOutboxEvent.movement_id).where(InventoryOutboxEvent.product_id == product_id)
+        ))
+
+    assert sorted(queued()) == movement_ids
+
+    # Un lote rechazado queda en la cola
+    relay_inventory_outbox(RecordingSink(fail=True))
+    assert sorted(queued()) == movement_ids
+
+    sink = RecordingSink()
+    relay_inventory_outbox(sink)
+    delivered = [event for event in sink.events if event["data"]["product_id"] == product_id]
+    assert [event["data"]["movement_id"] for event in delivered] == movement_ids
+    assert [event["id"] for event in delivered] == sorted(event["id"] for event in delivered)
+    assert all(event["type"] == "movement_created" for event in delivered)
+    assert [event["data"]["stock_after"] for event in delivered] == [5, 7, 11]
+    assert queued() == []
@@ -0,0 +1,66 @@
+"""
+Reservas frente a salidas y ajustes directos.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.database import SessionLocal
+from app.schemas.inventory import StockAdjustment
+from app.schemas.reservation import ReservationCreate
+from app.schemas.sale import SaleLine
+from app.services.inventory_service import InventoryService
+from app.services.reservation_service import ReservationService
+from tests.integration.test_stock_movements import WORKERS, exit_one
+
+pytestmark = pytest.mark.integration
+
+
+def reserve_one(product_id: int) -> Optional[int]:
+    """Reserva de una unidad en su propia sesión; status HTTP si se rechaza."""
+    with SessionLocal() as db:
+        try:
+            ReservationService(db).reserve(ReservationCreate(items=[SaleLine(product_id=product_id, quantity=1)]))
+        except HTTPException as exc:
+            return exc.status_code
+    return None
+
+
+def test_direct_exit_cannot_take_reserved_units(db, make_product):
+    product_id = make_product(stock=10)
+    reservation = ReservationService(db).reserve(
+        ReservationCreate(items=[SaleLine(product_id=product_id, quantity=7)])
+    )
+    service = InventoryService(db)
+
+    with pytest.raises(HTTPException) as exc:
+        service.remove_stock(product_id, 4)
+    assert exc.value.status_code == 400
+    assert service.remove_stock(product_id, 3).stock_after == 7
+
+    with pytest.raises(HTTPException) as exc:
+        service.adjust_stock(StockAdjustment(product_id=product_id, new_stock=6))
+    assert exc.value.status_code == 400
+    assert service.adjust_stock(StockAdjustment(product_id=product_id, new_stock=9)).stock_after == 9
+
+    ReservationService(db).release(reservation.id)
+    assert service.remove_stock(product_id, 9).stock_after == 0
+
+
+def test_concurrent_reservations_and_exits_share_the_stock(db, make_product):
+    product_id = make_product(stock=10)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        reserves = [pool.submit(reserve_one, product_id) for _ in range(12)]
+        exits = [pool.submit(exit_one, product_id) for _ in range(12)]
+        reserved = sum(f.result() is None for f in reserves)
+        sold = sum(f.result() is None for f in exits)
+
+    # Reservas y salidas juntas no superan el stock inicial
+    assert reserved + sold == 10
+    availability = InventoryService(db).get_stock_availability(product_id, 1)
+    assert availability.stock_current == 10 - sold
+    assert availability.stock_reserved == reserved
+    assert availability.stock_available == 0
@@ -0,0 +1,67 @@
+"""
+Checkout: cada línea del ticket con su movimiento.
+"""
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+from app.schemas.sale import SaleCreate, SaleLine
+from app.services.sale_service import SaleService
+
+pytestmark = pytest.mark.integration
+
+
+def test_checkout_maps_each_line_to_its_movement(db, make_product):
+    first = make_product(stock=10, price="3.00")
+    second = make_product(stock=5, price="2.50")
+    items = [
+        SaleLine(product_id=first, quantity=2),
+        SaleLine(product_id=second, quantity=1),
+        SaleLine(product_id=first, quantity=3),
+        SaleLine(product_id=second, quantity=4),
+    ]
+
+    sale = SaleService(db).checkout(SaleCreate(items=items, reference="TICKET-1"))
+
+    assert [(line.product_id, line.quantity) for line in sale.lines] == [
+        (item.product_id, item.quantity) for item in items
+    ]
+    # Stock después de cada línea en el orden del ticket
+    assert [line.stock_after for line in sale.lines] == [8, 4, 5, 0]
+    assert sale.total_items == 10
+    assert sale.total_amount == Decimal("27.50")
+
+    movements = {
+        movement.id: movement
+        for movement in db.query(InventoryMovement).filter(
+            InventoryMovement.id.in_([line.movement_id for line in sale.lines])
+        )
+    }
+    assert len(movements) == len(items)
+    for line in sale.lines:
+        movement = movements[line.movement_id]
+        assert (movement.product_id, movement.quantity, movement.stock_after) == (
+            line.product_id, line.quantity, line.stock_after
+        )
+        assert movement.reference == "TICKET-1"
+    assert db.get(Product, first).stock_current == 5
+    assert db.get(Product, second).stock_current == 0
+
+
+def test_checkout_is_all_or_nothing(db, make_product):
+    first = make_product(stock=10)
+    second = make_product(stock=1)
+
+    with pytest.raises(HTTPException) as exc:
+        SaleService(db).checkout(SaleCreate(items=[
+            SaleLine(product_id=first, quantity=2),
+            SaleLine(product_id=second, quantity=2),
+        ]))
+
+    assert exc.value.status_code == 400
+    assert [shortage["product_id"] for shortage in exc.value.detail["shortages"]] == [second]
+    assert db.get(Product, first).stock_current == 10
+    assert db.query(InventoryMovement).filter(InventoryMovement.product_id.in_([first, second])).count() == 0
@@ -0,0 +1,48 @@
+"""
+Movimientos de stock bajo concurrencia: UPDATE condicional.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.database import SessionLocal
+from app.models.inventory_movement import InventoryMovement
+from app.models.product import Product
+from app.schemas.inventory import InventoryMovementCreate, MovementReasonEnum, MovementTypeEnum
+from app.services.inventory_service import InventoryService
+
+pytestmark = pytest.mark.integration
+
+WORKERS = 8
+
+
+def exit_one(product_id: int) -> Optional[int]:
+    """Salida de una unidad en su propia sesión; status HTTP si se rechaza."""
+    with SessionLocal() as db:
+        try:
+            InventoryService(db).create_movement(InventoryMovementCreate(
+                product_id=product_id,
+                movement_type=MovementTypeEnum.EXIT,
+                reason=MovementReasonEnum.SALE,
+                quantity=1,
+            ))
+        except HTTPException as exc:
+            return exc.status_code
+    return None
+
+
+def test_concurrent_decrements_never_oversell(db, make_product):
+    product_id = make_product(stock=20)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = list(pool.map(exit_one, [product_id] * 40))
+
+    assert results.count(None) == 20
+    assert results.count(400) == 20
+    assert db.get(Product, product_id).stock_current == 0
+    # Cada salida partió del stock que dejó la anterior (sin actualizaciones perdidas)
+    movements = db.query(InventoryMovement).filter(InventoryMovement.product_id == product_id).all()
+    chain = sorted((m.stock_before, m.stock_after) for m in movements)
+    assert chain == [(stock + 1, stock) for stock in range(20)]
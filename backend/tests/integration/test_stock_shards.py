@@ -0,0 +1,78 @@
+"""
+Stock repartido: escrituras concurrentes sobre los slots y plegado.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+from app.models.inventory_movement import InventoryMovement
+from app.models.inventory_outbox import InventoryOutboxEvent
+from app.models.product import Product
+from app.models.stock_shard import StockShard
+from app.schemas.inventory import BatchStockEntry, BatchStockEntryRequest
+from app.schemas.sale import SaleCreate, SaleLine
+from app.services.inventory_service import InventoryService
+from app.services.sale_service import SaleService
+from app.services.stock_shards import fold_stock_shards
+from tests.integration.test_stock_movements import WORKERS, exit_one
+
+pytestmark = pytest.mark.integration
+
+
+def movements_of(db, product_id: int) -> list[InventoryMovement]:
+    return list(db.scalars(
+        select(InventoryMovement).where(InventoryMovement.product_id == product_id).order_by(InventoryMovement.id)
+    ))
+
+
+def test_fold_fills_movements_and_emits_outbox_events(db, make_product, outbox_enabled):
+    product_id = make_product(stock=10, shards=4)
+    other_id = make_product(stock=3)
+    service = InventoryService(db)
+
+    service.remove_stock(product_id, 3)
+    service.remove_stock(product_id, 2)
+    service.batch_stock_entry(BatchStockEntryRequest(items=[
+        BatchStockEntry(product_id=product_id, quantity=6),
+        BatchStockEntry(product_id=other_id, quantity=1),
+    ]))
+    SaleService(db).checkout(SaleCreate(items=[SaleLine(product_id=product_id, quantity=4)]))
+
+    pending = movements_of(db, product_id)
+    assert [m.stock_after for m in pending] == [None] * 4
+    assert db.get(Product, product_id).stock_current == 10
+
+    assert fold_stock_shards() >= 1
+    db.expire_all()
+
+    movements = movements_of(db, product_id)
+    assert [(m.stock_before, m.stock_after) for m in movements] == [(10, 7), (7, 5), (5, 11), (11, 7)]
+    assert db.get(Product, product_id).stock_current == 7
+    assert sum(db.scalars(select(StockShard.stock).where(StockShard.product_id == product_id))) == 7
+
+    folded = {
+        event.movement_id: (event.payload["stock_before"], event.payload["stock_after"])
+        for event in db.scalars(
+            select(InventoryOutboxEvent).where(
+                InventoryOutboxEvent.product_id == product_id,
+                InventoryOutboxEvent.event_type == "movement_folded",
+            )
+        )
+    }
+    assert folded == {m.id: (m.stock_before, m.stock_after) for m in movements}
+
+
+def test_concurrent_decrements_on_shards_never_oversell(db, make_product):
+    product_id = make_product(stock=20, shards=4)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = list(pool.map(exit_one, [product_id] * 30))
+
+    assert results.count(None) == 20
+    assert results.count(400) == 10
+    fold_stock_shards()
+    db.expire_all()
+    assert db.get(Product, product_id).stock_current == 0
+    chain = [(m.stock_before, m.stock_after) for m in movements_of(db, product_id)]
+    assert chain == [(stock, stock - 1) for stock in range(20, 0, -1)]
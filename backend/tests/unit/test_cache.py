@@ -0,0 +1,104 @@
+"""
+Cachés en memoria del proceso: TTL, desalojo y generaciones.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cache
+from app.core.cache import ReferenceDataCache, ReferenceSnapshot, TTLCache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj monotónico manual para ``app.core.cache``."""
+    now = [1000.0]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_entries_expire_after_the_ttl(clock):
+    ttl_cache = TTLCache(maxsize=10, ttl=30)
+    ttl_cache.set("a", 1)
+
+    clock[0] += 29.9
+    assert ttl_cache.get("a") == 1
+    clock[0] += 0.1
+    assert ttl_cache.get("a", "vencido") == "vencido"
+    assert ttl_cache.stats()["size"] == 0
+    assert (ttl_cache.hits, ttl_cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl=30)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+
+    ttl_cache.set("c", 3)
+
+    assert ttl_cache.get("b") is None
+    assert (ttl_cache.get("a"), ttl_cache.get("c")) == (1, 3)
+    assert ttl_cache.evictions == 1
+
+
+def test_set_renews_the_ttl_and_invalidate_removes(clock):
+    ttl_cache = TTLCache(maxsize=10, ttl=30)
+    ttl_cache.set("a", 1)
+    clock[0] += 20
+    ttl_cache.set("a", 2)
+    clock[0] += 20
+    assert ttl_cache.get("a") == 2
+
+    ttl_cache.invalidate("a")
+    ttl_cache.invalidate("a")
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.invalidations == 1
+
+
+def snapshot(version: int) -> ReferenceSnapshot:
+    return ReferenceSnapshot.build("categories", version, [SimpleNamespace(id=1)])
+
+
+def test_reference_snapshot_expires_after_the_ttl(clock):
+    reference_cache = ReferenceDataCache(ttl=300)
+    assert reference_cache.set("categories", snapshot(1), reference_cache.generation("categories"))
+
+    clock[0] += 299
+    assert reference_cache.get("categories").by_id[1].id == 1
+    clock[0] += 1
+    assert reference_cache.get("categories") is None
+
+
+def test_load_started_before_an_invalidation_is_discarded(clock):
+    reference_cache = ReferenceDataCache(ttl=300)
+    generation = reference_cache.generation("categories")
+
+    # Otro hilo cambia la tabla mientras esta carga lee las filas
+    reference_cache.invalidate("categories")
+
+    assert not reference_cache.set("categories", snapshot(1), generation)
+    assert reference_cache.get("categories") is None
+    assert reference_cache.set("categories", snapshot(2), reference_cache.generation("categories"))
+
+
+def test_clear_discards_loads_of_every_name(clock):
+    reference_cache = ReferenceDataCache(ttl=300)
+    generation = reference_cache.generation("suppliers")
+
+    reference_cache.clear()
+
+    assert not reference_cache.set("suppliers", snapshot(1), generation)
+
+
+def test_notification_keeps_a_snapshot_already_at_that_version(clock):
+    reference_cache = ReferenceDataCache(ttl=300)
+    reference_cache.set("categories", snapshot(5), reference_cache.generation("categories"))
+
+    reference_cache.invalidate("categories", version=5)
+    assert reference_cache.get("categories").version == 5
+
+    reference_cache.invalidate("categories", version=6)
+    assert reference_cache.get("categories") is None
@@ -0,0 +1,51 @@
+"""
+Tokens de paginación por cursor.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.utils.pagination import decode_cursor, decode_key_cursor, encode_cursor, encode_key_cursor
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2026, 10, 17, 8, 30, 15, 123456),
+    datetime(2026, 10, 17, 8, 30, tzinfo=timezone(timedelta(hours=-3))),
+])
+def test_cursor_round_trip(created_at):
+    token = encode_cursor(created_at, 987654)
+
+    assert "=" not in token
+    assert decode_cursor(token) == (created_at, 987654)
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "no-es-base64!",
+    encode_cursor(datetime(2026, 1, 1), 1)[:-3],
+    "eyJpIjoxfQ",  # {"i":1}, sin fecha
+    "eyJjIjoiYXllciIsImkiOjF9",  # {"c":"ayer","i":1}
+])
+def test_invalid_cursor_is_rejected(token):
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        decode_cursor(token)
+
+
+def test_key_cursor_round_trip():
+    token = encode_key_cursor(12, 345)
+
+    assert decode_key_cursor(token, 2) == (12, 345)
+
+
+@pytest.mark.parametrize("token, size", [
+    (encode_key_cursor(12, 345), 3),
+    (encode_key_cursor(12), 2),
+    ("eyJhIjoxfQ", 1),  # {"a":1}, no es lista
+    ("WyJ4Il0", 1),  # ["x"]
+    ("%%%", 1),
+])
+def test_invalid_key_cursor_is_rejected(token, size):
+    with pytest.raises(ValueError, match="Cursor inválido"):
+        decode_key_cursor(token, size)
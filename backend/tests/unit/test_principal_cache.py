@@ -0,0 +1,29 @@
+"""
+Caché de principales: qué se guarda de cada usuario.
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.cache import principal_cache
+from app.models.user import User
+from app.services.auth_service import PRINCIPAL_FIELDS, cache_principal
+
+pytestmark = pytest.mark.unit
+
+
+def test_cached_principal_never_keeps_the_password_hash():
+    now = datetime.now(timezone.utc)
+    user = User(
+        id=1, email="principal@test.local", full_name="Principal", password_hash="$2b$12$secreto",
+        role="admin", is_active=True, created_at=now, updated_at=now,
+    )
+
+    cache_principal(user.email, user)
+    try:
+        cached = principal_cache.get(user.email)
+        assert set(cached) == set(PRINCIPAL_FIELDS)
+        assert "password_hash" not in cached
+        assert User(**cached).role == "admin"
+    finally:
+        principal_cache.invalidate(user.email)
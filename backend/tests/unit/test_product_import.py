@@ -0,0 +1,85 @@
+"""
+Lectores de CSV / XLSX y validación de filas de la importación de productos.
+"""
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+
+from app.services.product_import_service import _parse_row
+from app.utils.import_readers import ImportFileError, iter_csv_rows, iter_xlsx_rows
+
+pytestmark = pytest.mark.unit
+
+
+def xlsx_file(*rows) -> BytesIO:
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_csv_rows_are_numbered_like_the_spreadsheet():
+    data = "\ufeffSKU, Name ,price\nA-1, Uno ,1.50\n,,\nB-2,,2\n".encode()
+
+    rows = list(iter_csv_rows(BytesIO(data)))
+
+    # BOM de Excel al inicio; la fila vacía (3) se saltea sin cambiar la numeración
+    assert rows == [
+        (2, {"sku": "A-1", "name": "Uno", "price": "1.50"}),
+        (4, {"sku": "B-2", "name": None, "price": "2"}),
+    ]
+
+
+def test_csv_detects_semicolon_and_counts_quoted_newlines_as_one_row():
+    data = 'sku;description;price\nA-1;"dos\nlíneas";1,50\nB-2;x;3\n'.encode()
+
+    rows = list(iter_csv_rows(BytesIO(data)))
+
+    assert rows[0] == (2, {"sku": "A-1", "description": "dos\nlíneas", "price": "1,50"})
+    assert rows[1][0] == 3
+
+
+def test_csv_with_wrong_encoding_is_an_import_error():
+    with pytest.raises(ImportFileError, match="CSV inválido"):
+        list(iter_csv_rows(BytesIO("sku\nñandú\n".encode("latin-1"))))
+
+
+def test_xlsx_rows_skip_blank_lines_and_unnamed_columns():
+    file = xlsx_file(("SKU", "Price", None), (12345, 1.5, "sin encabezado"), (None, "  ", None), ("b-2", 2, None))
+
+    rows = list(iter_xlsx_rows(file))
+
+    assert rows == [(2, {"sku": 12345, "price": 1.5}), (4, {"sku": "b-2", "price": 2})]
+
+
+def test_invalid_xlsx_is_an_import_error():
+    with pytest.raises(ImportFileError, match="XLSX inválido"):
+        list(iter_xlsx_rows(BytesIO(b"no es un zip")))
+
+
+def test_parse_row_normalizes_spreadsheet_values():
+    product, error = _parse_row({
+        "sku": 12345, "name": "Producto", "price": "1,50", "cost": Decimal("0.75"),
+        "stock_current": 3, "ignorada": "x",
+    })
+
+    assert error == ""
+    assert (product.sku, product.price, product.cost, product.stock_current) == ("12345", Decimal("1.50"), Decimal("0.75"), 3)
+
+
+@pytest.mark.parametrize("raw, message", [
+    ({"sku": "A", "price": "1", "cost": "1"}, "name:"),
+    ({"sku": "A", "name": "Producto", "price": "-1", "cost": "1"}, "price:"),
+    ({"sku": "A", "name": "Producto", "price": "100000000", "cost": "1"}, "el monto excede"),
+    ({"sku": "A", "name": "Producto", "price": "1", "cost": "1", "stock_min": 2**31}, "el valor excede"),
+])
+def test_parse_row_reports_invalid_rows(raw, message):
+    product, error = _parse_row(raw)
+
+    assert product is None
+    assert message in error